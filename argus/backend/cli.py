@@ -3,7 +3,9 @@ import click
 from flask import Blueprint, current_app
 from flask.cli import with_appcontext
 from argus.backend.db import ScyllaCluster
+from argus.backend.models.web import ArgusRelease
 from argus.backend.plugins.loader import all_plugin_models, all_plugin_types
+from argus.backend.plugins.sct.service import SCTService
 from argus.backend.service.build_system_monitor import JenkinsMonitor
 from argus.backend.service.github_service import GithubService
 from argus.backend.service.jira_service import JiraService
@@ -55,8 +57,27 @@ def refresh_issues_command():
 
 @cli_bp.cli.add_command
 @click.command('scan-jenkins')
+@click.option("--dry-run", is_flag=True, help="Only list the releases, groups and tests that would be created")
 @with_appcontext
-def scan_jenkins_command():
+def scan_jenkins_command(dry_run: bool):
     monitor = JenkinsMonitor()
-    monitor.collect()
-    click.echo("Done.")
+    diff = monitor.collect(dry_run=dry_run)
+    if dry_run:
+        for release in diff.releases:
+            click.echo(f"+ release {release.name}")
+        for group in diff.groups:
+            click.echo(f"+ group {group.build_system_id}")
+        for test in diff.tests:
+            click.echo(f"+ test {test.build_system_id}")
+    click.echo(f"Done. {len(diff.releases)} new releases, {len(diff.groups)} new groups, {len(diff.tests)} new tests.")
+
+
+@cli_bp.cli.add_command
+@click.command('index-kernels')
+@click.option("--release", "release_names", multiple=True, help="Release to index, all releases if omitted")
+@with_appcontext
+def index_kernels_command(release_names: tuple[str, ...]):
+    names = release_names or [release.name for release in ArgusRelease.find().all()]
+    for name in names:
+        indexed = SCTService.index_release_kernels(release_name=name)
+        click.echo(f"{name}: indexed {indexed} runs.")
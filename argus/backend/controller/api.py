@@ -24,7 +24,7 @@ from argus.backend.service.testrun import TestRunService
 from argus.backend.service.user import UserService, api_login_required
 from argus.backend.service.stats import ReleaseStatsCollector
 from argus.backend.models.web import ArgusRelease, ArgusGroup, ArgusTest, User, UserOauthToken
-from argus.backend.util.common import get_payload
+from argus.backend.util.common import conditional_json_response, get_payload
 
 bp = Blueprint('api', __name__, url_prefix='/api/v1')
 bp.register_blueprint(notifications_bp)
@@ -436,14 +436,14 @@ def test_results():
         exists = service.is_results_exist(test_id=UUID(test_id))
         return Response(status=200 if exists else 404)
 
-    graphs, ticks, releases_filters = service.get_test_graphs(test_id=UUID(
+    graphs, ticks, releases_filters, graphs_etag = service.get_test_graph_snapshots(test_id=UUID(
         test_id), start_date=start_date, end_date=end_date, table_names=table_names)
     graph_views = service.get_argus_graph_views(test_id=UUID(test_id))
 
-    return {
+    return conditional_json_response(request, [graphs_etag, current_app.json.dumps(graph_views)], lambda: {
         "status": "ok",
         "response": {"graphs": graphs, "ticks": ticks, "releases_filters": releases_filters, "graph_views": graph_views}
-    }
+    })
 
 
 @bp.route("/create-graph-view", methods=["POST"])
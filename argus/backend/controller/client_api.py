@@ -160,6 +160,17 @@ def submit_pytest_result():
     }
 
 
+@bp.route("/testrun/pytest/result/submit_batch", methods=["POST"])
+@api_login_required
+def submit_pytest_results():
+    payload = get_payload(request)
+    result = ClientService().submit_pytest_results(results=payload["results"])
+    return {
+        "status": "ok",
+        "response": result
+    }
+
+
 @bp.route("/testrun/pytest/<string:test_name>/stats/<string:field_name>/<string:aggr_function>")
 @api_login_required
 def get_pytest_test_field_stats(test_name: str, field_name: str, aggr_function: str):
@@ -179,6 +190,24 @@ def get_pytest_test_field_stats(test_name: str, field_name: str, aggr_function:
     }
 
 
+@bp.route("/testrun/pytest/stats/duration", methods=["POST"])
+@api_login_required
+def get_pytest_duration_stats():
+    """
+        Method: POST
+        Body:
+            tests: names of pytest units, for example ["sample.py::TestSample::test_sampe"]
+            status, since: optional filters, same as for the single test stats
+        Returns duration avg, p95 and count per test
+    """
+    payload = get_payload(request)
+    result = TestRunService().get_pytest_duration_stats(test_names=payload["tests"], query=payload)
+    return {
+        "status": "ok",
+        "response": result
+    }
+
+
 @bp.route("/testrun/report/email", methods=["POST"])
 @api_login_required
 def send_email_report():
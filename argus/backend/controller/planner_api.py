@@ -192,3 +192,15 @@ def trigger_jobs_for_plans():
         "status": "ok",
         "response": result,
     }
+
+
+@bp.route("/plan/trigger/<string:trigger_id>/status", methods=["GET"])
+@api_login_required
+def get_trigger_status(trigger_id: str):
+    service = PlanningService()
+    result = service.get_trigger_status(trigger_id)
+
+    return {
+        "status": "ok",
+        "response": result,
+    }
@@ -17,7 +17,7 @@ from __future__ import annotations
 from flask import Blueprint, request
 
 from argus.backend.error_handlers import APIException, handle_api_exception
-from argus.backend.service.replay_service import ReplayService
+from argus.backend.service.replay_service import ReplayCheckpointStore, ReplayService
 from argus.backend.service.user import api_login_required
 
 bp = Blueprint("replay_api", __name__, url_prefix="/replay")
@@ -73,6 +73,8 @@ def replay_ingest():
     backfill_logs = request.args.get(
         "backfill_logs", "true",
     ).lower() in {"1", "true", "yes"}
+    # Skip the runs a previous ingest of the same archive already replayed.
+    resume = request.args.get("resume", "false").lower() in {"1", "true", "yes"}
 
     # Propagate the caller's Authorization header to the in-process
     # ``test_client`` so internal proxied requests inherit the same identity
@@ -85,6 +87,8 @@ def replay_ingest():
         auth_header=auth_header,
         create_missing_tests=create_missing_tests,
         backfill_logs=backfill_logs,
+        resume=resume,
+        checkpoint_store=ReplayCheckpointStore(),
     ).ingest(archive, dry_run=dry_run)
 
     return {"status": "ok", "response": summary.as_dict()}
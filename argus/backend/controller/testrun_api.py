@@ -12,6 +12,7 @@ import magic
 from coodie.exceptions import DocumentNotFound
 
 from argus.backend.error_handlers import handle_api_exception
+from argus.backend.metrics import METRICS
 from argus.backend.models.web import ArgusTest
 from argus.backend.service.github_service import GithubService
 from argus.backend.service.issue_service import IssueService
@@ -100,6 +101,7 @@ def test_run_activity(run_id: str):
 
 @bp.route("/run/<string:test_id>/<string:run_id>/fetch_results", methods=["GET"])
 @api_login_required
+@METRICS.histogram("run_results_fetch_seconds", "Time to read and assemble the result tables of a run")
 def fetch_results(test_id: str, run_id: str):
     tables = ResultsService().get_run_results(test_id=UUID(test_id), run_id=UUID(run_id))
     return {
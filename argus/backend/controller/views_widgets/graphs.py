@@ -1,11 +1,12 @@
 from uuid import UUID
 from datetime import datetime, timezone
 
-from flask import Blueprint, request
+from flask import Blueprint, current_app, request
 
 from argus.backend.models.web import ArgusUserView, ArgusTest
 from argus.backend.service.results_service import ResultsService
 from argus.backend.service.user import api_login_required
+from argus.backend.util.common import conditional_json_response
 bp = Blueprint("graphs", __name__, url_prefix="/widgets")
 
 
@@ -19,10 +20,12 @@ def get_graph_views():
     service = ResultsService()
     response = {}
     tests_details = {}
+    etag_parts = []
 
     for test_id in view.tests:
         test_uuid = test_id
         graph_views = service.get_argus_graph_views(test_uuid)
+        etag_parts.append(current_app.json.dumps(graph_views))
         if graph_views:
             test_name = ArgusTest.get(id=test_uuid).name
             tests_details[str(test_id)] = {"name": test_name}
@@ -38,12 +41,13 @@ def get_graph_views():
             # Get graphs data for these tables
             start_dt = datetime.fromisoformat(start_date).astimezone(timezone.utc) if start_date else None
             end_dt = datetime.fromisoformat(end_date).astimezone(timezone.utc) if end_date else None
-            graphs, ticks, releases_filters = service.get_test_graphs(
+            graphs, ticks, releases_filters, graphs_etag = service.get_test_graph_snapshots(
                 test_id=test_uuid,
                 start_date=start_dt,
                 end_date=end_dt,
                 table_names=list(table_names)
             )
+            etag_parts.append(graphs_etag)
 
             # filter out graphs that are not in the graph views
             graphs = [graph for graph in graphs if graph["options"]
@@ -61,8 +65,9 @@ def get_graph_views():
 
         response[str(test_id)] = view_data
 
-    return {
+    etag_parts.append(current_app.json.dumps(tests_details))
+    return conditional_json_response(request, etag_parts, lambda: {
         "status": "ok",
         "response": response,
         "tests_details": tests_details
-    }
+    })
@@ -31,6 +31,17 @@ def get_release_pytest_results(release_id: str):
     }
 
 
+@bp.route("/pytest/release/<string:release_id>/charts", methods=["GET"])
+@api_login_required
+def get_release_pytest_charts(release_id: str):
+    service = PytestViewService()
+    res = service.release_charts(release_id)
+    return {
+        "status": "ok",
+        "response": res
+    }
+
+
 @bp.route("/pytest/view/<string:view_id>/results", methods=["GET"])
 @api_login_required
 def get_view_pytest_results(view_id: str):
@@ -41,6 +52,17 @@ def get_view_pytest_results(view_id: str):
         "response": res
     }
 
+
+@bp.route("/pytest/view/<string:view_id>/charts", methods=["GET"])
+@api_login_required
+def get_view_pytest_charts(view_id: str):
+    service = PytestViewService()
+    res = service.view_charts(view_id)
+    return {
+        "status": "ok",
+        "response": res
+    }
+
 @bp.route("/pytest/results", methods=["GET"])
 @api_login_required
 def get_pytest_results():
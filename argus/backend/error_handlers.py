@@ -19,6 +19,10 @@ class DataValidationError(APIException):
     pass
 
 
+class ResultWriteError(APIException):
+    pass
+
+
 class DBErrorHandler():
     DB_ERROR_COUNTER = 0
     DB_ERROR_THRESHOLD = 10
@@ -53,3 +53,16 @@ class SCTCriticalEventEmbedding(Document):
     class Settings:
         name = "sct_critical_event_embedding"
         keyspace = "argus_tablets"
+
+
+class SCTSimilarityShardLease(Document):
+    """Lease of one token-range shard of sct_unprocessed_events by a similarity worker.
+
+    Rows are written with a TTL and renewed by their owner, so a crashed worker's shard frees itself.
+    """
+    shard: Annotated[Optional[int], PrimaryKey()] = None
+    owner: Optional[str] = None
+    acquired_at: Optional[datetime] = None
+
+    class Settings:
+        name = "sct_similarity_shard_lease"
@@ -4,7 +4,7 @@ from uuid import UUID
 
 from pydantic import Field
 from cassandra.util import uuid_from_time
-from coodie import Ascii, Indexed, PrimaryKey, TimeUUID
+from coodie import Ascii, ClusteringKey, Indexed, PrimaryKey, TimeUUID
 from coodie.sync import Document
 
 
@@ -44,3 +44,19 @@ class ArgusReleasePlan(Document):
 
     def __hash__(self):
         return hash(self.id)
+
+
+class PlanTriggerJob(Document):
+    """Progress of one job of a plan trigger, polled through the trigger status endpoint."""
+    trigger_id: Annotated[UUID, TimeUUID(), PrimaryKey()]
+    build_system_id: Annotated[str, ClusteringKey()]
+    test_id: Optional[UUID] = None
+    status: Annotated[Optional[str], Ascii()] = None
+    url: Optional[str] = None
+    error: Optional[str] = None
+    last_updated: Optional[datetime.datetime] = Field(
+        default_factory=lambda: datetime.datetime.now(tz=datetime.UTC))
+
+    class Settings:
+        name = "plan_trigger_job"
+        __default_ttl__ = 7 * 24 * 3600
@@ -1,11 +1,11 @@
 from typing import Annotated, Any, Optional, TypedDict
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 from uuid import UUID
 
 from pydantic import Field
 from cassandra.util import uuid_from_time
 from cassandra.cluster import Session
-from coodie import ClusteringKey, Double, Indexed, PrimaryKey, TimeUUID
+from coodie import ClusteringKey, Counter, Double, Indexed, PrimaryKey, TimeUUID
 from coodie.sync import Document
 
 from argus.common.enums import PytestStatus
@@ -83,3 +83,70 @@ class PytestUserField(Document):
 
     class Settings:
         name = "pytest_user_field"
+
+
+class PytestTestName(Document):
+    """Denormalized index: pytest test names reported for an Argus test.
+    Lets the pytest widget narrow a release or view down to the tests whose
+    names match a search without a DISTINCT scan of pytest_v2.
+    """
+    test_id: Annotated[Optional[UUID], PrimaryKey()] = None
+    name: Annotated[Optional[str], ClusteringKey()] = None
+
+    class Settings:
+        name = "pytest_test_name"
+
+
+class PytestResultByDay(Document):
+    """Denormalized copy of pytest_v2 for the pytest widget search.
+    Partitioned by Argus test and UTC day of the result, so a date range
+    only reads the partitions of its days; user fields are inlined so
+    filtering on them needs no pytest_user_field lookups.
+    """
+    test_id: Annotated[Optional[UUID], PrimaryKey(partition_key_index=0)] = None
+    day: Annotated[Optional[date], PrimaryKey(partition_key_index=1)] = None
+    id: Annotated[Optional[datetime], ClusteringKey(clustering_key_index=0, order="DESC")] = None
+    name: Annotated[Optional[str], ClusteringKey(clustering_key_index=1)] = None
+    status: Optional[str] = None
+    test_type: Optional[str] = None
+    run_id: Optional[UUID] = None
+    release_id: Optional[UUID] = None
+    duration: Annotated[Optional[float], Double()] = None
+    message: Optional[str] = None
+    session_timestamp: Optional[datetime] = None
+    markers: list[str] = Field(default_factory=list)
+    user_fields: dict[str, str] = Field(default_factory=dict)
+
+    class Settings:
+        name = "pytest_result_by_day"
+
+
+class PytestDailyStatusCount(Document):
+    """Rollup: number of pytest results per Argus test, UTC day, test name and status.
+    Incremented on submission so the pytest widget charts of a release or view
+    read one small partition per test and day instead of every result.
+    """
+    test_id: Annotated[Optional[UUID], PrimaryKey(partition_key_index=0)] = None
+    day: Annotated[Optional[date], PrimaryKey(partition_key_index=1)] = None
+    name: Annotated[Optional[str], ClusteringKey(clustering_key_index=0)] = None
+    status: Annotated[Optional[str], ClusteringKey(clustering_key_index=1)] = None
+    count: Annotated[Optional[int], Counter()] = None
+
+    class Settings:
+        name = "pytest_daily_status"
+
+
+class PytestCountedResult(Document):
+    """Results counted in pytest_daily_status, with the status they are counted under.
+    Claimed with a lightweight transaction before a counter is touched, so a
+    result submitted again is not counted twice and one reported again with
+    another status moves its count instead of adding one.
+    """
+    test_id: Annotated[Optional[UUID], PrimaryKey(partition_key_index=0)] = None
+    day: Annotated[Optional[date], PrimaryKey(partition_key_index=1)] = None
+    id: Annotated[Optional[datetime], ClusteringKey(clustering_key_index=0)] = None
+    name: Annotated[Optional[str], ClusteringKey(clustering_key_index=1)] = None
+    status: Optional[str] = None
+
+    class Settings:
+        name = "pytest_counted_result"
@@ -193,3 +193,30 @@ class ArgusGraphView(Document):
 
     class Settings:
         name = "graph_view_v1"
+
+
+class ArgusGraphSnapshot(Document):
+    """Serialized Chart.js graphs of one results table for one date window.
+    Rebuilt after results are submitted for the test and served by the results API as is.
+    """
+    test_id: Annotated[Optional[UUID], PrimaryKey()] = None
+    window: Annotated[Optional[str], Ascii(), ClusteringKey(clustering_key_index=0)] = None  # "<start>/<end>" or "/"
+    name: Annotated[Optional[str], ClusteringKey(clustering_key_index=1)] = None
+    payload: Optional[str] = None
+    etag: Annotated[Optional[str], Ascii()] = None
+    generated_at: Optional[datetime] = None
+    generation: Optional[UUID] = None  # ArgusGraphSnapshotGeneration of the test the snapshot was built in
+
+    class Settings:
+        name = "generic_result_graph_snapshot_v1"
+
+
+class ArgusGraphSnapshotGeneration(Document):
+    """Current generation of the graph snapshots of a test, replaced whenever its results or ignored runs change.
+    Snapshots of another generation are stale: built from data read before the change, possibly written after it.
+    """
+    test_id: Annotated[Optional[UUID], PrimaryKey()] = None
+    generation: Optional[UUID] = None
+
+    class Settings:
+        name = "generic_result_graph_snapshot_generation_v1"
@@ -1,7 +1,8 @@
+import itertools
 import logging
-from typing import Annotated, Optional
+from typing import Annotated, ClassVar, Optional
 from uuid import UUID, uuid1, uuid4
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum, IntEnum, auto
 from cassandra.util import uuid_from_time, unix_time_from_uuid1
 from pydantic import Field
@@ -10,13 +11,16 @@ from coodie.exceptions import DocumentNotFound
 
 from argus.backend.models.github_issue import GithubIssue, IssueAssignee, IssueLabel, IssueLink
 from argus.backend.models.jira import JiraIssue
-from argus.backend.models.plan import ArgusReleasePlan
-from argus.backend.models.pytest import PytestResultTable, PytestResultTableOld, PytestUserField
+from argus.backend.models.plan import ArgusReleasePlan, PlanTriggerJob
+from argus.backend.models.pytest import PytestCountedResult, PytestDailyStatusCount, PytestResultByDay, \
+    PytestResultTable, PytestResultTableOld, PytestTestName, PytestUserField
 from argus.backend.models.result import (
     ArgusGenericResultMetadata,
     ArgusGenericResultData,
     ArgusBestResultData,
     ArgusGraphView,
+    ArgusGraphSnapshot,
+    ArgusGraphSnapshotGeneration,
     ColumnMetadata,
     ValidationRules,
 )
@@ -26,7 +30,7 @@ from coodie.sync import Document
 from argus.backend.models.runtime_store import RuntimeStore
 from argus.backend.models.view_widgets import WidgetHighlights, WidgetComment
 from argus.backend.models.argus_ai import ErrorEventEmbeddings, CriticalEventEmbeddings, SCTErrorEventEmbedding, \
-    SCTCriticalEventEmbedding
+    SCTCriticalEventEmbedding, SCTSimilarityShardLease
 from argus.backend.models.ssh_key import SSHTunnelKey, ProxyTunnelConfig
 
 
@@ -155,7 +159,67 @@ class UserOauthToken(Document):
         name = "user_oauth_token"
 
 
-class ArgusRelease(Document):
+TEST_LOOKUP_CHANGE_TTL = 7 * 24 * 3600
+
+
+class TestLookupChange(Document):
+    """
+    Log of saved and deleted releases, groups and tests, partitioned by day.
+
+    The version (a timeuuid) of the rows a process has read is the stamp of its
+    TestLookup search index: refreshing it reads the changes after that stamp and
+    reloads only the entities they name. Rows expire after TEST_LOOKUP_CHANGE_TTL,
+    an index that fell further behind is rebuilt.
+    """
+    day: Annotated[date, PrimaryKey()]
+    version: Annotated[UUID, TimeUUID(), ClusteringKey()] = Field(default_factory=uuid_now)
+    entity_type: Optional[str] = None
+    entity_id: Optional[UUID] = None
+
+    class Settings:
+        name = "test_lookup_change"
+        __default_ttl__ = TEST_LOOKUP_CHANGE_TTL
+
+
+_local_lookup_changes = itertools.count(1)
+_local_lookup_version = 0
+
+
+def record_lookup_change(entity_type: str, entity_id: UUID) -> None:
+    global _local_lookup_version  # pylint: disable=global-statement
+    version = uuid_now()
+    TestLookupChange.create(day=datetime.utcfromtimestamp(unix_time_from_uuid1(version)).date(), version=version,
+                            entity_type=entity_type, entity_id=entity_id)
+    # Lets the search index of this process pick the change up without waiting for its refresh interval
+    _local_lookup_version = next(_local_lookup_changes)
+
+
+def local_lookup_version() -> int:
+    """Number of changes recorded by this process, bumped after each change is logged."""
+    return _local_lookup_version
+
+
+class TestLookupTracked:
+    """Records saves, updates and deletes of the document in TestLookupChange."""
+    lookup_type: ClassVar[str]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        record_lookup_change(self.lookup_type, self.id)
+
+    def update(self, *args, **kwargs):
+        result = super().update(*args, **kwargs)
+        record_lookup_change(self.lookup_type, self.id)
+        return result
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        record_lookup_change(self.lookup_type, self.id)
+        return result
+
+
+class ArgusRelease(TestLookupTracked, Document):
+    lookup_type: ClassVar[str] = "release"
     id: Annotated[UUID, PrimaryKey()] = Field(default_factory=uuid4)
     name: Annotated[Optional[str], Indexed()] = None
     pretty_name: Optional[str] = None
@@ -178,7 +242,8 @@ class ArgusRelease(Document):
             return super().__eq__(other)
 
 
-class ArgusGroup(Document):
+class ArgusGroup(TestLookupTracked, Document):
+    lookup_type: ClassVar[str] = "group"
     id: Annotated[UUID, PrimaryKey()] = Field(default_factory=uuid4)
     release_id: Annotated[Optional[UUID], Indexed()] = None
     name: Annotated[Optional[str], Indexed()] = None
@@ -218,8 +283,24 @@ class ArgusUserView(Document):
     class Settings:
         name = "argus_user_view"
 
+    def save(self, *args, **kwargs):
+        try:
+            stored_tests = ArgusUserView.get(id=self.id).tests
+        except DocumentNotFound:
+            stored_tests = []
+        super().save(*args, **kwargs)
+        index_view_tests(self.id, stored_tests, self.tests)
+        invalidate_view_snapshots(self.id)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        index_view_tests(self.id, self.tests, [])
+        invalidate_view_snapshots(self.id)
+        return result
 
-class ArgusTest(Document):
+
+class ArgusTest(TestLookupTracked, Document):
+    lookup_type: ClassVar[str] = "test"
     id: Annotated[UUID, PrimaryKey()] = Field(default_factory=uuid4)
     group_id: Annotated[Optional[UUID], Indexed()] = None
     release_id: Annotated[Optional[UUID], Indexed()] = None
@@ -383,6 +464,49 @@ class ReleaseStatsSnapshot(Document):
         name = "argus_release_stats_snapshot"
 
 
+class ViewStatsSnapshot(Document):
+    """Stats of a view for one filter combination, served as-is until the view, a run of its tests or the
+    tests, groups and plans of their releases change.
+    Keyed by view_id (partition) + filter_key (clustering).
+    """
+    view_id: Annotated[Optional[UUID], PrimaryKey()] = None
+    filter_key: Annotated[Optional[str], ClusteringKey()] = None
+    payload: Optional[str] = None
+    generated_at: Optional[datetime] = None
+
+    class Settings:
+        name = "argus_view_stats_snapshot"
+
+
+class ViewTestMembership(Document):
+    """Denormalized index: views listing a test.
+    Lets a run of the test drop the stats snapshots of its views without scanning every view.
+    Keyed by test_id (partition) + view_id (clustering).
+    """
+    test_id: Annotated[Optional[UUID], PrimaryKey()] = None
+    view_id: Annotated[Optional[UUID], ClusteringKey()] = None
+
+    class Settings:
+        name = "view_test_membership"
+
+
+class ReleaseTestStats(Document):
+    """Per-test slice of a release stats snapshot for one filter combination.
+    Refreshed in place when a run of the test changes, so regenerating the
+    release roll-up only re-reads this partition instead of every plugin table.
+    Keyed by release_id (partition) + (filter_key, test_id) (clustering).
+    """
+    release_id: Annotated[Optional[UUID], PrimaryKey()] = None
+    filter_key: Annotated[Optional[str], ClusteringKey(clustering_key_index=0)] = None
+    test_id: Annotated[Optional[UUID], ClusteringKey(clustering_key_index=1)] = None
+    group_id: Optional[UUID] = None
+    payload: Optional[str] = None
+    generated_at: Optional[datetime] = None
+
+    class Settings:
+        name = "argus_release_test_stats"
+
+
 class ReleaseDistinctVersions(Document):
     """Denormalized index: distinct scylla_version values seen for a release.
     Replaces the expensive GSI scan in get_distinct_product_versions.
@@ -407,6 +531,37 @@ class ReleaseDistinctImages(Document):
         name = "release_distinct_images"
 
 
+class RunLocator(Document):
+    """Denormalized index: plugin and primary key of a run by its id.
+    Replaces probing the id index of every plugin run table to find a run.
+    Keyed by run_id (partition) so a run is located with a single primary key read.
+    """
+    run_id: Annotated[Optional[UUID], PrimaryKey()] = None
+    plugin_name: Optional[str] = None
+    build_id: Optional[str] = None
+    start_time: Optional[datetime] = None
+
+    class Settings:
+        name = "run_locator"
+
+
+REPLAY_CHECKPOINT_TTL = 30 * 24 * 3600
+
+
+class ReplayCheckpoint(Document):
+    """Runs of a replay-log archive that were replayed without failures.
+    Lets a re-ingest of the same archive resume with the remaining runs.
+    Keyed by archive_id (partition, sha256 of the archive) + run_id (clustering).
+    """
+    archive_id: Annotated[str, PrimaryKey()]
+    run_id: Annotated[str, ClusteringKey()]
+    completed_at: Optional[datetime] = None
+
+    class Settings:
+        name = "replay_checkpoint"
+        __default_ttl__ = REPLAY_CHECKPOINT_TTL
+
+
 _SNAPSHOT_LOGGER = logging.getLogger(__name__)
 
 
@@ -418,11 +573,54 @@ def invalidate_release_snapshots(release_id: UUID) -> None:
     mutations). The next stats request will regenerate the snapshots.
     Version-scoped invalidation in PluginModelBase.invalidate_release_snapshot()
     is used only for run lifecycle events (submit/finish).
+    Per-test rows are dropped as well, since structural changes can move
+    tests between groups or change their scheduling, and so are the
+    snapshots of the views listing tests of the release, which read the
+    same plans, groups and tests.
     """
     try:
         ReleaseStatsSnapshot.find(release_id=release_id).delete()
+        ReleaseTestStats.find(release_id=release_id).delete()
     except Exception:  # pylint: disable=broad-except
         _SNAPSHOT_LOGGER.warning("Failed to invalidate release snapshots for %s", release_id, exc_info=True)
+    invalidate_release_view_snapshots(release_id)
+
+
+def invalidate_view_snapshots(view_id: UUID) -> None:
+    """Full-partition delete of all ViewStatsSnapshot rows for a view."""
+    try:
+        ViewStatsSnapshot.find(view_id=view_id).delete()
+    except Exception:  # pylint: disable=broad-except
+        _SNAPSHOT_LOGGER.warning("Failed to invalidate view snapshots for %s", view_id, exc_info=True)
+
+
+def invalidate_test_view_snapshots(test_id: UUID) -> None:
+    """Drop the stats snapshots of every view listing the test."""
+    try:
+        for membership in ViewTestMembership.find(test_id=test_id).all():
+            ViewStatsSnapshot.find(view_id=membership.view_id).delete()
+    except Exception:  # pylint: disable=broad-except
+        _SNAPSHOT_LOGGER.warning("Failed to invalidate view snapshots for test %s", test_id, exc_info=True)
+
+
+def invalidate_release_view_snapshots(release_id: UUID) -> None:
+    """Drop the stats snapshots of every view listing a test of the release."""
+    try:
+        view_ids = {membership.view_id for test in ArgusTest.find(release_id=release_id).only("id").all()
+                    for membership in ViewTestMembership.find(test_id=test.id).all()}
+        for view_id in view_ids:
+            ViewStatsSnapshot.find(view_id=view_id).delete()
+    except Exception:  # pylint: disable=broad-except
+        _SNAPSHOT_LOGGER.warning("Failed to invalidate view snapshots for release %s", release_id, exc_info=True)
+
+
+def index_view_tests(view_id: UUID, previous_tests: list[UUID], tests: list[UUID]) -> None:
+    """Bring the ViewTestMembership rows of a view from its previous test list to the current one."""
+    current = set(tests or [])
+    for test_id in set(previous_tests or []) - current:
+        ViewTestMembership.find(test_id=test_id, view_id=view_id).delete()
+    for test_id in current - set(previous_tests or []):
+        ViewTestMembership.create(test_id=test_id, view_id=view_id)
 
 
 # Application models; synced via Document.sync_table()
@@ -434,6 +632,7 @@ USED_MODELS: list[type[Document]] = [
     ArgusRelease,
     ArgusGroup,
     ArgusTest,
+    TestLookupChange,
     ArgusTestRunComment,
     ArgusEvent,
     ReleasePlannerComment,
@@ -443,10 +642,13 @@ USED_MODELS: list[type[Document]] = [
     ArgusGenericResultData,
     ArgusBestResultData,
     ArgusGraphView,
+    ArgusGraphSnapshot,
+    ArgusGraphSnapshotGeneration,
     ArgusUserView,
     WidgetHighlights,
     WidgetComment,
     ArgusReleasePlan,
+    PlanTriggerJob,
     GithubIssue,
     IssueLink,
     JiraIssue,
@@ -455,15 +657,25 @@ USED_MODELS: list[type[Document]] = [
     PytestResultTable,
     PytestResultTableOld,
     PytestUserField,
+    PytestTestName,
+    PytestResultByDay,
+    PytestDailyStatusCount,
+    PytestCountedResult,
     ReleaseStatsSnapshot,
+    ReleaseTestStats,
+    ViewStatsSnapshot,
+    ViewTestMembership,
     ReleaseDistinctVersions,
     ReleaseDistinctImages,
+    RunLocator,
+    ReplayCheckpoint,
     RunConfiguration,
     RunConfigParam,
     ErrorEventEmbeddings,  # to be deprecated
     CriticalEventEmbeddings,  # to be deprecated
     SCTErrorEventEmbedding,
     SCTCriticalEventEmbedding,
+    SCTSimilarityShardLease,
 ]
 
 # User-defined types; synced via UserType.sync_type() and registered with
@@ -1,8 +1,10 @@
 import logging
+import threading
+from collections import OrderedDict
 from collections.abc import Iterable
 from datetime import datetime, UTC
 from math import ceil
-from typing import Annotated, ClassVar, Optional
+from typing import Annotated, ClassVar, NamedTuple, Optional
 from uuid import UUID
 from time import time
 from cassandra.concurrent import execute_concurrent_with_args
@@ -21,11 +23,72 @@ from argus.backend.models.web import (
     ArgusRelease,
     ReleaseStatsSnapshot,
     ReleaseDistinctVersions,
+    RunLocator,
+    invalidate_release_snapshots,
+    invalidate_test_view_snapshots,
 )
 from argus.backend.util.common import chunk
 from argus.common.enums import TestInvestigationStatus, TestStatus
 
 LOGGER = logging.getLogger(__name__)
+RUN_LOCATION_CACHE_SIZE = 16384
+
+
+class RunLocation(NamedTuple):
+    plugin_name: str
+    build_id: str
+    start_time: datetime
+
+
+class RunLocationCache:
+    """
+    Bounded LRU of run id -> RunLocation, in front of the RunLocator table.
+
+    The plugin and primary key of a run never change once the run is submitted,
+    so entries need no invalidation; they are only evicted to bound memory.
+    """
+
+    def __init__(self, max_size: int = RUN_LOCATION_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: OrderedDict[UUID, RunLocation] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, run_id: UUID) -> RunLocation | None:
+        with self._lock:
+            location = self._entries.get(run_id)
+            if location:
+                self._entries.move_to_end(run_id)
+            return location
+
+    def put(self, run_id: UUID, location: RunLocation) -> None:
+        with self._lock:
+            self._entries[run_id] = location
+            self._entries.move_to_end(run_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+RUN_LOCATIONS = RunLocationCache()
+
+
+def locate_run(run_id: UUID) -> RunLocation | None:
+    """Plugin and primary key of a run from the cache or the RunLocator table, None if it was never indexed."""
+    if location := RUN_LOCATIONS.get(run_id):
+        return location
+    try:
+        row = RunLocator.get(run_id=run_id)
+    except DocumentNotFound:
+        return None
+    location = RunLocation(row.plugin_name, row.build_id, row.start_time)
+    RUN_LOCATIONS.put(run_id, location)
+    return location
 
 
 class PluginModelBase(Document):
@@ -33,6 +96,8 @@ class PluginModelBase(Document):
         __abstract__ = True
 
     _plugin_name: ClassVar[str] = "unknown"
+    # Columns submit_product_version reads or changes besides the primary key and release_id
+    product_version_columns: ClassVar[tuple[str, ...]] = ("scylla_version", "assignee", "product_version")
     # Metadata
     build_id: Annotated[Optional[str], PrimaryKey()] = None
     start_time: Annotated[Optional[datetime], ClusteringKey(order="DESC")] = Field(
@@ -123,6 +188,82 @@ class PluginModelBase(Document):
 
         return bound_query
 
+    @classmethod
+    def load_run_columns(cls, run_id: UUID, columns: Iterable[str]) -> dict:
+        """
+        Read only `columns` of a run instead of the whole row.
+
+        The run is read by primary key when its location is known, through the
+        id index otherwise; the primary key is always selected and remembered.
+        """
+        names = list(dict.fromkeys(["build_id", "start_time", "id", *columns]))
+        cluster = ScyllaCluster.get()
+        location = locate_run(run_id)
+        if location and location.plugin_name == cls._plugin_name:
+            query = cluster.prepare(
+                f"SELECT {', '.join(names)} FROM {cls.table_name()} WHERE build_id = ? AND start_time = ?")
+            row = cluster.session.execute(query=query, parameters=(location.build_id, location.start_time)).one()
+        else:
+            query = cluster.prepare(f"SELECT {', '.join(names)} FROM {cls.table_name()} WHERE id = ?")
+            row = cluster.session.execute(query=query, parameters=(run_id,)).one()
+        if not row:
+            raise DocumentNotFound(f"Run {run_id} not found")
+        if not location:
+            cls._index_location(run_id, row["build_id"], row["start_time"])
+        return row
+
+    @classmethod
+    def load_partial_run(cls, run_id: UUID, columns: Iterable[str]) -> 'PluginModelBase':
+        """Run with only the primary key, id and `columns` loaded, the rest are model defaults."""
+        # Empty collections are read back as null
+        return cls(**{name: value for name, value in cls.load_run_columns(run_id, columns).items() if value is not None})
+
+    @classmethod
+    def get_primary_key(cls, run_id: UUID) -> tuple[str, datetime]:
+        location = locate_run(run_id)
+        if location and location.plugin_name == cls._plugin_name:
+            return location.build_id, location.start_time
+        row = cls.load_run_columns(run_id, ())
+        return row["build_id"], row["start_time"]
+
+    @classmethod
+    def get_by_id(cls, run_id: UUID) -> 'PluginModelBase':
+        """Load a run by id with a primary key read once it is located, raises DocumentNotFound."""
+        build_id, start_time = cls.get_primary_key(run_id)
+        return cls.get(build_id=build_id, start_time=start_time)
+
+    @classmethod
+    def _index_location(cls, run_id: UUID, build_id: str, start_time: datetime) -> None:
+        RUN_LOCATIONS.put(run_id, RunLocation(cls._plugin_name, build_id, start_time))
+        try:
+            RunLocator.create(run_id=run_id, plugin_name=cls._plugin_name, build_id=build_id, start_time=start_time)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.warning("Failed to index location of run %s", run_id, exc_info=True)
+
+    def index_location(self) -> None:
+        """Record where this run is stored so lookups by id skip the per-plugin id indexes."""
+        self._index_location(self.id, self.build_id, self.start_time)
+
+    @classmethod
+    def _update_row(cls, build_id: str, start_time: datetime, values: dict) -> None:
+        if not values:
+            return
+        names = sorted(values)
+        cluster = ScyllaCluster.get()
+        query = cluster.prepare(
+            f"UPDATE {cls.table_name()} SET {', '.join(f'{name} = ?' for name in names)} WHERE build_id = ? AND start_time = ?")
+        cluster.session.execute(query=query, parameters=(*(values[name] for name in names), build_id, start_time))
+
+    @classmethod
+    def update_run_columns(cls, run_id: UUID, **values) -> None:
+        """Write `values` to a run with a single UPDATE of only those columns, no read of the row."""
+        build_id, start_time = cls.get_primary_key(run_id)
+        cls._update_row(build_id, start_time, values)
+
+    def update_columns(self, *columns: str) -> None:
+        """Persist only `columns` of this run, e.g. after changing a run loaded with `load_partial_run`."""
+        self._update_row(self.build_id, self.start_time, {column: getattr(self, column) for column in columns})
+
     @classmethod
     def get_stats_for_release(cls, release: ArgusRelease, build_ids=list[str]):
         cluster = ScyllaCluster.get()
@@ -238,6 +379,8 @@ class PluginModelBase(Document):
         raise NotImplementedError()
 
     def invalidate_release_snapshot(self) -> None:
+        if self.test_id:
+            invalidate_test_view_snapshots(self.test_id)
         if not self.release_id:
             return
         try:
@@ -250,6 +393,18 @@ class PluginModelBase(Document):
         except Exception:
             LOGGER.warning("Failed to invalidate stats snapshot for release %s", self.release_id, exc_info=True)
 
+    def refresh_test_stats(self) -> None:
+        """Refresh the per-test stats rows of this run's test; call after the run is saved."""
+        if not self.release_id or not self.test_id:
+            return
+        # Imported here: the stats service depends on the plugin loader, which imports this module
+        from argus.backend.service.stats import refresh_test_stats
+        try:
+            refresh_test_stats(ArgusTest.get(id=self.test_id))
+        except Exception:
+            LOGGER.warning("Failed to refresh stats for test %s, dropping release snapshots", self.test_id, exc_info=True)
+            invalidate_release_snapshots(self.release_id)
+
     def index_version(self) -> None:
         if not self.release_id or not self.scylla_version:
             return
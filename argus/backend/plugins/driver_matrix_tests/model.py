@@ -138,7 +138,7 @@ class DriverTestRun(PluginModelBase):
 
     @classmethod
     def load_test_run(cls, run_id: UUID) -> 'DriverTestRun':
-        return cls.get(id=run_id)
+        return cls.get_by_id(run_id)
 
     @classmethod
     def parse_driver_name(cls, raw_file_name: str) -> str:
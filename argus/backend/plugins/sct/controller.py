@@ -211,7 +211,7 @@ def sct_event_submit(run_id: str):
     payload = get_payload(request)
     event_data = payload["data"]
     if isinstance(event_data, list):
-        result = all([SCTService.submit_event(run_id=run_id, raw_event=e) for e in event_data])
+        result = SCTService.submit_event_batch(run_id=run_id, raw_events=event_data)
     else:
         result = SCTService.submit_event(run_id=run_id, raw_event=event_data)
     return {
@@ -1,6 +1,7 @@
 from flask import Blueprint
 
-from argus.backend.plugins.sct.testrun import SCTEvent, SCTJunitReports, SCTResource, SCTNemesis, SCTTestRun, SCTUnprocessedEvent, StressCommand
+from argus.backend.plugins.sct.testrun import SCTEvent, SCTJunitReports, SCTResource, SCTNemesis, SCTRunKernel, SCTTestRun, \
+    SCTUnprocessedEvent, StressCommand
 from argus.backend.plugins.sct.controller import bp as sct_bp
 from argus.backend.plugins.core import PluginInfoBase, PluginModelBase
 from argus.backend.plugins.sct.udt import (
@@ -28,6 +29,7 @@ class PluginInfo(PluginInfoBase):
         SCTUnprocessedEvent,
         StressCommand,
         SCTResource,
+        SCTRunKernel,
     ]
     all_types = [
         NemesisRunInfo,
@@ -9,15 +9,18 @@ from typing import TypedDict
 from uuid import UUID
 from xml.etree import ElementTree
 from flask import current_app, g
+from cassandra.concurrent import execute_concurrent_with_args
 from cassandra.util import uuid_from_time
 from coodie.exceptions import DocumentNotFound
 
 from argus.backend.db import ScyllaCluster
+from argus.backend.error_handlers import ResultWriteError
 from argus.backend.models.github_issue import GithubIssue, IssueLink
 from argus.backend.models.jira import JiraIssue
-from argus.backend.models.web import ArgusEventTypes, ErrorEventEmbeddings, CriticalEventEmbeddings
+from argus.backend.models.web import ArgusEventTypes, ArgusRelease, ErrorEventEmbeddings, CriticalEventEmbeddings
 from argus.backend.models.argus_ai import SCTErrorEventEmbedding, SCTCriticalEventEmbedding
-from argus.backend.plugins.sct.testrun import SCTEvent, SCTEventSeverity, SCTJunitReports, SCTResource, SCTNemesis, SCTTestRun, SubtestType, SCTUnprocessedEvent, StressCommand
+from argus.backend.plugins.sct.testrun import SCTEvent, SCTEventSeverity, SCTJunitReports, SCTResource, SCTNemesis, SCTRunKernel, \
+    SCTTestRun, SubtestType, SCTUnprocessedEvent, StressCommand, scylla_version_and_kernel
 from argus.common.sct_types import GeminiResultsRequest, PerformanceResultsRequest, RawEventPayload, ResourceUpdateRequest
 from argus.backend.plugins.sct.udt import (
     CloudInstanceDetails,
@@ -477,8 +480,8 @@ class SCTService:
 
         return "updated"
 
-    @classmethod
-    def submit_event(cls, run_id: str, raw_event: RawEventPayload):
+    @staticmethod
+    def _build_event(run_id: str, raw_event: RawEventPayload) -> SCTEvent:
         req = EventSubmitRequest(**raw_event)
 
         event = SCTEvent()
@@ -501,7 +504,11 @@ class SCTService:
         event.duration = req.duration
 
         event.known_issue = req.known_issue
+        return event
 
+    @classmethod
+    def submit_event(cls, run_id: str, raw_event: RawEventPayload):
+        event = cls._build_event(run_id, raw_event)
         event.save()
         try:
             if event.event_type.lower() == "coredumpevent" and (link := cls.create_coredump_link(event.message, event.ts)):
@@ -527,6 +534,72 @@ class SCTService:
 
         return True
 
+    @classmethod
+    def submit_event_batch(cls, run_id: str, raw_events: list[RawEventPayload]) -> list[dict]:
+        """
+        Store a burst of events of one run with batched writes.
+
+        All events are validated first, then written in unlogged batches per
+        (run_id, severity) partition, followed by one batch of the ERROR and
+        CRITICAL events into the unprocessed queue and a single update of the
+        run logs with the coredump links found. Returns a {"status"} entry per
+        event, in order, with a "message" for the failed ones; raises
+        ResultWriteError carrying those entries if any event was not stored.
+        """
+        # Imported here: the results service depends on the plugin loader, which imports this module
+        from argus.backend.service.results_service import write_partition_rows
+        results: list[dict] = [{"status": "ok"} for _ in raw_events]
+        events_by_severity: dict[str, list[tuple[int, SCTEvent]]] = {}
+        for index, raw_event in enumerate(raw_events):
+            try:
+                event = cls._build_event(run_id, raw_event)
+            except (AttributeError, TypeError, ValueError) as exc:
+                results[index] = {"status": "error", "message": f"Invalid event: {exc}"}
+                continue
+            events_by_severity.setdefault(event.severity, []).append((index, event))
+
+        cluster = ScyllaCluster.get()
+        columns = ("run_id", "severity", "ts", "event_id", "event_type", "message", "node", "received_timestamp",
+                   "nemesis_name", "duration", "target_node", "nemesis_status", "known_issue")
+        statement = cluster.prepare(f"INSERT INTO {SCTEvent.table_name()} ({', '.join(columns)}) "
+                                    f"VALUES ({', '.join('?' for _ in columns)})")
+        stored: list[SCTEvent] = []
+        for severity, indexed_events in events_by_severity.items():
+            failures = write_partition_rows(statement,
+                                            rows=[tuple(getattr(event, column) for column in columns)
+                                                  for _, event in indexed_events],
+                                            keys=[str(index) for index, _ in indexed_events])
+            failed = {int(failure["key"]): failure["error"] for failure in failures}
+            for index, event in indexed_events:
+                if index in failed:
+                    results[index] = {"status": "error", "message": failed[index]}
+                else:
+                    stored.append(event)
+
+        queued = [event for event in stored
+                  if event.severity in (SCTEventSeverity.ERROR.value, SCTEventSeverity.CRITICAL.value)]
+        if queued:
+            statement = cluster.prepare(
+                f"INSERT INTO {SCTUnprocessedEvent.table_name()} (run_id, severity, ts) VALUES (?, ?, ?)")
+            if failures := write_partition_rows(statement, rows=[(event.run_id, event.severity, event.ts) for event in queued],
+                                                keys=[str(event.ts) for event in queued]):
+                LOGGER.error("Failed to add %s of %s events of run %s to the unprocessed queue",
+                             len(failures), len(queued), run_id)
+
+        try:
+            links = [link for event in stored
+                     if event.event_type.lower() == "coredumpevent" and (link := cls.create_coredump_link(event.message, event.ts))]
+            if links:
+                run = SCTTestRun.load_partial_run(UUID(run_id), ("logs",))
+                run.submit_logs(links)
+                run.update_columns("logs")
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.warning("Unable to store coredump links of run %s.", run_id, exc_info=True)
+
+        if failed_count := sum(result["status"] != "ok" for result in results):
+            raise ResultWriteError(f"Failed to store {failed_count} of {len(raw_events)} events", results)
+        return results
+
     @staticmethod
     def get_events(run_id: str, limit: int, severities: list[str], before: str | None, after: str | None = None) -> list[dict]:
         before_dt = datetime.fromtimestamp(
@@ -897,30 +970,17 @@ class SCTService:
 
     @staticmethod
     def get_scylla_version_kernels_report(release_name: str):
-        all_release_runs = SCTTestRun.get_version_data_for_release(
-            release_name=release_name)
+        release = ArgusRelease.get(name=release_name)
         kernels_by_version = {}
         kernel_metadata = {}
-        for run in all_release_runs:
-            packages = run["packages"]
-            if not packages:
-                continue
-            scylla_pkgs = {
-                p["name"]: p for p in packages if "scylla-server" in p["name"]}
-            scylla_pkg = scylla_pkgs["scylla-server-upgraded"] if scylla_pkgs.get(
-                "scylla-server-upgraded") else scylla_pkgs.get("scylla-server")
-            version = f"{scylla_pkg['version']}-{scylla_pkg['date']
-                                                 }.{scylla_pkg['revision_id']}" if scylla_pkg else "unknown"
-            kernel_packages = [p for p in packages if "kernel" in p["name"]]
-            kernel_package = kernel_packages[0] if len(
-                kernel_packages) > 0 else None
-            if not kernel_package:
+        for run in SCTRunKernel.find(release_id=release.id).all():
+            if not run.kernel_version:
                 continue
-            version_list = set(kernels_by_version.get(version, []))
-            version_list.add(kernel_package["version"])
-            kernels_by_version[version] = list(version_list)
+            version_list = set(kernels_by_version.get(run.scylla_version, []))
+            version_list.add(run.kernel_version)
+            kernels_by_version[run.scylla_version] = list(version_list)
             metadata = kernel_metadata.get(
-                kernel_package.version,
+                run.kernel_version,
                 {
                     "passed": 0,
                     "failed": 0,
@@ -928,15 +988,34 @@ class SCTService:
                     "test_error": 0,
                 }
             )
-            if run["status"] in ["passed", "failed", "aborted", "test_error"]:
-                metadata[run["status"]] += 1
-            kernel_metadata[kernel_package["version"]] = metadata
+            if run.status in ["passed", "failed", "aborted", "test_error"]:
+                metadata[run.status] += 1
+            kernel_metadata[run.kernel_version] = metadata
 
         return {
             "versions": kernels_by_version,
             "metadata": kernel_metadata
         }
 
+    @staticmethod
+    def index_release_kernels(release_name: str) -> int:
+        """Write the SCTRunKernel rows of every run of a release, returns the number of runs indexed."""
+        release = ArgusRelease.get(name=release_name)
+        rows = []
+        for run in SCTTestRun.get_version_data_for_release(release_name=release_name):
+            versions = scylla_version_and_kernel(run["packages"] or [])
+            if versions:
+                rows.append((release.id, run["id"], run["test_id"], *versions, run["status"]))
+
+        cluster = ScyllaCluster.get()
+        insert = cluster.prepare(f"INSERT INTO {SCTRunKernel.table_name()} "
+                                 "(release_id, run_id, test_id, scylla_version, kernel_version, status) VALUES (?, ?, ?, ?, ?, ?)")
+        for success, error in execute_concurrent_with_args(cluster.session, insert, rows, concurrency=32,
+                                                           raise_on_first_error=False):
+            if not success:
+                LOGGER.error("Failed to index kernel of a run in release %s: %s", release.name, error)
+        return len(rows)
+
     @staticmethod
     def junit_submit(run_id: str, file_name: str, content: str) -> bool:
         xml_content = str(base64.decodebytes(
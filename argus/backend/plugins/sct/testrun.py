@@ -145,8 +145,37 @@ class SCTResource(Document):
         name = "sct_resource"
 
 
+class SCTRunKernel(Document):
+    """Denormalized index: Scylla version, kernel version and status of the SCT runs of a release.
+    Replaces reading the packages of every run of the release for the kernels report.
+    Keyed by release_id (partition) + run_id (clustering). Status changes of runs
+    without a kernel package leave rows without kernel_version, which the report skips.
+    """
+    release_id: Annotated[Optional[UUID], PrimaryKey()] = None
+    run_id: Annotated[Optional[UUID], ClusteringKey()] = None
+    test_id: Optional[UUID] = None
+    scylla_version: Optional[str] = None
+    kernel_version: Optional[str] = None
+    status: Optional[str] = None
+
+    class Settings:
+        name = "sct_run_kernel"
+
+
+def scylla_version_and_kernel(packages: list[PackageVersion]) -> tuple[str, str] | None:
+    """Scylla version and kernel version reported for a run, None if it has no kernel package."""
+    scylla_pkgs = {p.name: p for p in packages if "scylla-server" in (p.name or "")}
+    scylla_pkg = scylla_pkgs.get("scylla-server-upgraded") or scylla_pkgs.get("scylla-server")
+    version = f"{scylla_pkg.version}-{scylla_pkg.date}.{scylla_pkg.revision_id}" if scylla_pkg else "unknown"
+    kernel_package = next((p for p in packages if "kernel" in (p.name or "")), None)
+    if not kernel_package:
+        return None
+    return version, kernel_package.version
+
+
 class SCTTestRun(PluginModelBase):
     _plugin_name: ClassVar[str] = "scylla-cluster-tests"
+    product_version_columns: ClassVar[tuple[str, ...]] = ("scylla_version", "assignee", "product_version", "version_source")
 
     class Settings:
         name = "sct_test_run"
@@ -212,7 +241,7 @@ class SCTTestRun(PluginModelBase):
 
     @classmethod
     def load_test_run(cls, run_id: UUID) -> 'SCTTestRun':
-        return cls.get(id=run_id)
+        return cls.get_by_id(run_id)
 
     @classmethod
     def submit_run(cls, request_data: dict) -> 'SCTTestRun':
@@ -238,7 +267,7 @@ class SCTTestRun(PluginModelBase):
     def get_version_data_for_release(cls, release_name: str):
         cluster = ScyllaCluster.get()
         release = ArgusRelease.get(name=release_name)
-        query = cluster.prepare(f"SELECT scylla_version, packages, status FROM {
+        query = cluster.prepare(f"SELECT id, test_id, scylla_version, packages, status FROM {
                                 cls.table_name()} WHERE release_id = ?")
         rows = cluster.session.execute(query=query, parameters=(release.id,))
 
@@ -501,6 +530,31 @@ class SCTTestRun(PluginModelBase):
             SCTResource.find(run_id=run_id).all())
         return response
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.index_kernel()
+
+    def update_columns(self, *columns: str) -> None:
+        super().update_columns(*columns)
+        if "status" in columns and self.release_id:
+            try:
+                SCTRunKernel.find(release_id=self.release_id, run_id=self.id).update(status=self.status)
+            except Exception:
+                LOGGER.warning("Failed to index status of run %s", self.id, exc_info=True)
+
+    def index_kernel(self) -> None:
+        if not self.release_id or not self.packages:
+            return
+        try:
+            versions = scylla_version_and_kernel(self.packages)
+            if not versions:
+                return
+            scylla_version, kernel_version = versions
+            SCTRunKernel.create(release_id=self.release_id, run_id=self.id, test_id=self.test_id,
+                                scylla_version=scylla_version, kernel_version=kernel_version, status=self.status)
+        except Exception:
+            LOGGER.warning("Failed to index kernel of run %s", self.id, exc_info=True)
+
     @staticmethod
     def index_image(run: 'SCTTestRun') -> None:
         if not run.release_id:
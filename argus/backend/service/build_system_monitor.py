@@ -1,19 +1,32 @@
 import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 import jenkins
 import click
 import re
 from flask import current_app
-from flask.cli import with_appcontext
-
-from coodie.exceptions import DocumentNotFound
 
 from argus.backend.db import ScyllaCluster
-from argus.backend.models.web import ArgusRelease, ArgusGroup, ArgusTest, ArgusTestException
+from argus.backend.models.web import ArgusRelease, ArgusGroup, ArgusTest
 from argus.backend.service.release_manager import ReleaseManagerService
 
 LOGGER = logging.getLogger(__name__)
 
+JENKINS_API_WORKERS = 16
+CREATE_WORKERS = 16
+
+
+@dataclass(init=True, repr=True)
+class ScanDiff:
+    """Releases, groups and tests a build system scan found missing from Argus."""
+    releases: list[ArgusRelease] = field(default_factory=list)
+    groups: list[ArgusGroup] = field(default_factory=list)
+    tests: list[ArgusTest] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.releases or self.groups or self.tests)
+
 
 class ArgusTestsMonitor(ABC):
     BUILD_SYSTEM_FILTERED_PREFIXES = [
@@ -22,45 +35,98 @@ class ArgusTestsMonitor(ABC):
 
     def __init__(self) -> None:
         self._cluster = ScyllaCluster.get()
-        self._existing_releases = list(ArgusRelease.find())
-        self._existing_groups = list(ArgusGroup.find())
-        self._existing_tests = list(ArgusTest.find())
+        self._releases_by_name = {release.name: release for release in ArgusRelease.find().all()}
+        self._groups_by_build_id = {group.build_system_id: group for group in ArgusGroup.find().all()
+                                    if group.build_system_id}
+        self._tests_by_build_id = {test.build_system_id: test for test in ArgusTest.find().all()
+                                   if test.build_system_id}
         self._filtered_groups: list[str] = self.BUILD_SYSTEM_FILTERED_PREFIXES
 
-    def create_release(self, release_name: str):
+    def new_release(self, release_name: str) -> ArgusRelease:
         release = ArgusRelease()
         release.name = release_name
-        release.save()
-
+        self._releases_by_name[release.name] = release
         return release
 
-    def create_group(self, release: ArgusRelease, group_name: str, build_id: str, group_pretty_name: str | None = None):
+    def new_group(self, release: ArgusRelease, group_name: str, build_id: str,
+                  group_pretty_name: str | None = None) -> ArgusGroup:
         group = ArgusGroup()
         group.release_id = release.id
         group.name = group_name
         group.build_system_id = build_id
         if group_pretty_name:
             group.pretty_name = group_pretty_name
-        group.save()
-
+        self._groups_by_build_id[build_id] = group
         return group
 
-    def create_test(self, release: ArgusRelease, group: ArgusGroup,
-                    test_name: str, build_id: str, build_url: str) -> ArgusTest:
+    def new_test(self, release: ArgusRelease, group: ArgusGroup,
+                 test_name: str, build_id: str, build_url: str) -> ArgusTest:
         test = ArgusTest()
         test.name = test_name
         test.group_id = group.id
         test.release_id = release.id
         test.build_system_id = build_id
         test.build_system_url = build_url
+        self._tests_by_build_id[build_id] = test
+        return test
+
+    def create_release(self, release_name: str):
+        release = self.new_release(release_name)
+        release.save()
+
+        return release
+
+    def create_group(self, release: ArgusRelease, group_name: str, build_id: str, group_pretty_name: str | None = None):
+        group = self.new_group(release, group_name, build_id, group_pretty_name)
+        group.save()
+
+        return group
+
+    def create_test(self, release: ArgusRelease, group: ArgusGroup,
+                    test_name: str, build_id: str, build_url: str) -> ArgusTest:
+        test = self.new_test(release, group, test_name, build_id, build_url)
         test.validate_build_system_id()
         test.save()
         ReleaseManagerService().move_test_runs(test)
 
         return test
 
+    def apply(self, diff: ScanDiff) -> None:
+        """
+        Save what a scan found missing; groups and tests are written concurrently, releases first, tests last.
+
+        Tests of a group that failed to save are skipped, the next scan picks them up again.
+        """
+        for release in diff.releases:
+            release.save()
+        release_manager = ReleaseManagerService()
+
+        def create_group(group: ArgusGroup) -> bool:
+            try:
+                group.save()
+                return True
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.error("Unable to create group for build_id %s", group.build_system_id, exc_info=True)
+                return False
+
+        def create_test(test: ArgusTest):
+            try:
+                test.validate_build_system_id()
+                test.save()
+                release_manager.move_test_runs(test)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.error("Unable to create test for build_id %s", test.build_system_id, exc_info=True)
+
+        with ThreadPoolExecutor(max_workers=CREATE_WORKERS, thread_name_prefix="scan-create") as executor:
+            failed_groups = {group.id for group, created in zip(diff.groups, executor.map(create_group, diff.groups))
+                             if not created}
+            for test in diff.tests:
+                if test.group_id in failed_groups:
+                    LOGGER.warning("Skipping test %s, its group was not created", test.build_system_id)
+            list(executor.map(create_test, [test for test in diff.tests if test.group_id not in failed_groups]))
+
     @abstractmethod
-    def collect(self):
+    def collect(self, dry_run: bool = False) -> ScanDiff:
         raise NotImplementedError()
 
     def check_filter(self, group_name: str) -> bool:
@@ -104,21 +170,52 @@ class JenkinsMonitor(ArgusTestsMonitor):
     def _check_release_name(self, release_name: str):
         return any(re.match(pattern, release_name, re.IGNORECASE) for pattern in self._monitored_releases)
 
-    def collect(self):
+    def fetch_display_names(self, folders: list[dict]) -> dict[str, str | None]:
+        """Display names of folders Jenkins listed without one, fetched concurrently; None where the call failed."""
+        def fetch(folder: dict) -> str | None:
+            try:
+                return self._jenkins.get_job_info(name=folder["fullname"])["displayName"]
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.warning("Unable to fetch display name of %s", folder["fullname"], exc_info=True)
+                return None
+
+        with ThreadPoolExecutor(max_workers=JENKINS_API_WORKERS, thread_name_prefix="jenkins-api") as executor:
+            return dict(zip([folder["fullname"] for folder in folders], executor.map(fetch, folders)))
+
+    def missing_display_names(self, release_folders: list[dict]) -> list[dict]:
+        """Folders that will become new groups and that Jenkins listed without a display name."""
+        missing = []
+        stack = [job for release in release_folders for job in self.collect_groups_for_release(release.get("jobs", []))]
+        while stack:
+            folder = stack.pop()
+            if folder["fullname"] not in self._groups_by_build_id and "displayName" not in folder:
+                missing.append(folder)
+            stack.extend(job for job in folder.get("jobs", []) if "Folder" in job["_class"])
+        return missing
+
+    def collect(self, dry_run: bool = False) -> ScanDiff:
+        """
+        Find the releases, groups and tests of the monitored Jenkins folders that Argus doesn't know yet.
+
+        Existing entities are matched by name (releases) and build system id
+        (groups and tests) through in-memory indexes. Unless `dry_run` is set,
+        what is missing is then created, see ArgusTestsMonitor.apply.
+        """
         click.echo("Collecting new tests from jenkins")
         all_jobs = self._jenkins.get_all_jobs()
         all_monitored_folders = [job for job in all_jobs if self._check_release_name(job["fullname"])]
         LOGGER.info("Will collect %s", [f["fullname"] for f in all_monitored_folders])
+        display_names = self.fetch_display_names(self.missing_display_names(all_monitored_folders))
+        diff = ScanDiff()
 
         for release in all_monitored_folders:
             LOGGER.info("Processing release %s", release["fullname"])
-            try:
-                saved_release = ArgusRelease.get(name=release["fullname"])
+            if saved_release := self._releases_by_name.get(release["fullname"]):
                 LOGGER.info("Release %s exists", release["fullname"])
-            except DocumentNotFound:
+            else:
                 LOGGER.warning("Release %s does not exist, creating...", release["fullname"])
-                saved_release = self.create_release(release["fullname"])
-                self._existing_releases.append(saved_release)
+                saved_release = self.new_release(release["fullname"])
+                diff.releases.append(saved_release)
 
             try:
                 groups = self.collect_groups_for_release(release["jobs"])
@@ -140,47 +237,37 @@ class JenkinsMonitor(ArgusTestsMonitor):
             while len(folder_stack) != 0:
                 group_dict = folder_stack.pop()
                 group = group_dict["group"]
-                LOGGER.info("Processing group %s for release %s", group["name"], saved_release.name)
-                try:
-                    group_name = group["name"] if not group_dict["parent_name"] else f"{group_dict['parent_name']}-{group['name']}"
-                    saved_group = filter(lambda g: g.build_system_id == group["fullname"], self._existing_groups)
-                    saved_group = next(saved_group)
-                    LOGGER.info("Group %s already exists. (id: %s)", saved_group.build_system_id, saved_group.id)
-                except StopIteration:
+                LOGGER.debug("Processing group %s for release %s", group["name"], saved_release.name)
+                group_name = group["name"] if not group_dict["parent_name"] else f"{group_dict['parent_name']}-{group['name']}"
+                if saved_group := self._groups_by_build_id.get(group["fullname"]):
+                    LOGGER.debug("Group %s already exists. (id: %s)", saved_group.build_system_id, saved_group.id)
+                else:
                     LOGGER.warning(
                         "Group %s for release %s doesn't exist, creating...", group_name, saved_release.name)
-                    try:
-                        display_name = group.get("displayName", self._jenkins.get_job_info(
-                            name=group["fullname"])["displayName"])
-                        display_name = display_name if not group_dict[
-                            "parent_display_name"] else f"{group_dict['parent_display_name']} - {display_name}"
-                    except Exception:
-                        display_name = None
-
-                    saved_group = self.create_group(saved_release, group_name, group["fullname"], display_name)
-                    self._existing_groups.append(saved_group)
+                    display_name = group.get("displayName") or display_names.get(group["fullname"])
+                    if display_name and group_dict["parent_display_name"]:
+                        display_name = f"{group_dict['parent_display_name']} - {display_name}"
+                    saved_group = self.new_group(saved_release, group_name, group["fullname"], display_name)
+                    diff.groups.append(saved_group)
 
                 for job in group["jobs"]:
-                    LOGGER.info("Processing job %s for release %s and group %s",
-                                job["fullname"], saved_group.name, saved_release.name)
-                    saved_test = None
+                    LOGGER.debug("Processing job %s for release %s and group %s",
+                                 job["fullname"], saved_group.name, saved_release.name)
                     if "Folder" in job["_class"]:
                         folder_stack.append(dict(parent_name=saved_group.name,
                                             parent_display_name=saved_group.pretty_name, group=job))
                     if "WorkflowJob" in job["_class"]:
-                        try:
-                            saved_test = filter(lambda t: t.build_system_id == job["fullname"], self._existing_tests)
-                            saved_test = next(saved_test)
-                            LOGGER.info("Test %s already exists. (id: %s)", saved_test.build_system_id, saved_test.id)
-                        except StopIteration:
-                            LOGGER.warning("Test %s for release %s (group %s) doesn't exist, creating...",
-                                           job["name"], saved_release.name, saved_group.name)
-                            try:
-                                saved_test = self.create_test(
-                                    saved_release, saved_group, job["name"], job["fullname"], job["url"])
-                                self._existing_tests.append(saved_test)
-                            except ArgusTestException:
-                                LOGGER.error("Unable to create test for build_id %s", job["fullname"], exc_info=True)
+                        if saved_test := self._tests_by_build_id.get(job["fullname"]):
+                            LOGGER.debug("Test %s already exists. (id: %s)", saved_test.build_system_id, saved_test.id)
+                            continue
+                        LOGGER.warning("Test %s for release %s (group %s) doesn't exist, creating...",
+                                       job["name"], saved_release.name, saved_group.name)
+                        diff.tests.append(self.new_test(saved_release, saved_group, job["name"], job["fullname"],
+                                                        job["url"]))
+
+        if not dry_run:
+            self.apply(diff)
+        return diff
 
     def collect_groups_for_release(self, jobs):
         groups = [folder for folder in jobs if "Folder" in folder["_class"] or "WorkflowMultiBranchProject" in folder["_class"]]
@@ -1,16 +1,18 @@
 import base64
 import json
 import logging
-from dataclasses import asdict
 from datetime import UTC, datetime
+from time import time
 from typing import Any
 from uuid import UUID
 
 
+from cassandra.concurrent import execute_concurrent
+from cassandra.query import BatchStatement, BatchType
 from coodie.exceptions import DocumentNotFound
 
 from argus.backend.db import ScyllaCluster
-from argus.backend.error_handlers import DataValidationError
+from argus.backend.error_handlers import DataValidationError, ResultWriteError
 from argus.backend.models.pytest import PytestResultTable, PytestSubmitData, PytestUserField
 from argus.backend.models.result import ArgusGenericResultMetadata, ArgusGenericResultData
 from argus.backend.models.run_config import RunConfigParam, RunConfiguration
@@ -19,7 +21,10 @@ from argus.backend.plugins.core import PluginModelBase
 from argus.backend.plugins.generic.model import GenericRun
 from argus.backend.plugins.loader import AVAILABLE_PLUGINS
 from argus.backend.events.event_processors import EVENT_PROCESSORS
-from argus.backend.service.results_service import ResultsService, Cell
+from argus.backend.service.results_service import RESULTS_WRITE_CONCURRENCY, ResultsService, Cell, invalidate_runs_details, \
+    refresh_graph_snapshots, write_partition_rows
+from argus.backend.service.test_lookup import TestLookup
+from argus.backend.service.views_widgets.pytest import count_statuses, search_index_statements
 from argus.common.enums import TestStatus
 
 LOGGER = logging.getLogger(__name__)
@@ -44,10 +49,13 @@ class ClientService:
     def submit_run(self, run_type: str, request_data: dict) -> str:
         model = self.get_model(run_type)
         run = model.submit_run(request_data=request_data)
+        run.index_location()
+        run.refresh_test_stats()
+        invalidate_runs_details(run.test_id)
         return "Created"
 
-    def submit_pytest_result(self, request_data: PytestSubmitData) -> dict[str, str | UUID]:
-
+    @staticmethod
+    def _build_pytest_result(request_data: PytestSubmitData) -> tuple[PytestResultTable, list[PytestUserField]]:
         new_result = PytestResultTable()
         new_result.name = request_data["name"]
         new_result.id = datetime.fromtimestamp(request_data["timestamp"], tz=UTC)
@@ -67,38 +75,101 @@ class ClientService:
             f.field_name = field
             f.field_value = value
             fields.append(f)
+        return new_result, fields
 
+    @staticmethod
+    def _pytest_run_keys(run_id: UUID) -> tuple[UUID | None, UUID | None]:
+        """release_id and test_id of the run the pytest results belong to."""
         try:
-            run: GenericRun = AVAILABLE_PLUGINS.get("generic").model.find(id=new_result.run_id).only("id", "release_id", "test_id").first()
-            if run is None:
-                raise DocumentNotFound(f"Run {new_result.run_id} not found")
-            new_result.release_id = run.release_id
-            new_result.test_id = run.test_id
+            row = GenericRun.load_run_columns(run_id, ("release_id", "test_id"))
+            return row["release_id"], row["test_id"]
         except DocumentNotFound:
-            LOGGER.warning("RunId %s does not exist - result will be not be indexed for a release/view", new_result.run_id)
+            LOGGER.warning("RunId %s does not exist - result will be not be indexed for a release/view", run_id)
+            return None, None
+
+    def submit_pytest_result(self, request_data: PytestSubmitData) -> dict[str, str | UUID]:
+        new_result, fields = self._build_pytest_result(request_data)
+        new_result.release_id, new_result.test_id = self._pytest_run_keys(new_result.run_id)
 
         new_result.save()
         [f.save() for f in fields]
+        for statement, values in search_index_statements(new_result, fields):
+            self.cluster.session.execute(statement, values)
+        if errors := count_statuses([new_result]):
+            raise errors[0]
         return {
             "name": new_result.name,
             "id": new_result.id,
         }
 
+    def submit_pytest_results(self, results: list[PytestSubmitData]) -> list[dict[str, str | UUID]]:
+        """
+        Store a session's worth of pytest results at once.
+
+        Each result is written together with its user fields as one unlogged
+        batch (both tables are partitioned by the test name), and the batches
+        of all results are executed concurrently. Runs are resolved once per
+        distinct run id instead of once per result.
+        """
+        built = [self._build_pytest_result(request_data) for request_data in results]
+        run_keys = {run_id: self._pytest_run_keys(run_id) for run_id in {result.run_id for result, _ in built}}
+
+        result_statement = self.cluster.prepare(
+            f"INSERT INTO {PytestResultTable.table_name()} (name, status, id, test_type, run_id, test_id, release_id, "
+            "duration, message, test_timestamp, session_timestamp, markers) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+        field_statement = self.cluster.prepare(
+            f"INSERT INTO {PytestUserField.table_name()} (name, id, field_name, field_value) VALUES (?, ?, ?, ?)")
+        statements, owners = [], []
+        for index, (result, fields) in enumerate(built):
+            result.release_id, result.test_id = run_keys[result.run_id]
+            batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+            batch.add(result_statement, (result.name, result.status, result.id, result.test_type, result.run_id,
+                                         result.test_id, result.release_id, result.duration, result.message,
+                                         result.test_timestamp, result.session_timestamp, result.markers))
+            for f in fields:
+                batch.add(field_statement, (f.name, f.id, f.field_name, f.field_value))
+            statements.append((batch, None))
+            owners.append(index)
+            # Search index rows live in other partitions, they are written alongside the batch
+            for statement in search_index_statements(result, fields):
+                statements.append(statement)
+                owners.append(index)
+
+        errors = {}
+        outcomes = execute_concurrent(self.cluster.session, statements, concurrency=RESULTS_WRITE_CONCURRENCY,
+                                      raise_on_first_error=False)
+        for index, (success, error) in zip(owners, outcomes):
+            if not success:
+                errors.setdefault(index, error)
+        # Stored results are counted once written; counting them again on a resend is a no-op
+        stored = [index for index in range(len(built)) if index not in errors]
+        for position, error in count_statuses([built[index][0] for index in stored]).items():
+            errors.setdefault(stored[position], error)
+        response, failures = [], []
+        for index, (result, _) in enumerate(built):
+            if index in errors:
+                LOGGER.error("Failed to store pytest result %s: %s", result.name, errors[index])
+                failures.append({"key": result.name, "error": str(errors[index])})
+            else:
+                response.append({"name": result.name, "id": result.id})
+        if failures:
+            raise ResultWriteError(f"Failed to store {len(failures)} of {len(built)} pytest results", failures)
+        return response
+
     def get_run(self, run_type: str, run_id: str):
         run_id = UUID(run_id) if isinstance(run_id, str) else run_id
         model = self.get_model(run_type)
         try:
-            run = model.get(id=run_id)
+            run = model.get_by_id(run_id)
         except DocumentNotFound:
             return None
         return run
 
     def heartbeat(self, run_type: str, run_id: str) -> int:
         model = self.get_model(run_type)
-        run = model.load_test_run(UUID(run_id))
-        run.update_heartbeat()
-        run.save()
-        return run.heartbeat
+        heartbeat = int(time())
+        model.update_run_columns(UUID(run_id), heartbeat=heartbeat)
+        return heartbeat
 
     def get_run_status(self, run_type: str, run_id: str) -> str:
         model = self.get_model(run_type)
@@ -107,25 +178,33 @@ class ClientService:
 
     def update_run_status(self, run_type: str, run_id: str, new_status: str) -> str:
         model = self.get_model(run_type)
-        run = model.load_test_run(UUID(run_id))
+        run = model.load_partial_run(UUID(run_id), ("status", "release_id", "test_id", "scylla_version"))
+        old_status = run.status
         run.change_status(new_status=TestStatus(new_status))
-        run.save()
+        run.update_columns("status")
+        if run.status != old_status:
+            run.invalidate_release_snapshot()
+            run.refresh_test_stats()
 
         return run.status
 
     def submit_product_version(self, run_type: str, run_id: str, version: str) -> str:
         model = self.get_model(run_type)
-        run = model.load_test_run(UUID(run_id))
+        columns = model.product_version_columns
+        run = model.load_partial_run(UUID(run_id), ("release_id", *columns))
+        loaded = {column: getattr(run, column) for column in columns}
         run.submit_product_version(version)
-        run.save()
+        run.update_columns(*(column for column in columns if getattr(run, column) != loaded[column]))
 
         return "Submitted"
 
     def submit_logs(self, run_type: str, run_id: str, logs: list[dict]) -> str:
         model = self.get_model(run_type)
-        run = model.load_test_run(UUID(run_id))
+        run = model.load_partial_run(UUID(run_id), ("logs",))
+        loaded = list(run.logs)
         run.submit_logs(logs)
-        run.save()
+        if run.logs != loaded:
+            run.update_columns("logs")
 
         return "Submitted"
 
@@ -134,6 +213,7 @@ class ClientService:
         run = model.load_test_run(UUID(run_id))
         run.finish_run(payload)
         run.save()
+        run.refresh_test_stats()
 
 
         return "Finalized"
@@ -165,16 +245,20 @@ class ClientService:
         table_name = results["meta"]["name"]
         sut_timestamp = results["sut_timestamp"]
         result_failed = False
+        rows = []
         for cell in cells:
             cell.update_cell_status_based_on_rules(table_metadata, best_results)
             if cell.status == "ERROR":
                 result_failed = True
-            ArgusGenericResultData(test_id=run.test_id,
-                                   run_id=run.id,
-                                   name=table_name,
-                                   sut_timestamp=sut_timestamp,
-                                   **asdict(cell)
-                                   ).save()
+            rows.append((run.test_id, table_name, run.id, cell.column, cell.row, sut_timestamp,
+                         cell.value, cell.value_text, cell.status))
+        statement = self.cluster.prepare(f"INSERT INTO {ArgusGenericResultData.table_name()} "
+                                         "(test_id, name, run_id, column, row, sut_timestamp, value, value_text, status) "
+                                         "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+        failures = write_partition_rows(statement, rows, keys=[f"{cell.column}:{cell.row}" for cell in cells])
+        refresh_graph_snapshots(run.test_id)
+        if failures:
+            raise ResultWriteError(f"Failed to store {len(failures)} of {len(cells)} cells", failures)
         if result_failed:
             raise DataValidationError()
         return {"status": "ok", "message": "Results submitted"}
@@ -185,20 +269,10 @@ class ClientService:
         Returns the test run itself, test info (test, group, release), comments, and activity.
         """
         run_uuid = UUID(run_id)
-        run = None
-        plugin_name = None
-
-        for name, plugin in AVAILABLE_PLUGINS.items():
-            model = plugin.model
-            try:
-                run = model.get(id=run_uuid)
-                plugin_name = name
-                break
-            except DocumentNotFound:
-                continue
-
+        run = TestLookup.find_run(run_uuid)
         if not run:
             raise ClientException(f"Test run {run_id} not found in any plugin model")
+        plugin_name = run._plugin_name
 
         run_data = run.model_dump()
 
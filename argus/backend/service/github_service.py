@@ -11,11 +11,12 @@ from github import Github, Auth
 from coodie.exceptions import DocumentNotFound
 
 from argus.backend.models.runtime_store import RuntimeStore
-from argus.backend.models.web import ArgusEventTypes, ArgusTest, ArgusUserView, invalidate_release_snapshots
+from argus.backend.models.web import ArgusEventTypes, ArgusTest, ArgusUserView
 from argus.backend.models.github_issue import GithubIssue, IssueAssignee, IssueLink, IssueLabel
 from argus.backend.plugins.core import PluginInfoBase
 from argus.backend.plugins.loader import AVAILABLE_PLUGINS
 from argus.backend.service.event_service import EventService
+from argus.backend.service.stats import invalidate_test_stats
 from argus.backend.util.common import chunk
 
 LOGGER = logging.getLogger(__name__)
@@ -177,7 +178,7 @@ class GithubService:
             test_id=link.test_id
         )
 
-        invalidate_release_snapshots(test.release_id)
+        invalidate_test_stats(test.release_id, test.id)
         response = {
             **issue.model_dump(),
             "title": issue.title,
@@ -251,7 +252,7 @@ class GithubService:
         if remaining_links == 0:
             issue.delete()
 
-        invalidate_release_snapshots(link.release_id)
+        invalidate_test_stats(link.release_id, link.test_id)
         return {
             "deleted": issue_id if remaining_links == 0 else (link.run_id, link.issue_id)
         }
@@ -63,10 +63,27 @@ class JenkinsService:
         }
     }
 
-    def __init__(self) -> None:
+    _job_definitions: dict[tuple[str, str], Any] | None = None
+
+    def __init__(self, cache_job_definitions: bool = False) -> None:
+        """
+        With cache_job_definitions, the job info and config fetched for the
+        parameters and the last build of a job are kept for the lifetime of the
+        service, so a service made for a single batch of triggers asks Jenkins once.
+        """
         self._jenkins = jenkins.Jenkins(url=current_app.config["JENKINS_URL"],
                                         username=current_app.config["JENKINS_USER"],
                                         password=current_app.config["JENKINS_API_TOKEN"])
+        if cache_job_definitions:
+            self._job_definitions = {}
+
+    def _job_definition(self, kind: str, build_id: str):
+        fetch = self._jenkins.get_job_info if kind == "info" else self._jenkins.get_job_config
+        if self._job_definitions is None:
+            return fetch(name=build_id)
+        if (kind, build_id) not in self._job_definitions:
+            self._job_definitions[(kind, build_id)] = fetch(name=build_id)
+        return self._job_definitions[(kind, build_id)]
 
     @staticmethod
     def _extract_choice_parameters(config: ET.Element) -> dict[str, list[str]]:
@@ -104,8 +121,8 @@ class JenkinsService:
         Cli: True
         Frontend: False
         """
-        job_info = self._jenkins.get_job_info(name=build_id)
-        raw_config = self._jenkins.get_job_config(name=build_id)
+        job_info = self._job_definition("info", build_id)
+        raw_config = self._job_definition("config", build_id)
         config = ET.fromstring(raw_config)
         parameter_defs = config.find("*//parameterDefinitions")
         if parameter_defs:
@@ -168,7 +185,7 @@ class JenkinsService:
 
     def latest_build(self, build_id: str) -> int:
         try:
-            job_info = self._jenkins.get_job_info(name=build_id)
+            job_info = self._job_definition("info", build_id)
             last_build = job_info.get("lastBuild")
             if not last_build:
                 return -1
@@ -14,11 +14,12 @@ from argus.backend.models.jira import JiraIssue
 from coodie.exceptions import DocumentNotFound
 
 from argus.backend.models.runtime_store import RuntimeStore
-from argus.backend.models.web import ArgusEventTypes, ArgusTest, ArgusUserView, invalidate_release_snapshots
+from argus.backend.models.web import ArgusEventTypes, ArgusTest, ArgusUserView
 from argus.backend.models.github_issue import IssueLink, IssueLabel
 from argus.backend.plugins.core import PluginInfoBase
 from argus.backend.plugins.loader import AVAILABLE_PLUGINS
 from argus.backend.service.event_service import EventService
+from argus.backend.service.stats import invalidate_test_stats
 from argus.backend.util.common import chunk
 
 LOGGER = logging.getLogger(__name__)
@@ -157,7 +158,7 @@ class JiraService:
             test_id=link.test_id
         )
 
-        invalidate_release_snapshots(test.release_id)
+        invalidate_test_stats(test.release_id, test.id)
         response = {
             **issue.model_dump(),
             "summary": issue.summary,
@@ -231,7 +232,7 @@ class JiraService:
         if remaining_links == 0:
             issue.delete()
 
-        invalidate_release_snapshots(link.release_id)
+        invalidate_test_stats(link.release_id, link.test_id)
         return {
             "deleted": issue_id if remaining_links == 0 else (link.run_id, link.issue_id)
         }
@@ -3,17 +3,20 @@ import logging
 import datetime
 import json
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
 from copy import deepcopy
 from dataclasses import dataclass, field
+from enum import Enum
 from functools import reduce
-from typing import Any, Optional, TypedDict
+from typing import Any, NotRequired, Optional, TypedDict
 from uuid import UUID
+from cassandra.util import uuid_from_time
 from flask import g
 from slugify import slugify
 
 from coodie.exceptions import DocumentNotFound
 
-from argus.backend.models.plan import ArgusReleasePlan
+from argus.backend.models.plan import ArgusReleasePlan, PlanTriggerJob
 from argus.backend.models.web import ArgusGroup, ArgusRelease, ArgusTest, ArgusUserView, User, invalidate_release_snapshots
 from argus.backend.service.jenkins_service import JenkinsService
 from argus.backend.service.test_lookup import TestLookup
@@ -113,12 +116,28 @@ class PlanTriggerPayload(TypedDict):
     version: str | None
     common_params: dict[str, str]
     params: list[dict[str, str]]
+    wait: NotRequired[bool]
 
 
 class PlannerServiceException(Exception):
     pass
 
 
+class TriggerJobStatus(str, Enum):
+    QUEUED = "queued"
+    TRIGGERING = "triggering"
+    TRIGGERED = "triggered"
+    FAILED = "failed"
+
+
+PLAN_TRIGGER_WORKERS = 8
+# Jobs still queued or triggering this long after their last update were lost with the process triggering them
+PLAN_TRIGGER_STALE_AFTER = datetime.timedelta(hours=1)
+
+# Shared by all triggers, so concurrent triggers together stay within PLAN_TRIGGER_WORKERS Jenkins calls at a time
+_trigger_executor = ThreadPoolExecutor(max_workers=PLAN_TRIGGER_WORKERS, thread_name_prefix="plan-trigger")
+
+
 class PlanningService:
 
     VIEW_WIDGET_SETTINGS = [
@@ -737,57 +756,101 @@ class PlanningService:
 
         LOGGER.info("Will trigger %s tests...", len(tests))
 
-        service = JenkinsService()
-        failures = []
-        successes = []
-        for test in tests:
-            try:
-                latest_build_number = service.latest_build(
-                    test.build_system_id)
-                if latest_build_number == -1:
-                    failures.append(test.build_system_id)
-                    continue
-                raw_params = service.retrieve_job_parameters(
-                    test.build_system_id, latest_build_number)
-                job_params = {param["name"]: param["value"]
-                              for param in raw_params if param.get("value")}
-                backend = job_params.get("backend")
-                match backend.split("-"):
-                    case ["aws", *_]:
-                        region_key = "region"
-                    case ["gce", *_]:
-                        region_key = "gce_datacenter"
-                    case ["azure", *_]:
-                        region_key = "azure_region_name"
-                    case ["oci", *_]:
-                        region_key = "oci_region_name"
-                    case _:
-                        raise PlannerServiceException(
-                            f"Unknown backend encountered: {backend}", backend)
-
-                job_params = None
-                for param_set in params:
-                    if param_set["test"] == "longevity" and backend == param_set["backend"]:
-                        job_params = dict(param_set)
-                        job_params.pop("type", None)
-                        region = job_params.pop("region", None)
-                        job_params[region_key] = region
-                        break
-                if not job_params:
+        trigger_id = uuid_from_time(datetime.datetime.now(tz=datetime.UTC))
+        jobs = {test.build_system_id: PlanTriggerJob(trigger_id=trigger_id, build_system_id=test.build_system_id,
+                                                     test_id=test.id, status=TriggerJobStatus.QUEUED.value)
+                for test in tests}
+        for job in jobs.values():
+            job.save()
+
+        service = JenkinsService(cache_job_definitions=True)
+        username = g.user.username
+        futures = [_trigger_executor.submit(self.trigger_job, service, job, params, common_params, username)
+                   for job in jobs.values()]
+        # Blocking by default, callers polling the status endpoint opt out with "wait": false
+        if payload.get("wait", True):
+            wait(futures)
+
+        return self.get_trigger_status(trigger_id)
+
+    @staticmethod
+    def trigger_job(service: JenkinsService, job: PlanTriggerJob, params: list[dict[str, str]],
+                    common_params: dict[str, str], username: str) -> None:
+        """Trigger one plan job on a trigger worker, recording its progress in the job row."""
+        build_id = job.build_system_id
+        try:
+            job.update(status=TriggerJobStatus.TRIGGERING.value, last_updated=datetime.datetime.now(tz=datetime.UTC))
+            latest_build_number = service.latest_build(build_id)
+            if latest_build_number == -1:
+                raise PlannerServiceException("Job has no builds to take parameters from", build_id)
+            raw_params = service.retrieve_job_parameters(build_id, latest_build_number)
+            job_params = {param["name"]: param["value"]
+                          for param in raw_params if param.get("value")}
+            backend = job_params.get("backend")
+            match backend.split("-"):
+                case ["aws", *_]:
+                    region_key = "region"
+                case ["gce", *_]:
+                    region_key = "gce_datacenter"
+                case ["azure", *_]:
+                    region_key = "azure_region_name"
+                case ["oci", *_]:
+                    region_key = "oci_region_name"
+                case _:
                     raise PlannerServiceException(
-                        f"Parameters not found for job {test.build_system_id}", test.build_system_id)
-                final_params = {**job_params, **common_params, **job_params}
-                queue_item = service.build_job(
-                    test.build_system_id, final_params, g.user.username)
-                info = service.get_queue_info(queue_item)
-                url = info.get("url", info.get("taskUrl", ""))
-                successes.append(url)
-            except Exception:
-                LOGGER.error("Failed to trigger %s",
-                             test.build_system_id, exc_info=True)
-                failures.append(test.build_system_id)
-
+                        f"Unknown backend encountered: {backend}", backend)
+
+            job_params = None
+            for param_set in params:
+                if param_set["test"] == "longevity" and backend == param_set["backend"]:
+                    job_params = dict(param_set)
+                    job_params.pop("type", None)
+                    region = job_params.pop("region", None)
+                    job_params[region_key] = region
+                    break
+            if not job_params:
+                raise PlannerServiceException(
+                    f"Parameters not found for job {build_id}", build_id)
+            final_params = {**job_params, **common_params, **job_params}
+            queue_item = service.build_job(build_id, final_params, username)
+            info = service.get_queue_info(queue_item)
+            url = info.get("url", info.get("taskUrl", ""))
+            job.update(status=TriggerJobStatus.TRIGGERED.value, url=url,
+                       last_updated=datetime.datetime.now(tz=datetime.UTC))
+        except Exception as exc:  # pylint: disable=broad-except
+            LOGGER.error("Failed to trigger %s", build_id, exc_info=True)
+            job.update(status=TriggerJobStatus.FAILED.value, error=str(exc.args[0]) if exc.args else repr(exc),
+                       last_updated=datetime.datetime.now(tz=datetime.UTC))
+
+    def get_trigger_status(self, trigger_id: str | UUID) -> dict:
+        """
+        Progress of a plan trigger: the url of each triggered job, the build ids
+        that failed, and every job with its status. Jobs left pending for
+        PLAN_TRIGGER_STALE_AFTER are marked failed.
+        """
+        trigger_id = UUID(trigger_id) if isinstance(trigger_id, str) else trigger_id
+        jobs = list(PlanTriggerJob.find(trigger_id=trigger_id).all())
+        now = datetime.datetime.now(tz=datetime.UTC)
+        for job in jobs:
+            last_updated = job.last_updated.replace(tzinfo=datetime.UTC) if job.last_updated else None
+            if job.status in (TriggerJobStatus.QUEUED, TriggerJobStatus.TRIGGERING) \
+                    and (not last_updated or now - last_updated > PLAN_TRIGGER_STALE_AFTER):
+                job.update(status=TriggerJobStatus.FAILED.value, error="Trigger was interrupted before the job started",
+                           last_updated=now)
+        pending = [job for job in jobs if job.status in (TriggerJobStatus.QUEUED, TriggerJobStatus.TRIGGERING)]
         return {
-            "jobs": successes,
-            "failed_to_execute": failures,
+            "trigger_id": trigger_id,
+            "total": len(jobs),
+            "pending": len(pending),
+            "done": not pending,
+            "jobs": [job.url for job in jobs if job.status == TriggerJobStatus.TRIGGERED],
+            "failed_to_execute": [job.build_system_id for job in jobs if job.status == TriggerJobStatus.FAILED],
+            "progress": [{
+                "build_system_id": job.build_system_id,
+                "test_id": job.test_id,
+                "status": job.status,
+                "url": job.url,
+                "error": job.error,
+                "last_updated": job.last_updated,
+            } for job in jobs],
         }
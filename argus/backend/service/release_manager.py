@@ -5,7 +5,7 @@ from coodie.exceptions import DocumentNotFound
 
 from argus.backend.db import ScyllaCluster
 from argus.backend.plugins.sct.testrun import SCTTestRun
-from argus.backend.models.web import ArgusRelease, ArgusGroup, ArgusTest, ReleaseDistinctVersions, ReleaseDistinctImages, ReleaseStatsSnapshot, invalidate_release_snapshots
+from argus.backend.models.web import ArgusRelease, ArgusGroup, ArgusTest, ReleaseDistinctVersions, ReleaseDistinctImages, ReleaseStatsSnapshot, ReleaseTestStats, invalidate_release_snapshots, invalidate_test_view_snapshots
 
 LOGGER = logging.getLogger(__name__)
 
@@ -117,6 +117,8 @@ class ReleaseManagerService:
         if delete_tests:
             for test in tests_to_change.all():
                 test.delete()
+                # No longer in the release, so invalidate_release_snapshots() won't find its views
+                invalidate_test_view_snapshots(test.id)
         else:
             new_group = ArgusGroup.get(id=UUID(new_group_id))
             for test in tests_to_change.all():
@@ -130,6 +132,7 @@ class ReleaseManagerService:
     def delete_test(self, test_id: str) -> bool:
         test_to_delete = ArgusTest.get(id=UUID(test_id) if isinstance(test_id, str) else test_id)
         test_to_delete.delete()
+        invalidate_test_view_snapshots(test_to_delete.id)
         invalidate_release_snapshots(test_to_delete.release_id)
         return True
 
@@ -218,6 +221,7 @@ class ReleaseManagerService:
             row.delete()
         for row in ReleaseStatsSnapshot.find(release_id=release.id).all():
             row.delete()
+        ReleaseTestStats.find(release_id=release.id).delete()
 
         release.delete()
         return True
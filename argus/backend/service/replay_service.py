@@ -36,6 +36,16 @@ Two side concerns remain server-side:
   terminal status/version for non-SCT plugins, so skipping it silently left
   replayed dtest/pytest runs stuck without a final status.
 
+Records are streamed out of the archive and spooled per run (the ``id``
+location param, or ``run_id`` of a ``submit_run`` body); small runs stay in
+memory, larger ones spill to disk. The ordering above is applied to each run
+on its own, and independent runs are dispatched concurrently on a bounded
+pool, so replay time scales with the number of workers and memory with the
+largest run rather than with the archive. Given a checkpoint store (the
+ingest endpoint always passes one), each run that replays without failures
+is checkpointed under the archive's digest; re-ingesting the same archive
+with ``resume`` set skips those runs.
+
 When ``create_missing_tests`` is set, ``submit_run`` records get a pre-step
 that ensures the ``ArgusRelease/Group/Test`` triple exists for the run's
 build_id, so that the controller's ``assign_categories`` can populate
@@ -51,15 +61,21 @@ the app's existing read-only S3 credentials and the link-only log model
 (nothing is uploaded or hosted), and is idempotent, so the extra S3 list per
 ingest is the only cost when there is nothing to back-fill.
 """
+import contextlib
 import gzip
+import hashlib
 import io
 import json
 import logging
 import re
 import tarfile
+import tempfile
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Iterable
+from datetime import UTC, datetime
+from typing import IO, Iterable
 
 import zstandard as zstd
 from flask import current_app
@@ -116,6 +132,13 @@ _S3_LINK_RE = re.compile(
 # Suffixes stripped from an S3 key's basename to derive a human log name.
 _LOG_NAME_SUFFIXES = (".tar.zst", ".tar.gz", ".tar.zstd", ".tgz", ".tar", ".zip")
 
+# Runs dispatched concurrently. Records of one run are always dispatched in
+# order by a single worker.
+REPLAY_WORKERS = 8
+
+# Bytes of records a run keeps in memory before its spool moves to disk.
+RUN_SPOOL_MAX_SIZE = 1024 * 1024
+
 
 @dataclass
 class ReplayOutcome:
@@ -135,8 +158,20 @@ class ReplaySummary:
     # Number of log links discovered in S3 and back-filled onto runs (i.e. logs
     # that were uploaded but whose ``logs/submit`` call was never recorded).
     backfilled_logs: int = 0
+    # Runs skipped because a previous ingest of the archive already replayed them.
+    resumed_runs: int = 0
     errors: list[dict] = field(default_factory=list)
 
+    def merge(self, other: "ReplaySummary") -> None:
+        self.total += other.total
+        self.processed += other.processed
+        self.succeeded += other.succeeded
+        self.failed += other.failed
+        self.skipped_no_replay += other.skipped_no_replay
+        self.backfilled_logs += other.backfilled_logs
+        self.resumed_runs += other.resumed_runs
+        self.errors.extend(other.errors)
+
     def as_dict(self) -> dict:
         return {
             "total": self.total,
@@ -145,6 +180,7 @@ class ReplaySummary:
             "failed": self.failed,
             "skipped_no_replay": self.skipped_no_replay,
             "backfilled_logs": self.backfilled_logs,
+            "resumed_runs": self.resumed_runs,
             "errors": self.errors,
         }
 
@@ -158,6 +194,18 @@ class ReplayServiceError(APIException):
     """
 
 
+class ReplayCheckpointStore:
+    """Runs of an archive that were replayed without failures, kept in ``ReplayCheckpoint``."""
+
+    def completed_runs(self, archive_id: str) -> set[str]:
+        from argus.backend.models.web import ReplayCheckpoint
+        return {row.run_id for row in ReplayCheckpoint.find(archive_id=archive_id).all()}
+
+    def mark_completed(self, archive_id: str, run_id: str) -> None:
+        from argus.backend.models.web import ReplayCheckpoint
+        ReplayCheckpoint.create(archive_id=archive_id, run_id=run_id, completed_at=datetime.now(UTC))
+
+
 class ReplayService:
     """Replay one replay-log archive against the current Flask app.
 
@@ -177,6 +225,9 @@ class ReplayService:
         create_missing_tests: bool = False,
         backfill_logs: bool = False,
         s3_client=None,
+        resume: bool = False,
+        workers: int = REPLAY_WORKERS,
+        checkpoint_store: ReplayCheckpointStore | None = None,
     ) -> None:
         self._app = app
         self._auth_header = auth_header
@@ -184,17 +235,59 @@ class ReplayService:
         self._backfill_logs = backfill_logs
         # Lazily built from app config on first use; injectable for tests.
         self._s3 = s3_client
+        self._resume = resume
+        self._workers = workers
+        # Runs are checkpointed only when a store is given (the ingest endpoint always passes one).
+        self._checkpoints = checkpoint_store
+        # Concurrent runs of a new test must not create its release/group/test twice.
+        self._hierarchy_lock = threading.Lock()
 
     # ------------------------------------------------------------------
     # Entry point
     # ------------------------------------------------------------------
     def ingest(self, archive_bytes: bytes, *, dry_run: bool = False) -> ReplaySummary:
-        records = list(self._extract_records(archive_bytes))
-        records = self._apply_ordering(records)
+        archive_id = hashlib.sha256(archive_bytes).hexdigest() if self._checkpoints else ""
+        completed = self._checkpoints.completed_runs(archive_id) if self._resume and self._checkpoints else set()
+        spools, schema_version = self._spool_runs(archive_bytes, completed)
+
+        summary = ReplaySummary(resumed_runs=len(completed))
+        if spools:
+            app = self._app or current_app._get_current_object()  # type: ignore[attr-defined]
+            if self._backfill_logs and not dry_run:
+                # Built once up front instead of racing to build it in every worker
+                self._s3_client()
+            try:
+                with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="replay_ingest") as executor:
+                    futures = [
+                        executor.submit(self._replay_run, app, run_id, spool, archive_id,
+                                        dry_run=dry_run, schema_version=schema_version)
+                        for run_id, spool in spools.items()
+                    ]
+                    for future in futures:
+                        summary.merge(future.result())
+            finally:
+                for spool in spools.values():
+                    spool.close()
+
+        LOGGER.info(
+            "Replay ingest complete: total=%d processed=%d ok=%d failed=%d skipped=%d "
+            "backfilled_logs=%d resumed_runs=%d (dry_run=%s, create_missing_tests=%s, backfill_logs=%s)",
+            summary.total, summary.processed, summary.succeeded,
+            summary.failed, summary.skipped_no_replay, summary.backfilled_logs, summary.resumed_runs,
+            dry_run, self._create_missing_tests, self._backfill_logs,
+        )
+        return summary
+
+    def _replay_run(self, app, run_id: str, spool: IO[bytes], archive_id: str, *,
+                    dry_run: bool, schema_version: str | None) -> ReplaySummary:
+        """Dispatch the records of one run in order and checkpoint it if none failed."""
+        spool.seek(0)
+        records = self._apply_ordering([json.loads(line) for line in spool])
+        spool.close()
 
         summary = ReplaySummary(total=len(records))
-        if records:
-            client = self._test_client()
+        with self._app_context(app):
+            client = app.test_client()
             last_seen_ts = self._compute_last_seen_ts(records)
             for rec in records:
                 self._process_one(client, rec, summary, dry_run=dry_run, last_seen_ts=last_seen_ts)
@@ -204,30 +297,23 @@ class ReplayService:
             # recorded (e.g. loader/monitor/sct-runner bundles), and submit
             # their links through the same dispatch path. Skipped on dry_run.
             if self._backfill_logs and not dry_run:
-                backfill_records = self._build_log_backfill_records(records)
+                backfill_records = self._build_log_backfill_records(records, schema_version=schema_version)
                 summary.total += len(backfill_records)
                 for rec in backfill_records:
                     self._process_one(client, rec, summary, dry_run=dry_run, last_seen_ts=last_seen_ts)
                     summary.backfilled_logs += len((rec.get("body") or {}).get("logs") or [])
 
-        LOGGER.info(
-            "Replay ingest complete: total=%d processed=%d ok=%d failed=%d skipped=%d "
-            "backfilled_logs=%d (dry_run=%s, create_missing_tests=%s, backfill_logs=%s)",
-            summary.total, summary.processed, summary.succeeded,
-            summary.failed, summary.skipped_no_replay, summary.backfilled_logs,
-            dry_run, self._create_missing_tests, self._backfill_logs,
-        )
+        if self._checkpoints and not dry_run and not summary.failed:
+            try:
+                self._checkpoints.mark_completed(archive_id, run_id)
+            except Exception:  # noqa: BLE001 -- a lost checkpoint only means the run is replayed again
+                LOGGER.warning("Failed to checkpoint replayed run %r", run_id, exc_info=True)
         return summary
 
-    def _test_client(self):
-        """Resolve the Flask test client to dispatch through.
-
-        Prefers an explicitly-injected app (used by unit tests); falls back
-        to :py:obj:`flask.current_app` so the controller doesn't need to
-        thread the app through.
-        """
-        app = self._app or current_app._get_current_object()  # type: ignore[attr-defined]
-        return app.test_client()
+    @staticmethod
+    def _app_context(app):
+        """App context for a dispatch worker; injected app stand-ins have none."""
+        return app.app_context() if hasattr(app, "app_context") else contextlib.nullcontext()
 
     # ------------------------------------------------------------------
     # Archive handling
@@ -325,6 +411,44 @@ class ReplayService:
                     source_name, line_no, exc,
                 )
 
+    # ------------------------------------------------------------------
+    # Run spooling
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _run_id(record: dict) -> str:
+        """Run a record belongs to; records of no run share the empty id."""
+        location = record.get("location_params") or {}
+        body = record.get("body")
+        run_id = location.get("id") or (body.get("run_id") if isinstance(body, dict) else None)
+        return str(run_id or "")
+
+    def _spool_runs(self, archive_bytes: bytes, completed: set[str]) -> tuple[dict[str, IO[bytes]], str | None]:
+        """Stream the archive into one spool of JSON lines per run, in order of first appearance.
+
+        Records of ``completed`` runs are dropped. Also returns the first
+        ``schema_version`` of a recorded ``logs/submit``, used for the log
+        back-fill of runs that recorded none.
+        """
+        spools: dict[str, IO[bytes]] = {}
+        schema_version: str | None = None
+        try:
+            for record in self._extract_records(archive_bytes):
+                run_id = self._run_id(record)
+                if run_id in completed:
+                    continue
+                if (not schema_version
+                        and self._normalise_endpoint(record.get("endpoint", "")) == LOGS_SUBMIT_ENDPOINT):
+                    schema_version = (record.get("body") or {}).get("schema_version")
+                spool = spools.get(run_id)
+                if spool is None:
+                    spool = spools[run_id] = tempfile.SpooledTemporaryFile(max_size=RUN_SPOOL_MAX_SIZE)
+                spool.write(json.dumps(record).encode("utf-8") + b"\n")
+        except BaseException:
+            for spool in spools.values():
+                spool.close()
+            raise
+        return spools, schema_version
+
     # ------------------------------------------------------------------
     # Endpoint normalisation
     # ------------------------------------------------------------------
@@ -644,7 +768,7 @@ class ReplayService:
                 break
         return keys
 
-    def _build_log_backfill_records(self, records: list[dict]) -> list[dict]:
+    def _build_log_backfill_records(self, records: list[dict], *, schema_version: str | None = None) -> list[dict]:
         """Synthesise ``logs/submit`` records for a run's S3 log archives that
         were uploaded but never recorded.
 
@@ -654,10 +778,11 @@ class ReplayService:
         records are dispatched through the normal ``logs/submit`` path, whose
         ``submit_logs`` appends-and-dedups -- so this is idempotent across
         re-ingests (deterministic key-derived names) and never clobbers links
-        the client already submitted.
+        the client already submitted. ``schema_version`` is used when none of
+        ``records`` is a ``logs/submit`` carrying one.
         """
         runs: dict[tuple, set] = {}
-        schema_version: str | None = None
+        recorded_schema_version: str | None = None
         for rec in records:
             loc = rec.get("location_params") or {}
             run_type, run_id = loc.get("type"), loc.get("id")
@@ -666,11 +791,12 @@ class ReplayService:
             links = runs.setdefault((run_type, run_id), set())
             if self._normalise_endpoint(rec.get("endpoint", "")) == LOGS_SUBMIT_ENDPOINT:
                 body = rec.get("body") or {}
-                schema_version = schema_version or body.get("schema_version")
+                recorded_schema_version = recorded_schema_version or body.get("schema_version")
                 for log in body.get("logs") or []:
                     if log.get("log_link"):
                         links.add(log["log_link"])
 
+        schema_version = recorded_schema_version or schema_version
         backfill: list[dict] = []
         for (run_type, run_id), recorded_links in runs.items():
             bucket = self._resolve_run_bucket(recorded_links)
@@ -764,7 +890,8 @@ class ReplayService:
         # dispatch and surface its error.
         if self._create_missing_tests and endpoint == "/testrun/$type/submit":
             try:
-                self._ensure_hierarchy_for_submit_run(record)
+                with self._hierarchy_lock:
+                    self._ensure_hierarchy_for_submit_run(record)
             except Exception:  # noqa: BLE001
                 LOGGER.exception(
                     "Hierarchy auto-create failed for ts=%s; continuing with dispatch", ts,
@@ -1,26 +1,74 @@
 import copy
+import hashlib
+import json
 import logging
 import math
 import operator
-from collections import defaultdict
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from functools import partial, cache
-from typing import List, Dict, Any
+from functools import partial
+from itertools import accumulate
+from typing import Any, Callable, Dict, List
 from uuid import UUID, uuid4
 
 from dataclasses import dataclass
+from cassandra.concurrent import execute_concurrent, execute_concurrent_with_args
+from cassandra.query import BatchStatement, BatchType, PreparedStatement
 from coodie.exceptions import DocumentNotFound
 
 from argus.backend.db import ScyllaCluster
-from argus.backend.models.result import ArgusGenericResultMetadata, ArgusGenericResultData, ArgusBestResultData, ColumnMetadata, ArgusGraphView
+from argus.backend.error_handlers import ResultWriteError
+from argus.backend.models.result import ArgusGenericResultMetadata, ArgusGenericResultData, ArgusBestResultData, ColumnMetadata, ArgusGraphView, \
+    ArgusGraphSnapshot, ArgusGraphSnapshotGeneration
 from argus.backend.plugins.sct.udt import PackageVersion
 from argus.backend.service.testrun import TestRunService
+from argus.backend.util.encoders import ArgusJSONEncoder
 
 LOGGER = logging.getLogger(__name__)
 
 type RunId = str
 type ReleasesMap = dict[str, list[RunId]]
 
+# Result cells and best results of a table share one partition (test_id, name),
+# so they are written as unlogged single-partition batches of this size.
+RESULTS_BATCH_SIZE = 50
+RESULTS_WRITE_CONCURRENCY = 8
+# Run details (ignored runs and packages) of a test are read by every graph and best-results
+# request, so they are cached per process. Run submission and investigation status changes
+# invalidate the test's entry; the TTL bounds staleness from any other run update.
+RUNS_DETAILS_CACHE_SIZE = 512
+RUNS_DETAILS_CACHE_TTL = 300
+# Graph snapshots are rebuilt on every results submission, the TTL only bounds
+# snapshots of custom date windows and of tests that stopped running.
+GRAPH_SNAPSHOT_TTL = 7 * 24 * 3600
+
+
+def write_partition_rows(statement: PreparedStatement, rows: list[tuple], keys: list[str]) -> list[dict[str, str]]:
+    """Write rows of a single partition in concurrent unlogged batches.
+
+    Returns one {"key", "error"} entry per row of every batch that failed, `keys` naming the rows.
+    """
+    cluster = ScyllaCluster.get()
+    batches = []
+    for start in range(0, len(rows), RESULTS_BATCH_SIZE):
+        batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+        for values in rows[start:start + RESULTS_BATCH_SIZE]:
+            batch.add(statement, values)
+        batches.append((batch, None))
+    results = execute_concurrent(cluster.session, batches, concurrency=RESULTS_WRITE_CONCURRENCY,
+                                 raise_on_first_error=False)
+    failures = []
+    for index, (success, result) in enumerate(results):
+        if not success:
+            LOGGER.error("Failed to write results batch into %s: %s", statement.query_string, result)
+            start = index * RESULTS_BATCH_SIZE
+            failures.extend({"key": key, "error": str(result)} for key in keys[start:start + RESULTS_BATCH_SIZE])
+    return failures
+
 
 @dataclass
 class BestResult:
@@ -67,10 +115,99 @@ class Cell:
 
 @dataclass
 class RunsDetails:
-    ignored: list[RunId]
+    ignored: frozenset[RunId]
     packages: dict[RunId, list[PackageVersion]]
 
 
+class RunsDetailsCache:
+    """Bounded TTL cache of RunsDetails keyed by test_id, shared by all ResultsService instances."""
+
+    def __init__(self, max_size: int = RUNS_DETAILS_CACHE_SIZE, ttl: float = RUNS_DETAILS_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[UUID, tuple[float, RunsDetails]] = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, test_id: UUID) -> bool:
+        return test_id in self._entries
+
+    def get(self, test_id: UUID, loader: Callable[[UUID], RunsDetails]) -> RunsDetails:
+        with self._lock:
+            entry = self._entries.get(test_id)
+            if entry and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(test_id)
+                return entry[1]
+            generation = self._generation
+
+        details = loader(test_id)
+        with self._lock:
+            # Skip storing a result that an invalidation raced with, it may predate the change
+            if self._generation == generation:
+                self._entries[test_id] = (time.monotonic(), details)
+                self._entries.move_to_end(test_id)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return details
+
+    def invalidate(self, test_id: UUID) -> None:
+        with self._lock:
+            self._entries.pop(test_id, None)
+            self._generation += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+
+RUNS_DETAILS_CACHE = RunsDetailsCache()
+
+
+def invalidate_runs_details(test_id: UUID) -> None:
+    """Drop cached run details of a test after its runs were added or their investigation status changed."""
+    RUNS_DETAILS_CACHE.invalidate(test_id)
+
+
+_graph_snapshot_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="graph-snapshots")
+_pending_graph_snapshots: set[UUID] = set()
+_pending_graph_snapshots_lock = threading.Lock()
+
+
+def graph_snapshot_window(start_date: datetime | None, end_date: datetime | None) -> str:
+    return f"{start_date.isoformat() if start_date else ''}/{end_date.isoformat() if end_date else ''}"
+
+
+def refresh_graph_snapshots(test_id: UUID) -> None:
+    """Drop the graph snapshots of a test now and rebuild the default one in the background.
+
+    Call after results of the test were submitted or its runs were (un)ignored. A new snapshot
+    generation is stored first, so snapshots of builds still running elsewhere are not served
+    once they land. Refreshes queued for the same test before the rebuild starts are coalesced
+    into one.
+    """
+    invalidate_runs_details(test_id)
+    ArgusGraphSnapshotGeneration.create(test_id=test_id, generation=uuid4())
+    ArgusGraphSnapshot.find(test_id=test_id).delete()
+    with _pending_graph_snapshots_lock:
+        if test_id in _pending_graph_snapshots:
+            return
+        _pending_graph_snapshots.add(test_id)
+    _graph_snapshot_executor.submit(_rebuild_graph_snapshots, test_id)
+
+
+def _rebuild_graph_snapshots(test_id: UUID) -> None:
+    with _pending_graph_snapshots_lock:
+        _pending_graph_snapshots.discard(test_id)
+    try:
+        ResultsService().rebuild_graph_snapshots(test_id)
+    except Exception:  # pylint: disable=broad-except
+        LOGGER.warning("Failed to rebuild graph snapshots of test %s", test_id, exc_info=True)
+
+
 default_options = {
     "scales": {
         "y": {
@@ -140,39 +277,73 @@ dash_patterns = [
 ]
 
 
+class PackageChanges:
+    """Package versions of every run and the version changes between consecutive runs of a series.
+
+    All (column, row) series of a table follow mostly the same run sequence, so versions are
+    formatted once per run and the changes between two runs are computed once per run pair.
+    """
+
+    def __init__(self, runs_details: RunsDetails, main_package: str):
+        self.packages = runs_details.packages
+        self.main_package = main_package
+        self._versions: dict[RunId, tuple[str, dict[str, str]]] = {}
+        self._changes: dict[tuple[RunId, RunId], tuple[list[str], bool]] = {}
+
+    def versions(self, run_id: RunId) -> tuple[str, dict[str, str]]:
+        """Main package entry and the versions of the other packages of a run."""
+        if (cached := self._versions.get(run_id)) is None:
+            versions = {pkg.name: pkg.version + (f" ({pkg.date})" if pkg.date else "")
+                        for pkg in self.packages.get(run_id, [])}
+            cached = f"{self.main_package}: {versions.pop(self.main_package, None)}", versions
+            self._versions[run_id] = cached
+        return cached
+
+    def changes(self, prev_run_id: RunId | None, run_id: RunId) -> tuple[list[str], bool]:
+        """Change descriptions of a point and whether a package other than the main one changed."""
+        key = (prev_run_id, run_id)
+        if (cached := self._changes.get(key)) is None:
+            main_entry, current_versions = self.versions(run_id)
+            if prev_run_id is None:
+                cached = [main_entry], False
+            else:
+                prev_versions = self.versions(prev_run_id)[1]
+                changes = [f"{pkg_name}: {prev_versions.get(pkg_name)} -> {current_versions.get(pkg_name)}"
+                           for pkg_name in current_versions.keys() | prev_versions.keys()
+                           if current_versions.get(pkg_name) != prev_versions.get(pkg_name)]
+                cached = [main_entry] + changes, bool(changes)
+            self._changes[key] = cached
+        return cached
+
+
+def group_points_by_column_and_row(data: List[ArgusGenericResultData], runs_details: RunsDetails,
+                                   main_package: str,
+                                   package_changes: PackageChanges | None = None) -> dict[tuple[str, str], List[Dict[str, Any]]]:
+    """Time-ordered chart points of every (column, row) of a table, built in a single pass over the cells."""
+    package_changes = package_changes or PackageChanges(runs_details, main_package)
+    series = defaultdict(list)
+    # All cells of a run share its sut_timestamp, format it once
+    formatted_timestamps = {}
+    for entry in data:
+        if (x := formatted_timestamps.get(entry.sut_timestamp)) is None:
+            x = formatted_timestamps[entry.sut_timestamp] = entry.sut_timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
+        series[(entry.column, entry.row)].append({"x": x,
+                                                  "y": entry.value,
+                                                  "id": entry.run_id,
+                                                  })
+    for points in series.values():
+        points.sort(key=lambda point: point["x"])
+        prev_run_id = None
+        for point in points:
+            point['changes'], point['dep_change'] = package_changes.changes(prev_run_id, point["id"])
+            prev_run_id = point["id"]
+    return series
+
+
 def get_sorted_data_for_column_and_row(data: List[ArgusGenericResultData], column: str, row: str,
                                        runs_details: RunsDetails, main_package: str) -> List[Dict[str, Any]]:
-    points = sorted([{"x": entry.sut_timestamp.strftime('%Y-%m-%dT%H:%M:%SZ'),
-                      "y": entry.value,
-                      "id": entry.run_id,
-                      }
-                     for entry in data if entry.column == column and entry.row == row],
-                    key=lambda point: point["x"])
-    if not points:
-        return points
-    packages = runs_details.packages
-    prev_versions = {pkg.name: pkg.version + (f" ({pkg.date})" if pkg.date else "")
-                     for pkg in packages.get(points[0]["id"], [])}
-    points[0]['changes'] = [f"{main_package}: {prev_versions.pop(main_package, None)}"]
-    points[0]['dep_change'] = False
-    for point in points[1:]:
-        changes = []
-        mark_dependency_change = False
-        current_versions = {pkg.name: pkg.version + (f" ({pkg.date})" if pkg.date else "")
-                            for pkg in packages.get(point["id"], [])}
-        main_package_version = current_versions.pop(main_package, None)
-        for pkg_name in current_versions.keys() | prev_versions.keys():
-            curr_ver = current_versions.get(pkg_name)
-            prev_ver = prev_versions.get(pkg_name)
-            if curr_ver != prev_ver:
-                changes.append({'name': pkg_name, 'prev_version': prev_ver, 'curr_version': curr_ver})
-                if pkg_name != main_package:
-                    mark_dependency_change = True
-        point['changes'] = [f"{main_package}: {main_package_version}"] + [
-            f"{change['name']}: {change['prev_version']} -> {change['curr_version']}" for change in changes]
-        point['dep_change'] = mark_dependency_change
-        prev_versions = current_versions
-    return points
+    cells = [entry for entry in data if entry.column == column and entry.row == row]
+    return group_points_by_column_and_row(cells, runs_details, main_package).get((column, row), [])
 
 
 def get_min_max_y(datasets: List[Dict[str, Any]]) -> (float, float):
@@ -203,30 +374,41 @@ def coerce_values_to_axis_boundaries(datasets: List[Dict[str, Any]], min_y: floa
     return datasets
 
 
+def _last_applicable_indexes(dates: list[datetime], point_dates: list[datetime]) -> list[int]:
+    """For every point date, the index of the last entry of `dates` not after it (0 if there is none)."""
+    order = sorted(range(len(dates)), key=lambda index: dates[index])
+    sorted_dates = [dates[index] for index in order]
+    # latest[i] is the highest list index among the i+1 earliest entries
+    latest = list(accumulate(order, max))
+    indexes = []
+    for point_date in point_dates:
+        position = bisect_right(sorted_dates, point_date)
+        indexes.append(latest[position - 1] if position else 0)
+    return indexes
+
+
 def calculate_limits(points: List[dict], best_results: List, validation_rules_list: List, higher_is_better: bool) -> List[dict]:
     """Calculate limits for points based on best results and validation rules"""
-    for point in points:
-        point_date = datetime.strptime(point["x"], '%Y-%m-%dT%H:%M:%SZ')
-        validation_rule = next(
-            (rule for rule in reversed(validation_rules_list) if rule.valid_from <= point_date),
-            validation_rules_list[0]
-        )
-        best_result = next(
-            (result for result in reversed(best_results) if result.result_date <= point_date),
-            best_results[0]
-        )
-        limit_values = []
-        if validation_rule.fixed_limit is not None:
-            limit_values.append(validation_rule.fixed_limit)
-        best_value = best_result.value
-        if validation_rule.best_pct is not None:
-            multiplier = 1 - validation_rule.best_pct / 100 if higher_is_better else 1 + validation_rule.best_pct / 100
-            limit_values.append(best_value * multiplier)
-        if validation_rule.best_abs is not None:
-            limit_values.append(
-                best_value - validation_rule.best_abs if higher_is_better else best_value + validation_rule.best_abs)
-        if limit_values:
-            limit_value = max(limit_values) if higher_is_better else min(limit_values)
+    point_dates = [datetime.fromisoformat(point["x"].removesuffix("Z")) for point in points]
+    rule_indexes = _last_applicable_indexes([rule.valid_from for rule in validation_rules_list], point_dates)
+    best_indexes = _last_applicable_indexes([result.result_date for result in best_results], point_dates)
+    limits: dict[tuple[int, int], float | None] = {}
+    for point, rule_index, best_index in zip(points, rule_indexes, best_indexes):
+        if (rule_index, best_index) not in limits:
+            validation_rule = validation_rules_list[rule_index]
+            best_value = best_results[best_index].value
+            limit_values = []
+            if validation_rule.fixed_limit is not None:
+                limit_values.append(validation_rule.fixed_limit)
+            if validation_rule.best_pct is not None:
+                multiplier = 1 - validation_rule.best_pct / 100 if higher_is_better else 1 + validation_rule.best_pct / 100
+                limit_values.append(best_value * multiplier)
+            if validation_rule.best_abs is not None:
+                limit_values.append(
+                    best_value - validation_rule.best_abs if higher_is_better else best_value + validation_rule.best_abs)
+            limits[(rule_index, best_index)] = (max(limit_values) if higher_is_better else min(limit_values)) \
+                if limit_values else None
+        if (limit_value := limits[(rule_index, best_index)]) is not None:
             point['limit'] = limit_value
 
     return points
@@ -234,17 +416,22 @@ def calculate_limits(points: List[dict], best_results: List, validation_rules_li
 
 def create_datasets_for_column(table: ArgusGenericResultMetadata, data: list[ArgusGenericResultData],
                                best_results: dict[str, List[BestResult]], releases_map: ReleasesMap, column: ColumnMetadata,
-                               runs_details: RunsDetails, main_package: str) -> List[Dict]:
+                               runs_details: RunsDetails, main_package: str,
+                               points_by_key: dict[tuple[str, str], List[Dict]] | None = None) -> List[Dict]:
     """
     Create datasets (series) for a specific column, splitting by version and showing limit lines.
+    `points_by_key` are the table points already grouped by group_points_by_column_and_row().
     """
     datasets = []
     is_fixed_limit_drawn = False
+    if points_by_key is None:
+        points_by_key = group_points_by_column_and_row(
+            [entry for entry in data if entry.column == column.name], runs_details, main_package)
 
     for idx, row in enumerate(table.rows_meta):
         line_color = colors[idx % len(colors)]
         line_dash = dash_patterns[idx % len(dash_patterns)]
-        points = get_sorted_data_for_column_and_row(data, column.name, row, runs_details, main_package)
+        points = points_by_key.get((column.name, row), [])
 
         datasets.extend(create_release_datasets(points, row, releases_map, line_dash))
 
@@ -261,9 +448,18 @@ def create_release_datasets(points: list[Dict], row: str, releases_map: Releases
     Create datasets separately for each release.
     """
     release_datasets = []
+    run_releases = defaultdict(list)
+    for release, run_ids in releases_map.items():
+        for run_id in run_ids:
+            if run_releases[run_id][-1:] != [release]:
+                run_releases[run_id].append(release)
+    points_by_release = defaultdict(list)
+    for point in points:
+        for release in run_releases.get(point["id"], []):
+            points_by_release[release].append(point)
 
-    for v_idx, (release, run_ids) in enumerate(releases_map.items()):
-        release_points = [point for point in points if point["id"] in run_ids]
+    for v_idx, release in enumerate(releases_map):
+        release_points = points_by_release.get(release)
 
         if release_points:
             release_datasets.append({
@@ -377,10 +573,11 @@ def create_chartjs(table: ArgusGenericResultMetadata, data: list[ArgusGenericRes
     graphs = []
     columns = [column for column in table.columns_meta
                if column.type != "TEXT" and column.visible is not False]
+    points_by_key = group_points_by_column_and_row(data, runs_details, main_package)
 
     for column in columns:
         datasets = create_datasets_for_column(table, data, best_results, releases_map,
-                                              column, runs_details, main_package)
+                                              column, runs_details, main_package, points_by_key=points_by_key)
 
         if datasets:
             min_y, max_y = get_min_max_y(datasets)
@@ -409,15 +606,17 @@ class ResultsService:
         packages = [p for p in packages if p.name not in packages_to_remove]
         return packages
 
-    @cache
     def _get_runs_details(self, test_id: UUID) -> RunsDetails:
+        return RUNS_DETAILS_CACHE.get(test_id, self._load_runs_details)
+
+    def _load_runs_details(self, test_id: UUID) -> RunsDetails:
         plugin_query = self.cluster.prepare("SELECT id, plugin_name FROM argus_test_v2 WHERE id = ?")
         plugin_name = self.cluster.session.execute(plugin_query, parameters=(test_id,)).one()['plugin_name']
         plugin = TestRunService().get_plugin(plugin_name)
         runs_details_query = self.cluster.prepare(
             f"SELECT id, investigation_status, packages FROM {plugin.model.table_name()} WHERE test_id = ?")
         rows = self.cluster.session.execute(runs_details_query, parameters=(test_id,)).all()
-        ignored_runs = [row["id"] for row in rows if row["investigation_status"].lower() == "ignored"]
+        ignored_runs = frozenset(row["id"] for row in rows if row["investigation_status"].lower() == "ignored")
         packages = {row["id"]: self._remove_duplicate_packages(
             row["packages"]) for row in rows if row["packages"] and row["id"] not in ignored_runs}
         return RunsDetails(ignored=ignored_runs, packages=packages)
@@ -430,7 +629,7 @@ class ResultsService:
         tables_meta = self.cluster.session.execute(query=query, parameters=(test_id,))
         return [ArgusGenericResultMetadata(**table) for table in tables_meta]
 
-    def _get_tables_data(self, test_id: UUID, table_name: str, ignored_runs: list[RunId],
+    def _get_tables_data(self, test_id: UUID, table_name: str, ignored_runs: frozenset[RunId],
                          start_date: datetime | None = None, end_date: datetime | None = None) -> list[ArgusGenericResultData]:
         query_fields = ["run_id", "column", "row", "value", "status", "sut_timestamp"]
         raw_query = (f"SELECT {','.join(query_fields)}"
@@ -463,10 +662,13 @@ class ResultsService:
                      f"FROM generic_result_data_v1 WHERE test_id = ? AND run_id = ? AND name = ?")
         query = self.cluster.prepare(raw_query)
         tables_meta = self._get_tables_metadata(test_id=test_id)
+        # Every table is its own partition: issue all reads up front and assemble
+        # each table while the reads of the following ones are still in flight
+        futures = [self.cluster.session.execute_async(query=query, parameters=(test_id, run_id, table.name))
+                   for table in tables_meta]
         table_entries = []
-        for table in tables_meta:
-            cells = self.cluster.session.execute(query=query, parameters=(test_id, run_id, table.name))
-            cells = [dict(cell.items()) for cell in cells]
+        for table, future in zip(tables_meta, futures):
+            cells = [dict(cell.items()) for cell in future.result()]
             if key_metrics:
                 cells = [cell for cell in cells if cell['column'] in key_metrics]
             if not cells:
@@ -526,6 +728,24 @@ class ResultsService:
 
         return [{entry['table_name']: entry['table_data']} for entry in table_entries]
 
+    def _create_table_graphs(self, test_id: UUID, table: ArgusGenericResultMetadata, sut_package_name: str | None,
+                             runs_details: RunsDetails, start_date: datetime | None = None,
+                             end_date: datetime | None = None) -> tuple[list[dict], list[str]]:
+        """Chart.js graphs of one results table and the releases they are split by (empty if there is no data)."""
+        data = self._get_tables_data(test_id=test_id, table_name=table.name, ignored_runs=runs_details.ignored,
+                                     start_date=start_date, end_date=end_date)
+        if not data:
+            return [], []
+        best_results = self.get_best_results(test_id=test_id, name=table.name, runs_details=runs_details)
+        main_package = sut_package_name
+        if not main_package:
+            main_package = _identify_most_changed_package(
+                [pkg for sublist in runs_details.packages.values() for pkg in sublist])
+        releases_map = _split_results_by_release(runs_details.packages, main_package=main_package)
+        graphs = create_chartjs(table, data, best_results, releases_map=releases_map, runs_details=runs_details,
+                                main_package=main_package)
+        return graphs, list(releases_map.keys())
+
     def get_test_graphs(self, test_id: UUID, start_date: datetime | None = None, end_date: datetime | None = None, table_names: list[str] | None = None):
         runs_details = self._get_runs_details(test_id)
         tables_meta = self._get_tables_metadata(test_id=test_id)
@@ -536,28 +756,91 @@ class ResultsService:
         graphs = []
         releases_filters = set()
         for table in tables_meta:
-            data = self._get_tables_data(test_id=test_id, table_name=table.name, ignored_runs=runs_details.ignored,
-                                         start_date=start_date, end_date=end_date)
-            if not data:
-                continue
-            best_results = self.get_best_results(test_id=test_id, name=table.name)
-            main_package = tables_meta[0].sut_package_name
-            if not main_package:
-                main_package = _identify_most_changed_package(
-                    [pkg for sublist in runs_details.packages.values() for pkg in sublist])
-            releases_map = _split_results_by_release(runs_details.packages, main_package=main_package)
-            graphs.extend(
-                create_chartjs(table, data, best_results, releases_map=releases_map, runs_details=runs_details, main_package=main_package))
-            releases_filters.update(releases_map.keys())
+            table_graphs, releases = self._create_table_graphs(test_id, table, tables_meta[0].sut_package_name,
+                                                               runs_details, start_date=start_date, end_date=end_date)
+            graphs.extend(table_graphs)
+            releases_filters.update(releases)
         ticks = calculate_graph_ticks(graphs)
         return graphs, ticks, list(releases_filters)
 
+    def _graph_snapshot_generation(self, test_id: UUID) -> UUID | None:
+        query = self.cluster.prepare(f"SELECT generation FROM {ArgusGraphSnapshotGeneration.table_name()} "
+                                     "WHERE test_id = ?")
+        row = self.cluster.session.execute(query, parameters=(test_id,)).one()
+        return row["generation"] if row else None
+
+    def _store_graph_snapshots(self, test_id: UUID, window: str, tables: list[ArgusGenericResultMetadata],
+                               sut_package_name: str | None, generation: UUID | None,
+                               start_date: datetime | None = None,
+                               end_date: datetime | None = None) -> dict[str, dict]:
+        # Snapshots outlive the cache TTL and the cache of this process may predate another process' refresh
+        runs_details = self._load_runs_details(test_id)
+        statement = self.cluster.prepare(f"INSERT INTO {ArgusGraphSnapshot.table_name()} "
+                                         "(test_id, window, name, payload, etag, generated_at, generation) "
+                                         "VALUES (?, ?, ?, ?, ?, ?, ?) USING TTL ?")
+        generated_at = datetime.now(timezone.utc)
+        snapshots, params = {}, []
+        for table in tables:
+            graphs, releases = self._create_table_graphs(test_id, table, sut_package_name, runs_details,
+                                                         start_date=start_date, end_date=end_date)
+            payload = json.dumps({"graphs": graphs, "releases": releases}, cls=ArgusJSONEncoder)
+            etag = hashlib.sha1(payload.encode()).hexdigest()
+            snapshots[table.name] = {"payload": payload, "etag": etag}
+            params.append((test_id, window, table.name, payload, etag, generated_at, generation, GRAPH_SNAPSHOT_TTL))
+        execute_concurrent_with_args(self.cluster.session, statement, params, concurrency=RESULTS_WRITE_CONCURRENCY,
+                                     raise_on_first_error=False)
+        return snapshots
+
+    def get_test_graph_snapshots(self, test_id: UUID, start_date: datetime | None = None,
+                                 end_date: datetime | None = None,
+                                 table_names: list[str] | None = None) -> tuple[list[dict], dict[str, str], list[str], str]:
+        """Same graphs as get_test_graphs() served from stored snapshots, plus an ETag of the graphs.
+
+        Tables without a snapshot of the current generation for the window are built and stored on
+        the way. Snapshots of a test are superseded when its results or ignored runs change (see
+        refresh_graph_snapshots()).
+        """
+        window = graph_snapshot_window(start_date, end_date)
+        # Read before the snapshots and their data: a refresh in between makes the new ones stale, not the reverse
+        generation = self._graph_snapshot_generation(test_id)
+        all_tables = self._get_tables_metadata(test_id=test_id)
+        tables = [table for table in all_tables if table.name in table_names] if table_names else all_tables
+        query = self.cluster.prepare(f"SELECT name, payload, etag, generation FROM {ArgusGraphSnapshot.table_name()} "
+                                     "WHERE test_id = ? AND window = ?")
+        snapshots = {row["name"]: row for row in self.cluster.session.execute(query, parameters=(test_id, window))
+                     if row["generation"] == generation}
+        if missing := [table for table in tables if table.name not in snapshots]:
+            snapshots.update(self._store_graph_snapshots(test_id, window, missing,
+                                                         all_tables[0].sut_package_name if all_tables else None,
+                                                         generation, start_date=start_date, end_date=end_date))
+        graphs = []
+        releases_filters = set()
+        etags = []
+        for table in tables:
+            snapshot = snapshots[table.name]
+            payload = json.loads(snapshot["payload"])
+            graphs.extend(payload["graphs"])
+            releases_filters.update(payload["releases"])
+            etags.append(snapshot["etag"])
+        ticks = calculate_graph_ticks(graphs)
+        return graphs, ticks, list(releases_filters), hashlib.sha1(":".join(etags).encode()).hexdigest()
+
+    def rebuild_graph_snapshots(self, test_id: UUID) -> None:
+        """Build the graph snapshots of the unfiltered, unbounded window in the current generation."""
+        generation = self._graph_snapshot_generation(test_id)
+        tables = self._get_tables_metadata(test_id=test_id)
+        if tables:
+            self._store_graph_snapshots(test_id, graph_snapshot_window(None, None), tables, tables[0].sut_package_name,
+                                        generation)
+
     def is_results_exist(self, test_id: UUID):
         """Verify if results for given test id exist at all."""
         return bool(ArgusGenericResultMetadata.find(test_id=test_id).only("name").limit(1).all())
 
-    def get_best_results(self, test_id: UUID, name: str) -> dict[str, List[BestResult]]:
-        runs_details = self._get_runs_details(test_id)
+    def get_best_results(self, test_id: UUID, name: str,
+                         runs_details: RunsDetails | None = None) -> dict[str, List[BestResult]]:
+        if runs_details is None:
+            runs_details = self._get_runs_details(test_id)
         query_fields = ["key", "value", "result_date", "run_id"]
         raw_query = (f"SELECT {','.join(query_fields)}"
                      f" FROM generic_result_best_v2 WHERE test_id = ? and name = ?")
@@ -573,7 +856,10 @@ class ResultsService:
                             table_metadata: ArgusGenericResultMetadata, run_id: str) -> dict[str, List[BestResult]]:
         """update best results for given test_id and table_name based on cells values - if any value is better than current best"""
         higher_is_better_map = {meta.name: meta.higher_is_better for meta in table_metadata.columns_meta}
-        best_results = self.get_best_results(test_id=test_id, name=table_name)
+        # New best results are decided on fresh run details rather than a possibly stale cached copy
+        best_results = self.get_best_results(test_id=test_id, name=table_name,
+                                             runs_details=self._load_runs_details(test_id))
+        new_best_rows = []
         for cell in cells:
             if cell.value is None:
                 # textual value, skip
@@ -588,8 +874,12 @@ class ResultsService:
             if current_best is None or is_better(current_best.value):
                 result_date = datetime.now(timezone.utc)
                 best_results[key].append(BestResult(key=key, value=cell.value, result_date=result_date, run_id=run_id))
-                ArgusBestResultData(test_id=test_id, name=table_name, key=key, value=cell.value, result_date=result_date,
-                                    run_id=run_id).save()
+                new_best_rows.append((test_id, table_name, key, cell.value, result_date, UUID(str(run_id))))
+        if new_best_rows:
+            statement = self.cluster.prepare(f"INSERT INTO {ArgusBestResultData.table_name()} "
+                                             "(test_id, name, key, value, result_date, run_id) VALUES (?, ?, ?, ?, ?, ?)")
+            if failures := write_partition_rows(statement, new_best_rows, keys=[row[2] for row in new_best_rows]):
+                raise ResultWriteError("Failed to store best results", failures)
         return best_results
 
     def _exclude_disabled_tests(self, test_ids: list[UUID]) -> list[UUID]:
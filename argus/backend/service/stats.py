@@ -4,9 +4,10 @@ import json
 import logging
 
 from datetime import UTC, datetime
-from typing import Any, TypedDict
+from typing import Any, Callable, TypedDict
 from uuid import UUID
 
+from cassandra.concurrent import execute_concurrent_with_args
 from flask import current_app
 from coodie.exceptions import DocumentNotFound
 
@@ -17,7 +18,8 @@ from argus.backend.plugins.loader import all_plugin_models
 from argus.backend.util.common import chunk, get_build_number, check_version
 from argus.common.enums import TestStatus, TestInvestigationStatus
 from argus.backend.models.web import ArgusRelease, ArgusGroup, ArgusTest, \
-    ArgusTestRunComment, ArgusUserView, ReleaseStatsSnapshot
+    ArgusTestRunComment, ArgusUserView, ReleaseStatsSnapshot, ReleaseTestStats, ViewStatsSnapshot, \
+    invalidate_release_snapshots, invalidate_test_view_snapshots
 from argus.backend.db import ScyllaCluster
 
 LOGGER = logging.getLogger(__name__)
@@ -27,6 +29,44 @@ def snapshot_filter_key(version: str | None, image_id: str | None, include_no_ve
     return f"v={version or ''}::img={image_id or ''}::nov={int(include_no_version)}::lim={int(limited)}"
 
 
+def view_snapshot_filter_key(version: str | None, image_id: str | None, include_no_version: bool, limited: bool,
+                             widget_id: int | None) -> str:
+    widget = widget_id if isinstance(widget_id, int) else ""
+    return f"{snapshot_filter_key(version, image_id, include_no_version, limited)}::w={widget}"
+
+
+def parse_snapshot_filter_key(filter_key: str) -> tuple[str | None, str | None, bool, bool]:
+    """Inverse of snapshot_filter_key: (version, image_id, include_no_version, limited)."""
+    parts = dict(part.split("=", 1) for part in filter_key.split("::"))
+    return parts["v"] or None, parts["img"] or None, parts["nov"] == "1", parts["lim"] == "1"
+
+
+def run_row_filter(version: str | None, include_no_version: bool, image_id: str | None = None) -> Callable[[dict], bool]:
+    if version:
+        if include_no_version:
+            def version_matches(row): return check_version(version, row["scylla_version"]) or not row["scylla_version"]
+        elif version == "!noVersion":
+            def version_matches(row): return not row["scylla_version"]
+        else:
+            def version_matches(row): return check_version(version, row["scylla_version"])
+    else:
+        if include_no_version:
+            def version_matches(row): return row
+        else:
+            def version_matches(row): return row["scylla_version"]
+
+    def image_matches(row: dict):
+        setup = row.get("cloud_setup")
+        if not setup:
+            return False
+        db_node = setup.db_node
+        if not db_node:
+            return False
+        return db_node.image_id == image_id
+
+    return lambda row: bool(version_matches(row)) and (not image_id or image_matches(row))
+
+
 class TestRunStatRow(TypedDict):
     build_id: str
     status: TestStatus
@@ -174,6 +214,15 @@ def fetch_issues(release: list[UUID] | UUID):
     else:
         links = _fetch_multiple_release_queries(IssueLink, release)
 
+    return _resolve_issue_links(links)
+
+
+def fetch_issues_for_runs(run_ids: list[UUID]):
+    links = [link for run_id in run_ids for link in IssueLink.find(run_id=run_id).all()]
+    return _resolve_issue_links(links)
+
+
+def _resolve_issue_links(links: list[IssueLink]):
     unique_issues = {link.issue_id for link in links}
     resolved_issues = {}
     for batch in chunk(unique_issues):
@@ -214,6 +263,7 @@ class ViewStats:
         self.rows = []
         self.releases = {}
         self.all_tests = []
+        self.cached_tests: dict[UUID, dict] = {}
 
     def to_dict(self) -> dict:
         converted_groups = {str(group.group.id): group.to_dict() for group in self.groups}
@@ -306,6 +356,7 @@ class ReleaseStats:
         self.forced_collection = False
         self.rows = []
         self.all_tests = []
+        self.cached_tests: dict[UUID, dict] = {}
 
     def to_dict(self) -> dict:
         converted_groups = {str(group.group.id): group.to_dict() for group in self.groups}
@@ -333,7 +384,9 @@ class ReleaseStats:
             **aggregated_investigation_status
         }
 
-    def collect(self, rows: list[TestRunStatRow], limited=False, force=False, dict: dict | None = None, tests=None, version_filter: str = None) -> None:
+    def collect(self, rows: list[TestRunStatRow], limited=False, force=False, dict: dict | None = None, tests=None,
+                version_filter: str = None, groups: list[ArgusGroup] | None = None,
+                cached_tests: dict[UUID, dict] | None = None) -> None:
         self.forced_collection = force
         if not self.release.enabled and not force:
             return
@@ -346,7 +399,12 @@ class ReleaseStats:
 
         self.rows = rows
         self.dict = dict
-        if not limited or force:
+        self.cached_tests = cached_tests or {}
+        self.all_tests = ArgusTest.find(release_id=self.release.id).all() if not tests else tests
+        if groups is None:
+            groups = ArgusGroup.find(release_id=self.release.id).all()
+        groups: list[ArgusGroup] = list(groups)
+        if (not limited or force) and stale_tests(self.all_tests, groups, self.cached_tests):
             self.issues = reduce(
                 lambda acc, row: acc[row["run_id"]].append(row) or acc,
                 fetch_issues(self.release.id),
@@ -357,8 +415,6 @@ class ReleaseStats:
                 ArgusTestRunComment.find(release_id=self.release.id).all(),
                 defaultdict(list)
             )
-        self.all_tests = ArgusTest.find(release_id=self.release.id).all() if not tests else tests
-        groups: list[ArgusGroup] = ArgusGroup.find(release_id=self.release.id).all()
         for group in groups:
             if group.enabled:
                 stats = GroupStats(group=group, parent_release=self)
@@ -403,26 +459,29 @@ class GroupStats:
             **investigation_progress
         }
 
+    def is_scheduled(self, test: ArgusTest) -> bool:
+        for plan in self.parent_release.plans:
+            if test.id in plan.tests:
+                return True
+            if self.group.id in plan.groups:
+                return True
+        return False
+
     def collect(self, limited=False):
         tests = [test for test in self.parent_release.all_tests if test.group_id == self.group.id]
 
         for test in tests:
             if test.enabled:
-                is_scheduled = False
-                for plan in self.parent_release.plans:
-                    if test.id in plan.tests:
-                        is_scheduled = True
-                        break
-                    if self.group.id in plan.groups:
-                        is_scheduled = True
-                        break
                 stats = TestStats(
                     test=test,
                     parent_group=self,
-                    scheduled=is_scheduled,
+                    scheduled=self.is_scheduled(test),
                     schedules=self.parent_release.test_schedules.get(test.id, []),
                 )
-                stats.collect(limited=limited)
+                if (cached := self.parent_release.cached_tests.get(test.id)) is not None:
+                    stats.restore(cached)
+                else:
+                    stats.collect(limited=limited)
                 self.tests.append(stats)
 
     def increment_status(self, status=TestStatus.NOT_PLANNED):
@@ -452,6 +511,7 @@ class TestStats:
         self.schedules = schedules if schedules else tuple()
         self.is_scheduled_legacy = len(self.schedules) > 0  # TODO: Remove once old scheduling system is removed
         self.tracked_run_number = None
+        self.restored = False
 
     def to_dict(self) -> dict:
         return {
@@ -466,6 +526,19 @@ class TestStats:
             "buildId": self.test.build_system_id,
         }
 
+    def restore(self, payload: dict):
+        """Load a previously collected to_dict() payload instead of re-reading the runs."""
+        self.restored = True
+        self.status = payload["status"]
+        self.investigation_status = payload["investigation_status"]
+        self.last_runs = payload["last_runs"]
+        self.start_time = payload["start_time"]
+        self.has_bug_report = payload["hasBugReport"]
+        self.has_comments = payload["hasComments"]
+        self.tracked_run_number = payload["buildNumber"]
+        self.parent_group.increment_status(status=self.status)
+        self.parent_group.parent_release.has_bug_report = self.has_bug_report or self.parent_group.parent_release.has_bug_report
+
     def collect(self, limited=False):
 
         # TODO: Parametrize run limit
@@ -524,6 +597,113 @@ class TestStats:
         self.tracked_run_number = target_run.get("build_number", get_build_number(target_run.get("build_job_url")))
 
 
+def stale_tests(tests: list[ArgusTest], groups: list[ArgusGroup], cached_tests: dict[UUID, dict]) -> list[ArgusTest]:
+    enabled_groups = {group.id for group in groups if group.enabled}
+    return [test for test in tests if test.enabled and test.group_id in enabled_groups and test.id not in cached_tests]
+
+
+def load_test_stats(release_id: UUID, filter_key: str) -> dict[UUID, dict]:
+    rows = ReleaseTestStats.find(release_id=release_id, filter_key=filter_key).all()
+    return {row.test_id: json.loads(row.payload) for row in rows}
+
+
+def save_test_stats(release_id: UUID, filter_key: str, tests: list[TestStats]) -> None:
+    if not tests:
+        return
+    cluster = ScyllaCluster.get()
+    query = cluster.prepare(f"INSERT INTO {ReleaseTestStats.table_name()} "
+                            "(release_id, filter_key, test_id, group_id, payload, generated_at) VALUES (?, ?, ?, ?, ?, ?)")
+    generated_at = datetime.now(UTC)
+    params = []
+    for stats in tests:
+        payload = stats.to_dict()
+        payload.pop("test")
+        params.append((release_id, filter_key, stats.test.id, stats.test.group_id,
+                       current_app.json.dumps(payload), generated_at))
+    execute_concurrent_with_args(cluster.session, query, params, concurrency=50, raise_on_first_error=True)
+
+
+def cached_filter_keys(release_id: UUID) -> list[str]:
+    """Distinct filter keys present in the release partition of ReleaseTestStats.
+
+    Walks the first clustering column one key at a time, so the cost is one
+    single-row read per filter combination rather than a scan of every test row.
+    """
+    cluster = ScyllaCluster.get()
+    query = cluster.prepare(f"SELECT filter_key FROM {ReleaseTestStats.table_name()} "
+                            "WHERE release_id = ? AND filter_key > ? LIMIT 1")
+    keys = []
+    while row := cluster.session.execute(query=query, parameters=(release_id, keys[-1] if keys else "")).one():
+        keys.append(row["filter_key"])
+    return keys
+
+
+def refresh_test_stats(test: ArgusTest) -> None:
+    """Recompute the per-test stats rows of a single test in place.
+
+    Every filter combination already rolled up for the release is refreshed
+    from one partition read of the test's runs, so the next roll-up does not
+    need to touch the plugin tables at all.
+    """
+    filter_keys = cached_filter_keys(test.release_id)
+    if not filter_keys:
+        return
+    group: ArgusGroup = ArgusGroup.get(id=test.group_id)
+    if not test.enabled or not group.enabled:
+        for filter_key in filter_keys:
+            ReleaseTestStats.find(release_id=test.release_id, filter_key=filter_key, test_id=test.id).delete()
+        return
+
+    release: ArgusRelease = ArgusRelease.get(id=test.release_id)
+    model = next((model for model in all_plugin_models() if model._plugin_name == test.plugin_name), None)
+    rows = []
+    if model:
+        rows = [row for future in model.get_stats_for_release(release=release, build_ids=[test.build_system_id])
+                for row in future.result()]
+    run_ids = [row["id"] for row in rows]
+    issues = reduce(
+        lambda acc, row: acc[row["run_id"]].append(row) or acc,
+        fetch_issues_for_runs(run_ids),
+        defaultdict(list)
+    )
+    comments = reduce(
+        lambda acc, row: acc[row.test_run_id].append(row) or acc,
+        [comment for run_id in run_ids for comment in ArgusTestRunComment.find(test_run_id=run_id).all()],
+        defaultdict(list)
+    )
+    plans: list[ArgusReleasePlan] = list(ArgusReleasePlan.find(release_id=release.id).all())
+
+    for filter_key in filter_keys:
+        version, image_id, include_no_version, limited = parse_snapshot_filter_key(filter_key)
+        test_rows = list(filter(run_row_filter(version, include_no_version, image_id), rows))
+        release_stats = ReleaseStats(release=release)
+        release_stats.plans = [] if limited else [plan for plan in plans if version == plan.target_version]
+        release_stats.rows = test_rows
+        release_stats.dict = {test.build_system_id: test_rows}
+        release_stats.issues = issues
+        release_stats.comments = comments
+        release_stats.all_tests = [test]
+        group_stats = GroupStats(group=group, parent_release=release_stats)
+        group_stats.collect(limited=limited)
+        save_test_stats(release.id, filter_key, group_stats.tests)
+
+
+def invalidate_test_stats(release_id: UUID, test_id: UUID) -> None:
+    """Drop the release and view roll-ups and refresh the per-test rows of a single test.
+
+    Use this for changes scoped to one test (run status, investigation status,
+    assignee, issues and comments) instead of invalidate_release_snapshots(),
+    which discards the per-test rows of the whole release.
+    """
+    invalidate_test_view_snapshots(test_id)
+    try:
+        ReleaseStatsSnapshot.find(release_id=release_id).delete()
+        refresh_test_stats(ArgusTest.get(id=test_id))
+    except Exception:  # pylint: disable=broad-except
+        LOGGER.warning("Failed to refresh stats for test %s, dropping release snapshots", test_id, exc_info=True)
+        invalidate_release_snapshots(release_id)
+
+
 class ReleaseStatsCollector:
     def __init__(self, release_name: str, release_version: str | None = None) -> None:
         self.database = ScyllaCluster.get()
@@ -536,51 +716,32 @@ class ReleaseStatsCollector:
 
     def collect(self, limited=False, force=False, include_no_version=False, image_id: str = None) -> dict:
         self.release: ArgusRelease = ArgusRelease.get(name=self.release_name)
+        filter_key = snapshot_filter_key(self.release_version, image_id, include_no_version, limited)
 
         if not force:
-            filter_key = snapshot_filter_key(self.release_version, image_id, include_no_version, limited)
             try:
                 snapshot = ReleaseStatsSnapshot.get(release_id=self.release.id, filter_key=filter_key)
                 return json.loads(snapshot.payload)
             except DocumentNotFound:
                 pass
 
+        if self.release.dormant and not force:
+            return {
+                "dormant": True
+            }
+
         all_tests: list[ArgusTest] = list(ArgusTest.find(release_id=self.release.id).all())
+        all_groups: list[ArgusGroup] = list(ArgusGroup.find(release_id=self.release.id).all())
+        # Tests with an up-to-date per-test row are rolled up as-is, only the rest hit the plugin tables.
+        cached_tests = {} if force else load_test_stats(self.release.id, filter_key)
+        tests_to_collect = stale_tests(all_tests, all_groups, cached_tests)
+
         build_ids = reduce(lambda acc, test: acc[test.plugin_name or "unknown"].append(
-            test.build_system_id) or acc, all_tests, defaultdict(list))
+            test.build_system_id) or acc, tests_to_collect, defaultdict(list))
         self.release_rows = [futures for plugin in all_plugin_models()
                              for futures in plugin.get_stats_for_release(release=self.release, build_ids=build_ids.get(plugin._plugin_name, []))]
         self.release_rows = [row for future in self.release_rows for row in future.result()]
-        if self.release.dormant and not force:
-            return {
-                "dormant": True
-            }
-        if self.release_version:
-            if include_no_version:
-                def expr(row): return check_version(self.release_version, row["scylla_version"]) or not row["scylla_version"]
-            elif self.release_version == "!noVersion":
-                def expr(row): return not row["scylla_version"]
-            else:
-                def expr(row): return check_version(self.release_version, row["scylla_version"])
-        else:
-            if include_no_version:
-                def expr(row): return row
-            else:
-                def expr(row): return row["scylla_version"]
-        self.release_rows = list(filter(expr, self.release_rows))
-        if image_id:
-            def filter_for_image(row: dict):
-                setup = row.get("cloud_setup")
-                if not setup:
-                    return False
-                db_node = setup.db_node
-                if not db_node:
-                    return False
-                image = db_node.image_id
-
-                return image == image_id
-
-            self.release_rows = list(filter(filter_for_image, self.release_rows))
+        self.release_rows = list(filter(run_row_filter(self.release_version, include_no_version, image_id), self.release_rows))
         self.release_dict = {}
         for row in self.release_rows:
             runs = self.release_dict.get(row["build_id"], [])
@@ -589,11 +750,15 @@ class ReleaseStatsCollector:
 
         self.release_stats = ReleaseStats(release=self.release)
         self.release_stats.collect(rows=self.release_rows, limited=limited, force=force,
-                                   dict=self.release_dict, tests=all_tests, version_filter=self.release_version)
+                                   dict=self.release_dict, tests=all_tests, version_filter=self.release_version,
+                                   groups=all_groups, cached_tests=cached_tests)
         result = self.release_stats.to_dict()
 
-        filter_key = snapshot_filter_key(self.release_version, image_id, include_no_version, limited)
         try:
+            if not (force and limited):
+                # A forced limited collection carries full run details and must not leak into limited rows
+                collected = [test for group in self.release_stats.groups for test in group.tests if not test.restored]
+                save_test_stats(self.release.id, filter_key, collected)
             ReleaseStatsSnapshot.create(
                 release_id=self.release.id,
                 filter_key=filter_key,
@@ -618,6 +783,14 @@ class ViewStatsCollector:
         self.filter = filter
 
     def collect(self, limited=False, force=False, include_no_version=False, widget_id: int = None, image_id: str = None) -> dict:
+        filter_key = view_snapshot_filter_key(self.filter, image_id, include_no_version, limited, widget_id)
+        if not force:
+            try:
+                snapshot = ViewStatsSnapshot.get(view_id=self.view_id, filter_key=filter_key)
+                return json.loads(snapshot.payload)
+            except DocumentNotFound:
+                pass
+
         self.view: ArgusUserView = ArgusUserView.get(id=self.view_id)
         widget: dict[str, Any] | None = None
         if isinstance(widget_id, int):
@@ -657,4 +830,16 @@ class ViewStatsCollector:
         self.view_stats = ViewStats(release=self.view)
         self.view_stats.collect(rows=self.view_rows, limited=limited, force=force,
                                 dict=self.runs_by_build_id, tests=all_tests, version_filter=self.filter)
-        return self.view_stats.to_dict()
+        result = self.view_stats.to_dict()
+
+        try:
+            ViewStatsSnapshot.create(
+                view_id=self.view_id,
+                filter_key=filter_key,
+                payload=current_app.json.dumps(result),
+                generated_at=datetime.now(UTC),
+            )
+        except Exception:
+            LOGGER.warning("Failed to write stats snapshot for view %s", self.view_id, exc_info=True)
+
+        return result
@@ -1,18 +1,279 @@
 
 
-from functools import partial
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
+import heapq
+import logging
 import re
+import threading
+import time
 from urllib.parse import unquote
-from typing import Any, Callable
+from typing import Any
 from uuid import UUID
 
+from cassandra.util import min_uuid_from_time, unix_time_from_uuid1
 from coodie.sync import Document
 from coodie.exceptions import DocumentNotFound
 
-from argus.backend.models.web import ArgusGroup, ArgusRelease, ArgusTest
-from argus.backend.plugins.core import PluginModelBase
+from argus.backend.db import ScyllaCluster
+from argus.backend.models.web import TEST_LOOKUP_CHANGE_TTL, ArgusGroup, ArgusRelease, ArgusTest, TestLookupChange, \
+    local_lookup_version
+from argus.backend.plugins.core import PluginModelBase, locate_run
 from argus.backend.plugins.loader import all_plugin_models
 
+LOGGER = logging.getLogger(__name__)
+
+TEST_LOOKUP_REFRESH_INTERVAL = 5
+TEST_LOOKUP_REBUILD_INTERVAL = 3600
+# Changes are read again for this long, so ones logged by other processes with a slightly older version are not missed
+TEST_LOOKUP_CHANGE_OVERLAP = 60
+TEST_LOOKUP_GRAM = 3
+
+LOOKUP_MODELS: dict[str, type[Document]] = {"release": ArgusRelease, "group": ArgusGroup, "test": ArgusTest}
+TYPE_RANK = {"release": 0, "group": 1, "test": 2}
+FACET_EXTRACTOR = re.compile(r"(?:(?P<name>(?:release|group|type)):(?P<value>\"?[\w\d\.\-]*\"?))")
+
+
+def name_grams(name: str) -> set[str]:
+    return {name[start:start + TEST_LOOKUP_GRAM] for start in range(len(name) - TEST_LOOKUP_GRAM + 1)}
+
+
+def match_rank(name: str, query: str) -> int:
+    """0 for an exact match, 1 for a prefix, 2 for a word prefix, 3 for any other substring."""
+    if name == query:
+        return 0
+    if name.startswith(query):
+        return 1
+    position = name.find(query)
+    while position > 0:
+        if not name[position - 1].isalnum():
+            return 2
+        position = name.find(query, position + 1)
+    return 3
+
+
+class TestLookupIndex:
+    """
+    Process-local search index over releases, groups and tests.
+
+    Entities are kept as TestLookup.index_mapper dicts, with a trigram index of
+    their lowercased names and maps of the entities of each type, release and
+    group for the facets. The index is rebuilt from scratch on first use and
+    every TEST_LOOKUP_REBUILD_INTERVAL seconds; in between, at most every
+    TEST_LOOKUP_REFRESH_INTERVAL seconds (and right after this process changed
+    an entity) the TestLookupChange log past the index version is read and only
+    the entities named there are reloaded. Searches only read memory.
+    """
+
+    def __init__(self, refresh_interval: float = TEST_LOOKUP_REFRESH_INTERVAL,
+                 rebuild_interval: float = TEST_LOOKUP_REBUILD_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._built_at: float | None = None
+        self._checked_at = 0.0
+        self._local_version = 0
+        self._since: datetime | None = None
+        self._applied: dict[UUID, datetime] = {}
+        self._reset({})
+
+    def _reset(self, entities: dict[UUID, dict]) -> None:
+        self._entities: dict[UUID, dict] = {}
+        self._names: dict[UUID, str] = {}
+        self._grams: dict[str, set[UUID]] = defaultdict(set)
+        self._by_type: dict[str, set[UUID]] = defaultdict(set)
+        self._by_release: dict[UUID, set[UUID]] = defaultdict(set)
+        self._by_group: dict[UUID, set[UUID]] = defaultdict(set)
+        for entity in entities.values():
+            self._add(entity)
+
+    def _add(self, entity: dict) -> None:
+        entity_id = entity["id"]
+        name = (entity["pretty_name"] or entity["name"] or "").lower()
+        self._entities[entity_id] = entity
+        self._names[entity_id] = name
+        for gram in name_grams(name):
+            self._grams[gram].add(entity_id)
+        self._by_type[entity["type"]].add(entity_id)
+        if release_id := entity.get("release_id"):
+            self._by_release[release_id].add(entity_id)
+        if group_id := entity.get("group_id"):
+            self._by_group[group_id].add(entity_id)
+
+    def _remove(self, entity_id: UUID) -> None:
+        entity = self._entities.pop(entity_id, None)
+        if not entity:
+            return
+        name = self._names.pop(entity_id)
+        for gram in name_grams(name):
+            self._grams[gram].discard(entity_id)
+            if not self._grams[gram]:
+                del self._grams[gram]
+        self._by_type[entity["type"]].discard(entity_id)
+        if release_id := entity.get("release_id"):
+            self._by_release[release_id].discard(entity_id)
+        if group_id := entity.get("group_id"):
+            self._by_group[group_id].discard(entity_id)
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    @staticmethod
+    def load_entities() -> dict[UUID, dict]:
+        entities = {}
+        for entity_type, model in LOOKUP_MODELS.items():
+            for document in model.find().all():
+                entities[document.id] = TestLookup.index_mapper(document, type=entity_type)
+        return entities
+
+    def load_changes(self, since: datetime, until: datetime) -> list[tuple[UUID, datetime, str, UUID]]:
+        """Changes logged after `since`, as (version, time, entity type, entity id), oldest first."""
+        cluster = ScyllaCluster.get()
+        statement = cluster.prepare(f"SELECT version, entity_type, entity_id FROM {TestLookupChange.table_name()} "
+                                    "WHERE day = ? AND version > ?")
+        lower = min_uuid_from_time(since.timestamp())
+        changes = []
+        day = since.date()
+        while day <= until.date():
+            for row in cluster.session.execute(statement, (day, lower)):
+                changed_at = datetime.fromtimestamp(unix_time_from_uuid1(row["version"]), tz=UTC)
+                changes.append((row["version"], changed_at, row["entity_type"], row["entity_id"]))
+            day += timedelta(days=1)
+        return changes
+
+    def refresh(self) -> None:
+        """Rebuild or catch up with the change log when due; searches of other threads keep the current contents."""
+        now = time.monotonic()
+        rebuild = self._built_at is None or now - self._built_at >= self.rebuild_interval
+        if not rebuild and now - self._checked_at < self.refresh_interval \
+                and self._local_version == local_lookup_version():
+            return
+        # Only the first build is waited for, a refresh in progress elsewhere is not
+        if not self._refresh_lock.acquire(blocking=self._built_at is None):
+            return
+        try:
+            if self._checked_at > now:
+                # Refreshed by another thread while this one waited for the first build
+                return
+            local_version = local_lookup_version()
+            started = datetime.now(UTC)
+            if not rebuild and started - self._since > timedelta(seconds=TEST_LOOKUP_CHANGE_TTL / 2):
+                rebuild = True
+            if rebuild:
+                entities = self.load_entities()
+                with self._lock:
+                    self._reset(entities)
+                self._built_at = time.monotonic()
+                self._applied = {}
+                since = started - timedelta(seconds=TEST_LOOKUP_CHANGE_OVERLAP)
+                LOGGER.info("Built the test lookup index of %s entities", len(entities))
+            else:
+                since = self._since
+                self.apply_changes(self.load_changes(since, started))
+            self._since = max(since, started - timedelta(seconds=TEST_LOOKUP_CHANGE_OVERLAP))
+            self._applied = {version: at for version, at in self._applied.items() if at > self._since}
+            self._checked_at = time.monotonic()
+            self._local_version = local_version
+        finally:
+            self._refresh_lock.release()
+
+    def apply_changes(self, changes: list[tuple[UUID, datetime, str, UUID]]) -> None:
+        changed = {}
+        for version, changed_at, entity_type, entity_id in changes:
+            if version in self._applied or entity_type not in LOOKUP_MODELS:
+                continue
+            self._applied[version] = changed_at
+            changed[entity_id] = entity_type
+        reloaded = {}
+        for entity_id, entity_type in changed.items():
+            try:
+                document = LOOKUP_MODELS[entity_type].get(id=entity_id)
+                reloaded[entity_id] = TestLookup.index_mapper(document, type=entity_type)
+            except DocumentNotFound:
+                reloaded[entity_id] = None
+        with self._lock:
+            for entity_id, entity in reloaded.items():
+                self._remove(entity_id)
+                if entity:
+                    self._add(entity)
+
+    def clear(self) -> None:
+        with self._refresh_lock, self._lock:
+            self._reset({})
+            self._built_at = None
+
+    def _candidates(self, text: str) -> set[UUID] | None:
+        """Entities whose name may contain `text`, None when every entity may."""
+        if len(text) < TEST_LOOKUP_GRAM:
+            return None
+        postings = sorted((self._grams.get(gram, set()) for gram in name_grams(text)), key=len)
+        return set(postings[0]).intersection(*postings[1:])
+
+    def _facet_candidates(self, facet: str, value: str) -> set[UUID]:
+        value = value.strip("\"").lower()
+        if facet == "type":
+            return set(self._by_type.get(value, ()))
+        owners = self._by_type["release" if facet == "release" else "group"]
+        by_owner = self._by_release if facet == "release" else self._by_group
+        return {entity_id for owner_id in owners if value in self._names[owner_id]
+                for entity_id in by_owner.get(owner_id, ())}
+
+    def _visible(self, entity: dict, release_id: UUID | None) -> bool:
+        if entity["type"] == "release" and release_id:
+            return False
+        if not entity["enabled"]:
+            return False
+        if (group := self._entities.get(entity.get("group_id"))) and not group["enabled"]:
+            return False
+        if (release := self._entities.get(entity.get("release_id"))) and not release["enabled"]:
+            return False
+        return True
+
+    def search(self, text: str, facets: list[tuple[str, str]], release_id: UUID | None = None,
+               limit: int | None = None) -> list[dict]:
+        """
+        Visible entities whose name contains `text`, narrowed by `facets` and `release_id`.
+
+        Every match is returned unless `limit` is given, the "Add all..." entry
+        of the search bars adds the whole result.
+
+        Exact matches rank first, then name prefixes, word prefixes and other
+        substrings; releases before groups before tests, then shorter names first.
+        """
+        self.refresh()
+        text = text.lower()
+        with self._lock:
+            candidates = self._candidates(text)
+            for facet, value in facets:
+                matching = self._facet_candidates(facet, value)
+                candidates = matching if candidates is None else candidates & matching
+            if release_id:
+                scoped = self._by_release.get(release_id, set())
+                candidates = scoped if candidates is None else candidates & scoped
+            if candidates is None:
+                candidates = self._entities.keys()
+
+            ranked = []
+            for entity_id in candidates:
+                name = self._names[entity_id]
+                if text and text not in name:
+                    continue
+                entity = self._entities[entity_id]
+                if not self._visible(entity, release_id):
+                    continue
+                ranked.append((match_rank(name, text) if text else 0, TYPE_RANK[entity["type"]], len(name), name,
+                               entity_id))
+            top = sorted(ranked) if limit is None else heapq.nsmallest(limit, ranked)
+            return [{
+                **self._entities[entity_id],
+                "group": self._entities.get(self._entities[entity_id].get("group_id")),
+                "release": self._entities.get(self._entities[entity_id].get("release_id")),
+            } for *_, entity_id in top]
+
+
+TEST_LOOKUP_INDEX = TestLookupIndex()
+
 
 class TestLookup:
     ADD_ALL_ID = UUID("db6f33b2-660b-4639-ba7f-79725ef96616")
@@ -41,12 +302,21 @@ class TestLookup:
         return exploded
 
     @classmethod
-    def find_run(self, run_id: UUID) -> PluginModelBase | None:
-        for model in all_plugin_models():
+    def find_run(cls, run_id: UUID) -> PluginModelBase | None:
+        models = {model._plugin_name: model for model in all_plugin_models()}
+        if (location := locate_run(run_id)) and (model := models.get(location.plugin_name)):
             try:
-                return model.get(id=run_id)
+                return model.get(build_id=location.build_id, start_time=location.start_time)
             except DocumentNotFound:
                 pass
+        # Runs submitted before the locator existed: probe each plugin's id index once, then index them
+        for model in models.values():
+            try:
+                run = model.get(id=run_id)
+            except DocumentNotFound:
+                continue
+            run.index_location()
+            return run
         return None
 
     @classmethod
@@ -99,76 +369,13 @@ class TestLookup:
         return []
 
     @classmethod
-    def test_lookup(cls, query: str, release_id: UUID | str = None):
+    def test_lookup(cls, query: str, release_id: UUID | str = None, limit: int | None = None):
         release_id = UUID(release_id) if isinstance(release_id, str) else release_id
         if uuid := cls.query_to_uuid(query):
             return cls.make_single_run_response(uuid)
 
-        def check_visibility(entity: dict):
-            if entity["type"] == "release" and release_id:
-                return False
-            if not entity["enabled"]:
-                return False
-            if entity.get("group") and not entity["group"]["enabled"]:
-                return False
-            if entity.get("release") and not entity["release"]["enabled"]:
-                return False
-            return True
-
-        def facet_extraction(query: str) -> str:
-            extractor = re.compile(r"(?:(?P<name>(?:release|group|type)):(?P<value>\"?[\w\d\.\-]*\"?))")
-            facets = re.findall(extractor, query)
-
-            return (re.sub(extractor, "", query).strip(), facets)
-
-        def type_facet_filter(item: dict, key: str, facet_query: str):
-            entity_type: str = item[key]
-            return facet_query.lower() == entity_type
-
-        def facet_filter(item: dict, key: str, facet_query: str):
-            if entity := item.get(key):
-                name: str = entity.get("pretty_name") or entity.get("name")
-                return facet_query.lower() in name.lower() if name else False
-            return False
+        facets = [(facet, value) for facet, value in FACET_EXTRACTOR.findall(query)]
+        text_query = unquote(FACET_EXTRACTOR.sub("", query).strip())
+        results = TEST_LOOKUP_INDEX.search(text_query, facets, release_id=release_id, limit=limit)
 
-        def facet_wrapper(query_func: Callable[[dict], bool], facet_query: str, facet_type: str) -> bool:
-            def inner(item: dict, query: str):
-                return query_func(item, query) and facet_funcs[facet_type](item, facet_type, facet_query)
-            return inner
-
-        facet_funcs = {
-            "type": type_facet_filter,
-            "release": facet_filter,
-            "group": facet_filter,
-        }
-
-        def index_searcher(item, query: str):
-            name: str = item["pretty_name"] or item["name"]
-            return unquote(query).lower() in name.lower() if query else True
-
-        text_query, facets = facet_extraction(query)
-        search_func = index_searcher
-        for facet, value in facets:
-            if facet in facet_funcs.keys():
-                search_func = facet_wrapper(query_func=search_func, facet_query=value, facet_type=facet)
-
-        if release_id:
-            all_releases = [ArgusRelease.get(id=release_id)]
-        else:
-            all_releases = ArgusRelease.find()
-        all_tests = ArgusTest.find()
-        all_groups = ArgusGroup.find()
-        if release_id:
-            all_tests = all_tests.filter(release_id=release_id)
-            all_groups = all_groups.filter(release_id=release_id)
-        release_by_id = {release.id: partial(cls.index_mapper, type="release")(release) for release in all_releases}
-        group_by_id = {group.id: partial(cls.index_mapper, type="group")(group) for group in all_groups}
-        index = [cls.index_mapper(t) for t in all_tests]
-        index = [*release_by_id.values(), *group_by_id.values(), *index]
-        for item in index:
-            item["group"] = group_by_id.get(item.get("group_id"))
-            item["release"] = release_by_id.get(item.get("release_id"))
-
-        results = filter(partial(search_func, query=text_query), index)
-
-        return [{"id": cls.ADD_ALL_ID, "name": "Add all...", "type": "special"}, *list(res for res in results if check_visibility(res))]
+        return [{"id": cls.ADD_ALL_ID, "name": "Add all...", "type": "special"}, *results]
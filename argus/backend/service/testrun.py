@@ -1,10 +1,12 @@
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from datetime import datetime, timedelta, UTC
 from functools import reduce
 import json
 import logging
+import math
 import re
 from sys import prefix
+import threading
 import time
 from typing import Any
 from uuid import UUID
@@ -14,6 +16,7 @@ import magic
 import requests
 from flask import current_app, g
 from botocore.exceptions import ClientError
+from cassandra.concurrent import execute_concurrent_with_args
 from cassandra.util import uuid_from_time
 from cassandra.query import BatchStatement, ConsistencyLevel
 from coodie.sync import BatchQuery
@@ -31,10 +34,9 @@ from argus.backend.models.web import (
     ArgusTest,
     ArgusTestRunComment,
     User,
-    invalidate_release_snapshots,
 )
 
-from argus.backend.plugins.core import PluginInfoBase, PluginModelBase
+from argus.backend.plugins.core import PluginInfoBase, PluginModelBase, locate_run
 
 from argus.backend.plugins.loader import AVAILABLE_PLUGINS
 from argus.backend.events.event_processors import EVENT_PROCESSORS
@@ -42,12 +44,63 @@ from argus.backend.plugins.sct.testrun import SCTTestRun
 from argus.backend.plugins.sirenada.model import SirenadaRun
 from argus.backend.service.event_service import EventService
 from argus.backend.service.notification_manager import NotificationManagerService
-from argus.backend.service.stats import ComparableTestStatus
+from argus.backend.service.stats import ComparableTestStatus, invalidate_test_stats
+from argus.backend.service.test_lookup import TestLookup
 from argus.backend.util.common import chunk, get_build_number, strip_html_tags
 from argus.common.enums import PytestStatus, TestInvestigationStatus, TestStatus
 
 LOGGER = logging.getLogger(__name__)
 
+# Duration stats are read by every shard of a sliced CI job right after collection,
+# so repeated lookups of the same tests within a short window are served from memory.
+PYTEST_STATS_CACHE_SIZE = 65536
+PYTEST_STATS_CACHE_TTL = 60
+PYTEST_STATS_READ_CONCURRENCY = 32
+
+
+class PytestStatsCache:
+    """Bounded TTL cache of pytest duration stats keyed by test name and query filters."""
+
+    def __init__(self, max_size: int = PYTEST_STATS_CACHE_SIZE, ttl: float = PYTEST_STATS_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry or time.monotonic() - entry[0] >= self.ttl:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: tuple, stats: dict) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), stats)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+PYTEST_STATS_CACHE = PytestStatsCache()
+
+
+def duration_stats(durations: list[float]) -> dict[str, float | int | None]:
+    """avg, nearest-rank 95th percentile and count of test durations."""
+    if not durations:
+        return {"avg": None, "p95": None, "count": 0}
+    durations = sorted(durations)
+    return {
+        "avg": sum(durations) / len(durations),
+        "p95": durations[math.ceil(0.95 * len(durations)) - 1],
+        "count": len(durations),
+    }
+
 
 class TestRunServiceException(Exception):
     pass
@@ -74,7 +127,7 @@ class TestRunService:
         plugin = self.plugins.get(run_type)
         if plugin:
             try:
-                return plugin.model.get(id=run_id)
+                return plugin.model.get_by_id(run_id)
             except DocumentNotFound:
                 return None
 
@@ -99,13 +152,10 @@ class TestRunService:
 
     def get_test_type_for_run(self, run_id: str) -> str:
         run_id = UUID(run_id) if isinstance(run_id, str) else run_id
-        for name, plugin in AVAILABLE_PLUGINS.items():
-            try:
-                run = plugin.model.get(id=run_id)
-                if run:
-                    return name
-            except DocumentNotFound:
-                continue
+        if location := locate_run(run_id):
+            return location.plugin_name
+        if run := TestLookup.find_run(run_id):
+            return run._plugin_name
         return "unknown-does-not-exist"
 
     def get_run_response(self, run_type: str, run_id: UUID) -> dict | None:
@@ -188,7 +238,7 @@ class TestRunService:
             test_id=test.id
         )
 
-        invalidate_release_snapshots(test.release_id)
+        invalidate_test_stats(test.release_id, test.id)
         return {
             "test_run_id": run.id,
             "status": new_status
@@ -291,7 +341,9 @@ class TestRunService:
             test_id=test.id
         )
 
-        invalidate_release_snapshots(test.release_id)
+        invalidate_test_stats(test.release_id, test.id)
+        from argus.backend.service.results_service import refresh_graph_snapshots  # results_service imports this module
+        refresh_graph_snapshots(test.id)
         return {
             "test_run_id": run.id,
             "investigation_status": new_status
@@ -352,7 +404,7 @@ class TestRunService:
                     "build_number": run.build_number,
                 }
             )
-        invalidate_release_snapshots(test.release_id)
+        invalidate_test_stats(test.release_id, test.id)
         return {
             "test_run_id": run.id,
             "assignee": str(new_assignee_user.id) if new_assignee_user else None
@@ -414,7 +466,7 @@ class TestRunService:
             "username": g.user.username
         }, user_id=g.user.id, run_id=run_id, release_id=release.id, test_id=test.id)
 
-        invalidate_release_snapshots(release.id)
+        invalidate_test_stats(test.release_id, test.id)
         return self.get_run_comments(run_id=run_id)
 
     def delete_run_comment(self, comment_id: UUID, test_id: UUID, run_id: UUID):
@@ -428,7 +480,7 @@ class TestRunService:
             "username": g.user.username
         }, user_id=g.user.id, run_id=run_id, release_id=comment.release_id, test_id=test_id)
 
-        invalidate_release_snapshots(comment.release_id)
+        invalidate_test_stats(comment.release_id, test_id)
         return self.get_run_comments(run_id=run_id)
 
     def update_run_comment(self, comment_id: UUID, test_id: UUID, run_id: UUID, message: str, mentions: list[str], reactions: dict):
@@ -445,7 +497,7 @@ class TestRunService:
             "username": g.user.username
         }, user_id=g.user.id, run_id=run_id, release_id=comment.release_id, test_id=test_id)
 
-        invalidate_release_snapshots(comment.release_id)
+        invalidate_test_stats(comment.release_id, test_id)
         return self.get_run_comments(run_id=run_id)
 
     def get_run_events(self, run_id: UUID):
@@ -559,7 +611,9 @@ class TestRunService:
 
         cluster.session.execute(batch)
         event_batch.execute()
-        invalidate_release_snapshots(test.release_id)
+        invalidate_test_stats(test.release_id, test.id)
+        from argus.backend.service.results_service import refresh_graph_snapshots  # results_service imports this module
+        refresh_graph_snapshots(test.id)
         return jobs_affected
 
     def get_pytest_test_results(self, test_name: str, before: float = None, after: float = None) -> list[PytestResultTable]:
@@ -620,6 +674,59 @@ class TestRunService:
             }
         }
 
+    def get_pytest_duration_stats(self, test_names: list[str], query: dict) -> dict[str, dict]:
+        """
+        Duration avg, p95 and count of many pytest tests at once.
+
+        Accepts the same status and since filters as get_pytest_test_field_stats.
+        Every test is a partition of pytest_v2, so the partitions are read
+        concurrently and the stats computed here; results are cached for
+        PYTEST_STATS_CACHE_TTL seconds.
+        """
+        db = ScyllaCluster.get()
+        raw_query = "SELECT duration FROM pytest_v2 WHERE name = ?"
+        query_values = []
+        status = query.get("status")
+        period = query.get("since")
+        if status:
+            raw_query += " AND status = ?"
+            query_values.append(status)
+
+        if not status and period:
+            raw_query += " AND status IN ?"
+            query_values.append([s.value for s in PytestStatus])
+
+        if period:
+            try:
+                since = datetime.fromtimestamp(int(period))
+            except ValueError:
+                raise TestRunServiceException("Malformed timestamp value")
+            raw_query += " AND id >= ?"
+            query_values.append(since)
+
+        stats = {}
+        missing = []
+        for test_name in dict.fromkeys(test_names):
+            cached = PYTEST_STATS_CACHE.get((test_name, status, period))
+            if cached is None:
+                missing.append(test_name)
+            else:
+                stats[test_name] = cached
+
+        statement = db.prepare(raw_query)
+        results = execute_concurrent_with_args(db.session, statement,
+                                               [(test_name, *query_values) for test_name in missing],
+                                               concurrency=PYTEST_STATS_READ_CONCURRENCY, raise_on_first_error=False)
+        for test_name, (success, rows) in zip(missing, results):
+            if not success:
+                LOGGER.warning("Failed to read durations of %s: %s", test_name, rows)
+                stats[test_name] = duration_stats([])
+                continue
+            stats[test_name] = duration_stats([row["duration"] for row in rows if row["duration"] is not None])
+            PYTEST_STATS_CACHE.put((test_name, status, period), stats[test_name])
+
+        return stats
+
     def get_pytest_release_results(self, release_id: str | UUID) -> list[PytestResultTable]:
         """
             Unbound filter function, will return all tests for a specific release
@@ -16,7 +16,7 @@ from coodie.exceptions import DocumentNotFound
 
 from argus.backend.models.ssh_key import ProxyTunnelConfig, SSHTunnelKey
 from argus.backend.models.web import User, UserRoles
-from argus.backend.service.user import UserService
+from argus.backend.service.user import UserService, invalidate_user_token_cache
 
 LOGGER = logging.getLogger(__name__)
 
@@ -533,6 +533,7 @@ class TunnelService:
                             if role != UserRoles.SSHTunnelServer.value
                         ]
                     service_user.save()
+                invalidate_user_token_cache(service_user.id)
 
         config.delete()
 
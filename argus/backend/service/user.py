@@ -6,8 +6,11 @@ import os
 import base64
 import logging
 import re
+import threading
+from collections import OrderedDict
+from typing import Callable
 from uuid import UUID
-from time import time
+from time import monotonic, time
 from hashlib import sha384
 
 from coodie.exceptions import DocumentNotFound
@@ -15,6 +18,7 @@ from flask import current_app, flash, g, redirect, request, session, url_for
 import magic
 import requests
 import jwt
+from prometheus_client import Counter
 from werkzeug.security import generate_password_hash, check_password_hash
 
 from argus.backend.db import ScyllaCluster
@@ -26,6 +30,81 @@ LOGGER = logging.getLogger(__name__)
 
 SSH_TUNNEL_SERVER_ALLOWED_ENDPOINTS_KEY = "ssh_tunnel_server_allowed_endpoints"
 
+API_TOKEN_CACHE_SIZE = 4096
+API_TOKEN_CACHE_TTL = 60
+
+API_TOKEN_CACHE_LOOKUPS = Counter("argus_api_token_cache_lookups", "API token authentications by cache result",
+                                  ["result"])
+
+
+class ApiTokenCache:
+    """
+    Bounded TTL cache of the users owning API tokens, keyed by the token's sha256.
+
+    Invalidation only reaches the cache of the process that made the change,
+    other processes keep serving the previous user (or a replaced token) for
+    at most the TTL.
+    """
+
+    def __init__(self, max_size: int = API_TOKEN_CACHE_SIZE, ttl: float = API_TOKEN_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, User]] = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def token_key(token: str) -> str:
+        return hashlib.sha256(token.encode(encoding="utf-8")).hexdigest()
+
+    def get(self, token: str, loader: Callable[[str], User]) -> User:
+        """The user owning `token`, a copy per call as callers may modify it; loader errors are not cached."""
+        key = self.token_key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                API_TOKEN_CACHE_LOOKUPS.labels(result="hit").inc()
+                return entry[1].model_copy(deep=True)
+            self.misses += 1
+            API_TOKEN_CACHE_LOOKUPS.labels(result="miss").inc()
+            generation = self._generation
+
+        user = loader(token)
+        with self._lock:
+            # Skip storing a user that an invalidation raced with, it may predate the change
+            if self._generation == generation:
+                self._entries[key] = (monotonic(), user.model_copy(deep=True))
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return user
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        with self._lock:
+            for key in [key for key, (_, user) in self._entries.items() if user.id == user_id]:
+                del self._entries[key]
+            self._generation += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+
+API_TOKEN_CACHE = ApiTokenCache()
+
+
+def invalidate_user_token_cache(user_id: UUID) -> None:
+    """Drop the cached user of an API token after the user's token, roles or profile changed or it was deleted."""
+    API_TOKEN_CACHE.invalidate_user(user_id)
+
 class UserServiceException(Exception):
     pass
 
@@ -232,6 +311,7 @@ class UserService:
                                               ).digest()).decode(encoding="utf-8").strip()
         user.api_token = new_token
         user.save()
+        invalidate_user_token_cache(user.id)
         return new_token
 
     def get_or_generate_token(self, user: User) -> str:
@@ -246,6 +326,7 @@ class UserService:
             raise UserServiceException("Invalid email.")
         user.email = new_email
         user.save()
+        invalidate_user_token_cache(user.id)
 
         return True
 
@@ -263,6 +344,7 @@ class UserService:
             user.set_as_admin()
 
         user.save()
+        invalidate_user_token_cache(user.id)
         return True
 
 
@@ -344,6 +426,7 @@ class UserService:
             raise UserServiceException("Cannot delete admin users. Unset admin flag before deleting")
 
         user.delete()
+        invalidate_user_token_cache(user.id)
 
         return True
 
@@ -359,6 +442,7 @@ class UserService:
 
         user.password = generate_password_hash(new_password)
         user.save()
+        invalidate_user_token_cache(user.id)
 
         return True
 
@@ -369,10 +453,12 @@ class UserService:
             raise UserServiceException("Cannot use '@' in the username")
         user.username = new_username
         user.save()
+        invalidate_user_token_cache(user.id)
 
     def update_name(self, user: User, new_name: str):
         user.full_name = new_name
         user.save()
+        invalidate_user_token_cache(user.id)
 
     def save_profile_picture_to_disk(self, original_filename: str, filedata: bytes, suffix: str):
         filename_fragment = hashlib.sha256(os.urandom(64)).hexdigest()[:10]
@@ -463,7 +549,7 @@ def load_logged_in_user():
             auth_schema, *auth_data = auth_header.split()
             if auth_schema == "token":
                 token = auth_data[0]
-                g.user = User.get(api_token=token)
+                g.user = API_TOKEN_CACHE.get(token, lambda token: User.get(api_token=token))
                 return
         except IndexError as exception:
             raise APIException("Malformed authorization header") from exception
@@ -11,9 +11,13 @@ from time import sleep, time
 
 from humanize import naturaltime
 from flask import request
+from cassandra.concurrent import execute_concurrent_with_args
+from cassandra.query import PreparedStatement
 from cassandra.util import uuid_from_time, unix_time_from_uuid1
+from coodie.exceptions import DocumentNotFound
 from argus.backend.db import ScyllaCluster
-from argus.backend.models.pytest import PytestResultTable, PytestUserField
+from argus.backend.models.pytest import PytestCountedResult, PytestDailyStatusCount, PytestResultByDay, \
+    PytestResultTable, PytestTestName, PytestUserField
 from argus.backend.models.web import ArgusTest, ArgusUserView
 from argus.backend.plugins.generic.plugin import PluginInfo as GenericPluginInfo
 from argus.backend.util.common import chunk
@@ -21,6 +25,111 @@ from argus.common.enums import PytestStatus
 
 LOGGER = logging.getLogger(__name__)
 
+# Search windows without a lower bound are cut to this many days before the upper one
+PYTEST_SEARCH_DEFAULT_DAYS = 30
+# Day partitions are read in steps of this many days, newest first
+PYTEST_SEARCH_DAY_STEP = 7
+PYTEST_SEARCH_READ_CONCURRENCY = 32
+PYTEST_ROLLUP_CONCURRENCY = 32
+# Reports of one result racing with other statuses give up moving its count after this many attempts
+PYTEST_ROLLUP_MOVE_ATTEMPTS = 5
+PYTEST_SEARCH_COLUMNS = ("test_id", "id", "name", "run_id", "message", "session_timestamp", "status", "markers",
+                         "duration", "test_type", "user_fields")
+
+
+def search_index_statements(result: PytestResultTable,
+                            fields: list[PytestUserField]) -> list[tuple[PreparedStatement, tuple]]:
+    """Statements adding a submitted result to the search tables, none for results of unknown runs."""
+    if not result.test_id:
+        return []
+    cluster = ScyllaCluster.get()
+    name_statement = cluster.prepare(f"INSERT INTO {PytestTestName.table_name()} (test_id, name) VALUES (?, ?)")
+    result_statement = cluster.prepare(
+        f"INSERT INTO {PytestResultByDay.table_name()} (test_id, day, id, name, status, test_type, run_id, release_id, "
+        "duration, message, session_timestamp, markers, user_fields) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+    return [
+        (name_statement, (result.test_id, result.name)),
+        (result_statement, (result.test_id, result_day(result), result.id, result.name, result.status,
+                            result.test_type, result.run_id, result.release_id, result.duration, result.message,
+                            result.session_timestamp, result.markers, {f.field_name: f.field_value for f in fields})),
+    ]
+
+
+def count_statuses(results: list[PytestResultTable]) -> dict[int, Exception]:
+    """
+    Count submitted results in the daily status rollup, returns the errors by index of the result.
+
+    A result is claimed in pytest_counted_result (by test, day, id and name, the
+    key of its pytest_result_by_day row) before its counter is touched: one
+    submitted again is not counted again, one reported again with another status
+    moves its count to the new status. Results of unknown runs are not counted.
+    A claimed result whose counter updates failed is not counted again.
+    """
+    cluster = ScyllaCluster.get()
+    claim_statement = cluster.prepare(
+        f"INSERT INTO {PytestCountedResult.table_name()} (test_id, day, id, name, status) VALUES (?, ?, ?, ?, ?) "
+        "IF NOT EXISTS")
+    move_statement = cluster.prepare(
+        f"UPDATE {PytestCountedResult.table_name()} SET status = ? WHERE test_id = ? AND day = ? AND id = ? "
+        "AND name = ? IF status = ?")
+    count_statement = cluster.prepare(
+        f"UPDATE {PytestDailyStatusCount.table_name()} SET count = count + ? "
+        "WHERE test_id = ? AND day = ? AND name = ? AND status = ?")
+
+    counted = [(index, result) for index, result in enumerate(results) if result.test_id]
+    keys = [(result.test_id, result_day(result), result.id, result.name) for _, result in counted]
+    claims = execute_concurrent_with_args(cluster.session, claim_statement,
+                                          [(*key, result.status) for key, (_, result) in zip(keys, counted)],
+                                          concurrency=PYTEST_ROLLUP_CONCURRENCY, raise_on_first_error=False)
+    errors, increments, owners = {}, [], []
+    for key, (index, result), (success, outcome) in zip(keys, counted, claims):
+        if not success:
+            errors[index] = outcome
+            continue
+        row = outcome.one()
+        if row["[applied]"]:
+            increments.append((1, key[0], key[1], result.name, result.status))
+            owners.append(index)
+            continue
+        previous = row["status"]
+        try:
+            for _ in range(PYTEST_ROLLUP_MOVE_ATTEMPTS):
+                if previous == result.status:
+                    break
+                moved = cluster.session.execute(move_statement, (result.status, *key, previous)).one()
+                if moved["[applied]"]:
+                    increments.append((-1, key[0], key[1], result.name, previous))
+                    increments.append((1, key[0], key[1], result.name, result.status))
+                    owners.extend([index, index])
+                    break
+                previous = moved["status"]
+            else:
+                raise ValueError(f"Status of {result.name} changed concurrently, not moved to {result.status}")
+        except Exception as exc:  # pylint: disable=broad-except
+            errors[index] = exc
+
+    for index, (success, outcome) in zip(owners, execute_concurrent_with_args(
+            cluster.session, count_statement, increments, concurrency=PYTEST_ROLLUP_CONCURRENCY,
+            raise_on_first_error=False)):
+        if not success:
+            errors.setdefault(index, outcome)
+    return errors
+
+
+def result_day(result: PytestResultTable) -> date:
+    # Ids read back from pytest_v2 are naive UTC datetimes, submitted ones are aware
+    return (result.id.astimezone(UTC) if result.id.tzinfo else result.id).date()
+
+
+def encode_cursor(hit: dict) -> str:
+    """Position after `hit` in the search order, the driver returns result ids as naive UTC datetimes."""
+    return f"{round(hit['id'].replace(tzinfo=UTC).timestamp() * 1_000_000)}:{hit['name']}"
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    micros, name = cursor.split(":", 1)
+    return datetime.fromtimestamp(int(micros) / 1_000_000, tz=UTC).replace(tzinfo=None), name
+
 
 class PytestResult(TypedDict):
     hits: list[PytestResultTable]
@@ -59,11 +168,31 @@ class PytestViewService:
             return not res
         return res
 
+    @staticmethod
+    def view_test_ids(view_id: str | UUID) -> list[UUID]:
+        view_id = UUID(view_id) if isinstance(view_id, str) else view_id
+        try:
+            return ArgusUserView.get(id=view_id).tests
+        except DocumentNotFound:
+            LOGGER.warning("View %s does not exist - no pytest results to show", view_id)
+            return []
+
+    @staticmethod
+    def release_test_ids(release_id: str | UUID) -> list[UUID]:
+        release_id = UUID(release_id) if isinstance(release_id, str) else release_id
+        return [test.id for test in ArgusTest.find(release_id=release_id).only("id").all()]
+
     def view_results(self, view_id: str | UUID):
-        return self.result_filter()
+        return self.search_results(self.view_test_ids(view_id))
 
     def release_results(self, release_id: str | UUID):
-        return self.result_filter()
+        return self.search_results(self.release_test_ids(release_id))
+
+    def view_charts(self, view_id: str | UUID):
+        return self.status_charts(self.view_test_ids(view_id))
+
+    def release_charts(self, release_id: str | UUID):
+        return self.status_charts(self.release_test_ids(release_id))
 
     def prepare_pie_chart(self, hits: list[dict]) -> dict:
         def count_status(acc: dict, result: dict):
@@ -111,6 +240,177 @@ class PytestViewService:
             "datasets": datasets,
         }
 
+    def matching_test_ids(self, test_ids: list[UUID], test: str | None) -> list[UUID]:
+        """
+        Tests of `test_ids` that reported a pytest test whose name contains `test`, or any pytest test without `test`.
+
+        Read from the name index, so that tests without pytest results (most of a release) cost
+        one read here instead of one read per day of the window.
+        """
+        if test:
+            statement = self.cluster.prepare(f"SELECT name FROM {PytestTestName.table_name()} WHERE test_id = ?")
+        else:
+            statement = self.cluster.prepare(f"SELECT name FROM {PytestTestName.table_name()} WHERE test_id = ? LIMIT 1")
+        results = execute_concurrent_with_args(self.cluster.session, statement, [(test_id,) for test_id in test_ids],
+                                               concurrency=PYTEST_SEARCH_READ_CONCURRENCY)
+        pattern = re.compile(re.escape(test or ""))
+        return [test_id for test_id, (_, rows) in zip(test_ids, results)
+                if any(pattern.search(row["name"]) for row in rows)]
+
+    def scan_days(self, test_ids: list[UUID], after: datetime, before: datetime):
+        """Yield the rows of the day partitions in [after, before] of the given tests, a step of days at a time, newest first."""
+        statement = self.cluster.prepare(
+            f"SELECT {', '.join(PYTEST_SEARCH_COLUMNS)} FROM {PytestResultByDay.table_name()} "
+            "WHERE test_id = ? AND day = ? AND id >= ? AND id <= ?")
+        days = [before.date() - timedelta(days=offset) for offset in range((before.date() - after.date()).days + 1)]
+        for step in chunk(days, PYTEST_SEARCH_DAY_STEP):
+            results = execute_concurrent_with_args(
+                self.cluster.session, statement,
+                [(test_id, day, after, before) for day in step for test_id in test_ids],
+                concurrency=PYTEST_SEARCH_READ_CONCURRENCY)
+            rows = [row for _, day_rows in results for row in day_rows]
+            rows.sort(key=lambda row: (row["id"], row["name"]), reverse=True)
+            yield rows
+
+    @staticmethod
+    def search_window() -> tuple[datetime | None, datetime | None, datetime, datetime]:
+        """before and after query arguments, and the window they bound (PYTEST_SEARCH_DEFAULT_DAYS without after)."""
+        before = request.args.get("before")
+        after = request.args.get("after")
+        before = datetime.fromtimestamp(int(before), tz=UTC) if before else None
+        after = datetime.fromtimestamp(int(after), tz=UTC) if after else None
+        upper = before or datetime.now(tz=UTC)
+        lower = after or upper - timedelta(days=PYTEST_SEARCH_DEFAULT_DAYS)
+        return before, after, lower, upper
+
+    def status_counts(self, test_ids: list[UUID], first_day: date, last_day: date, test: str | None,
+                      statuses: set[str]) -> dict[date, dict[str, int]]:
+        """
+        Results per day and status of the given tests from the daily rollup, days without results are left out.
+
+        `test_ids` are expected to be narrowed down with matching_test_ids already, `test` only filters the rows.
+        """
+        statement = self.cluster.prepare(
+            f"SELECT name, status, count FROM {PytestDailyStatusCount.table_name()} WHERE test_id = ? AND day = ?")
+        days = [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+        parameters = [(test_id, day) for day in days for test_id in test_ids]
+        results = execute_concurrent_with_args(self.cluster.session, statement, parameters,
+                                               concurrency=PYTEST_SEARCH_READ_CONCURRENCY)
+        counts = defaultdict(lambda: defaultdict(lambda: 0))
+        for (_, day), (_, rows) in zip(parameters, results):
+            for row in rows:
+                if statuses and row["status"] not in statuses:
+                    continue
+                if test and test not in row["name"]:
+                    continue
+                counts[day][row["status"]] += row["count"]
+        return counts
+
+    @staticmethod
+    def counts_bar_chart(counts: dict[date, dict[str, int]], first_day: date, last_day: date) -> dict:
+        labels = [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+        return {
+            "labels": [day.strftime("%Y-%m-%d") for day in labels],
+            "datasets": [{
+                "label": status.value,
+                "data": [counts.get(day, {}).get(status.value, 0) for day in labels],
+            } for status in PytestStatus],
+        }
+
+    @staticmethod
+    def counts_pie_chart(counts: dict[date, dict[str, int]]) -> dict:
+        pie = defaultdict(lambda: 0)
+        for day_counts in counts.values():
+            for status, count in day_counts.items():
+                pie[status] += count
+        return pie
+
+    def status_charts(self, test_ids: list[UUID]) -> dict:
+        """
+        Total, bar and pie charts of the pytest results of the given Argus tests.
+
+        Read from the daily status rollup, so the cost grows with the days of the
+        window and not with the number of results; takes the test, status[],
+        before and after arguments of search_results, at the granularity of days.
+        """
+        _, _, lower, upper = self.search_window()
+        test = request.args.get("test")
+        counts = self.status_counts(self.matching_test_ids(test_ids, test), lower.date(), upper.date(), test,
+                                    set(request.args.getlist("status[]")))
+        pie_chart = self.counts_pie_chart(counts)
+        return {
+            "total": sum(pie_chart.values()),
+            "barChart": self.counts_bar_chart(counts, lower.date(), upper.date()),
+            "pieChart": pie_chart,
+        }
+
+    def search_results(self, test_ids: list[UUID]) -> PytestResult:
+        """
+        Pytest results of the given Argus tests, newest first.
+
+        Takes the same query arguments as result_filter plus `cursor`. The tests are
+        narrowed by name through the name index and only the day partitions of the
+        date window are read. The first page also carries the total and the charts
+        of every match in the window: from the daily status rollup when only the
+        test and status filters are set, from the matched results otherwise. Pages
+        after it (requested with the `cursor` of the previous page) and first pages
+        with rollup charts stop reading as soon as they are full.
+        """
+        test = request.args.get("test")
+        limit = int(request.args.get("limit", 500))
+        enabled_statuses = set(request.args.getlist("status[]"))
+        query = request.args.get("query")
+        filters = [(f[0] == "!", *f.lstrip("!").split("=", 1)) for f in request.args.getlist("filters[]")]
+        markers = request.args.getlist("markers[]")
+        cursor = request.args.get("cursor")
+
+        before, after, lower, upper = self.search_window()
+        rollup_charts = not (cursor or markers or query or filters)
+        cursor_id, cursor_name = decode_cursor(cursor) if cursor else (None, None)
+        if cursor_id:
+            upper = min(upper, cursor_id.replace(tzinfo=UTC))
+        test_pattern = re.compile(re.escape(test)) if test else None
+        query_pattern = re.compile(query.lower()) if query else None
+
+        def matches(row: dict) -> bool:
+            if cursor_id and (row["id"], row["name"]) >= (cursor_id, cursor_name):
+                return False
+            if enabled_statuses and row["status"] not in enabled_statuses:
+                return False
+            if test_pattern and not test_pattern.search(row["name"]):
+                return False
+            if any(marker not in (row["markers"] or []) for marker in markers):
+                return False
+            if query_pattern and not query_pattern.search(
+                    f"{row['name']} {row['message'] or ''} {' '.join(row['markers'] or [])}".lower()):
+                return False
+            return all(self.do_user_field_filter(field, value, negated, row) for negated, field, value in filters)
+
+        matching_test_ids = self.matching_test_ids(test_ids, test)
+        hits = []
+        has_more = False
+        for rows in self.scan_days(matching_test_ids, lower, upper):
+            hits.extend(row for row in rows if matches(row))
+            if (cursor or rollup_charts) and len(hits) > limit:
+                break
+        if len(hits) > limit:
+            has_more = True
+
+        response = {
+            "hits": hits[:limit],
+            "cursor": encode_cursor(hits[limit - 1]) if has_more and limit > 0 else None,
+        }
+        if rollup_charts:
+            counts = self.status_counts(matching_test_ids, lower.date(), upper.date(), test, enabled_statuses)
+            response["pieChart"] = self.counts_pie_chart(counts)
+            response["total"] = sum(response["pieChart"].values())
+            response["barChart"] = self.counts_bar_chart(counts, lower.date(), upper.date())
+        elif not cursor:
+            response["total"] = len(hits)
+            response["barChart"] = self.prepare_bar_chart(hits, before, after or lower)
+            response["pieChart"] = self.prepare_pie_chart(hits)
+        return response
+
     def result_filter(self) -> PytestResult:
         db = ScyllaCluster.get()
         test = request.args.get("test")
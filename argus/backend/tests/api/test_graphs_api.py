@@ -142,3 +142,18 @@ def test_test_results_head_returns_404_when_no_results(flask_client, fake_test):
         f"{API_PREFIX}/test-results", query_string={"testId": str(fake_test.id)}
     )
     assert resp.status_code == 404
+
+
+def test_test_results_answers_not_modified_for_matching_etag(flask_client, fake_test):
+    first = flask_client.get(
+        f"{API_PREFIX}/test-results", query_string={"testId": str(fake_test.id)}
+    )
+    assert first.status_code == 200, first.data
+    assert first.headers.get("ETag")
+
+    second = flask_client.get(
+        f"{API_PREFIX}/test-results", query_string={"testId": str(fake_test.id)},
+        headers={"If-None-Match": first.headers["ETag"]},
+    )
+    assert second.status_code == 304
+    assert second.headers["ETag"] == first.headers["ETag"]
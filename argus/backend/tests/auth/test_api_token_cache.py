@@ -0,0 +1,111 @@
+from unittest.mock import Mock, patch
+from uuid import uuid4
+
+import pytest
+from coodie.exceptions import DocumentNotFound
+
+from argus.backend.models.web import User
+from argus.backend.service.user import ApiTokenCache
+
+
+class _FakeUserStore:
+    """Stands in for User.get(api_token=...), counting lookups."""
+
+    def __init__(self, *users: User):
+        self.users = {user.api_token: user for user in users}
+        self.lookups = Mock(side_effect=self._get)
+
+    def _get(self, token: str) -> User:
+        try:
+            return self.users[token]
+        except KeyError:
+            raise DocumentNotFound(token)
+
+
+def _user(token: str) -> User:
+    return User(id=uuid4(), username=f"user_{token}", api_token=token, roles=["ROLE_USER"])
+
+
+def test_token_is_looked_up_once_while_fresh():
+    cache = ApiTokenCache(ttl=60)
+    store = _FakeUserStore(_user("a"))
+
+    first = cache.get("a", store.lookups)
+    second = cache.get("a", store.lookups)
+
+    assert first.id == second.id
+    store.lookups.assert_called_once_with("a")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cached_user_is_copied_per_request():
+    cache = ApiTokenCache(ttl=60)
+    store = _FakeUserStore(_user("a"))
+    cache.get("a", store.lookups).roles.append("ROLE_ADMIN")
+
+    assert cache.get("a", store.lookups).roles == ["ROLE_USER"]
+
+
+def test_expired_token_is_looked_up_again():
+    cache = ApiTokenCache(ttl=60)
+    store = _FakeUserStore(_user("a"))
+    with patch("argus.backend.service.user.monotonic", return_value=1000.0):
+        cache.get("a", store.lookups)
+    with patch("argus.backend.service.user.monotonic", return_value=1061.0):
+        cache.get("a", store.lookups)
+
+    assert store.lookups.call_count == 2
+
+
+def test_unknown_token_is_not_cached():
+    cache = ApiTokenCache(ttl=60)
+    store = _FakeUserStore()
+
+    for _ in range(2):
+        with pytest.raises(DocumentNotFound):
+            cache.get("missing", store.lookups)
+
+    assert store.lookups.call_count == 2
+    assert len(cache) == 0
+
+
+def test_invalidate_user_drops_its_tokens_only():
+    cache = ApiTokenCache(ttl=60)
+    first, second = _user("a"), _user("b")
+    store = _FakeUserStore(first, second)
+    cache.get("a", store.lookups)
+    cache.get("b", store.lookups)
+
+    cache.invalidate_user(first.id)
+    # A regenerated token replaces the old one in the store
+    del store.users["a"]
+    with pytest.raises(DocumentNotFound):
+        cache.get("a", store.lookups)
+    cache.get("b", store.lookups)
+
+    assert [call.args[0] for call in store.lookups.call_args_list] == ["a", "b", "a"]
+
+
+def test_cache_evicts_least_recently_used_token():
+    cache = ApiTokenCache(max_size=2, ttl=60)
+    store = _FakeUserStore(_user("a"), _user("b"), _user("c"))
+    for token in ("a", "b", "a", "c"):
+        cache.get(token, store.lookups)
+
+    cache.get("a", store.lookups)
+    cache.get("b", store.lookups)
+
+    assert [call.args[0] for call in store.lookups.call_args_list] == ["a", "b", "c", "b"]
+
+
+def test_lookup_racing_with_invalidation_is_not_stored():
+    cache = ApiTokenCache(ttl=60)
+    user = _user("a")
+
+    def lookup(token):
+        cache.invalidate_user(user.id)
+        return user
+
+    cache.get("a", lookup)
+
+    assert len(cache) == 0
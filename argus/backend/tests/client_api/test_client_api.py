@@ -12,7 +12,9 @@ Covers endpoints not already exercised through other test modules:
 - POST /api/v1/client/testrun/<run_type>/<run_id>/logs/submit                (run_submit_logs)
 - POST /api/v1/client/testrun/<run_type>/<run_id>/finalize                   (run_finalize)
 - POST /api/v1/client/testrun/pytest/result/submit                           (submit_pytest_result)
+- POST /api/v1/client/testrun/pytest/result/submit_batch                     (submit_pytest_results)
 - GET  /api/v1/client/testrun/pytest/<test_name>/stats/<field>/<aggr>        (get_pytest_test_field_stats)
+- POST /api/v1/client/testrun/pytest/stats/duration                          (get_pytest_duration_stats)
 - POST /api/v1/client/testrun/report                                         (render_email_report)
 
 The send_email path (/testrun/report/email) and config endpoints are exercised in
@@ -26,6 +28,7 @@ from uuid import uuid4
 
 import pytest
 
+from argus.backend.models.pytest import PytestResultTable, PytestUserField
 from argus.backend.service.email_service import EmailService
 from argus.backend.tests.email_service.conftest import EmailListener
 
@@ -207,6 +210,23 @@ def test_submit_pytest_result_via_endpoint(flask_client):
     assert body["id"] is not None
 
 
+def test_submit_pytest_results_batch_via_endpoint(flask_client):
+    payloads = [_pytest_payload(f"client_api_pytest::test_batch_{index}_{uuid4().hex}") for index in range(5)]
+    resp = flask_client.post(
+        f"{API_PREFIX}/testrun/pytest/result/submit_batch",
+        data=json.dumps({"results": payloads}),
+        content_type="application/json",
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.json["status"] == "ok"
+    assert [item["name"] for item in resp.json["response"]] == [payload["name"] for payload in payloads]
+
+    stored = PytestResultTable.find(name=payloads[0]["name"]).all()
+    assert len(stored) == 1
+    fields = PytestUserField.find(name=payloads[0]["name"]).all()
+    assert {(field.field_name, field.field_value) for field in fields} == {("SCYLLA_MODE", "release")}
+
+
 def test_pytest_field_stats_returns_avg_duration(flask_client):
     test_name = f"client_api_pytest::test_avg_{uuid4().hex}"
     durations = [1.0, 2.0, 3.0]
@@ -230,6 +250,31 @@ def test_pytest_field_stats_returns_avg_duration(flask_client):
     assert avg == pytest.approx(sum(durations) / len(durations), rel=1e-3)
 
 
+def test_pytest_duration_stats_returns_stats_per_test(flask_client):
+    test_names = [f"client_api_pytest::test_bulk_{index}_{uuid4().hex}" for index in range(2)]
+    payloads = [_pytest_payload(test_names[0], duration=d) for d in (1.0, 3.0)]
+    for index, payload in enumerate(payloads):
+        payload["timestamp"] = time.time() + index
+        payload["session_timestamp"] = payload["timestamp"]
+    resp = flask_client.post(
+        f"{API_PREFIX}/testrun/pytest/result/submit_batch",
+        data=json.dumps({"results": payloads}),
+        content_type="application/json",
+    )
+    assert resp.status_code == 200, resp.text
+
+    resp = flask_client.post(
+        f"{API_PREFIX}/testrun/pytest/stats/duration",
+        data=json.dumps({"tests": test_names}),
+        content_type="application/json",
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.json["status"] == "ok"
+    stats = resp.json["response"]
+    assert stats[test_names[0]] == {"avg": pytest.approx(2.0), "p95": pytest.approx(3.0), "count": 2}
+    assert stats[test_names[1]]["count"] == 0
+
+
 def test_render_email_report_returns_html(flask_client, submitted_run_id):
     EmailService.set_sender(EmailListener())
     try:
@@ -1,13 +1,18 @@
 import base64
 from dataclasses import asdict, dataclass
+from datetime import datetime
 import json
+from uuid import UUID, uuid4
 
 import pytest
+from coodie.exceptions import DocumentNotFound
 from flask.testing import FlaskClient
 
-from argus.backend.models.web import ArgusTest
+from argus.backend.models.web import ArgusTest, RunLocator
+from argus.backend.plugins.core import RUN_LOCATIONS, RunLocation, RunLocationCache, locate_run
 from argus.backend.service.client_service import ClientService
 from argus.backend.plugins.sct.service import SCTService
+from argus.backend.service.test_lookup import TestLookup
 from argus.backend.service.testrun import TestRunService
 from argus.backend.plugins.sct.testrun import SCTTestRun
 from argus.backend.tests.conftest import get_fake_test_run
@@ -116,3 +121,68 @@ def test_get_configs_for_runs(flask_client: FlaskClient, client_service: ClientS
     configs = client_service.get_all_configs(run.id)
     assert len(configs) == 2
     assert [cfg.name for cfg in configs] == ["another_config", "my_config"]
+
+
+def test_partial_run_updates_keep_other_columns(client_service: ClientService, testrun_service: TestRunService, fake_test: ArgusTest):
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    run: SCTTestRun = testrun_service.get_run(run_type, run_req.run_id)
+    run.test_name = "changed-elsewhere"
+    run.save()
+
+    heartbeat = client_service.heartbeat(run_type, str(run.id))
+    client_service.update_run_status(run_type, str(run.id), "running")
+    client_service.submit_product_version(run_type, str(run.id), "2024.1.0")
+    client_service.submit_logs(run_type, str(run.id), [{"log_name": "db", "log_link": "https://example.com/db.tar.gz"}])
+    client_service.submit_logs(run_type, str(run.id), [{"log_name": "db", "log_link": "https://example.com/other.tar.gz"}])
+
+    run = testrun_service.get_run(run_type, run_req.run_id)
+    assert run.test_name == "changed-elsewhere"
+    assert run.heartbeat == heartbeat
+    assert run.status == "running"
+    assert run.scylla_version == "2024.1.0"
+    assert run.logs == [("db", "https://example.com/db.tar.gz")]
+
+
+def test_heartbeat_of_unknown_run_does_not_create_it(client_service: ClientService):
+    run_id = uuid4()
+    with pytest.raises(DocumentNotFound):
+        client_service.heartbeat("scylla-cluster-tests", str(run_id))
+
+    with pytest.raises(DocumentNotFound):
+        SCTTestRun.get(id=run_id)
+
+
+def test_run_location_cache_evicts_least_recently_used():
+    cache = RunLocationCache(max_size=2)
+    first, second, third = uuid4(), uuid4(), uuid4()
+    cache.put(first, RunLocation("generic", "a", datetime(2024, 1, 1)))
+    cache.put(second, RunLocation("generic", "b", datetime(2024, 1, 2)))
+    cache.get(first)
+    cache.put(third, RunLocation("generic", "c", datetime(2024, 1, 3)))
+
+    assert cache.get(first) == RunLocation("generic", "a", datetime(2024, 1, 1))
+    assert cache.get(second) is None
+    assert len(cache) == 2
+
+
+def test_submitted_run_is_located_without_scanning_plugins(client_service: ClientService, testrun_service: TestRunService, fake_test: ArgusTest):
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    RUN_LOCATIONS.clear()
+
+    location = locate_run(UUID(run_req.run_id))
+
+    assert location.plugin_name == run_type
+    assert location.build_id == run_req.job_name
+    assert testrun_service.get_test_type_for_run(run_req.run_id) == run_type
+    assert TestLookup.find_run(UUID(run_req.run_id)).id == UUID(run_req.run_id)
+
+
+def test_find_run_indexes_runs_missing_from_the_locator(testrun_service: TestRunService, fake_test: ArgusTest):
+    run = SCTTestRun.create(build_id=fake_test.build_system_id, id=uuid4(), test_id=fake_test.id)
+    RUN_LOCATIONS.clear()
+
+    assert locate_run(run.id) is None
+    assert TestLookup.find_run(run.id).id == run.id
+    assert RunLocator.get(run_id=run.id).plugin_name == SCTTestRun._plugin_name
@@ -1,9 +1,12 @@
 from dataclasses import asdict, dataclass
 from typing import Any
+from unittest.mock import patch
 
 import pytest
 
-from argus.backend.error_handlers import DataValidationError
+from argus.backend.error_handlers import DataValidationError, ResultWriteError
+from argus.backend.models.result import ArgusGenericResultData
+from argus.backend.service.results_service import RESULTS_BATCH_SIZE
 from argus.backend.tests.conftest import get_fake_test_run
 from argus.client.generic_result import ColumnMetadata, ResultType, ValidationRule, Status, \
     StaticGenericResultTable
@@ -77,3 +80,38 @@ def test_submit_results_responds_with_error_when_cell_has_error(fake_test, clien
     client_service.submit_run(run_type, asdict(run))
     with pytest.raises(DataValidationError):
         client_service.submit_results(run_type, run.run_id, results.as_dict())
+
+
+def test_submit_results_stores_tables_spanning_multiple_batches(fake_test, client_service):
+    run_type, run = get_fake_test_run(test=fake_test)
+    results = SampleTable()
+    results.sut_timestamp = 123
+    rows = [f"row{i}" for i in range(RESULTS_BATCH_SIZE * 2 + 1)]
+    for row in rows:
+        results.add_result(column="metric1", row=row, value=1.5, status=Status.UNSET)
+        results.add_result(column="metric2", row=row, value=2, status=Status.UNSET)
+    client_service.submit_run(run_type, asdict(run))
+
+    response = client_service.submit_results(run_type, run.run_id, results.as_dict())
+
+    assert response["status"] == "ok"
+    stored = list(ArgusGenericResultData.find(test_id=fake_test.id, name=SampleTable.Meta.name, run_id=run.run_id).all())
+    assert len(stored) == len(rows) * 2
+    assert {cell.status for cell in stored} == {"PASS"}
+
+
+def test_submit_results_reports_cells_of_failed_batches(fake_test, client_service):
+    run_type, run = get_fake_test_run(test=fake_test)
+    results = SampleTable()
+    results.sut_timestamp = 123
+    for i in range(RESULTS_BATCH_SIZE + 1):
+        results.add_result(column="metric1", row=f"row{i}", value=1.5, status=Status.UNSET)
+    client_service.submit_run(run_type, asdict(run))
+
+    write_results = [(True, None), (False, Exception("write timeout"))]
+    with patch("argus.backend.service.results_service.execute_concurrent", return_value=write_results):
+        with pytest.raises(ResultWriteError) as exc:
+            client_service.submit_results(run_type, run.run_id, results.as_dict())
+
+    _, failures = exc.value.args
+    assert failures == [{"key": f"metric1:row{RESULTS_BATCH_SIZE}", "error": "write timeout"}]
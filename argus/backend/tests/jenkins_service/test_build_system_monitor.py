@@ -0,0 +1,136 @@
+import time
+from unittest.mock import patch
+
+from argus.backend.models.web import ArgusGroup, ArgusRelease, ArgusTest
+from argus.backend.service.build_system_monitor import ArgusTestsMonitor, JenkinsMonitor
+
+
+class _FakeJenkins:
+    """Serves a fixed job tree the way python-jenkins' get_all_jobs does, recording job info requests."""
+
+    def __init__(self, jobs, display_names):
+        self._jobs = jobs
+        self._display_names = display_names
+        self.job_info_requests = []
+
+    def get_all_jobs(self):
+        return self._jobs
+
+    def get_job_info(self, name):
+        self.job_info_requests.append(name)
+        return {"displayName": self._display_names[name]}
+
+
+def _job(release: str, path: str) -> dict:
+    return {"_class": "org.jenkinsci.plugins.workflow.job.WorkflowJob", "name": path.rsplit("/", 1)[-1],
+            "fullname": f"{release}/{path}", "url": f"http://jenkins.test/job/{release}/job/{path}/"}
+
+
+def _folder(release: str, path: str, jobs: list[dict], display_name: str | None = None) -> dict:
+    folder = {"_class": "com.cloudbees.hudson.plugins.folder.Folder", "name": path.rsplit("/", 1)[-1],
+              "fullname": f"{release}/{path}", "jobs": jobs}
+    if display_name:
+        folder["displayName"] = display_name
+    return folder
+
+
+def _monitor(release: str) -> tuple[JenkinsMonitor, _FakeJenkins]:
+    jobs = [{
+        "_class": "com.cloudbees.hudson.plugins.folder.Folder",
+        "name": release,
+        "fullname": release,
+        "jobs": [
+            _job(release, "artifacts-test"),
+            _folder(release, "longevity", [
+                _job(release, "longevity/longevity-100gb"),
+                _folder(release, "longevity/large", [_job(release, "longevity/large/longevity-1tb")],
+                        display_name="Large"),
+            ]),
+            _folder(release, "releng-checks", [_job(release, "releng-checks/check")]),
+        ],
+    }]
+    fake = _FakeJenkins(jobs, display_names={f"{release}/longevity": "Longevity"})
+    # Bypass __init__ (which opens a real Jenkins connection) and inject the fake.
+    monitor = object.__new__(JenkinsMonitor)
+    ArgusTestsMonitor.__init__(monitor)
+    monitor._jenkins = fake
+    monitor._monitored_releases = [rf"^{release}$"]
+    return monitor, fake
+
+
+def test_jenkins_scan_dry_run_lists_missing_entities_without_saving():
+    release = f"scan-release-{time.time_ns()}"
+    monitor, fake = _monitor(release)
+
+    diff = monitor.collect(dry_run=True)
+
+    assert [r.name for r in diff.releases] == [release]
+    assert {g.build_system_id: (g.name, g.pretty_name) for g in diff.groups} == {
+        release: (f"{release}-root", "-- root directory --"),
+        f"{release}/longevity": ("longevity", "Longevity"),
+        f"{release}/longevity/large": ("longevity-large", "Longevity - Large"),
+    }
+    assert sorted(t.build_system_id for t in diff.tests) == [
+        f"{release}/artifacts-test",
+        f"{release}/longevity/large/longevity-1tb",
+        f"{release}/longevity/longevity-100gb",
+    ]
+    # Only the new folder listed without a display name is looked up
+    assert fake.job_info_requests == [f"{release}/longevity"]
+    assert ArgusRelease.find(name=release).all() == []
+
+
+def test_jenkins_scan_creates_missing_entities_once():
+    release = f"scan-release-{time.time_ns()}"
+    monitor, _ = _monitor(release)
+
+    diff = monitor.collect()
+
+    saved_release = ArgusRelease.get(name=release)
+    groups = {g.build_system_id: g for g in ArgusGroup.find(release_id=saved_release.id).all()}
+    assert set(groups) == {g.build_system_id for g in diff.groups}
+    tests = ArgusTest.find(release_id=saved_release.id).all()
+    assert {t.build_system_id: t.group_id for t in tests} == {
+        f"{release}/artifacts-test": groups[release].id,
+        f"{release}/longevity/longevity-100gb": groups[f"{release}/longevity"].id,
+        f"{release}/longevity/large/longevity-1tb": groups[f"{release}/longevity/large"].id,
+    }
+
+    rescan, fake = _monitor(release)
+    assert not rescan.collect()
+    assert fake.job_info_requests == []
+
+
+def test_jenkins_scan_skips_tests_of_groups_that_failed_to_save():
+    release = f"scan-release-{time.time_ns()}"
+    monitor, _ = _monitor(release)
+    diff = monitor.collect(dry_run=True)
+    failing = next(g for g in diff.groups if g.build_system_id == f"{release}/longevity")
+    save = ArgusGroup.save
+
+    def save_group(group, *args, **kwargs):
+        if group.id == failing.id:
+            raise RuntimeError("group write failed")
+        return save(group, *args, **kwargs)
+
+    with patch.object(ArgusGroup, "save", save_group):
+        monitor.apply(diff)
+
+    saved_release = ArgusRelease.get(name=release)
+    assert {t.build_system_id for t in ArgusTest.find(release_id=saved_release.id).all()} == {
+        f"{release}/artifacts-test",
+        f"{release}/longevity/large/longevity-1tb",
+    }
+
+
+def test_jenkins_scan_does_not_save_test_with_build_id_of_another_test():
+    release = f"scan-release-{time.time_ns()}"
+    monitor, _ = _monitor(release)
+    diff = monitor.collect(dry_run=True)
+    taken = next(t for t in diff.tests if t.build_system_id == f"{release}/artifacts-test")
+    other = ArgusTest(name="other-artifacts-test", build_system_id=taken.build_system_id)
+    other.save()
+
+    monitor.apply(diff)
+
+    assert [t.id for t in ArgusTest.find(build_system_id=taken.build_system_id).all()] == [other.id]
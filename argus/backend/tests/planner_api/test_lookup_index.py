@@ -0,0 +1,160 @@
+from datetime import UTC, datetime
+from unittest.mock import patch
+from uuid import UUID
+
+import pytest
+from cassandra.util import uuid_from_time
+from coodie.exceptions import DocumentNotFound
+
+from argus.backend.models.web import ArgusGroup, ArgusRelease, ArgusTest
+from argus.backend.service import test_lookup
+
+
+class _FakeModel:
+    """Stands in for a lookup model's get(id=...) when the index reloads changed entities."""
+
+    def __init__(self, documents: dict[UUID, object]):
+        self.documents = documents
+
+    def get(self, id: UUID):
+        try:
+            return self.documents[id]
+        except KeyError:
+            raise DocumentNotFound(id)
+
+
+@pytest.fixture
+def catalog():
+    release = ArgusRelease(name="scylla-master")
+    other_release = ArgusRelease(name="scylla-2025.1")
+    group = ArgusGroup(name="longevity", release_id=release.id)
+    other_group = ArgusGroup(name="longevity", release_id=other_release.id)
+    tests = [ArgusTest(name=f"longevity-{size}gb-test", group_id=group.id, release_id=release.id)
+             for size in range(150)]
+    tests.append(ArgusTest(name="longevity-10gb-test", group_id=other_group.id, release_id=other_release.id))
+    documents = {"release": {release.id: release, other_release.id: other_release},
+                 "group": {group.id: group, other_group.id: other_group},
+                 "test": {test.id: test for test in tests}}
+    return release, other_release, group, tests, documents
+
+
+def _index(documents: dict[str, dict], changes: list | None = None) -> test_lookup.TestLookupIndex:
+    index = test_lookup.TestLookupIndex(refresh_interval=0)
+    index.load_entities = lambda: {document.id: test_lookup.TestLookup.index_mapper(document, type=entity_type)
+                                   for entity_type, by_id in documents.items() for document in by_id.values()}
+    index.load_changes = lambda since, until: list(changes or [])
+    return index
+
+
+def _change(entity_type: str, entity_id: UUID) -> tuple[UUID, datetime, str, UUID]:
+    now = datetime.now(UTC)
+    return uuid_from_time(now), now, entity_type, entity_id
+
+
+def test_search_returns_every_match_by_default(catalog):
+    release, _, _, tests, documents = catalog
+    index = _index(documents)
+
+    hits = index.search("longevity", [("type", "test")], release_id=release.id)
+
+    assert len(hits) == len(tests) - 1
+    assert {hit["id"] for hit in hits} == {test.id for test in tests if test.release_id == release.id}
+
+
+def test_search_limit_keeps_best_ranked(catalog):
+    _, _, _, _, documents = catalog
+    index = _index(documents)
+
+    hits = index.search("longevity-1", [], limit=3)
+
+    assert [hit["name"] for hit in hits] == ["longevity-1gb-test", "longevity-10gb-test", "longevity-10gb-test"]
+
+
+def test_search_ranks_groups_before_tests(catalog):
+    release, _, group, _, documents = catalog
+    index = _index(documents)
+
+    hits = index.search("longevity", [], release_id=release.id)
+
+    assert hits[0]["id"] == group.id
+    assert hits[1]["group"]["id"] == group.id
+    assert hits[1]["release"]["id"] == release.id
+
+
+def test_release_facet_narrows_to_release(catalog):
+    _, other_release, _, _, documents = catalog
+    index = _index(documents)
+
+    hits = index.search("10gb", [("release", "2025.1")])
+
+    assert [(hit["name"], hit["release_id"]) for hit in hits] == [("longevity-10gb-test", other_release.id)]
+
+
+def test_disabled_group_hides_its_tests(catalog):
+    _, other_release, group, _, documents = catalog
+    group.enabled = False
+    index = _index(documents)
+
+    hits = index.search("", [("group", "longevity"), ("type", "test")])
+
+    assert [(hit["name"], hit["release_id"]) for hit in hits] == [("longevity-10gb-test", other_release.id)]
+
+
+def test_test_lookup_add_all_entry_covers_every_match(catalog):
+    release, _, _, tests, documents = catalog
+    index = _index(documents)
+
+    with patch.object(test_lookup, "TEST_LOOKUP_INDEX", index):
+        hits = test_lookup.TestLookup.test_lookup("longevity type:test", release_id=str(release.id))
+
+    assert hits[0]["id"] == test_lookup.TestLookup.ADD_ALL_ID
+    assert len(hits[1:]) == len(tests) - 1
+
+
+def test_refresh_reloads_only_changed_entities(catalog):
+    release, _, _, tests, documents = catalog
+    changes = []
+    index = _index(documents, changes)
+    index.refresh()
+
+    renamed, deleted = tests[0], tests[1]
+    renamed.pretty_name = "renamed-longevity-test"
+    del documents["test"][deleted.id]
+    changes.extend([_change("test", renamed.id), _change("test", deleted.id)])
+    fakes = {entity_type: _FakeModel(by_id) for entity_type, by_id in documents.items()}
+    index.load_entities = lambda: pytest.fail("refresh rebuilt the index instead of applying the changes")
+    with patch.dict(test_lookup.LOOKUP_MODELS, fakes):
+        index.refresh()
+
+    assert [hit["id"] for hit in index.search("renamed", [])] == [renamed.id]
+    assert deleted.id not in {hit["id"] for hit in index.search("longevity", [], release_id=release.id)}
+    assert len(index) == sum(len(by_id) for by_id in documents.values())
+
+
+def test_refresh_applies_each_change_once(catalog):
+    _, _, _, tests, documents = catalog
+    change = _change("test", tests[0].id)
+    index = _index(documents, [change])
+    index.refresh()
+    fake = _FakeModel(documents["test"])
+    with patch.object(fake, "get", wraps=fake.get) as get, patch.dict(test_lookup.LOOKUP_MODELS, {"test": fake}):
+        index.refresh()
+        index.refresh()
+
+    get.assert_called_once_with(id=tests[0].id)
+
+
+def test_refresh_waits_for_interval_unless_changed_locally(catalog):
+    _, _, _, _, documents = catalog
+    index = _index(documents)
+    index.refresh_interval = 3600
+    index.refresh()
+    index.load_changes = lambda since, until: pytest.fail("changes were read before the refresh interval")
+
+    index.refresh()
+
+    reads = []
+    index.load_changes = lambda since, until: reads.append(since) or []
+    with patch.object(test_lookup, "local_lookup_version", return_value=index._local_version + 1):
+        index.refresh()
+    assert len(reads) == 1
@@ -1,14 +1,18 @@
 import datetime
 import json
+import time
 import uuid
 
 import pytest
 from flask import g
 
+from cassandra.util import uuid_from_time
 from coodie.exceptions import DocumentNotFound
 
-from argus.backend.models.plan import ArgusReleasePlan
-from argus.backend.models.web import ArgusUserView, User, UserRoles
+from argus.backend.models.plan import ArgusReleasePlan, PlanTriggerJob
+from argus.backend.models.web import ArgusUserView, User, UserRoles, ViewStatsSnapshot
+from argus.backend.service.planner_service import PLAN_TRIGGER_STALE_AFTER
+from argus.backend.service.stats import ViewStatsCollector
 
 
 @pytest.fixture
@@ -117,6 +121,27 @@ def test_update_plan(flask_client, release, fake_test, cleanup_plans):
     assert fetched["target_version"] == "9.9"
 
 
+def test_plan_edits_drop_stats_snapshots_of_views_over_release_tests(flask_client, release, fake_test,
+                                                                     cleanup_plans):
+    """Views read the plans of their tests' releases, so plan edits must not leave stale view stats behind."""
+    view = ArgusUserView(name=f"plan_stats_view_{uuid.uuid4().hex[:8]}", tests=[fake_test.id], widget_settings="[]")
+    view.save()
+
+    def collect_and_edit(edit):
+        ViewStatsCollector(view.id).collect(include_no_version=True)
+        assert list(ViewStatsSnapshot.find(view_id=view.id).all())
+        res = edit()
+        assert res["status"] == "ok"
+        assert list(ViewStatsSnapshot.find(view_id=view.id).all()) == []
+        return res
+
+    plan_id = collect_and_edit(lambda: _create_plan(flask_client, release, fake_test))["response"]["id"]
+    collect_and_edit(lambda: flask_client.post("/api/v1/planning/plan/update",
+                                               json={"id": plan_id, "target_version": "9.9"}).json)
+    collect_and_edit(lambda: flask_client.delete(f"/api/v1/planning/plan/{plan_id}/delete?deleteView=1").json)
+    view.delete()
+
+
 def test_change_plan_owner(flask_client, release, fake_test, planner_user, cleanup_plans):
     plan_id = _create_plan(flask_client, release, fake_test)["response"]["id"]
     res = flask_client.post(
@@ -185,6 +210,18 @@ def test_search_finds_test_name(flask_client, release, fake_test):
     assert fake_test.name in names
 
 
+def test_search_follows_test_changes(flask_client, release, fake_test):
+    """Renamed and deleted tests are picked up by the search index without a rebuild."""
+    pretty_name = f"renamed_{fake_test.name}"
+    fake_test.update(pretty_name=pretty_name)
+    res = flask_client.get(f"/api/v1/planning/search?query={pretty_name}&releaseId={release.id}").json
+    assert [str(h["id"]) for h in res["response"]["hits"][1:]] == [str(fake_test.id)]
+
+    fake_test.delete()
+    res = flask_client.get(f"/api/v1/planning/search?query={pretty_name}&releaseId={release.id}").json
+    assert res["response"]["hits"][1:] == []
+
+
 def test_explode_group(flask_client, group, fake_test):
     res = flask_client.get(f"/api/v1/planning/group/{group.id}/explode").json
     assert res["status"] == "ok"
@@ -599,3 +636,80 @@ def test_trigger_jobs_for_plan_with_no_tests(
     assert body["failed_to_execute"] == []
     # Jenkins must NOT be invoked since there are no tests
     mock_jenkins_service.return_value.build_job.assert_not_called()
+
+
+def test_trigger_jobs_records_progress_per_job(
+    flask_client, release, fake_test, cleanup_plans, mock_jenkins_service
+):
+    """Each plan job is triggered on the worker pool before the request returns, the status endpoint serves the outcome."""
+    plan_id = _create_plan(flask_client, release, fake_test)["response"]["id"]
+    jenkins = mock_jenkins_service.return_value
+    jenkins.latest_build.return_value = 7
+    jenkins.retrieve_job_parameters.return_value = [{"name": "backend", "value": "aws"}]
+
+    res = flask_client.post(
+        "/api/v1/planning/plan/trigger",
+        json={
+            "plan_id": plan_id,
+            "common_params": {"scylla_version": "master:latest"},
+            "params": [{"test": "longevity", "backend": "aws", "region": "eu-west-1"}],
+        },
+    ).json
+    assert res["status"] == "ok"
+    body = res["response"]
+    assert body["done"] is True
+    assert body["jobs"] == ["http://jenkins.test/job/1/"]
+    assert body["failed_to_execute"] == []
+    jenkins.build_job.assert_called_once_with(
+        fake_test.build_system_id,
+        {"test": "longevity", "backend": "aws", "region": "eu-west-1", "scylla_version": "master:latest"},
+        g.user.username,
+    )
+
+    status = flask_client.get(f"/api/v1/planning/plan/trigger/{body['trigger_id']}/status").json
+    assert status["status"] == "ok"
+    [job] = status["response"]["progress"]
+    assert job["build_system_id"] == fake_test.build_system_id
+    assert job["status"] == "triggered"
+
+
+def test_trigger_jobs_without_wait_is_followed_through_status(
+    flask_client, release, fake_test, cleanup_plans, mock_jenkins_service
+):
+    """With "wait": false the trigger returns right away and its jobs are followed through the status endpoint."""
+    plan_id = _create_plan(flask_client, release, fake_test)["response"]["id"]
+    jenkins = mock_jenkins_service.return_value
+    jenkins.latest_build.return_value = 7
+    jenkins.retrieve_job_parameters.return_value = [{"name": "backend", "value": "aws"}]
+
+    body = flask_client.post(
+        "/api/v1/planning/plan/trigger",
+        json={
+            "plan_id": plan_id,
+            "common_params": {},
+            "params": [{"test": "longevity", "backend": "aws", "region": "eu-west-1"}],
+            "wait": False,
+        },
+    ).json["response"]
+    assert body["total"] == 1
+
+    for _ in range(50):
+        status = flask_client.get(f"/api/v1/planning/plan/trigger/{body['trigger_id']}/status").json["response"]
+        if status["done"]:
+            break
+        time.sleep(0.1)
+    assert status["jobs"] == ["http://jenkins.test/job/1/"]
+
+
+def test_trigger_status_fails_abandoned_jobs(flask_client):
+    """Jobs left queued by a process that died are reported failed instead of pending until they expire."""
+    trigger_id = uuid_from_time(datetime.datetime.now(tz=datetime.UTC))
+    PlanTriggerJob(trigger_id=trigger_id, build_system_id="abandoned", status="queued",
+                   last_updated=datetime.datetime.now(tz=datetime.UTC) - PLAN_TRIGGER_STALE_AFTER * 2).save()
+    PlanTriggerJob(trigger_id=trigger_id, build_system_id="queued", status="queued").save()
+
+    status = flask_client.get(f"/api/v1/planning/plan/trigger/{trigger_id}/status").json["response"]
+
+    assert status["failed_to_execute"] == ["abandoned"]
+    assert status["pending"] == 1
+    assert PlanTriggerJob.get(trigger_id=trigger_id, build_system_id="abandoned").status == "failed"
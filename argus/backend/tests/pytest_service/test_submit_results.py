@@ -155,3 +155,26 @@ def test_avg_duration_with_status_and_time_query(testrun_service: TestRunService
 
     result = testrun_service.get_pytest_test_field_stats(sample_data["name"], "duration", "avg", {"status": "passed", "since": since})
     assert sum(durations)/len(durations) == result[sample_data["name"]]["duration"]["avg"]
+
+
+def test_bulk_duration_stats(testrun_service: TestRunService, client_service: ClientService):
+    sample_data = {
+        "name": "testSuite::test_sample_duration_bulk",
+        "timestamp": 1753687331.758162,
+        "session_timestamp": 1753687331.758162,
+        "test_type": "dtest",
+        "run_id": "879b516b-6e93-4c4c-9c86-dd0f2fda5c66",
+        "status": "passed",
+        "duration": 1.27434,
+        "markers": ["dtest_full", "dtest"],
+        "user_fields": {}
+    }
+
+    durations = list(range(1, 21))
+    client_service.submit_pytest_results([{**sample_data, "timestamp": sample_data["timestamp"] + i, "duration": d}
+                                          for i, d in enumerate(durations)])
+
+    result = testrun_service.get_pytest_duration_stats([sample_data["name"], "testSuite::test_never_run"], {})
+
+    assert result[sample_data["name"]] == {"avg": sum(durations) / len(durations), "p95": 19, "count": 20}
+    assert result["testSuite::test_never_run"] == {"avg": None, "p95": None, "count": 0}
@@ -11,6 +11,7 @@ import gzip
 import io
 import json
 import tarfile
+import threading
 import zipfile
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
@@ -584,6 +585,89 @@ def test_dry_run_does_not_dispatch():
     assert client.open.call_count == 0
 
 
+# ---------------------------------------------------------------------------
+# run-partitioned dispatch and checkpoints
+# ---------------------------------------------------------------------------
+
+class _MemoryCheckpoints:
+    """In-memory stand-in for :class:`ReplayCheckpointStore`."""
+
+    def __init__(self) -> None:
+        self.runs: dict[str, set[str]] = {}
+
+    def completed_runs(self, archive_id: str) -> set[str]:
+        return set(self.runs.get(archive_id, set()))
+
+    def mark_completed(self, archive_id: str, run_id: str) -> None:
+        self.runs.setdefault(archive_id, set()).add(run_id)
+
+
+def _events(run_id: str, count: int) -> list[dict]:
+    return [_rec("/sct/$id/event/submit", ts=ts, location_params={"id": run_id}, body={"data": {"k": ts}})
+            for ts in range(count)]
+
+
+def test_runs_are_dispatched_concurrently_in_order_per_run():
+    # Records of both runs interleave across two files of the archive
+    archive = _make_archive({
+        "argus_replay_log_a_1.jsonl": _events("A", 3)[1:] + _events("B", 3)[2:],
+        "argus_replay_log_b_1.jsonl": _events("B", 3)[:2] + _events("A", 3)[:1],
+    })
+    # Both runs must be in flight at once for their first records to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    seen: dict[str, list[int]] = {"A": [], "B": []}
+
+    def open_(url, **kwargs):
+        run_id = url.split("/")[-3]
+        if not seen[run_id]:
+            barrier.wait()
+        seen[run_id].append(kwargs["json"]["data"]["k"])
+        return _Response(200)
+
+    client = MagicMock()
+    client.open.side_effect = open_
+    with patch("argus.backend.service.replay_service.RUN_SPOOL_MAX_SIZE", 64):
+        summary = ReplayService(app=_make_app(client), workers=2).ingest(archive)
+
+    assert summary.succeeded == 6
+    assert seen == {"A": [0, 1, 2], "B": [0, 1, 2]}
+
+
+def test_resume_skips_runs_replayed_without_failures():
+    archive = _make_archive({"argus_replay_log_r_1.jsonl": _events("A", 2) + _events("B", 2)})
+    checkpoints = _MemoryCheckpoints()
+
+    def open_(url, **kwargs):
+        return _Response(500 if "/B/" in url else 200)
+
+    client = MagicMock()
+    client.open.side_effect = open_
+    first = ReplayService(app=_make_app(client), checkpoint_store=checkpoints).ingest(archive)
+    assert (first.succeeded, first.failed) == (2, 2)
+
+    client.open.reset_mock()
+    second = ReplayService(app=_make_app(client), checkpoint_store=checkpoints, resume=True).ingest(archive)
+
+    assert second.resumed_runs == 1
+    assert second.total == 2
+    assert {c.args[0] for c in client.open.call_args_list} == {f"{CLIENT_ROUTE_PREFIX}/sct/B/event/submit"}
+
+
+def test_dry_run_and_no_resume_ignore_checkpoints():
+    archive = _make_archive({"argus_replay_log_r_1.jsonl": _events("A", 2)})
+    checkpoints = _MemoryCheckpoints()
+    client = MagicMock()
+    client.open.return_value = _Response(200)
+
+    ReplayService(app=_make_app(client), checkpoint_store=checkpoints).ingest(archive, dry_run=True)
+    assert checkpoints.runs == {}
+
+    ReplayService(app=_make_app(client), checkpoint_store=checkpoints).ingest(archive)
+    summary = ReplayService(app=_make_app(client), checkpoint_store=checkpoints).ingest(archive)
+    assert summary.resumed_runs == 0
+    assert summary.succeeded == 2
+
+
 # ---------------------------------------------------------------------------
 # create_missing_tests pre-step
 # ---------------------------------------------------------------------------
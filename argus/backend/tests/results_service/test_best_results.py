@@ -177,3 +177,17 @@ def test_ignored_runs_are_not_considered_in_best_results(fake_test, client_servi
     assert str(best_results["h_is_better:row"][-1].run_id) == run.run_id
     assert best_results["l_is_better:row"][-1].value == 10   # should not consider the second run
     assert str(best_results["l_is_better:row"][-1].run_id) == run.run_id
+
+
+def test_ignoring_run_invalidates_cached_run_details(fake_test, client_service, results_service, testrun_service):
+    run_type, run = get_fake_test_run(test=fake_test)
+    results = SampleTable()
+    results.sut_timestamp = 123
+    results.add_result(column="h_is_better", row="row", value=100, status=Status.UNSET)
+    client_service.submit_run(run_type, asdict(run))
+    client_service.submit_results(run_type, run.run_id, results.as_dict())
+    assert results_service.get_best_results(fake_test.id, results.name)["h_is_better:row"][-1].value == 100
+
+    testrun_service.change_run_investigation_status(fake_test.id, UUID(str(run.run_id)), TestInvestigationStatus.IGNORED)
+
+    assert "h_is_better:row" not in results_service.get_best_results(fake_test.id, results.name)
@@ -14,6 +14,7 @@ from argus.backend.service.results_service import (
     create_limit_dataset,
     calculate_limits,
     calculate_graph_ticks, _identify_most_changed_package, _split_results_by_release,
+    group_points_by_column_and_row,
     BestResult, RunsDetails
 )
 from argus.backend.models.result import ArgusGenericResultMetadata, ArgusGenericResultData, ColumnMetadata, ValidationRules
@@ -80,6 +81,27 @@ def test_get_sorted_data_for_column_and_row():
     assert result_data == expected
 
 
+def test_group_points_by_column_and_row_matches_per_series_lookup():
+    run_ids = [uuid4() for _ in range(4)]
+    data = [
+        ArgusGenericResultData(run_id=run_id, column=column, row=row, value=float(index), status="PASS",
+                               sut_timestamp=datetime(2023, 10, 25 - index))
+        for index, run_id in enumerate(run_ids) for column in ("col1", "col2") for row in ("row1", "row2")
+    ]
+    packages = {run_id: [PackageVersion(name='pkg1', version=f'1.{index // 2}', date='', revision_id='', build_id=''),
+                         PackageVersion(name='pkg2', version=f'2.{index}', date='', revision_id='', build_id='')]
+                for index, run_id in enumerate(run_ids)}
+    runs_details = RunsDetails(ignored=frozenset(), packages=packages)
+
+    grouped = group_points_by_column_and_row(data, runs_details, main_package="pkg1")
+
+    assert set(grouped) == {("col1", "row1"), ("col1", "row2"), ("col2", "row1"), ("col2", "row2")}
+    for (column, row), points in grouped.items():
+        assert points == get_sorted_data_for_column_and_row(data, column, row, runs_details, main_package="pkg1")
+        assert [point["id"] for point in points] == run_ids[::-1]
+        assert [point["dep_change"] for point in points] == [False, True, True, True]
+
+
 def test_get_min_max_y():
     datasets = [
         {
@@ -216,6 +238,23 @@ def test_calculate_limits():
         assert 'limit' in point
 
 
+def test_calculate_limits_uses_last_applicable_rule_and_best_result():
+    points = [
+        {"x": "2023-10-22T00:00:00Z", "y": 1.5},
+        {"x": "2023-10-24T00:00:00Z", "y": 2.5},
+        {"x": "2023-10-26T00:00:00Z", "y": 3.5},
+    ]
+    best_results = [BestResult(key="col1:row1", value=20.0, result_date=datetime(2023, 10, 23), run_id="run1"),
+                    BestResult(key="col1:row1", value=10.0, result_date=datetime(2023, 10, 25), run_id="run2")]
+    validation_rules_list = [ValidationRules(valid_from=datetime(2023, 10, 25), fixed_limit=30.0),
+                             ValidationRules(valid_from=datetime(2023, 10, 21), best_abs=1.0)]
+
+    updated_points = calculate_limits(points, best_results, validation_rules_list, higher_is_better=False)
+
+    # the first listed rule is the fallback until a rule is valid, later listed rules win when both are valid
+    assert [point["limit"] for point in updated_points] == [21.0, 21.0, 11.0]
+
+
 def test_calculate_graph_ticks_with_data_returns_min_max_ticks():
     graphs = [
         {
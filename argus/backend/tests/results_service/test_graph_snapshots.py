@@ -0,0 +1,74 @@
+import json
+from dataclasses import asdict
+from uuid import UUID
+
+from argus.backend.models.result import ArgusGraphSnapshot
+from argus.backend.service.results_service import graph_snapshot_window, refresh_graph_snapshots
+from argus.backend.tests.conftest import get_fake_test_run
+from argus.backend.util.encoders import ArgusJSONEncoder
+from argus.client.generic_result import ColumnMetadata, ResultType, StaticGenericResultTable, Status
+from argus.common.enums import TestInvestigationStatus
+
+
+class LatencyTable(StaticGenericResultTable):
+    class Meta:
+        name = "Snapshot Latency"
+        description = "Graph snapshot test table"
+        sut_package_name = "scylla-server"
+        Columns = [ColumnMetadata(name="p99", unit="ms", type=ResultType.FLOAT, higher_is_better=False)]
+
+
+def _submit(client_service, sct_service, fake_test, value: float) -> str:
+    run_type, run = get_fake_test_run(test=fake_test)
+    client_service.submit_run(run_type, asdict(run))
+    sct_service.submit_packages(run.run_id, [{"name": "scylla-server", "version": "2025.1.0", "date": "20250101",
+                                             "revision_id": "", "build_id": ""}])
+    table = LatencyTable()
+    table.sut_timestamp = 123
+    table.add_result(column="p99", row="read", value=value, status=Status.UNSET)
+    client_service.submit_results(run_type, run.run_id, table.as_dict())
+    return run.run_id
+
+
+def test_graph_snapshots_match_computed_graphs(fake_test, client_service, sct_service, results_service):
+    _submit(client_service, sct_service, fake_test, 10.0)
+
+    graphs, ticks, releases_filters, etag = results_service.get_test_graph_snapshots(fake_test.id)
+    assert graphs
+    expected_graphs, expected_ticks, expected_releases = results_service.get_test_graphs(fake_test.id)
+
+    assert graphs == json.loads(json.dumps(expected_graphs, cls=ArgusJSONEncoder))
+    assert ticks == expected_ticks
+    assert sorted(releases_filters) == sorted(expected_releases)
+    assert ArgusGraphSnapshot.get(test_id=fake_test.id, window=graph_snapshot_window(None, None),
+                                  name=LatencyTable.Meta.name).etag
+    assert results_service.get_test_graph_snapshots(fake_test.id)[3] == etag
+
+
+def test_graph_snapshots_change_after_results_and_ignored_runs(fake_test, client_service, sct_service,
+                                                               results_service, testrun_service):
+    _submit(client_service, sct_service, fake_test, 10.0)
+    first_etag = results_service.get_test_graph_snapshots(fake_test.id)[3]
+
+    run_id = _submit(client_service, sct_service, fake_test, 12.0)
+    graphs, _, _, second_etag = results_service.get_test_graph_snapshots(fake_test.id)
+    assert second_etag != first_etag
+    assert sum(len(dataset["data"]) for graph in graphs for dataset in graph["data"]["datasets"]
+               if dataset["label"] != "error threshold") == 2
+
+    testrun_service.change_run_investigation_status(fake_test.id, UUID(run_id), TestInvestigationStatus.IGNORED)
+    assert results_service.get_test_graph_snapshots(fake_test.id)[3] == first_etag
+
+
+def test_graph_snapshots_of_older_generation_are_not_served(fake_test, client_service, sct_service, results_service):
+    _submit(client_service, sct_service, fake_test, 10.0)
+    graphs = results_service.get_test_graph_snapshots(fake_test.id)[0]
+    stale = ArgusGraphSnapshot.get(test_id=fake_test.id, window=graph_snapshot_window(None, None),
+                                   name=LatencyTable.Meta.name)
+
+    refresh_graph_snapshots(fake_test.id)
+    # A build that started before the refresh writes its snapshot after it
+    ArgusGraphSnapshot.create(**{**stale.model_dump(), "payload": json.dumps({"graphs": [], "releases": []}),
+                                 "etag": "stale"})
+
+    assert results_service.get_test_graph_snapshots(fake_test.id)[0] == graphs
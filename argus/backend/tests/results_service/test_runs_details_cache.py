@@ -0,0 +1,59 @@
+from unittest.mock import Mock, patch
+from uuid import uuid4
+
+from argus.backend.service.results_service import RunsDetails, RunsDetailsCache
+
+
+def _details() -> RunsDetails:
+    return RunsDetails(ignored=frozenset(), packages={})
+
+
+def test_get_loads_test_once_while_fresh():
+    cache = RunsDetailsCache(ttl=60)
+    loader = Mock(side_effect=lambda test_id: _details())
+    test_id = uuid4()
+
+    first = cache.get(test_id, loader)
+    second = cache.get(test_id, loader)
+
+    assert first is second
+    loader.assert_called_once_with(test_id)
+
+
+def test_get_reloads_expired_entry():
+    cache = RunsDetailsCache(ttl=60)
+    loader = Mock(side_effect=lambda test_id: _details())
+    test_id = uuid4()
+    with patch("argus.backend.service.results_service.time.monotonic", return_value=1000.0):
+        cache.get(test_id, loader)
+    with patch("argus.backend.service.results_service.time.monotonic", return_value=1061.0):
+        cache.get(test_id, loader)
+
+    assert loader.call_count == 2
+
+
+def test_cache_evicts_least_recently_used_test():
+    cache = RunsDetailsCache(max_size=2)
+    first, second, third = uuid4(), uuid4(), uuid4()
+    for test_id in (first, second, first, third):
+        cache.get(test_id, lambda _: _details())
+
+    assert len(cache) == 2
+    assert first in cache and third in cache
+    assert second not in cache
+
+
+def test_invalidate_drops_entry_and_result_of_racing_load():
+    cache = RunsDetailsCache()
+    test_id = uuid4()
+    cache.get(test_id, lambda _: _details())
+
+    cache.invalidate(test_id)
+    assert test_id not in cache
+
+    def loader(_):
+        cache.invalidate(test_id)
+        return _details()
+
+    cache.get(test_id, loader)
+    assert test_id not in cache
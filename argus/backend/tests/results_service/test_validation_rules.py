@@ -211,3 +211,19 @@ def test_can_track_validation_rules_changes(fake_test, client_service, results_s
                 'value'] == cell.value, f"Expected {cell.value} but got {actual_cells[cell.column][cell.row]['value']}"
             assert actual_cells[cell.column][cell.row][
                 'status'] == "PASS", f"Expected PASS for {cell.column} but got {actual_cells[cell.column][cell.row]['status']}"
+
+
+def test_run_results_keep_submission_order_of_many_tables(fake_test, client_service, results_service):
+    run_type, run = get_fake_test_run(test=fake_test)
+    client_service.submit_run(run_type, asdict(run))
+    table_names = [f"workload-{index}" for index in range(12)]
+    for name in table_names:
+        results = SampleTable()
+        results.name = name
+        results.sut_timestamp = 123
+        results.add_result(column="non tracked col name", row="row", value=1.0, status=Status.UNSET)
+        client_service.submit_results(run_type, run.run_id, results.as_dict())
+
+    run_results = results_service.get_run_results(fake_test.id, UUID(run.run_id))
+
+    assert [next(iter(table)) for table in run_results] == table_names
@@ -62,6 +62,28 @@ def test_submit_packages(flask_client, sct_run_id):
                "6.0.0" for p in run.packages)
 
 
+def test_kernels_report_follows_packages_and_status(flask_client, sct_run_id, release):
+    kernel = f"5.15.0-{time.time_ns()}"
+    payload = {
+        "packages": [
+            {"name": "scylla-server", "version": "6.0.0", "date": "20240101", "revision_id": "abc123"},
+            {"name": "kernel", "version": kernel},
+        ],
+        "schema_version": "v8",
+    }
+    resp = flask_client.post(f"{API_PREFIX}/{sct_run_id}/packages/submit", data=json.dumps(payload),
+                             content_type="application/json")
+    assert resp.json["status"] == "ok"
+    resp = flask_client.post(f"/api/v1/client/testrun/scylla-cluster-tests/{sct_run_id}/set_status",
+                             data=json.dumps({"new_status": "passed"}), content_type="application/json")
+    assert resp.json["status"] == "ok"
+
+    report = flask_client.get(f"{API_PREFIX}/release/{release.name}/kernels").json["response"]
+
+    assert kernel in report["versions"]["6.0.0-20240101.abc123"]
+    assert report["metadata"][kernel] == {"passed": 1, "failed": 0, "aborted": 0, "test_error": 0}
+
+
 def test_submit_screenshots(flask_client, sct_run_id):
     payload = {
         "screenshot_links": ["https://grafana/snap/1", "https://grafana/snap/2"],
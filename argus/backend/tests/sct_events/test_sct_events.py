@@ -4,11 +4,13 @@ import json
 import logging
 from time import sleep
 
+import pytest
 from flask.testing import FlaskClient
 
 from argus.backend.db import ScyllaCluster
+from argus.backend.error_handlers import ResultWriteError
 from argus.backend.models.web import ArgusRelease, ArgusGroup, ArgusTest
-from argus.backend.plugins.sct.testrun import SCTEvent, SCTEventSeverity, SCTTestRun
+from argus.backend.plugins.sct.testrun import SCTEvent, SCTEventSeverity, SCTTestRun, SCTUnprocessedEvent
 from argus.backend.service.client_service import ClientService
 from argus.backend.plugins.sct.service import SCTService
 from argus.backend.service.testrun import TestRunService
@@ -364,6 +366,52 @@ def test_controller_submit_multiple_events(flask_client: FlaskClient, fake_test:
 
 
 
+def test_submit_event_batch_stores_valid_events_and_reports_invalid_ones(client_service: ClientService, sct_service: SCTService, testrun_service: TestRunService, fake_test: ArgusTest):
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    run: SCTTestRun = testrun_service.get_run(run_type, run_req.run_id)
+
+    base_ts = datetime.now(tz=UTC).timestamp()
+    events = [{
+        "message": f"This is event {i}",
+        "run_id": run.id,
+        "severity": [SCTEventSeverity.ERROR.value, SCTEventSeverity.NORMAL.value][i % 2],
+        "ts": base_ts + i,
+        "event_type": "DatabaseEvent",
+    } for i in range(6)]
+    events.insert(2, {**events[0], "severity": "NOT_A_SEVERITY"})
+
+    with pytest.raises(ResultWriteError) as exc_info:
+        sct_service.submit_event_batch(str(run.id), events)
+
+    statuses = [result["status"] for result in exc_info.value.args[1]]
+    assert statuses == ["ok", "ok", "error", "ok", "ok", "ok", "ok"]
+    assert len(run.get_all_events()) == 6
+    assert len(list(SCTUnprocessedEvent.find(run_id=run.id).all())) == 3
+
+
+def test_submit_event_batch_coalesces_coredump_links(client_service: ClientService, sct_service: SCTService, testrun_service: TestRunService, fake_test: ArgusTest):
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    run: SCTTestRun = testrun_service.get_run(run_type, run_req.run_id)
+
+    base_ts = datetime.now(tz=UTC).timestamp()
+    events = [{
+        "message": f"corefile_url=https://example.com/core.scylla.{i}.zst\nnode=db-node-{i}",
+        "run_id": run.id,
+        "severity": SCTEventSeverity.ERROR.value,
+        "ts": base_ts + i,
+        "event_type": "CoreDumpEvent",
+    } for i in range(2)]
+
+    results = sct_service.submit_event_batch(str(run.id), events)
+
+    assert results == [{"status": "ok"}, {"status": "ok"}]
+    run = testrun_service.get_run(run_type, run_req.run_id)
+    assert sorted(link for _, link in run.logs) == ["https://example.com/core.scylla.0.zst",
+                                                     "https://example.com/core.scylla.1.zst"]
+
+
 def test_controller_submit_events_and_get_by_severity(flask_client: FlaskClient, fake_test: ArgusTest, client_service: ClientService, testrun_service: TestRunService):
     run_type, run_req = get_fake_test_run(fake_test)
     client_service.submit_run(run_type, asdict(run_req))
@@ -14,6 +14,9 @@ Covers:
 - New run appears after invalidation (stale data regression)
 - Migration script idempotency
 - delete_release() cleanup of indexes and snapshots
+- Per-test ReleaseTestStats rows: roll-up parity and in-place refresh
+- ViewStatsCollector snapshots and their invalidation by runs of the view's tests
+  and by group, test and plan changes in their releases
 """
 import importlib.util
 import json
@@ -27,13 +30,26 @@ from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
+from flask import current_app
 
 from argus.backend.models.web import (
+    ArgusUserView,
     ReleaseDistinctVersions,
     ReleaseDistinctImages,
     ReleaseStatsSnapshot,
+    ReleaseTestStats,
+    ViewStatsSnapshot,
+    ViewTestMembership,
+)
+from argus.backend.service.stats import (
+    snapshot_filter_key,
+    view_snapshot_filter_key,
+    parse_snapshot_filter_key,
+    run_row_filter,
+    cached_filter_keys,
+    ReleaseStatsCollector,
+    ViewStatsCollector,
 )
-from argus.backend.service.stats import snapshot_filter_key, ReleaseStatsCollector
 from argus.backend.tests.conftest import get_fake_test_run
 
 
@@ -68,7 +84,7 @@ def plugin_run_stub(release_id, version: str | None) -> SimpleNamespace:
     SimpleNamespace that carries only the attributes the methods read.
     """
     from argus.backend.plugins.core import PluginModelBase
-    obj = SimpleNamespace(release_id=release_id, scylla_version=version)
+    obj = SimpleNamespace(release_id=release_id, test_id=None, scylla_version=version)
     obj.invalidate_release_snapshot = types.MethodType(
         PluginModelBase.invalidate_release_snapshot, obj
     )
@@ -119,6 +135,37 @@ def test_snapshot_filter_key_no_collisions():
     assert len(keys) == 6
 
 
+@pytest.mark.parametrize("version,image_id,nov,lim", [
+    (None,    None,      True,  False),
+    ("5.2",   None,      False, True),
+    ("5.6.1", "ami-xyz", True,  True),
+    ("!noVersion", None, False, False),
+])
+def test_parse_snapshot_filter_key_roundtrip(version, image_id, nov, lim):
+    assert parse_snapshot_filter_key(snapshot_filter_key(version, image_id, nov, lim)) == (version, image_id, nov, lim)
+
+
+@pytest.mark.parametrize("version,nov,scylla_version,expected", [
+    (None,         True,  None,    True),
+    (None,         False, None,    False),
+    (None,         False, "5.2.1", True),
+    ("5.2",        False, "5.2.1", True),
+    ("5.2",        False, "5.3.0", False),
+    ("5.2",        True,  None,    True),
+    ("!noVersion", False, None,    True),
+    ("!noVersion", False, "5.2.1", False),
+])
+def test_run_row_filter_version(version, nov, scylla_version, expected):
+    assert run_row_filter(version, nov)({"scylla_version": scylla_version}) is expected
+
+
+def test_run_row_filter_image():
+    row = {"scylla_version": "5.2.1", "cloud_setup": SimpleNamespace(db_node=SimpleNamespace(image_id="ami-1"))}
+    assert run_row_filter(None, True, "ami-1")(row)
+    assert not run_row_filter(None, True, "ami-2")(row)
+    assert not run_row_filter(None, True, "ami-1")({"scylla_version": "5.2.1"})
+
+
 # ---------------------------------------------------------------------------
 # Unit: invalidate_release_snapshot targeted deletion
 # ---------------------------------------------------------------------------
@@ -479,3 +526,149 @@ def test_delete_release_removes_indexes_and_snapshots(argus_db, release_manager_
     assert list(ReleaseDistinctVersions.find(release_id=rid).all()) == []
     assert list(ReleaseDistinctImages.find(release_id=rid).all()) == []
     assert get_snapshots(rid) == []
+
+
+# ---------------------------------------------------------------------------
+# Integration: per-test stats rows
+# ---------------------------------------------------------------------------
+
+def get_test_stats_rows(release_id, filter_key: str) -> dict:
+    return {row.test_id: json.loads(row.payload) for row in ReleaseTestStats.find(release_id=release_id, filter_key=filter_key).all()}
+
+
+@pytest.mark.docker_required
+def test_cache_miss_writes_per_test_rows(argus_db, fake_test, client_service, release):
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    for s in get_snapshots(release.id):
+        s.delete()
+
+    ReleaseStatsCollector(release.name).collect(force=False, include_no_version=True)
+
+    filter_key = snapshot_filter_key(None, None, True, False)
+    rows = get_test_stats_rows(release.id, filter_key)
+    assert fake_test.id in rows
+    assert rows[fake_test.id]["last_runs"][0]["id"] == run_req.run_id
+    assert filter_key in cached_filter_keys(release.id)
+
+
+@pytest.mark.docker_required
+def test_rollup_from_per_test_rows_matches_full_collection(argus_db, fake_test, client_service, release):
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    collector = ReleaseStatsCollector(release.name)
+    full = json.loads(current_app.json.dumps(collector.collect(force=True, include_no_version=True)))
+
+    for s in get_snapshots(release.id):
+        s.delete()
+    with patch("argus.backend.plugins.core.PluginModelBase.get_stats_for_release") as mock_stats:
+        rolled_up = collector.collect(force=False, include_no_version=True)
+        mock_stats.assert_not_called()
+
+    assert json.loads(current_app.json.dumps(rolled_up)) == full
+
+
+@pytest.mark.docker_required
+def test_finish_run_refreshes_per_test_row_in_place(argus_db, fake_test, client_service, release):
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    ReleaseStatsCollector(release.name).collect(force=True, include_no_version=True)
+
+    client_service.update_run_status(run_type, run_req.run_id, "passed")
+    client_service.finish_run(run_type, run_req.run_id)
+
+    filter_key = snapshot_filter_key(None, None, True, False)
+    row = get_test_stats_rows(release.id, filter_key)[fake_test.id]
+    assert row["status"] == "passed"
+    assert row["last_runs"][0]["status"] == "passed"
+
+
+@pytest.mark.docker_required
+def test_structural_invalidation_drops_per_test_rows(argus_db, fake_test, client_service, release, release_manager_service):
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    ReleaseStatsCollector(release.name).collect(force=True, include_no_version=True)
+
+    release_manager_service.toggle_test_enabled(str(fake_test.id), True)
+
+    assert cached_filter_keys(release.id) == []
+
+
+# ---------------------------------------------------------------------------
+# Integration: view stats snapshots
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def view(fake_test) -> ArgusUserView:
+    view = ArgusUserView(name=f"stats_view_{uuid.uuid4().hex[:12]}", tests=[fake_test.id], widget_settings="[]")
+    view.save()
+    return view
+
+
+def test_view_snapshot_filter_key_separates_widgets():
+    assert view_snapshot_filter_key(None, None, True, False, None) == "v=::img=::nov=1::lim=0::w="
+    assert view_snapshot_filter_key("5.2", None, True, False, 0) == "v=5.2::img=::nov=1::lim=0::w=0"
+
+
+@pytest.mark.docker_required
+def test_view_snapshot_hit_skips_collection(argus_db, fake_test, client_service, view):
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    collector = ViewStatsCollector(view.id)
+    full = json.loads(current_app.json.dumps(collector.collect(include_no_version=True)))
+
+    with patch("argus.backend.service.stats.ArgusUserView.get") as mock_view:
+        cached = ViewStatsCollector(view.id).collect(include_no_version=True)
+        mock_view.assert_not_called()
+
+    assert cached == full
+    assert ViewTestMembership.get(test_id=fake_test.id, view_id=view.id)
+
+
+@pytest.mark.docker_required
+def test_run_status_change_drops_view_snapshots(argus_db, fake_test, client_service, view):
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    ViewStatsCollector(view.id).collect(include_no_version=True)
+    assert list(ViewStatsSnapshot.find(view_id=view.id).all())
+
+    client_service.update_run_status(run_type, run_req.run_id, "failed")
+
+    assert list(ViewStatsSnapshot.find(view_id=view.id).all()) == []
+    stats = ViewStatsCollector(view.id).collect(include_no_version=True)
+    assert stats["failed"] == 1
+
+
+@pytest.mark.docker_required
+def test_removing_test_from_view_unlinks_its_runs(argus_db, fake_test, client_service, view):
+    view.tests = []
+    view.save()
+    ViewStatsCollector(view.id).collect(include_no_version=True)
+
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+
+    assert list(ViewStatsSnapshot.find(view_id=view.id).all())
+    assert ViewTestMembership.find(test_id=fake_test.id, view_id=view.id).all() == []
+
+
+@pytest.mark.docker_required
+def test_disabling_group_or_test_drops_view_snapshots(argus_db, fake_test, release_manager_service, view):
+    for toggle in (lambda: release_manager_service.toggle_group_enabled(fake_test.group_id, False),
+                   lambda: release_manager_service.toggle_test_enabled(fake_test.id, False)):
+        ViewStatsCollector(view.id).collect(include_no_version=True)
+        assert list(ViewStatsSnapshot.find(view_id=view.id).all())
+
+        toggle()
+
+        assert list(ViewStatsSnapshot.find(view_id=view.id).all()) == []
+    release_manager_service.toggle_group_enabled(fake_test.group_id, True)
+
+
+@pytest.mark.docker_required
+def test_deleting_test_drops_view_snapshots(argus_db, fake_test, release_manager_service, view):
+    ViewStatsCollector(view.id).collect(include_no_version=True)
+
+    release_manager_service.delete_test(str(fake_test.id))
+
+    assert list(ViewStatsSnapshot.find(view_id=view.id).all()) == []
@@ -5,6 +5,7 @@ import uuid
 import pytest
 from flask import g
 
+from argus.backend.models.web import ViewStatsSnapshot
 from argus.backend.service.views import UserViewException, UserViewService
 
 
@@ -256,3 +257,23 @@ def test_view_stats_with_widget_id_filter_returns_ok(flask_client, view_name):
     res = flask_client.get(f"/api/v1/views/stats?viewId={view_id}&widgetId=0").json
     assert res["status"] == "ok"
     assert isinstance(res["response"], dict)
+
+
+def test_update_view_drops_stats_snapshots(flask_client, view_name, fake_test):
+    """Editing a view must not leave its dashboard served from the old definition."""
+    created = _create_view(flask_client, view_name)
+    view_id = created["response"]["id"]
+    assert flask_client.get(f"/api/v1/views/stats?viewId={view_id}").json["status"] == "ok"
+    assert list(ViewStatsSnapshot.find(view_id=uuid.UUID(view_id)).all())
+
+    update_payload = {
+        "viewId": view_id,
+        "updateData": {
+            "name": view_name,
+            "items": [f"test:{fake_test.id}"],
+            "widget_settings": '{"widgets": []}',
+        },
+    }
+    assert flask_client.post("/api/v1/views/update", json=update_payload).json["status"] == "ok"
+
+    assert list(ViewStatsSnapshot.find(view_id=uuid.UUID(view_id)).all()) == []
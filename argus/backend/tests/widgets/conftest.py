@@ -27,6 +27,7 @@ from argus.backend.models.result import (
 )
 from argus.backend.models.pytest import PytestResultTable, PytestUserField
 from argus.backend.models.web import ArgusUserView
+from argus.backend.plugins.generic.model import GenericRun
 from argus.backend.plugins.sct.testrun import SCTTestRun
 
 
@@ -272,11 +273,17 @@ def graph_view_for_test(generic_results_for_run: SeededGenericResults):
 
 @pytest.fixture
 def seeded_pytest_row(client_service, fake_test):
-    """Insert a single ``PytestResultTable`` + ``PytestUserField`` via the client service."""
+    """Insert a single ``PytestResultTable`` + ``PytestUserField`` via the client service.
+
+    The result belongs to a generic run of ``fake_test``, so it is indexed for
+    the pytest widget search of the test's release and views.
+    """
     name = f"pytest.widget_{uuid.uuid4().hex[:8]}"
     timestamp = _time.time()
+    run = GenericRun.create(build_id=fake_test.build_system_id, start_time=datetime.now(UTC), id=uuid.uuid4(),
+                            release_id=fake_test.release_id, group_id=fake_test.group_id, test_id=fake_test.id)
     payload = {
-        "run_id": uuid.uuid4(),
+        "run_id": run.id,
         "name": name,
         "status": "passed",
         "test_type": "unit",
@@ -294,6 +301,8 @@ def seeded_pytest_row(client_service, fake_test):
         "id": inserted["id"],
         "iso_id": inserted["id"].isoformat(),
         "status": "passed",
+        "test_id": fake_test.id,
+        "release_id": fake_test.release_id,
     }
 
     # Best-effort cleanup; pytest tables are partition-keyed by name so
@@ -306,6 +315,29 @@ def seeded_pytest_row(client_service, fake_test):
         PytestUserField.find(name=inserted["name"]).delete()
     except Exception:
         pass
+    try:
+        run.delete()
+    except Exception:
+        pass
+
+
+@pytest.fixture
+def seeded_pytest_view(flask_client, seeded_pytest_row) -> str:
+    """Create an ``ArgusUserView`` over the test of the seeded pytest row, yields the view id."""
+    resp = flask_client.post(
+        "/api/v1/views/create",
+        json={"name": f"pytest_view_{uuid.uuid4().hex[:8]}", "items": [f"test:{seeded_pytest_row['test_id']}"],
+              "settings": "{}"},
+    )
+    assert resp.status_code == 200, resp.text
+    view_id = resp.json["response"]["id"]
+
+    yield view_id
+
+    try:
+        ArgusUserView.get(id=uuid.UUID(view_id)).delete()
+    except DocumentNotFound:
+        pass
 
 
 @pytest.fixture
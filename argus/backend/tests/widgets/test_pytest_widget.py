@@ -1,8 +1,13 @@
 import uuid
 from datetime import datetime, timezone
+from unittest.mock import patch
+from urllib.parse import quote
 
 import pytest
 
+from argus.backend.models.pytest import PytestResultTable
+from argus.backend.service.views_widgets.pytest import PytestViewService
+
 
 def test_pytest_view_returns_zero(flask_client):
     res = flask_client.get("/api/v1/views/widgets/pytest/view").json
@@ -19,9 +24,8 @@ def _bracket_params() -> str:
 
 def test_pytest_view_results_empty(flask_client):
     view_id = uuid.uuid4()
-    # `result_filter` queries pytest_v2 globally (view_id/release_id are ignored
-    # by the service), so use a unique `test=` name filter to guarantee zero
-    # hits regardless of rows seeded by other test modules in the same session.
+    # An unknown view has no tests, the unique `test=` name filter keeps the
+    # result empty regardless of rows seeded by other test modules.
     marker = f"__widget_empty_marker_{uuid.uuid4().hex}__"
     res = flask_client.get(
         f"/api/v1/views/widgets/pytest/view/{view_id}/results?{_bracket_params()}&test={marker}"
@@ -63,13 +67,10 @@ def test_pytest_user_fields_invalid_id_errors(flask_client):
     assert res["status"] == "error"
 
 
-def test_pytest_view_results_with_seeded_row(flask_client, seeded_pytest_row):
-    """A seeded pytest row appears in result_filter output (via barChart/pieChart)."""
-    view_id = uuid.uuid4()
-    # status[] is required when filtering by id range -- pytest_v2 has status as
-    # a clustering key before id, so unrestricted id filtering would error.
+def test_pytest_view_results_with_seeded_row(flask_client, seeded_pytest_row, seeded_pytest_view):
+    """A seeded pytest row appears in the results of a view over its test (via barChart/pieChart)."""
     res = flask_client.get(
-        f"/api/v1/views/widgets/pytest/view/{view_id}/results?{_bracket_params()}&status[]=passed"
+        f"/api/v1/views/widgets/pytest/view/{seeded_pytest_view}/results?{_bracket_params()}&status[]=passed"
     ).json
     assert res["status"] == "ok"
     body = res["response"]
@@ -78,6 +79,134 @@ def test_pytest_view_results_with_seeded_row(flask_client, seeded_pytest_row):
     assert body["pieChart"].get("passed", 0) >= 1
 
 
+def test_pytest_view_results_are_scoped_to_the_view(flask_client, seeded_pytest_row):
+    """Results of tests outside the view are not returned."""
+    view_id = uuid.uuid4()
+    res = flask_client.get(
+        f"/api/v1/views/widgets/pytest/view/{view_id}/results?{_bracket_params()}&test={seeded_pytest_row['name']}"
+    ).json
+    assert res["status"] == "ok"
+    assert res["response"]["hits"] == []
+
+
+def test_pytest_release_results_filters_pushed_to_index(flask_client, seeded_pytest_row):
+    """Release results match on name, marker and user field filters from the search index."""
+    base = f"/api/v1/views/widgets/pytest/release/{seeded_pytest_row['release_id']}/results?{_bracket_params()}"
+    res = flask_client.get(
+        f"{base}&test={seeded_pytest_row['name']}&markers[]=widget_seed&filters[]=SCYLLA_MODE=release"
+    ).json
+    assert res["status"] == "ok"
+    hits = res["response"]["hits"]
+    assert [hit["name"] for hit in hits] == [seeded_pytest_row["name"]]
+    assert hits[0]["user_fields"] == {"SCYLLA_MODE": "release"}
+
+    res = flask_client.get(f"{base}&test={seeded_pytest_row['name']}&filters[]=!SCYLLA_MODE=release").json
+    assert res["response"]["hits"] == []
+
+
+def test_pytest_charts_count_submitted_results(flask_client, seeded_pytest_row, seeded_pytest_view):
+    """View and release charts are read from the daily status rollup the submission incremented."""
+    day = seeded_pytest_row["id"].astimezone(timezone.utc).date()
+    after = int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
+    params = f"after={after}&before={after + 86399}&test={seeded_pytest_row['name']}"
+
+    for scope in (f"view/{seeded_pytest_view}", f"release/{seeded_pytest_row['release_id']}"):
+        res = flask_client.get(f"/api/v1/views/widgets/pytest/{scope}/charts?{params}").json
+        assert res["status"] == "ok"
+        body = res["response"]
+        assert body["total"] == 1
+        assert body["pieChart"] == {"passed": 1}
+        assert body["barChart"]["labels"] == [day.strftime("%Y-%m-%d")]
+        passed = next(dataset for dataset in body["barChart"]["datasets"] if dataset["label"] == "passed")
+        assert passed["data"] == [1]
+
+    res = flask_client.get(f"/api/v1/views/widgets/pytest/view/{seeded_pytest_view}/charts?{params}&status[]=failed").json
+    assert res["response"]["total"] == 0
+
+
+def test_pytest_widget_resolves_matching_tests_once_per_request(flask_client, seeded_pytest_row, seeded_pytest_view):
+    """The name index is read once per request, not again for every day of the window."""
+    params = f"after={int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp())}&test={seeded_pytest_row['name']}"
+    for endpoint in ("charts", "results"):
+        with patch.object(PytestViewService, "matching_test_ids", autospec=True,
+                          side_effect=PytestViewService.matching_test_ids) as matching:
+            res = flask_client.get(f"/api/v1/views/widgets/pytest/view/{seeded_pytest_view}/{endpoint}?{params}").json
+        assert res["status"] == "ok"
+        assert res["response"]["total"] >= 1
+        assert matching.call_count == 1
+
+
+def test_pytest_widget_skips_tests_without_pytest_results(flask_client, seeded_pytest_row):
+    """Only tests that reported pytest results are read, with or without a name filter."""
+    test_id = seeded_pytest_row["test_id"]
+    service = PytestViewService()
+
+    assert service.matching_test_ids([test_id, uuid.uuid4()], None) == [test_id]
+    assert service.matching_test_ids([test_id, uuid.uuid4()], seeded_pytest_row["name"]) == [test_id]
+    assert service.matching_test_ids([test_id], f"__no_such_test_{uuid.uuid4().hex}__") == []
+
+
+def test_pytest_charts_count_resubmitted_result_once(flask_client, client_service, seeded_pytest_row,
+                                                    seeded_pytest_view):
+    """A result posted again is counted once, under the status it was last reported with."""
+    seeded = PytestResultTable.find(name=seeded_pytest_row["name"]).first()
+    timestamp = seeded_pytest_row["id"].timestamp()
+    payload = {
+        "run_id": seeded.run_id,
+        "name": seeded_pytest_row["name"],
+        "status": "passed",
+        "test_type": "unit",
+        "timestamp": timestamp,
+        "session_timestamp": timestamp,
+        "markers": [],
+        "user_fields": {},
+        "message": "",
+        "duration": 1.5,
+    }
+    client_service.submit_pytest_result(payload)
+    client_service.submit_pytest_results([payload])
+    client_service.submit_pytest_results([{**payload, "status": "failed"}])
+
+    day = seeded_pytest_row["id"].astimezone(timezone.utc).date()
+    after = int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
+    params = f"after={after}&before={after + 86399}&test={seeded_pytest_row['name']}"
+    res = flask_client.get(f"/api/v1/views/widgets/pytest/view/{seeded_pytest_view}/charts?{params}").json
+    assert res["response"]["total"] == 1
+    assert res["response"]["pieChart"] == {"failed": 1}
+
+
+def test_pytest_results_cursor_pagination(flask_client, client_service, seeded_pytest_row, seeded_pytest_view):
+    """Pages requested with the returned cursor continue after the last hit of the previous page."""
+    base_payload = {
+        "run_id": None,
+        "name": seeded_pytest_row["name"],
+        "status": "passed",
+        "test_type": "unit",
+        "markers": [],
+        "user_fields": {},
+        "message": "",
+        "duration": 1.0,
+    }
+    seeded = PytestResultTable.find(name=seeded_pytest_row["name"]).first()
+    for offset in (1, 2):
+        timestamp = seeded_pytest_row["id"].timestamp() - offset * 60
+        client_service.submit_pytest_result({**base_payload, "run_id": seeded.run_id,
+                                             "timestamp": timestamp, "session_timestamp": timestamp})
+
+    url = (f"/api/v1/views/widgets/pytest/view/{seeded_pytest_view}/results?{_bracket_params()}"
+           f"&test={seeded_pytest_row['name']}&limit=2")
+    first = flask_client.get(url).json["response"]
+    assert first["total"] == 3
+    assert len(first["hits"]) == 2
+    assert first["cursor"]
+
+    second = flask_client.get(f"{url}&cursor={quote(first['cursor'])}").json["response"]
+    assert len(second["hits"]) == 1
+    assert second["cursor"] is None
+    ids = [hit["id"] for hit in first["hits"] + second["hits"]]
+    assert len(set(ids)) == 3
+
+
 def test_pytest_user_fields_for_seeded_row(flask_client, seeded_pytest_row):
     """get_user_fields_for_result returns the user_fields submitted with the row."""
     res = flask_client.get(
@@ -1,11 +1,12 @@
 import base64
+import hashlib
 from itertools import islice
 import logging
 import os
 from typing import Callable, Iterable, TypeVar
 from uuid import UUID
 
-from flask import Request, Response, g
+from flask import Request, Response, current_app, g, jsonify
 
 from argus.backend.models.web import User
 
@@ -54,6 +55,21 @@ def get_payload(client_request: Request) -> dict:
     return request_payload
 
 
+def conditional_json_response(client_request: Request, etag_parts: Iterable[str], build: Callable[[], dict]) -> Response:
+    """JSON response of `build()` with an ETag derived from `etag_parts`.
+
+    The parts must change whenever the built payload would, so a matching If-None-Match
+    is answered with 304 Not Modified without building the payload at all.
+    """
+    etag = hashlib.sha1(":".join(etag_parts).encode()).hexdigest()
+    if client_request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(etag)
+    return response
+
+
 def current_user() -> User:
     return g.user
 
@@ -13,6 +13,7 @@ class ArgusGenericClient(ArgusClient):
 
     class Routes(ArgusClient.Routes):
         TRIGGER_JOBS = "/planning/plan/trigger"
+        TRIGGER_STATUS = "/planning/plan/trigger/$id/status"
 
     def __init__(self, auth_token: str, base_url: str, log_dir, api_version="v1",
                  extra_headers: dict | None = None, timeout: int = 180, max_retries: int = 3,
@@ -35,13 +36,21 @@ class ArgusGenericClient(ArgusClient):
         response = self.submit_run(run_type=self.test_type, run_body=request_body)
         self.check_response(response)
 
-    def trigger_jobs(self, common_params: dict[str, str], params: list[dict[str, str]], version: str = None, release: str = None, plan_id: str = None):
+    def trigger_jobs(self, common_params: dict[str, str], params: list[dict[str, str]], version: str = None, release: str = None, plan_id: str = None,
+                     wait: bool = True):
+        """
+        Trigger the jobs of the matching release plans.
+
+        Waits until every job is triggered unless `wait` is False, in which case the
+        response only carries the `trigger_id` to follow with get_trigger_status().
+        """
         request_body = {
             "common_params": common_params,
             "params": params,
             "version": version,
             "release": release,
             "plan_id": plan_id,
+            "wait": wait,
         }
         response = self.post(
             endpoint=self.Routes.TRIGGER_JOBS,
@@ -54,6 +63,12 @@ class ArgusGenericClient(ArgusClient):
         self.check_response(response)
         return response.json()
 
+    def get_trigger_status(self, trigger_id: UUID | str) -> dict:
+        """Progress of a plan trigger: urls of the triggered jobs, failed build ids and the status of every job."""
+        response = self.get(endpoint=self.Routes.TRIGGER_STATUS, location_params={"id": str(trigger_id)})
+        self.check_response(response)
+        return response.json()["response"]
+
     def finalize_generic_run(self, run_id: str, status: str, scylla_version: str | None = None):
         response = self.finalize_run(run_type=self.test_type, run_id=run_id, body={
             "status": status,
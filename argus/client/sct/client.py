@@ -6,6 +6,7 @@ from argus.common.email import RawAttachment, ReportSection, ReportSectionShortH
 from argus.common.sct_types import GeminiResultsRequest, PerformanceResultsRequest, RawEventPayload
 from argus.common.enums import ResourceState, TestStatus
 from argus.client.base import ArgusClient
+from argus.client.sct.event_buffer import DEFAULT_BATCH_SIZE, DEFAULT_FLUSH_INTERVAL, DEFAULT_MAX_QUEUED, EventBuffer
 from argus.client.sct.types import EventsInfo, LogLink, Package
 from argus.common.utils import clamp_ts_to_milliseconds
 
@@ -38,10 +39,26 @@ class ArgusSCTClient(ArgusClient):
 
     def __init__(self, run_id: UUID, auth_token: str, base_url: str, log_dir, api_version="v1",
                  extra_headers: dict | None = None, timeout: int = 60, max_retries: int = 3,
-                 use_tunnel: bool | None = None, replay_log_only: bool = False) -> None:
+                 use_tunnel: bool | None = None, replay_log_only: bool = False,
+                 buffer_events: bool = False, event_batch_size: int = DEFAULT_BATCH_SIZE,
+                 event_flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 max_queued_events: int = DEFAULT_MAX_QUEUED) -> None:
         super().__init__(auth_token, base_url, log_dir=log_dir, api_version=api_version,
                          extra_headers=extra_headers, timeout=timeout, max_retries=max_retries,
                          use_tunnel=use_tunnel, replay_log_only=replay_log_only, run_id=run_id)
+        # Opt-in: submit_event only queues the event, a background thread ships them in batches
+        self._event_buffer = EventBuffer(
+            send=self._post_events,
+            spill=self._spill_events,
+            batch_size=event_batch_size,
+            flush_interval=event_flush_interval,
+            max_queued=max_queued_events,
+        ) if buffer_events else None
+
+    def close(self) -> None:
+        if self._event_buffer is not None:
+            self._event_buffer.close(timeout=self._timeout)
+        super().close()
 
     def submit_sct_run(self, job_name: str, job_url: str, started_by: str, commit_id: str,
                        origin_url: str, branch_name: str, sct_config: dict) -> None:
@@ -118,6 +135,21 @@ class ArgusSCTClient(ArgusClient):
         self.check_response(response)
 
     def submit_event(self, event_data: RawEventPayload | list[RawEventPayload]):
+        if self._event_buffer is not None:
+            for event in event_data if isinstance(event_data, list) else [event_data]:
+                self._event_buffer.put(event)
+            return
+        self._post_events(event_data)
+
+    def flush_events(self, timeout: float | None = None) -> bool:
+        """
+            Sends the events queued in buffered mode, returns False if they were not sent within timeout.
+        """
+        if self._event_buffer is None:
+            return True
+        return self._event_buffer.flush(timeout=timeout)
+
+    def _post_events(self, event_data: RawEventPayload | list[RawEventPayload]) -> None:
         response = self.post(
             endpoint=self.Routes.SUBMIT_EVENT,
             location_params={"id": str(self.run_id)},
@@ -128,6 +160,10 @@ class ArgusSCTClient(ArgusClient):
         )
         self.check_response(response)
 
+    def _spill_events(self, events: list[RawEventPayload], reason: str) -> None:
+        self._replay_log.write("POST", self.Routes.SUBMIT_EVENT, {"id": str(self.run_id)}, None,
+                               {**self.generic_body, "data": events}, success=False, error=reason)
+
     def submit_sct_logs(self, logs: list[LogLink]) -> None:
         """
             Submits links to logs collected from nodes by SCT
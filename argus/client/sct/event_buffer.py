@@ -0,0 +1,182 @@
+"""Background batching of SCT events for :class:`ArgusSCTClient`.
+
+In buffered mode ``ArgusSCTClient.submit_event`` only enqueues the event and
+returns; a single ``argus-event-sender`` thread ships the queued events in
+batches through the list form of the ``event/submit`` endpoint. A batch is
+sent once it holds ``batch_size`` events, once its oldest event is
+``flush_interval`` seconds old, on :meth:`EventBuffer.flush` and on
+:meth:`EventBuffer.close`.
+
+Events are sent in submission order by one thread, so events of the same
+severity reach Argus in the order SCT produced them. The queue is bounded:
+when Argus cannot keep up and the queue is full, an event is not waited for
+but spilled straight to the replay log as an unsent request, so the calling
+event loop never blocks on Argus and nothing is silently lost. Failed batches
+are recorded in the replay log by ``ArgusClient.post`` like any other call.
+
+Events put once :meth:`EventBuffer.close` has begun are spilled as well. When
+the sender does not finish within the close timeout (bounded when the buffer
+is closed at interpreter exit), the events it has not sent yet, including the
+batch whose request is still in flight, are spilled and the sender stops.
+"""
+from __future__ import annotations
+
+import atexit
+import functools
+import logging
+import queue
+import threading
+import time
+import weakref
+from typing import Callable
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 2.0
+DEFAULT_MAX_QUEUED = 10000
+# An unreachable Argus must not hold up interpreter exit for the client's whole retry budget
+ATEXIT_CLOSE_TIMEOUT = 10.0
+
+_STOP = object()
+
+
+class EventBuffer:
+    """Bounded queue of events drained in batches by a background sender thread."""
+
+    def __init__(
+        self,
+        send: Callable[[list[dict]], None],
+        spill: Callable[[list[dict], str], None],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+    ) -> None:
+        self._send = send
+        self._spill = spill
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queued)
+        self._closed = False
+        self._close_lock = threading.Lock()
+        # Events taken off the queue and not sent yet, and whether close() gave up on the sender
+        self._batch: list[dict] = []
+        self._sending: list[dict] = []
+        self._abandoned = False
+        self._sender_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="argus-event-sender", daemon=True)
+        self._thread.start()
+        # Ship what is still queued when the interpreter exits without close()
+        self._atexit_callback = functools.partial(self._atexit_close, weakref.ref(self))
+        atexit.register(self._atexit_callback)
+
+    @staticmethod
+    def _atexit_close(buffer_ref: "weakref.ReferenceType[EventBuffer]") -> None:
+        buffer = buffer_ref()
+        if buffer is not None:
+            buffer.close(timeout=ATEXIT_CLOSE_TIMEOUT)
+
+    def put(self, event: dict) -> bool:
+        """Queue an event without blocking; returns False if it was spilled to the replay log instead."""
+        # Checked and queued under the close lock, so no event lands behind the stop marker
+        with self._close_lock:
+            closed = self._closed
+            if not closed:
+                try:
+                    self._queue.put_nowait(event)
+                    return True
+                except queue.Full:
+                    pass
+        if closed:
+            self._spill([event], "event buffer closed")
+        else:
+            LOGGER.warning("Argus event buffer is full, spilling event to the replay log")
+            self._spill([event], "event buffer full")
+        return False
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Send everything queued so far; returns False if that did not finish within ``timeout``."""
+        if self._closed:
+            return not self._thread.is_alive()
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Send the remaining events and stop the sender thread, spilling what is not sent within ``timeout``."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        atexit.unregister(self._atexit_callback)
+        started = time.monotonic()
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+            self._thread.join(None if timeout is None else max(0.0, timeout - (time.monotonic() - started)))
+        except queue.Full:
+            pass
+        if self._thread.is_alive():
+            LOGGER.warning("Argus event sender did not finish within %ss, spilling unsent events", timeout)
+            with self._sender_lock:
+                self._abandoned = True
+                events = [*self._sending, *self._batch]
+                self._sending, self._batch = [], []
+            self._spill_queued(events)
+
+    def _spill_queued(self, events: list[dict]) -> None:
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, dict):
+                events.append(item)
+            elif isinstance(item, threading.Event):
+                item.set()
+        if events:
+            self._spill(events, "event sender did not finish")
+
+    def _ship(self) -> None:
+        with self._sender_lock:
+            if self._abandoned or not self._batch:
+                return
+            batch, self._batch = self._batch, []
+            self._sending = batch
+        try:
+            self._send(batch)
+        except Exception:  # noqa: BLE001 - the failed request is already in the replay log
+            LOGGER.warning("Failed to submit %s events to Argus", len(batch), exc_info=True)
+        finally:
+            with self._sender_lock:
+                self._sending = []
+
+    def _run(self) -> None:
+        deadline = 0.0
+        while not self._abandoned:
+            timeout = max(0.0, deadline - time.monotonic()) if self._batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._ship()
+                continue
+            if item is _STOP:
+                self._ship()
+                return
+            if isinstance(item, threading.Event):
+                self._ship()
+                item.set()
+                continue
+            with self._sender_lock:
+                if self._abandoned:
+                    # close() already spilled the rest, this one was taken off the queue meanwhile
+                    self._spill([item], "event sender did not finish")
+                    return
+                if not self._batch:
+                    deadline = time.monotonic() + self.flush_interval
+                self._batch.append(item)
+                full = len(self._batch) >= self.batch_size
+            if full:
+                self._ship()
@@ -0,0 +1,152 @@
+"""Tests for buffered SCT event shipping."""
+import json
+import threading
+import time
+from uuid import uuid4
+
+from argus.client.sct.client import ArgusSCTClient
+from argus.client.sct.event_buffer import EventBuffer
+
+BASE_URL = "https://test.example.com"
+
+
+def _event(index: int, severity: str = "NORMAL") -> dict:
+    return {"severity": severity, "ts": 1700000000 + index, "message": f"event {index}", "event_type": "DatabaseEvent"}
+
+
+def _client(tmp_path, run_id, **kwargs) -> ArgusSCTClient:
+    return ArgusSCTClient(run_id=run_id, auth_token="test_token", base_url=BASE_URL, log_dir=tmp_path,
+                          buffer_events=True, **kwargs)
+
+
+def test_buffered_client_should_send_batches_in_submission_order(requests_mock, tmp_path):
+    run_id = uuid4()
+    route = requests_mock.post(f"{BASE_URL}/api/v1/client/sct/{run_id}/event/submit", json={"status": "ok", "response": []})
+    client = _client(tmp_path, run_id, event_batch_size=4, event_flush_interval=60)
+
+    for index in range(10):
+        client.submit_event(_event(index, severity=["NORMAL", "ERROR"][index % 2]))
+    client.close()
+
+    batches = [request.json()["data"] for request in route.request_history]
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert [event["message"] for batch in batches for event in batch] == [f"event {index}" for index in range(10)]
+
+
+def test_buffered_client_should_flush_old_events(requests_mock, tmp_path):
+    run_id = uuid4()
+    route = requests_mock.post(f"{BASE_URL}/api/v1/client/sct/{run_id}/event/submit", json={"status": "ok", "response": []})
+    client = _client(tmp_path, run_id, event_batch_size=100, event_flush_interval=0.05)
+
+    client.submit_event([_event(0), _event(1)])
+    deadline = time.monotonic() + 5
+    while not route.called and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert route.call_count == 1
+    assert len(route.last_request.json()["data"]) == 2
+    client.close()
+
+
+def test_flush_events_should_send_queued_events(requests_mock, tmp_path):
+    run_id = uuid4()
+    route = requests_mock.post(f"{BASE_URL}/api/v1/client/sct/{run_id}/event/submit", json={"status": "ok", "response": []})
+    client = _client(tmp_path, run_id, event_batch_size=100, event_flush_interval=60)
+
+    client.submit_event(_event(0))
+
+    assert client.flush_events(timeout=5)
+    assert route.call_count == 1
+    client.close()
+
+
+def test_full_buffer_should_spill_instead_of_blocking(tmp_path):
+    sending, release = threading.Event(), threading.Event()
+    sent, spilled = [], []
+
+    def send(batch):
+        sending.set()
+        release.wait(5)
+        sent.extend(batch)
+
+    buffer = EventBuffer(send=send, spill=lambda events, reason: spilled.extend(events), batch_size=1,
+                         flush_interval=60, max_queued=2)
+    buffer.put(_event(0))
+    assert sending.wait(5)
+
+    accepted = [buffer.put(_event(index)) for index in range(1, 4)]
+    release.set()
+    buffer.close(timeout=5)
+
+    assert accepted == [True, True, False]
+    assert sent == [_event(0), _event(1), _event(2)]
+    assert spilled == [_event(3)]
+
+
+def test_buffered_client_should_record_spilled_events_as_unsent(tmp_path):
+    run_id = uuid4()
+    client = _client(tmp_path, run_id)
+    client._event_buffer.close()
+
+    client.submit_event(_event(0))
+    client.close()
+
+    records = [json.loads(line) for line in client.replay_log_path.read_text().splitlines()]
+    assert len(records) == 1
+    assert records[0]["success"] is False
+    assert records[0]["body"]["data"] == [_event(0)]
+
+
+def test_close_should_spill_unsent_events_when_sender_hangs(tmp_path):
+    sending, release = threading.Event(), threading.Event()
+    spilled = []
+
+    def send(batch):
+        sending.set()
+        release.wait(5)
+
+    buffer = EventBuffer(send=send, spill=lambda events, reason: spilled.extend(events), batch_size=1,
+                         flush_interval=60, max_queued=10)
+    buffer.put(_event(0))
+    assert sending.wait(5)
+    buffer.put(_event(1))
+
+    started = time.monotonic()
+    buffer.close(timeout=0.1)
+    elapsed = time.monotonic() - started
+    release.set()
+
+    assert elapsed < 2
+    assert spilled == [_event(0), _event(1)]
+
+
+def test_atexit_close_should_be_bounded(monkeypatch, tmp_path):
+    sending, release = threading.Event(), threading.Event()
+    spilled = []
+
+    def send(batch):
+        sending.set()
+        release.wait(5)
+
+    monkeypatch.setattr("argus.client.sct.event_buffer.ATEXIT_CLOSE_TIMEOUT", 0.1)
+    buffer = EventBuffer(send=send, spill=lambda events, reason: spilled.extend(events), batch_size=1,
+                         flush_interval=60, max_queued=10)
+    buffer.put(_event(0))
+    assert sending.wait(5)
+
+    buffer._atexit_callback()
+    release.set()
+
+    assert spilled == [_event(0)]
+
+
+def test_put_after_close_should_spill(tmp_path):
+    sent, spilled = [], []
+    buffer = EventBuffer(send=sent.extend, spill=lambda events, reason: spilled.extend(events), batch_size=10,
+                         flush_interval=60, max_queued=10)
+    buffer.put(_event(0))
+    buffer.close(timeout=5)
+
+    assert buffer.put(_event(1)) is False
+    assert sent == [_event(0)]
+    assert spilled == [_event(1)]
@@ -12,31 +12,75 @@ Deduplication is scoped to a single run: an event's embedding is compared only
 against the embeddings already stored for the same ``run_id``. Because ``run_id``
 is the partition key of both embedding tables, this is a single-partition read,
 so exact cosine over the partition is cheap and correct regardless of the total
-table size.
+table size. The partition is read once per run and then kept in memory as a
+normalized embedding matrix (see ``argusAI.utils.embedding_matrix_cache``), so
+each further event costs a single matrix-vector product.
+
+Events are handled a batch at a time: messages for the whole fetched batch are read
+concurrently, sanitized, and embedded in a single forward pass of the model. Duplicate
+detection walks the batch in queue order against the stored partition plus the events
+accepted earlier in the same batch, so the outcome matches processing the events one by
+one. Embedding inserts, duplicate markers and queue deletions are then written concurrently.
+
+Several workers can share the queue: started with ``--workers N`` (a local process pool) or
+as N ``--worker-index`` instances, each worker processes only the token-range shards of
+``sct_unprocessed_events`` it holds a lease on (see ``argusAI.utils.shard_lease``).
 """
 
+import argparse
 import logging
+import multiprocessing
+import signal
 import time
+from dataclasses import dataclass
 from threading import Event
 from uuid import UUID
 from datetime import datetime
 
-from chromadb.utils.distance_functions import cosine
-from numpy import array
-
 from argus.backend.models.argus_ai import SCTCriticalEventEmbedding, SCTErrorEventEmbedding
 from argus.backend.plugins.sct.testrun import SCTUnprocessedEvent, SCTEvent
 from argus.backend.util.logsetup import setup_application_logging
 from argusAI.utils.scylla_connection import ScyllaConnection
 from argusAI.utils.embedding import BgeSmallEnEmbeddingModel
+from argusAI.utils.embedding_matrix_cache import (
+    DEFAULT_IDLE_SECONDS,
+    DEFAULT_MAX_RUNS,
+    EmbeddingMatrixCache,
+    RunEmbeddingMatrix,
+    normalize,
+)
 from argusAI.utils.event_message_sanitizer import MessageSanitizer
+from argusAI.utils.shard_lease import DEFAULT_LEASE_SECONDS, ShardLeaseManager, shard_token_range
 from argusAI.utils.summary_dispatcher import SummaryDispatcher
+from argusAI.utils import similarity_metrics as metrics
 
 LOGGER = logging.getLogger(__name__)
 SLEEP_INTERVAL = 1  # Sleep for 1 second between processing cycles
 
 # Maximum cosine distance for two embeddings to be considered duplicates.
 DUPLICATE_DISTANCE_THRESHOLD = 0.05
+# In-flight statements for the concurrent reads and writes of a batch.
+BATCH_CONCURRENCY = 50
+# Page size of the run partition reads, a run can store thousands of embeddings.
+PARTITION_FETCH_SIZE = 5000
+# Token-range shards of the unprocessed queue when running with several workers.
+DEFAULT_SHARDS = 16
+# Sanitized messages memoized by the sanitizer; failing runs repeat the same ERROR many times.
+SANITIZER_MEMO_SIZE = 1024
+
+
+@dataclass
+class PendingEvent:
+    """An unprocessed event carried through the batched pipeline."""
+
+    run_id: UUID
+    severity: str
+    ts: datetime
+    event_id: UUID | None = None
+    message: str | None = None
+    sanitized: str | None = None
+    embedding: list[float] | None = None
+    error: str | None = None
 
 
 class EventSimilarityProcessorV2:
@@ -44,19 +88,27 @@ class EventSimilarityProcessorV2:
     Processes unprocessed SCT events by generating embeddings and storing them in severity-specific tables.
     """
 
-    def __init__(self, stop_event: Event | None = None) -> None:
+    def __init__(self, stop_event: Event | None = None, worker_index: int = 0, workers: int = 1) -> None:
         """
         Initialize the processor with embedding model and sanitizer.
 
         Args:
             stop_event: Optional threading.Event to signal shutdown
+            worker_index: Index of this worker when several workers share the queue
+            workers: Number of workers sharing the queue; above 1 the queue is processed by shard
         """
         self.embedding_model = BgeSmallEnEmbeddingModel()
-        self.sanitizer = MessageSanitizer()
+        self.sanitizer = MessageSanitizer(memo_size=SANITIZER_MEMO_SIZE)
         self.stop_event = stop_event or Event()
         self.db = ScyllaConnection()
         self.processed_count = 0
         self.error_count = 0
+        self.last_batch_rate = 0.0
+        # Per-run embedding matrices; a run's partition is read from Scylla only on first use.
+        self.embedding_cache = EmbeddingMatrixCache(
+            max_runs=int(self.db.config.get("EVENT_SIMILARITY_CACHED_RUNS", DEFAULT_MAX_RUNS)),
+            idle_seconds=float(self.db.config.get("EVENT_SIMILARITY_CACHE_IDLE_SECONDS", DEFAULT_IDLE_SECONDS)),
+        )
         self.keyspace = (
             SCTCriticalEventEmbedding.Settings.keyspace
             or SCTErrorEventEmbedding.Settings.keyspace
@@ -66,49 +118,32 @@ class EventSimilarityProcessorV2:
         # Inert unless EVENT_SUMMARIZATION_ENABLED and OPENAI_API_KEY are configured; the
         # embedding path is never blocked or altered by it.
         self.summary_dispatcher = SummaryDispatcher(self.db, self.db.config)
-        LOGGER.info("EventSimilarityProcessorV2 initialized")
-
-    def _get_potential_duplicate_rows(self, run_id: UUID, table_name: str) -> list:
-        """Read every embedding already stored for ``run_id`` (single-partition read)."""
-        query = f"SELECT ts, embedding FROM {self.keyspace}.{table_name} WHERE run_id = ?"
-        bound_statement = self.db.session.prepare(query)
-        return list(self.db.session.execute(bound_statement, parameters=[run_id]))
-
-    def _mark_event_is_duplicate(self, run_id: UUID, ts: datetime, severity: str, embedding: list[float]) -> bool:
-        try:
-            table_name = (
-                SCTErrorEventEmbedding.table_name() if severity == "ERROR" else SCTCriticalEventEmbedding.table_name()
-            )
-            query_vector = array(embedding, dtype=float)
-            dupe = next(
-                (
-                    row
-                    for row in self._get_potential_duplicate_rows(run_id, table_name)
-                    if row.ts != ts  # never match the event against its own stored embedding
-                    and cosine(array(row.embedding, dtype=float), query_vector) < DUPLICATE_DISTANCE_THRESHOLD
-                ),
-                None,
+        self.leases = None
+        if workers > 1:
+            self.leases = ShardLeaseManager(
+                self.db,
+                shards=max(int(self.db.config.get("EVENT_SIMILARITY_SHARDS", DEFAULT_SHARDS)), workers),
+                worker_index=worker_index,
+                workers=workers,
+                lease_seconds=int(self.db.config.get("EVENT_SIMILARITY_LEASE_SECONDS", DEFAULT_LEASE_SECONDS)),
             )
-            if not dupe:
-                return False
-            q = f"SELECT event_id FROM {SCTEvent.table_name()} WHERE run_id = ? AND severity = ? AND ts = ?"
-            bound_q = self.db.session.prepare(q)
-            dupe_event = self.db.session.execute(bound_q, parameters=(run_id, severity, dupe.ts)).one()
-            if dupe_event is None:
-                return False
-            self._clear_unprocessed_event(SCTUnprocessedEvent.table_name(), run_id, severity, ts)
-            update_query = (
-                f"UPDATE {SCTEvent.table_name()} SET duplicate_id = ? WHERE run_id = ? AND severity = ? AND ts = ?"
-            )
-            self.db.execute(update_query, (dupe_event.event_id, run_id, severity, ts))
-            return True
-        except Exception as e:
-            LOGGER.error(f"Duplicate search error: {e}", exc_info=True)
-            raise
+        LOGGER.info("EventSimilarityProcessorV2 initialized")
 
-    def _clear_unprocessed_event(self, table_name: str, run_id: str, severity: str, ts: datetime):
-        delete_query = f"DELETE FROM {table_name} WHERE run_id = ? AND severity = ? AND ts = ?"
-        self.db.execute(delete_query, (run_id, severity, ts))
+    def _find_duplicate_event_id(
+        self, matrix: RunEmbeddingMatrix, run_id: UUID, severity: str, ts: datetime, query_vector
+    ) -> UUID | None:
+        index = matrix.find_duplicate(query_vector, ts, DUPLICATE_DISTANCE_THRESHOLD)
+        if index is None:
+            return None
+        if matrix.event_ids[index]:
+            return matrix.event_ids[index]
+        q = f"SELECT event_id FROM {SCTEvent.table_name()} WHERE run_id = ? AND severity = ? AND ts = ?"
+        bound_q = self.db.session.prepare(q)
+        dupe_event = self.db.session.execute(bound_q, parameters=(run_id, severity, matrix.ts[index])).one()
+        if dupe_event is None:
+            return None
+        matrix.event_ids[index] = dupe_event.event_id
+        return dupe_event.event_id
 
     def process_unprocessed_events(self) -> None:
         """
@@ -117,12 +152,14 @@ class EventSimilarityProcessorV2:
         LOGGER.info("Starting event processing loop")
         while not self.stop_event.is_set():
             try:
-                batch_processed = self._process_batch()
+                batch_processed = self._process_owned_shards() if self.leases else self._process_batch()
                 if batch_processed == 0:
                     # No events to process, sleep before next iteration
                     time.sleep(SLEEP_INTERVAL)
                 else:
-                    LOGGER.info(f"Processed {batch_processed} events in this batch")
+                    LOGGER.info(
+                        f"Processed {batch_processed} events in this batch ({self.last_batch_rate:.1f} events/s)"
+                    )
             except Exception as e:
                 LOGGER.error(f"Error in processing loop: {e}", exc_info=True)
                 self.error_count += 1
@@ -130,20 +167,37 @@ class EventSimilarityProcessorV2:
 
         LOGGER.info(f"Processing loop stopped. Total processed: {self.processed_count}, Errors: {self.error_count}")
 
-    def _process_batch(self, batch_size: int = 100) -> int:
+    def _process_owned_shards(self) -> int:
+        """Process one batch from every queue shard this worker currently holds a lease on."""
+        shards, dropped = self.leases.refresh()
+        if dropped:
+            # Runs of a shard we no longer own may get embeddings stored by another worker
+            self.embedding_cache.clear()
+        return sum(self._process_batch(shard=shard) for shard in shards if not self.stop_event.is_set())
+
+    def _process_batch(self, batch_size: int = 100, shard: int | None = None) -> int:
         """
         Process a batch of unprocessed events.
 
         Args:
             batch_size: Maximum number of events to process in one batch
+            shard: Only take events of this token-range shard of the queue
 
         Returns:
             Number of events processed in this batch
         """
         # Fetch unprocessed events using raw query
-        query = f"SELECT run_id, severity, ts FROM {SCTUnprocessedEvent.table_name()} LIMIT {batch_size}"
+        params = None
+        if shard is None:
+            query = f"SELECT run_id, severity, ts FROM {SCTUnprocessedEvent.table_name()} LIMIT {batch_size}"
+        else:
+            query = (
+                f"SELECT run_id, severity, ts FROM {SCTUnprocessedEvent.table_name()} "
+                f"WHERE token(run_id) >= ? AND token(run_id) <= ? LIMIT {batch_size}"
+            )
+            params = shard_token_range(shard, self.leases.shards)
         try:
-            rows = self.db.execute(query)
+            rows = self.db.execute(query, params)
             unprocessed_events = list(rows)
         except Exception as e:
             LOGGER.error(f"Failed to fetch unprocessed events: {e}", exc_info=True)
@@ -152,127 +206,238 @@ class EventSimilarityProcessorV2:
         if not unprocessed_events:
             return 0
 
-        processed_in_batch = 0
+        started = time.perf_counter()
+        events = [PendingEvent(run_id=row.run_id, severity=row.severity, ts=row.ts) for row in unprocessed_events]
+        self._read_events(events)
+        self._sanitize_events(events)
+        embedding_started = time.perf_counter()
+        self._embed_events(events)
+        embedding_seconds = time.perf_counter() - embedding_started
+        statements, owners, outcomes = self._deduplicate_events(events)
+
+        # Failed events are still removed from the queue to avoid infinite retries
+        for index, event in enumerate(events):
+            statements.append(
+                (
+                    f"DELETE FROM {SCTUnprocessedEvent.table_name()} WHERE run_id = ? AND severity = ? AND ts = ?",
+                    (event.run_id, event.severity, event.ts),
+                )
+            )
+            owners.append(index)
+        for (success, result), index in zip(
+            self.db.execute_concurrent(statements, concurrency=BATCH_CONCURRENCY), owners
+        ):
+            event = events[index]
+            if not success and not event.error:
+                event.error = f"Failed to store event: {result}"
+                # The cached matrix may now hold an embedding that was never stored
+                self.embedding_cache.discard((event.run_id, self._embedding_table(event.severity)))
 
-        for event_row in unprocessed_events:
-            try:
-                self._process_single_event(run_id=event_row.run_id, severity=event_row.severity, ts=event_row.ts)
-                processed_in_batch += 1
-                self.processed_count += 1
-            except Exception as e:
+        processed_in_batch = 0
+        for event, outcome in zip(events, outcomes):
+            if event.error:
                 LOGGER.error(
-                    f"Failed to process event (run_id={event_row.run_id}, "
-                    f"severity={event_row.severity}, ts={event_row.ts}): {e}",
-                    exc_info=True,
+                    f"Failed to process event (run_id={event.run_id}, "
+                    f"severity={event.severity}, ts={event.ts}): {event.error}"
                 )
                 self.error_count += 1
-                # Still delete the unprocessed event to avoid infinite retries
-                delete_query = (
-                    f"DELETE FROM {SCTUnprocessedEvent.table_name()} WHERE run_id = ? AND severity = ? AND ts = ?"
-                )
-                self.db.execute(delete_query, (event_row.run_id, event_row.severity, event_row.ts))
+            else:
+                processed_in_batch += 1
+                self.processed_count += 1
+            metrics.EVENTS.labels(event.severity, "failed" if event.error else outcome).inc()
+
+        self.last_batch_rate = metrics.record_batch(len(events), time.perf_counter() - started, embedding_seconds)
         return processed_in_batch
 
-    def _process_single_event(self, run_id: UUID, severity: str, ts: datetime) -> None:
-        """
-        Process a single event: read, sanitize, embed, store, and cleanup.
+    def _read_events(self, events: list[PendingEvent]) -> None:
+        """Read event ids and messages for the whole batch concurrently."""
+        query = f"SELECT event_id, message FROM {SCTEvent.table_name()} WHERE run_id = ? AND severity = ? AND ts = ?"
+        results = self.db.execute_concurrent(
+            [(query, (event.run_id, event.severity, event.ts)) for event in events], concurrency=BATCH_CONCURRENCY
+        )
+        for event, (success, result) in zip(events, results):
+            if not success:
+                event.error = f"Failed to read event: {result}"
+                continue
+            row = result.one()
+            if not row:
+                LOGGER.warning(
+                    f"Event not found in SCTEvent table: run_id={event.run_id}, severity={event.severity}, ts={event.ts}"
+                )
+                event.error = "Event not found"
+            elif not row.message:
+                LOGGER.warning(f"Event has no message: run_id={event.run_id}, severity={event.severity}, ts={event.ts}")
+                event.error = "Event message is empty"
+            else:
+                event.event_id = row.event_id
+                event.message = row.message
+
+    def _sanitize_events(self, events: list[PendingEvent]) -> None:
+        for event in events:
+            if event.error:
+                continue
+            if event.severity not in ("ERROR", "CRITICAL"):
+                event.error = f"Unsupported severity: {event.severity}"
+                continue
+            try:
+                event.sanitized = self.sanitizer.sanitize(event.run_id, event.message)
+            except Exception as e:
+                LOGGER.error(f"Failed to sanitize message for event (run_id={event.run_id}): {e}", exc_info=True)
+                event.error = f"Failed to sanitize message: {e}"
+                continue
+            if not event.sanitized or not event.sanitized.strip():
+                LOGGER.warning(
+                    f"Sanitized message is empty for event: run_id={event.run_id}, "
+                    f"severity={event.severity}, ts={event.ts}"
+                )
+                event.error = "Sanitized message is empty"
 
-        Args:
-            run_id: Test run UUID
-            severity: Event severity (ERROR or CRITICAL)
-            ts: Event timestamp
+    def _embed_events(self, events: list[PendingEvent]) -> None:
+        """Embed every sanitized message of the batch in one forward pass.
 
-        Raises:
-            Exception: If event not found or embedding generation fails
+        If the batched call fails, messages are embedded one at a time so a single bad input
+        does not fail the whole batch.
         """
-        LOGGER.debug(f"Processing event: run_id={run_id}, severity={severity}, ts={ts}")
-
-        # Step 1: Read event message from SCTEvent table
-        try:
-            query = f"SELECT message FROM {SCTEvent.table_name()} WHERE run_id = ? AND severity = ? AND ts = ?"
-            result = self.db.execute(query, (run_id, severity, ts))
-            event = result.one()
-            if not event:
-                raise ValueError("Event not found")
-        except Exception:
-            LOGGER.warning(f"Event not found in SCTEvent table: run_id={run_id}, severity={severity}, ts={ts}")
-            raise
-
-        message = event.message
-        if not message:
-            LOGGER.warning(f"Event has no message: run_id={run_id}, severity={severity}, ts={ts}")
-            raise ValueError("Event message is empty")
-
-        # Step 2: Sanitize event message
-        try:
-            sanitized_message = self.sanitizer.sanitize(run_id, message)
-        except Exception as e:
-            LOGGER.error(f"Failed to sanitize message for event (run_id={run_id}): {e}", exc_info=True)
-            raise
-
-        if not sanitized_message or not sanitized_message.strip():
-            LOGGER.warning(f"Sanitized message is empty for event: run_id={run_id}, severity={severity}, ts={ts}")
-            raise ValueError("Sanitized message is empty")
-
-        # Step 3: Generate embedding
+        pending = [event for event in events if not event.error]
+        if not pending:
+            return
         try:
-            embeddings = self.embedding_model([sanitized_message])
-            if not embeddings or len(embeddings) == 0:
-                raise ValueError("Embedding generation returned empty result")
-            embedding = embeddings[0]
-        except Exception as e:
-            LOGGER.error(f"Failed to generate embedding for event (run_id={run_id}): {e}", exc_info=True)
-            raise
-
-        # Step 3.5: Check if event is duplicate, cancel remaining steps if it is.
-        if self._mark_event_is_duplicate(run_id, ts, severity, embedding):
+            embeddings = self.embedding_model([event.sanitized for event in pending])
+            if embeddings is None or len(embeddings) != len(pending):
+                raise ValueError(
+                    f"Embedding generation returned {0 if embeddings is None else len(embeddings)} "
+                    f"vectors for {len(pending)} messages"
+                )
+            for event, embedding in zip(pending, embeddings):
+                event.embedding = embedding
             return
+        except Exception as e:  # noqa: BLE001 - retried per message below
+            LOGGER.warning(
+                f"Batched embedding of {len(pending)} messages failed, embedding one by one: {e}", exc_info=True
+            )
 
-        # Step 3.6: Event is unique — dispatch summarization of the RAW message (not the
-        # sanitized one) as a fire-and-forget background task. Never blocks Step 4.
-        self.summary_dispatcher.dispatch(run_id, severity, ts, message)
-
-        # Step 4: Store embedding in severity-specific table
-        try:
-            if severity == "ERROR":
-                table_name = SCTErrorEventEmbedding.table_name()
-            elif severity == "CRITICAL":
-                table_name = SCTCriticalEventEmbedding.table_name()
-            else:
-                raise ValueError(f"Unsupported severity: {severity}")
+        for event in pending:
+            try:
+                embeddings = self.embedding_model([event.sanitized])
+                if embeddings is None or len(embeddings) == 0:
+                    raise ValueError("Embedding generation returned empty result")
+                event.embedding = embeddings[0]
+            except Exception as e:
+                LOGGER.error(f"Failed to generate embedding for event (run_id={event.run_id}): {e}", exc_info=True)
+                event.error = f"Failed to generate embedding: {e}"
 
-            insert_query = f"INSERT INTO {self.keyspace}.{table_name} (run_id, ts, embedding) VALUES (?, ?, ?)"
-            self.db.execute(insert_query, (run_id, ts, embedding))
-            LOGGER.debug(f"Stored embedding in {table_name} for event: run_id={run_id}, ts={ts}")
-        except Exception as e:
-            LOGGER.error(f"Failed to store embedding for event (run_id={run_id}): {e}", exc_info=True)
-            raise
+    def _load_duplicate_candidates(self, events: list[PendingEvent]) -> dict[tuple[UUID, str], RunEmbeddingMatrix]:
+        """Embedding matrices of every (run, severity table) partition touched by the batch.
 
-        # Step 5: Remove entry from unprocessed_events table
+        Partitions that are not cached yet are read concurrently.
+        """
+        partitions = list(
+            dict.fromkeys((event.run_id, self._embedding_table(event.severity)) for event in events if not event.error)
+        )
+        candidates = {
+            partition: self.embedding_cache.get(partition, list)
+            for partition in partitions
+            if partition in self.embedding_cache
+        }
+        missing = [partition for partition in partitions if partition not in candidates]
+        results = self.db.execute_concurrent(
+            [
+                (f"SELECT ts, embedding FROM {self.keyspace}.{table_name} WHERE run_id = ?", (run_id,))
+                for run_id, table_name in missing
+            ],
+            concurrency=BATCH_CONCURRENCY,
+            fetch_size=PARTITION_FETCH_SIZE,
+        )
+        for partition, (success, result) in zip(missing, results):
+            if not success:
+                raise RuntimeError(f"Failed to read stored embeddings for {partition}: {result}")
+            candidates[partition] = self.embedding_cache.build(result)
+            self.embedding_cache.put(partition, candidates[partition])
+        return candidates
+
+    def _deduplicate_events(self, events: list[PendingEvent]) -> tuple[list, list[int], list[str]]:
+        """Decide unique/duplicate for each embedded event in queue order.
+
+        Returns the write statements for the batch, the index of the event each statement
+        belongs to, and the outcome of every event.
+        """
+        statements, owners, outcomes = [], [], ["failed"] * len(events)
         try:
-            self._clear_unprocessed_event(SCTUnprocessedEvent.table_name(), run_id, severity, ts)
-            LOGGER.debug(f"Removed unprocessed event: run_id={run_id}, severity={severity}, ts={ts}")
+            candidates = self._load_duplicate_candidates(events)
         except Exception as e:
-            LOGGER.error(f"Failed to delete unprocessed event (run_id={run_id}): {e}", exc_info=True)
-            raise
+            LOGGER.error(f"Duplicate search error: {e}", exc_info=True)
+            for event in events:
+                event.error = event.error or f"Duplicate search error: {e}"
+            return statements, owners, outcomes
+
+        for index, event in enumerate(events):
+            if event.error:
+                continue
+            table_name = self._embedding_table(event.severity)
+            matrix = candidates[(event.run_id, table_name)]
+            query_vector = normalize(event.embedding)
+            try:
+                duplicate_of = self._find_duplicate_event_id(
+                    matrix, event.run_id, event.severity, event.ts, query_vector
+                )
+            except Exception as e:
+                LOGGER.error(f"Duplicate search error: {e}", exc_info=True)
+                event.error = f"Duplicate search error: {e}"
+                continue
+
+            if duplicate_of:
+                statements.append(
+                    (
+                        f"UPDATE {SCTEvent.table_name()} SET duplicate_id = ? WHERE run_id = ? AND severity = ? AND ts = ?",
+                        (duplicate_of, event.run_id, event.severity, event.ts),
+                    )
+                )
+                owners.append(index)
+                outcomes[index] = "duplicate"
+                continue
+
+            # Later events of this batch are compared against this one as if it were already stored
+            matrix.append(event.ts, query_vector, event.event_id)
+            # Event is unique — summarize the RAW message as a fire-and-forget background task.
+            self.summary_dispatcher.dispatch(event.run_id, event.severity, event.ts, event.message)
+            statements.append(
+                (
+                    f"INSERT INTO {self.keyspace}.{table_name} (run_id, ts, embedding) VALUES (?, ?, ?)",
+                    (event.run_id, event.ts, event.embedding),
+                )
+            )
+            owners.append(index)
+            outcomes[index] = "unique"
+        return statements, owners, outcomes
+
+    @staticmethod
+    def _embedding_table(severity: str) -> str:
+        return SCTErrorEventEmbedding.table_name() if severity == "ERROR" else SCTCriticalEventEmbedding.table_name()
 
     def shutdown(self) -> None:
         """Shutdown the processor and cleanup resources."""
         self.stop_event.set()
+        if self.leases:
+            self.leases.release_all()
         # Drain in-flight summarization tasks before closing the DB they write through.
         self.summary_dispatcher.shutdown()
         self.db.shutdown()
         LOGGER.info("EventSimilarityProcessorV2 shutdown complete")
 
 
-def main():
-    """Main entry point for the event similarity processor."""
+def run_worker(worker_index: int = 0, workers: int = 1) -> None:
+    """Run one processor until interrupted or terminated."""
     setup_application_logging(log_level=logging.INFO)
 
-    LOGGER.info("Starting Event Similarity Processor V2...")
+    LOGGER.info(f"Starting Event Similarity Processor V2 (worker {worker_index + 1} of {workers})...")
 
     stop_event = Event()
-    processor = EventSimilarityProcessorV2(stop_event=stop_event)
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    processor = EventSimilarityProcessorV2(stop_event=stop_event, worker_index=worker_index, workers=workers)
+    metrics_port = int(processor.db.config.get("EVENT_SIMILARITY_METRICS_PORT", 0))
+    if metrics_port:
+        # One port per worker, so the instances of a host do not collide
+        metrics.start_metrics_server(metrics_port + worker_index)
 
     try:
         processor.process_unprocessed_events()
@@ -283,5 +448,55 @@ def main():
         LOGGER.info("Event Similarity Processor V2 stopped")
 
 
+def run_pool(workers: int) -> None:
+    """Run ``workers`` processors as child processes, each owning its share of the queue shards."""
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=run_worker, args=(index, workers), name=f"similarity-worker-{index}")
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        LOGGER.info("Received keyboard interrupt, stopping workers...")
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+
+
+def main():
+    """Main entry point for the event similarity processor."""
+    parser = argparse.ArgumentParser(description="Generate embeddings for unprocessed SCT events.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of workers sharing the queue. Without --worker-index, starts that many local processes.",
+    )
+    parser.add_argument(
+        "--worker-index",
+        type=int,
+        default=None,
+        help="Run a single worker with this index (0-based), e.g. one systemd instance of a multi-worker setup.",
+    )
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.worker_index is not None and not 0 <= args.worker_index < args.workers:
+        parser.error("--worker-index must be between 0 and --workers - 1")
+
+    if args.worker_index is None and args.workers > 1:
+        setup_application_logging(log_level=logging.INFO)
+        run_pool(args.workers)
+    else:
+        run_worker(args.worker_index or 0, args.workers)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,91 @@
+"""Tests for the per-run embedding matrix cache used by duplicate detection."""
+
+from collections import namedtuple
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import numpy as np
+from chromadb.utils.distance_functions import cosine
+
+from argusAI.utils.embedding_matrix_cache import EmbeddingMatrixCache, RunEmbeddingMatrix, normalize
+
+EmbeddingRow = namedtuple("EmbeddingRow", ["ts", "embedding"])
+BASE_TS = datetime(2026, 1, 1)
+
+
+def _matrix(vectors: list) -> RunEmbeddingMatrix:
+    return EmbeddingMatrixCache.build(
+        EmbeddingRow(BASE_TS + timedelta(seconds=index), vector) for index, vector in enumerate(vectors)
+    )
+
+
+class TestRunEmbeddingMatrix:
+    def test_find_duplicate_should_agree_with_scalar_cosine(self):
+        """The vectorized lookup must pick the same first match as a per-row chromadb cosine scan."""
+        rng = np.random.default_rng(7)
+        vectors = rng.normal(size=(200, 16))
+        vectors[150] = vectors[40] * 3.0  # scaled copy: cosine distance 0
+        matrix = _matrix(list(vectors))
+        query = vectors[40] + rng.normal(scale=1e-3, size=16)
+        ts = BASE_TS + timedelta(days=1)
+
+        expected = next(
+            index for index, vector in enumerate(vectors) if cosine(np.asarray(vector), np.asarray(query)) < 0.05
+        )
+
+        assert matrix.find_duplicate(normalize(query), ts, 0.05) == expected == 40
+
+    def test_find_duplicate_should_skip_the_event_itself(self):
+        matrix = _matrix([[1.0, 0.0], [1.0, 0.0]])
+
+        assert matrix.find_duplicate(normalize([1.0, 0.0]), BASE_TS, 0.05) == 1
+        assert _matrix([[1.0, 0.0]]).find_duplicate(normalize([1.0, 0.0]), BASE_TS, 0.05) is None
+
+    def test_find_duplicate_should_ignore_distant_and_zero_vectors(self):
+        matrix = _matrix([[0.0, 1.0], [0.0, 0.0]])
+
+        assert matrix.find_duplicate(normalize([1.0, 0.0]), BASE_TS + timedelta(days=1), 0.05) is None
+
+    def test_append_should_grow_past_initial_capacity(self):
+        matrix = RunEmbeddingMatrix()
+        for index, vector in enumerate(np.eye(100)):
+            matrix.append(BASE_TS + timedelta(seconds=index), normalize(vector), event_id=index)
+
+        assert len(matrix) == 100
+        assert matrix.find_duplicate(normalize(np.eye(100)[99]), BASE_TS - timedelta(days=1), 0.05) == 99
+        assert matrix.event_ids[99] == 99
+
+
+class TestEmbeddingMatrixCache:
+    def test_get_should_load_partition_once(self):
+        cache = EmbeddingMatrixCache()
+        loader = Mock(return_value=[EmbeddingRow(BASE_TS, [1.0, 0.0])])
+
+        first = cache.get("run", loader)
+        second = cache.get("run", loader)
+
+        assert first is second
+        assert len(first) == 1
+        loader.assert_called_once()
+
+    def test_should_evict_least_recently_used_run_over_capacity(self):
+        cache = EmbeddingMatrixCache(max_runs=2)
+        cache.get("a", list)
+        cache.get("b", list)
+        cache.get("a", list)
+        cache.get("c", list)
+
+        assert "a" in cache and "c" in cache
+        assert "b" not in cache
+
+    def test_should_evict_idle_runs(self):
+        cache = EmbeddingMatrixCache(idle_seconds=60)
+        with patch("argusAI.utils.embedding_matrix_cache.time.monotonic", return_value=1000.0):
+            cache.get("idle", list)
+        with patch("argusAI.utils.embedding_matrix_cache.time.monotonic", return_value=1030.0):
+            cache.get("active", list)
+        with patch("argusAI.utils.embedding_matrix_cache.time.monotonic", return_value=1070.0):
+            cache.evict()
+
+        assert "idle" not in cache
+        assert "active" in cache
@@ -0,0 +1,162 @@
+"""Golden-output tests for MessageSanitizer.
+
+The sanitized text is what gets embedded, so any change in output changes duplicate detection.
+These tests pin the output of every message in the eval event corpus
+(argusAI/eval/baseline/events.json), of hand-written edge cases covering each sanitization pass
+and of deterministic fragment mixes of the corpus to the golden file in tests/data.
+
+After an intentional change of the sanitizer output, regenerate the golden file with:
+    PYTHONPATH=. python argusAI/tests/test_event_message_sanitizer.py
+"""
+
+import hashlib
+import json
+import random
+from pathlib import Path
+from uuid import UUID
+
+import pytest
+
+from argusAI.utils.event_message_sanitizer import MessageSanitizer
+
+CORPUS_PATH = Path(__file__).parents[1] / "eval" / "baseline" / "events.json"
+GOLDEN_PATH = Path(__file__).parent / "data" / "sanitizer_golden.json"
+RUN_ID = UUID(int=0)
+FUZZ_CASES = 150
+# Longer outputs are pinned by digest to keep the golden file small
+MAX_INLINE_OUTPUT = 1000
+
+EDGE_CASES = [
+    "",
+    "   ",
+    "plain message without anything to sanitize",
+    "2024-01-01 10:00:00.000: (DatabaseLogEvent Severity.ERROR) period_type=one-time "
+    "event_id=1c1d3f0e-3c8a-4e0b-8f43-4b6a1a4b0b0b: type=RUNTIME_ERROR regex=std::runtime_error "
+    "line_number=1234 node=longevity-100gb-4h-db-node-1a2b3c4d-0-1 [34.1.2.3 | 10.0.0.1]",
+    "(TestFrameworkEvent Severity.ERROR) target_node=Node longevity-db-node-1a2b-0-3 [1.2.3.4 | 10.0.0.3] "
+    "(seed: False) executable=/usr/bin/scylla executable_version=5.2.0 message=failed",
+    "Traceback (most recent call last):\n"
+    '  File "/home/ubuntu/scylla-cluster-tests/sdcm/tester.py", line 123, in run_stress\n'
+    "    self.verify()\n"
+    '  File "/home/ubuntu/scylla-cluster-tests/sdcm/utils/common.py", line 45, in verify\n'
+    "    raise ValueError('bad')\n"
+    "ValueError: bad",
+    "Stack trace of thread 12345:\n"
+    "#0  0x00007f1c2b3d4e5f raise (libc.so.6 + 0x3f5f)\n"
+    "#1  0x00007f1c2b3c1234 abort (libc.so.6 + 0x1234)\n"
+    "#2  0x0000000004a1b2c3 _ZN7seastar7reactor3runEv (/opt/scylladb/libexec/scylla + 0x4a1b2c3)\n"
+    "\nStack trace of thread 12346:\n"
+    "#0  0x00007f1c2b3d0000 __poll (libc.so.6 + 0xf0000)\n",
+    "Module libgcc_s.so.1 from rpm gcc-12.2.1-4.fc37.x86_64\n"
+    "PID: 12345 (scylla)\nUID: 112 (scylla)\nTimestamp: Mon 2024-01-01 10:00:00 UTC\n"
+    "Command Line: /usr/bin/scylla --log-to-syslog 1\nHostname: db-node-1\n"
+    "corefile_url= https://storage.cloud.google.com/upload/core.scylla.112.gz\n"
+    "download_instructions: gsutil cp gs://upload/core.scylla.112.gz .\n",
+    "[scylla[4321]]: Aborting on shard 3. Backtrace: 0x55e1 0x55e2 0x55e3\n"
+    "seastar::backtrace<seastar::current_backtrace()::{lambda}> at ./seastar/include/backtrace.hh:68\n"
+    "(inlined by) seastar::current_backtrace() at ./seastar/src/util/backtrace.cc:91\n"
+    "void seastar::print_with_backtrace at main.cc:1\n"
+    "replica::table::do_apply at ./replica/table.cc:2001\n"
+    " ?? ??:0\n"
+    "Please report: at https://github.com/scylladb/scylladb/issues\n",
+    "compaction failed: /var/lib/scylla/data/keyspace1/standard1-abc/me-3g8x-big-Data.db "
+    "(/usr/lib64/libstdc++.so.6 + 0x1a2b) at 2024-01-01T10:00:00_123+00:00 2024-01-01T10:00:00_456+00:00",
+    "00x1fx12 kept?  \\\\n escaped \\n newline and back\\slash",
+    "it's 'quoted' and \"double quoted\" (word) (a.b) () x=y==z",
+    "repeated repeated repeated words words and and and more more",
+    "ipv6 fe80::1ff:fe23:4567:890a and 2001:0db8:85a3:0000:0000:8a2e:0370:7334 and ::1 "
+    "and uuid 123e4567-e89b-12d3-a456-426614174000",
+    "namespace sdcm.cluster.BaseNode.run and a.b.c.d",
+    "x" * 250 + " short " + "y" * 101,
+    "2024-01-01T10:00:00_123+00:00 message=timeout at 2024-01-01T10:00:01_123+00:00 | a | b, c: d [e]",
+    "node=db-node-3 [10.0.0.3] period_type=interval message text",
+    "no backtrace here but seastar::backtrace and  ??:0 stay",
+    "backtrace\n" + "seastar::memory::allocate_slowpath\n" * 3 + "real frame\n",
+    "Node longevity-tls-1tb-7d-db-node-abcdef12-0-4 loader node loader-node-x-1 "
+    "perf-test-monitor-node-1a2b-0-1 longevity-loader-node-1a2b-0-2",
+    "/home/ubuntu/scylla-cluster-tests/sdcm/nemesis.py:123 and [/home/ubuntu/scylla-cluster-tests/a.py]",
+    "(ClusterHealthValidatorEvent Severity.CRITICAL) Severity.WARNING) Severity.INFO) Severity.DEBUG)",
+]
+
+
+def corpus_messages() -> list[str]:
+    return [event["message"] for event in json.loads(CORPUS_PATH.read_text())]
+
+
+def fuzz_cases(count: int = FUZZ_CASES) -> list[str]:
+    """Deterministic mixes of corpus and edge-case fragments, to catch pass interactions."""
+    rng = random.Random(20260101)
+    sources = corpus_messages() + [case for case in EDGE_CASES if case]
+    cases = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 4)):
+            source = rng.choice(sources)
+            start = rng.randrange(len(source))
+            parts.append(source[start : start + rng.randint(1, 400)])
+        cases.append(rng.choice(["", " ", "\n", "\\n", "|"]).join(parts))
+    return cases
+
+
+def all_cases() -> dict[str, str]:
+    cases = {}
+    for prefix, messages in (("corpus", corpus_messages()), ("edge", EDGE_CASES), ("fuzz", fuzz_cases())):
+        for index, message in enumerate(messages):
+            cases[f"{prefix}-{index}-{hashlib.sha1(message.encode()).hexdigest()[:10]}"] = message
+    return cases
+
+
+def golden_value(output: str) -> str:
+    if len(output) <= MAX_INLINE_OUTPUT:
+        return output
+    return "sha256:" + hashlib.sha256(output.encode()).hexdigest()
+
+
+CASES = all_cases()
+GOLDEN = json.loads(GOLDEN_PATH.read_text()) if GOLDEN_PATH.exists() else {}
+
+
+@pytest.fixture(scope="module")
+def sanitizer():
+    return MessageSanitizer(write_log=False)
+
+
+@pytest.mark.parametrize("case_id", sorted(CASES))
+def test_sanitize_should_match_golden_output(sanitizer, case_id):
+    assert case_id in GOLDEN, "golden file is out of date, see the module docstring"
+    assert golden_value(sanitizer.sanitize(RUN_ID, CASES[case_id])) == GOLDEN[case_id]
+
+
+def test_golden_file_should_not_have_stale_cases():
+    assert sorted(GOLDEN) == sorted(CASES)
+
+
+def test_memoized_sanitize_should_match_and_stay_bounded(sanitizer):
+    memoized = MessageSanitizer(write_log=False, memo_size=8)
+    messages = list(CASES.values())[:20]
+
+    for _ in range(2):
+        for message in messages:
+            assert memoized.sanitize(RUN_ID, message) == sanitizer.sanitize(RUN_ID, message)
+
+    assert len(memoized._memo) == 8
+
+
+def test_memoized_sanitize_should_still_log_every_message(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    memoized = MessageSanitizer(memo_size=8)
+
+    for _ in range(3):
+        memoized.sanitize(RUN_ID, "(DatabaseLogEvent Severity.ERROR) failed")
+    memoized.sanitized_messages_fp.close()
+
+    [log] = (tmp_path / "logs").iterdir()
+    assert log.read_text().splitlines() == [f"{RUN_ID}: (DatabaseLogEvent failed"] * 3
+
+
+if __name__ == "__main__":
+    GOLDEN_PATH.parent.mkdir(exist_ok=True)
+    reference = MessageSanitizer(write_log=False)
+    golden = {case_id: golden_value(reference.sanitize(RUN_ID, message)) for case_id, message in sorted(CASES.items())}
+    GOLDEN_PATH.write_text(json.dumps(golden, indent=1, sort_keys=True) + "\n")
+    print(f"Wrote {len(golden)} golden outputs to {GOLDEN_PATH}")
@@ -20,7 +20,12 @@ import pytest
 
 from argus.backend.models.argus_ai import SCTErrorEventEmbedding, SCTCriticalEventEmbedding
 from argus.backend.plugins.sct.testrun import SCTUnprocessedEvent
-from argusAI.event_similarity_processor_v2 import EventSimilarityProcessorV2, BgeSmallEnEmbeddingModel
+from argusAI.event_similarity_processor_v2 import (
+    PARTITION_FETCH_SIZE,
+    BgeSmallEnEmbeddingModel,
+    EventSimilarityProcessorV2,
+)
+from argusAI.utils.shard_lease import shard_token_range
 
 
 LOGGER = logging.getLogger(__name__)
@@ -29,6 +34,36 @@ LOGGER = logging.getLogger(__name__)
 EmbeddingRow = namedtuple("EmbeddingRow", ["run_id", "ts", "embedding"])
 
 
+def _queue(processor, events, messages=None, stored=None, fail_writes=()):
+    """Wire the mocked connection: the queue read returns ``events``, concurrent reads return
+    ``messages`` (event_id, message per event, a None message for a missing event) and ``stored`` embedding rows, writes succeed
+    unless their query contains one of ``fail_writes``."""
+    processor.db.execute.return_value = events
+    messages = messages or [(uuid4(), f"message {index}") for index in range(len(events))]
+    by_key = {(event.run_id, event.severity, event.ts): message for event, message in zip(events, messages)}
+    written = []
+
+    def execute_concurrent(statements, concurrency=50, fetch_size=10):
+        results = []
+        for query, params in statements:
+            if query.startswith("SELECT event_id, message"):
+                found = by_key.get(tuple(params))
+                found = found if found and found[1] is not None else None
+                row = Mock(event_id=found[0], message=found[1]) if found else None
+                results.append((True, Mock(one=Mock(return_value=row))))
+            elif query.startswith("SELECT ts, embedding"):
+                results.append((True, list((stored or {}).get(params[0], []))))
+            elif any(marker in query for marker in fail_writes):
+                results.append((False, RuntimeError("write timeout")))
+            else:
+                written.append((query, params))
+                results.append((True, None))
+        return results
+
+    processor.db.execute_concurrent.side_effect = execute_concurrent
+    return written
+
+
 class TestBgeSmallEnEmbeddingModel:
     """Tests for BGE-Small-EN embedding model configuration."""
 
@@ -109,27 +144,26 @@ class TestEventProcessing:
             processor = EventSimilarityProcessorV2()
             return processor
 
-    def test_process_single_event_should_complete_full_workflow_for_error_event(self, processor):
-        """Processing an ERROR event should sanitize, embed, store, and cleanup."""
+    def test_process_batch_should_complete_full_workflow_for_error_event(self, processor):
+        """Processing an ERROR event should read, sanitize, embed, store, and cleanup."""
         run_id = uuid4()
         severity = "ERROR"
         ts = datetime.now()
         original_message = "Error: Connection failed to 192.168.1.1"
-
-        # Mock database responses
-        mock_event = Mock()
-        mock_event.message = original_message
-        mock_result = Mock()
-        mock_result.one.return_value = mock_event
-        processor.db.execute.return_value = mock_result
-
-        # Execute
-        processor._process_single_event(run_id, severity, ts)
-
-        # Verify SELECT query was executed
-        select_calls = [call for call in processor.db.execute.call_args_list if call[0][0].startswith("SELECT message")]
-        assert len(select_calls) == 1
-        assert select_calls[0][0][1] == (run_id, severity, ts)
+        written = _queue(
+            processor, [Mock(run_id=run_id, severity=severity, ts=ts)], messages=[(uuid4(), original_message)]
+        )
+
+        assert processor._process_batch() == 1
+
+        # Verify the event was read with its key
+        reads = [
+            params
+            for call in processor.db.execute_concurrent.call_args_list
+            for query, params in call[0][0]
+            if query.startswith("SELECT event_id, message")
+        ]
+        assert reads == [(run_id, severity, ts)]
 
         # Verify sanitizer was called
         processor.sanitizer.sanitize.assert_called_once_with(run_id, original_message)
@@ -139,9 +173,9 @@ class TestEventProcessing:
 
         # Verify INSERT into sct_error_event_embedding
         insert_calls = [
-            call
-            for call in processor.db.execute.call_args_list
-            if call[0][0].startswith(
+            params
+            for query, params in written
+            if query.startswith(
                 f"INSERT INTO {SCTErrorEventEmbedding.Settings.keyspace}.{SCTErrorEventEmbedding.table_name()}"
             )
         ]
@@ -149,108 +183,54 @@ class TestEventProcessing:
 
         # Verify DELETE from unprocessed_events
         delete_calls = [
-            call
-            for call in processor.db.execute.call_args_list
-            if call[0][0].startswith(f"DELETE FROM {SCTUnprocessedEvent.table_name()}")
+            params for query, params in written if query.startswith(f"DELETE FROM {SCTUnprocessedEvent.table_name()}")
         ]
-        assert len(delete_calls) == 1
-        assert delete_calls[0][0][1] == (run_id, severity, ts)
+        assert delete_calls == [(run_id, severity, ts)]
 
-    def test_process_single_event_should_complete_full_workflow_for_critical_event(self, processor):
+    def test_process_batch_should_complete_full_workflow_for_critical_event(self, processor):
         """Processing a CRITICAL event should store in sct_critical_event_embedding table."""
-        run_id = uuid4()
-        severity = "CRITICAL"
-        ts = datetime.now()
-        original_message = "Critical: Cluster is down"
+        written = _queue(
+            processor,
+            [Mock(run_id=uuid4(), severity="CRITICAL", ts=datetime.now())],
+            messages=[(uuid4(), "Critical: Cluster is down")],
+        )
 
-        # Mock database responses
-        mock_event = Mock()
-        mock_event.message = original_message
-        mock_result = Mock()
-        mock_result.one.return_value = mock_event
-        processor.db.execute.return_value = mock_result
-
-        # Execute
-        processor._process_single_event(run_id, severity, ts)
+        assert processor._process_batch() == 1
 
-        # Verify INSERT into sct_critical_event_embedding
         insert_calls = [
-            call
-            for call in processor.db.execute.call_args_list
-            if call[0][0].startswith(
+            query
+            for query, _ in written
+            if query.startswith(
                 f"INSERT INTO {SCTCriticalEventEmbedding.Settings.keyspace}.{SCTCriticalEventEmbedding.table_name()}"
             )
         ]
         assert len(insert_calls) == 1
 
-    def test_process_single_event_should_raise_error_when_event_not_found(self, processor):
-        """Processing should raise ValueError when event is not found in database."""
-        run_id = uuid4()
-        severity = "ERROR"
-        ts = datetime.now()
-
-        # Mock event not found
-        mock_result = Mock()
-        mock_result.one.return_value = None
-        processor.db.execute.return_value = mock_result
-
-        # Execute and verify
-        with pytest.raises(ValueError, match="Event not found"):
-            processor._process_single_event(run_id, severity, ts)
-
-    def test_process_single_event_should_raise_error_when_message_is_empty(self, processor):
-        """Processing should raise ValueError when event message is empty."""
-        run_id = uuid4()
-        severity = "ERROR"
-        ts = datetime.now()
-
-        # Mock event with empty message
-        mock_event = Mock()
-        mock_event.message = ""
-        mock_result = Mock()
-        mock_result.one.return_value = mock_event
-        processor.db.execute.return_value = mock_result
-
-        # Execute and verify
-        with pytest.raises(ValueError, match="Event message is empty"):
-            processor._process_single_event(run_id, severity, ts)
-
-    def test_process_single_event_should_raise_error_when_sanitized_message_is_empty(self, processor):
-        """Processing should raise ValueError when sanitized message is empty."""
-        run_id = uuid4()
-        severity = "ERROR"
-        ts = datetime.now()
-
-        # Mock event with message
-        mock_event = Mock()
-        mock_event.message = "Some message"
-        mock_result = Mock()
-        mock_result.one.return_value = mock_event
-        processor.db.execute.return_value = mock_result
-
-        # Mock sanitizer returning empty string
-        processor.sanitizer.sanitize.return_value = "   "
-
-        # Execute and verify
-        with pytest.raises(ValueError, match="Sanitized message is empty"):
-            processor._process_single_event(run_id, severity, ts)
-
-    def test_process_single_event_should_raise_error_for_unsupported_severity(self, processor):
-        """Processing should raise ValueError for unsupported severity levels."""
-        run_id = uuid4()
-        severity = "WARNING"  # Unsupported severity
-        ts = datetime.now()
+    @pytest.mark.parametrize(
+        "severity, message, sanitized",
+        [
+            pytest.param("ERROR", None, "sanitized message", id="event-not-found"),
+            pytest.param("ERROR", "", "sanitized message", id="empty-message"),
+            pytest.param("ERROR", "Some message", "   ", id="empty-sanitized-message"),
+            pytest.param("WARNING", "Warning message", "sanitized message", id="unsupported-severity"),
+        ],
+    )
+    def test_process_batch_should_fail_and_dequeue_events_that_cannot_be_embedded(
+        self, processor, severity, message, sanitized
+    ):
+        """Events without a usable message are counted as errors, never stored, and removed from the queue."""
+        event = Mock(run_id=uuid4(), severity=severity, ts=datetime.now())
+        processor.sanitizer.sanitize.return_value = sanitized
+        written = _queue(processor, [event], messages=[(uuid4(), message)])
 
-        # Mock event
-        mock_event = Mock()
-        mock_event.message = "Warning message"
-        mock_result = Mock()
-        mock_result.one.return_value = mock_event
-        processor.db.execute.return_value = mock_result
+        assert processor._process_batch() == 0
 
-        # Execute and verify
-        with pytest.raises(ValueError, match="Unsupported severity"):
-            processor._process_single_event(run_id, severity, ts)
+        assert processor.error_count == 1
+        assert not [query for query, _ in written if query.startswith("INSERT")]
+        assert [params for query, params in written if query.startswith("DELETE")] == [
+            (event.run_id, event.severity, event.ts)
+        ]
+        processor.embedding_model.assert_not_called()
 
 
 class TestBatchProcessing:
@@ -288,39 +268,139 @@ class TestBatchProcessing:
 
     def test_process_batch_should_process_multiple_events(self, processor_with_mocks):
         """Batch processing should process multiple events and update counters."""
-        # Create mock events
-        mock_event1 = Mock(run_id=uuid4(), severity="ERROR", ts=datetime.now())
-        mock_event2 = Mock(run_id=uuid4(), severity="CRITICAL", ts=datetime.now())
-        mock_event3 = Mock(run_id=uuid4(), severity="ERROR", ts=datetime.now())
-
-        # Setup mock responses for unprocessed events query
-        processor_with_mocks.db.execute.return_value = [mock_event1, mock_event2, mock_event3]
+        events = [
+            Mock(run_id=uuid4(), severity="ERROR", ts=datetime.now()),
+            Mock(run_id=uuid4(), severity="CRITICAL", ts=datetime.now()),
+            Mock(run_id=uuid4(), severity="ERROR", ts=datetime.now()),
+        ]
+        processor_with_mocks.embedding_model.return_value = [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]
+        written = _queue(processor_with_mocks, events)
 
-        # Mock _process_single_event to avoid actual processing
-        with patch.object(processor_with_mocks, "_process_single_event") as mock_process:
-            result = processor_with_mocks._process_batch()
+        result = processor_with_mocks._process_batch()
 
         assert result == 3
         assert processor_with_mocks.processed_count == 3
-        assert mock_process.call_count == 3
+        assert processor_with_mocks.last_batch_rate > 0
+        inserts = [params for query, params in written if query.startswith("INSERT")]
+        deletes = [params for query, params in written if query.startswith("DELETE")]
+        assert [params[0] for params in inserts] == [event.run_id for event in events]
+        assert len(deletes) == 3
+
+    def test_process_batch_should_embed_whole_batch_in_one_call(self, processor_with_mocks):
+        """All sanitized messages of a batch should go through the model in a single call."""
+        events = [Mock(run_id=uuid4(), severity="ERROR", ts=datetime.now()) for _ in range(5)]
+        processor_with_mocks.embedding_model.return_value = [[float(index), 1.0] for index in range(5)]
+        _queue(processor_with_mocks, events)
+
+        processor_with_mocks._process_batch()
+
+        processor_with_mocks.embedding_model.assert_called_once_with(["sanitized"] * 5)
+
+    def test_process_batch_should_fall_back_to_single_embeddings_when_batch_call_fails(self, processor_with_mocks):
+        """A failing batched forward pass should only fail the events that cannot be embedded alone."""
+        events = [Mock(run_id=uuid4(), severity="ERROR", ts=datetime.now()) for _ in range(2)]
+        processor_with_mocks.embedding_model.side_effect = [
+            RuntimeError("bad input"),
+            RuntimeError("bad input"),
+            [[1.0, 0.0]],
+        ]
+        _queue(processor_with_mocks, events)
+
+        result = processor_with_mocks._process_batch()
+
+        assert result == 1
+        assert processor_with_mocks.error_count == 1
+
+    def test_process_batch_should_deduplicate_within_batch(self, processor_with_mocks):
+        """An event matching one accepted earlier in the same batch should be marked as its duplicate."""
+        run_id = uuid4()
+        first_ts, second_ts = datetime(2024, 1, 1, 0, 0, 0), datetime(2024, 1, 1, 0, 0, 1)
+        events = [
+            Mock(run_id=run_id, severity="ERROR", ts=first_ts),
+            Mock(run_id=run_id, severity="ERROR", ts=second_ts),
+        ]
+        first_event_id = uuid4()
+        processor_with_mocks.embedding_model.return_value = [[1.0, 0.0], [1.0, 0.001]]
+        written = _queue(processor_with_mocks, events, messages=[(first_event_id, "a"), (uuid4(), "a")])
+
+        result = processor_with_mocks._process_batch()
+
+        assert result == 2
+        inserts = [params for query, params in written if query.startswith("INSERT")]
+        updates = [params for query, params in written if query.startswith("UPDATE")]
+        assert [params[1] for params in inserts] == [first_ts]
+        assert updates == [(first_event_id, run_id, "ERROR", second_ts)]
+        processor_with_mocks.db.execute.assert_called_once()  # twin's event_id is known, no extra lookup
+
+    def test_process_batch_should_deduplicate_against_stored_partition(self, processor_with_mocks):
+        """An event matching a stored embedding should be marked with the stored event's id."""
+        run_id = uuid4()
+        stored_ts, ts = datetime(2024, 1, 1, 0, 0, 0), datetime(2024, 1, 1, 0, 0, 5)
+        events = [Mock(run_id=run_id, severity="ERROR", ts=ts)]
+        stored_event_id = uuid4()
+        processor_with_mocks.embedding_model.return_value = [[1.0, 0.0]]
+        written = _queue(processor_with_mocks, events, stored={run_id: [EmbeddingRow(run_id, stored_ts, [1.0, 0.0])]})
+        processor_with_mocks.db.session.execute.return_value = Mock(
+            one=Mock(return_value=Mock(event_id=stored_event_id))
+        )
+
+        processor_with_mocks._process_batch()
+
+        assert [params for query, params in written if query.startswith("UPDATE")] == [
+            (stored_event_id, run_id, "ERROR", ts)
+        ]
+        assert not [query for query, _ in written if query.startswith("INSERT")]
+
+    def test_process_batch_should_read_run_partition_once_across_batches(self, processor_with_mocks):
+        """A run's stored embeddings are read on its first batch only; later batches use the cached matrix."""
+        run_id = uuid4()
+        processor_with_mocks.embedding_model.return_value = [[1.0, 0.0]]
+        first = [Mock(run_id=run_id, severity="ERROR", ts=datetime(2024, 1, 1, 0, 0, 0))]
+        _queue(processor_with_mocks, first)
+        processor_with_mocks._process_batch()
+
+        processor_with_mocks.embedding_model.return_value = [[1.0, 0.001]]
+        second = [Mock(run_id=run_id, severity="ERROR", ts=datetime(2024, 1, 1, 0, 0, 1))]
+        written = _queue(processor_with_mocks, second, messages=[(uuid4(), "again")])
+        processor_with_mocks._process_batch()
+
+        partition_reads = [
+            query
+            for call in processor_with_mocks.db.execute_concurrent.call_args_list
+            for query, _ in call[0][0]
+            if query.startswith("SELECT ts, embedding")
+        ]
+        assert len(partition_reads) == 1
+        assert [query for query, _ in written if query.startswith("UPDATE")]
 
     def test_process_batch_should_handle_individual_event_failures(self, processor_with_mocks):
         """Batch processing should continue despite individual event failures and clean up failed events."""
-        # Create mock events
-        mock_event1 = Mock(run_id=uuid4(), severity="ERROR", ts=datetime.now())
-        mock_event2 = Mock(run_id=uuid4(), severity="CRITICAL", ts=datetime.now())
-
-        # Setup mock responses
-        processor_with_mocks.db.execute.return_value = [mock_event1, mock_event2]
+        events = [
+            Mock(run_id=uuid4(), severity="ERROR", ts=datetime.now()),
+            Mock(run_id=uuid4(), severity="CRITICAL", ts=datetime.now()),
+        ]
+        processor_with_mocks.embedding_model.return_value = [[1.0, 0.0]]
+        # First event has no message
+        written = _queue(processor_with_mocks, events, messages=[(uuid4(), ""), (uuid4(), "boom")])
 
-        # Mock _process_single_event to fail on first event
-        with patch.object(processor_with_mocks, "_process_single_event") as mock_process:
-            mock_process.side_effect = [Exception("Processing failed"), None]
-            result = processor_with_mocks._process_batch()
+        result = processor_with_mocks._process_batch()
 
         assert result == 1  # Only one successful
         assert processor_with_mocks.processed_count == 1
         assert processor_with_mocks.error_count == 1
+        deleted = [params[0] for query, params in written if query.startswith("DELETE")]
+        assert deleted == [events[0].run_id, events[1].run_id]
+
+    def test_process_batch_should_count_failed_writes_as_errors(self, processor_with_mocks):
+        """An event whose embedding insert fails should be counted as an error, not as processed."""
+        events = [Mock(run_id=uuid4(), severity="ERROR", ts=datetime.now())]
+        processor_with_mocks.embedding_model.return_value = [[1.0, 0.0]]
+        _queue(processor_with_mocks, events, fail_writes=("INSERT",))
+
+        result = processor_with_mocks._process_batch()
+
+        assert result == 0
+        assert processor_with_mocks.error_count == 1
 
     def test_process_batch_should_respect_batch_size(self, processor_with_mocks):
         """Batch processing should use the specified batch size."""
@@ -332,6 +412,30 @@ class TestBatchProcessing:
         call_args = processor_with_mocks.db.execute.call_args[0][0]
         assert "LIMIT 50" in call_args
 
+    def test_process_batch_should_read_only_the_token_range_of_its_shard(self, processor_with_mocks):
+        """In sharded mode the queue read is restricted to the shard's token range."""
+        processor_with_mocks.leases = Mock(shards=4)
+        processor_with_mocks.db.execute.return_value = []
+
+        processor_with_mocks._process_batch(shard=1)
+
+        query, params = processor_with_mocks.db.execute.call_args[0]
+        assert "WHERE token(run_id) >= ? AND token(run_id) <= ?" in query
+        assert params == shard_token_range(1, 4)
+
+    def test_process_owned_shards_should_clear_cache_when_a_shard_was_dropped(self, processor_with_mocks):
+        """Losing or handing back a shard invalidates cached runs, another worker may write them meanwhile."""
+        processor_with_mocks.leases = Mock()
+        processor_with_mocks.leases.refresh.return_value = ([0, 2], True)
+        processor_with_mocks.embedding_cache.get("stale", list)
+
+        with patch.object(processor_with_mocks, "_process_batch", return_value=3) as mock_batch:
+            result = processor_with_mocks._process_owned_shards()
+
+        assert result == 6
+        assert [call.kwargs["shard"] for call in mock_batch.call_args_list] == [0, 2]
+        assert len(processor_with_mocks.embedding_cache) == 0
+
 
 class TestProcessingLoop:
     """Tests for main processing loop."""
@@ -487,21 +591,16 @@ class TestIntegrationScenarios:
 
     def test_full_workflow_should_process_error_event_successfully(self, full_processor):
         """Complete workflow should process ERROR event from start to finish."""
-        run_id = uuid4()
-        severity = "ERROR"
-        ts = datetime.now()
+        written = _queue(
+            full_processor,
+            [Mock(run_id=uuid4(), severity="ERROR", ts=datetime.now())],
+            messages=[(uuid4(), "Connection failed to node")],
+        )
 
-        # Mock database responses
-        mock_event = Mock(message="Connection failed to node")
-        mock_result = Mock()
-        mock_result.one.return_value = mock_event
-        full_processor.db.execute.return_value = mock_result
-
-        # Execute
-        full_processor._process_single_event(run_id, severity, ts)
+        assert full_processor._process_batch() == 1
 
         # Verify all steps occurred in correct order
-        assert full_processor.db.execute.call_count >= 3  # SELECT, INSERT, DELETE
+        assert [query.split(" ")[0] for query, _ in written] == ["INSERT", "DELETE"]
         assert full_processor.sanitizer.sanitize.called
         assert full_processor.embedding_model.called
 
@@ -513,24 +612,34 @@ class TestIntegrationScenarios:
             Mock(run_id=uuid4(), severity="CRITICAL", ts=datetime.now()),
             Mock(run_id=uuid4(), severity="ERROR", ts=datetime.now()),
         ]
+        full_processor.db.execute.return_value = events
+        full_processor.embedding_model.return_value = [[0.1] * 384] * 3
 
-        # First call returns events, subsequent calls for each event processing
-        mock_event_data = Mock(message="Test message")
+        mock_event_data = Mock(event_id=uuid4(), message="Test message")
         mock_result = Mock()
         mock_result.one.return_value = mock_event_data
 
-        def execute_side_effect(query, params=None):
-            if "SELECT run_id" in query or "LIMIT" in query:
-                return events
-            return mock_result
+        def execute_concurrent_side_effect(statements, concurrency=50, fetch_size=10):
+            return [(True, [] if query.startswith("SELECT ts") else mock_result) for query, _ in statements]
 
-        full_processor.db.execute.side_effect = execute_side_effect
+        full_processor.db.execute_concurrent.side_effect = execute_concurrent_side_effect
 
         # Execute
         result = full_processor._process_batch()
 
         assert result == 3
         assert full_processor.processed_count == 3
+        inserted_tables = [
+            query.split(" ")[2].split(".")[-1]
+            for statements in [full_processor.db.execute_concurrent.call_args_list[-1][0][0]]
+            for query, _ in statements
+            if query.startswith("INSERT")
+        ]
+        assert inserted_tables == [
+            SCTErrorEventEmbedding.table_name(),
+            SCTCriticalEventEmbedding.table_name(),
+            SCTErrorEventEmbedding.table_name(),
+        ]
 
 
 class TestDeduplication:
@@ -551,173 +660,129 @@ class TestDeduplication:
             processor = EventSimilarityProcessorV2()
             return processor
 
-    def test_mark_event_is_duplicate_should_return_false_when_no_rows_returned(self, processor):
-        """Should return False when ANN search returns no rows (no similar events in DB or cache)."""
-        run_id = uuid4()
-        ts = datetime.now()
-        embedding = [0.1] * 384
-
-        # ANN query returns no results
-        processor.db.session.execute.return_value = []
-
-        result = processor._mark_event_is_duplicate(run_id, ts, "ERROR", embedding)
-
-        assert result is False
-
-    def test_get_potential_duplicate_rows_should_query_current_run_partition_only(self, processor):
+    @staticmethod
+    def _process(processor, embedding, stored=(), ts=None, stored_event_id=None):
+        """Process one ERROR event of a run whose partition holds ``stored`` rows; return the event and writes."""
+        event = Mock(run_id=uuid4(), severity="ERROR", ts=ts or datetime(2026, 1, 1, 12, 0, 0))
+        processor.embedding_model.return_value = [embedding]
+        written = _queue(
+            processor,
+            [event],
+            stored={event.run_id: [row._replace(run_id=event.run_id) for row in stored]},
+        )
+        processor.db.session.execute.return_value = Mock(one=Mock(return_value=Mock(event_id=stored_event_id)))
+        processor._process_batch()
+        return event, written
+
+    def test_process_batch_should_store_event_when_run_partition_is_empty(self, processor):
+        """With no stored embeddings in the run the event is unique and its embedding is stored."""
+        event, written = self._process(processor, [0.1] * 384)
+
+        assert [params[:2] for query, params in written if query.startswith("INSERT")] == [(event.run_id, event.ts)]
+        assert not [query for query, _ in written if query.startswith("UPDATE")]
+
+    def test_process_batch_should_read_current_run_partition_only(self, processor):
         """Regression (ARGUS-171): candidate fetch must be a per-run partition read, not a global ANN.
 
         A global ``ORDER BY embedding ANN OF ? LIMIT N`` lets other runs' near-identical events
         crowd the current run's own twins out of the top-N, so same-run duplicates are missed once
         the table grows past N rows. The fix scopes the read to ``WHERE run_id = ?``.
         """
-        run_id = uuid4()
-        processor.db.session.execute.return_value = []
+        event, _ = self._process(processor, [0.1] * 384)
 
-        processor._get_potential_duplicate_rows(run_id, SCTErrorEventEmbedding.table_name())
-
-        prepared_query = " ".join(processor.db.session.prepare.call_args[0][0].split())
-        assert "WHERE run_id = ?" in prepared_query, "candidate fetch must be scoped to the run partition"
-        assert "ANN" not in prepared_query, "candidate fetch must not use a global ANN search"
+        (partition_call,) = [
+            call
+            for call in processor.db.execute_concurrent.call_args_list
+            if call[0][0][0][0].startswith("SELECT ts, embedding")
+        ]
+        ((query, params),) = partition_call[0][0]
+        query = " ".join(query.split())
+        assert "WHERE run_id = ?" in query, "candidate fetch must be scoped to the run partition"
+        assert "ANN" not in query, "candidate fetch must not use a global ANN search"
         # run_id is the only bound parameter — no LIMIT that could truncate the partition.
-        assert processor.db.session.execute.call_args.kwargs["parameters"] == [run_id]
+        assert params == (event.run_id,)
+        # Large partitions are read in few pages, not the connection's default of 10 rows.
+        assert partition_call.kwargs["fetch_size"] == PARTITION_FETCH_SIZE
 
-    def test_mark_event_is_duplicate_should_return_false_when_cosine_distance_too_large(self, processor):
-        """Should return False when the closest embedding exceeds the similarity threshold."""
-        run_id = uuid4()
-        ts = datetime.now()
+    def test_process_batch_should_store_event_when_cosine_distance_too_large(self, processor):
+        """An event whose closest stored embedding exceeds the similarity threshold is unique."""
         # Two orthogonal unit vectors — cosine distance = 1.0, well outside (-0.05, 0.05)
         embedding = [1.0] + [0.0] * 383
         different_embedding = [0.0, 1.0] + [0.0] * 382
 
-        existing_row = EmbeddingRow(run_id=run_id, ts=datetime.now(), embedding=different_embedding)
-        processor.db.session.execute.return_value = [existing_row]
-
-        result = processor._mark_event_is_duplicate(run_id, ts, "ERROR", embedding)
+        _, written = self._process(
+            processor, embedding, stored=[EmbeddingRow(None, datetime(2026, 1, 1, 11, 0, 0), different_embedding)]
+        )
 
-        assert result is False
+        assert [query for query, _ in written if query.startswith("INSERT")]
+        assert not [query for query, _ in written if query.startswith("UPDATE")]
 
-    def test_mark_event_is_duplicate_should_return_true_for_near_identical_embedding(self, processor):
-        """Should return True and write duplicate_id when a near-identical embedding exists in the same run."""
-        run_id = uuid4()
-        # Distinct timestamps: the canonical event was stored earlier than the one being processed.
-        ts = datetime(2026, 1, 1, 12, 0, 0)
-        ts_existing = datetime(2026, 1, 1, 11, 0, 0)
+    def test_process_batch_should_mark_near_identical_embedding_as_duplicate(self, processor):
+        """A near-identical embedding stored earlier in the same run marks the event as its duplicate."""
         existing_event_id = uuid4()
         # Same unit vector — cosine distance = 0, clearly within (-0.05, 0.05)
         embedding = [1.0] + [0.0] * 383
+        ts_existing = datetime(2026, 1, 1, 11, 0, 0)
 
-        existing_row = EmbeddingRow(run_id=run_id, ts=ts_existing, embedding=embedding)
-
-        # First session.execute call: partition read → returns [existing_row]
-        # Second session.execute call: SELECT event_id → returns a mock dupe
-        mock_dupe = Mock(event_id=existing_event_id)
-        partition_read_done = False
-
-        def session_execute_side_effect(*args, **kwargs):
-            nonlocal partition_read_done
-            if not partition_read_done:
-                partition_read_done = True
-                return [existing_row]
-            return Mock(one=Mock(return_value=mock_dupe))
-
-        processor.db.session.execute.side_effect = session_execute_side_effect
-
-        result = processor._mark_event_is_duplicate(run_id, ts, "ERROR", embedding)
-
-        assert result is True
-
-        # Verify unprocessed event was deleted
-        delete_calls = [call for call in processor.db.execute.call_args_list if "DELETE FROM" in call[0][0]]
-        assert len(delete_calls) == 1
-
-        # Verify duplicate_id was written back to SCTEvent
-        update_calls = [call for call in processor.db.execute.call_args_list if "UPDATE" in call[0][0]]
-        assert len(update_calls) == 1
-        assert update_calls[0][0][1][0] == existing_event_id
+        event, written = self._process(
+            processor,
+            embedding,
+            stored=[EmbeddingRow(None, ts_existing, embedding)],
+            stored_event_id=existing_event_id,
+        )
+
+        # The stored twin's event_id is looked up by its key
+        assert processor.db.session.execute.call_args.kwargs["parameters"] == (event.run_id, "ERROR", ts_existing)
+        # duplicate_id is written back to SCTEvent, the embedding is not stored, the event is dequeued
+        assert [params for query, params in written if query.startswith("UPDATE")] == [
+            (existing_event_id, event.run_id, "ERROR", event.ts)
+        ]
+        assert not [query for query, _ in written if query.startswith("INSERT")]
+        assert [params for query, params in written if query.startswith("DELETE")] == [
+            (event.run_id, "ERROR", event.ts)
+        ]
 
-    def test_mark_event_is_duplicate_should_not_match_event_against_itself(self, processor):
+    def test_process_batch_should_not_match_event_against_itself(self, processor):
         """On a reprocess the partition read returns the event's own stored embedding; it must not
         be treated as its own duplicate (same run_id and same ts)."""
-        run_id = uuid4()
-        ts = datetime.now()
+        ts = datetime(2026, 1, 1, 12, 0, 0)
         embedding = [1.0] + [0.0] * 383
 
         # The only row in the partition is this exact event (same ts) — identical embedding.
-        own_row = EmbeddingRow(run_id=run_id, ts=ts, embedding=embedding)
-        processor.db.session.execute.return_value = [own_row]
+        _, written = self._process(processor, embedding, stored=[EmbeddingRow(None, ts, embedding)], ts=ts)
 
-        assert processor._mark_event_is_duplicate(run_id, ts, "ERROR", embedding) is False
-        assert not [call for call in processor.db.execute.call_args_list if "UPDATE" in call[0][0]]
+        assert not [query for query, _ in written if query.startswith("UPDATE")]
 
-    def test_mark_event_is_duplicate_should_find_twin_among_many_same_run_events(self, processor):
+    def test_process_batch_should_find_twin_among_many_same_run_events(self, processor):
         """The whole run partition is scanned, so a twin is found even amid many non-matching same-run rows.
 
         This is the crowd-out scenario from ARGUS-171 reduced to a unit test: the matching row is the
         last one in a large partition. A top-N ANN could drop it; an exhaustive partition scan cannot.
         """
-        run_id = uuid4()
-        # Distinct timestamps: the twin was stored earlier than the event being processed.
-        ts = datetime(2026, 1, 1, 12, 0, 0)
-        twin_ts = datetime(2026, 1, 1, 11, 0, 0)
         twin_event_id = uuid4()
         embedding = [1.0] + [0.0] * 383
-
         # 1500 unrelated same-run rows (orthogonal) followed by the near-identical twin.
-        noise = [
-            EmbeddingRow(run_id=run_id, ts=datetime(2025, 1, 1, 0, 0, i % 60), embedding=[0.0, 1.0] + [0.0] * 382)
-            for i in range(1500)
-        ]
-        twin = EmbeddingRow(run_id=run_id, ts=twin_ts, embedding=embedding)
-
-        mock_dupe = Mock(event_id=twin_event_id)
-        partition_read_done = False
-
-        def session_execute_side_effect(*args, **kwargs):
-            nonlocal partition_read_done
-            if not partition_read_done:
-                partition_read_done = True
-                return [*noise, twin]
-            return Mock(one=Mock(return_value=mock_dupe))
-
-        processor.db.session.execute.side_effect = session_execute_side_effect
-
-        assert processor._mark_event_is_duplicate(run_id, ts, "ERROR", embedding) is True
-        update_calls = [call for call in processor.db.execute.call_args_list if "UPDATE" in call[0][0]]
-        assert update_calls[0][0][1][0] == twin_event_id
-
-    def test_process_single_event_should_skip_insert_and_delete_when_duplicate_detected(self, processor):
-        """_process_single_event should return early without INSERT or final DELETE when a duplicate is found."""
-        run_id = uuid4()
-        severity = "ERROR"
-        ts = datetime.now()
+        noise = [EmbeddingRow(None, datetime(2025, 1, 1, 0, 0, i % 60), [0.0, 1.0] + [0.0] * 382) for i in range(1500)]
+        twin = EmbeddingRow(None, datetime(2026, 1, 1, 11, 0, 0), embedding)
 
-        mock_event = Mock(message="Connection refused to 10.0.0.1")
-        mock_result = Mock()
-        mock_result.one.return_value = mock_event
-        processor.db.execute.return_value = mock_result
+        _, written = self._process(processor, embedding, stored=[*noise, twin], stored_event_id=twin_event_id)
 
-        with patch.object(processor, "_mark_event_is_duplicate", return_value=True):
-            processor._process_single_event(run_id, severity, ts)
+        update_calls = [params for query, params in written if query.startswith("UPDATE")]
+        assert update_calls[0][0] == twin_event_id
 
-        insert_calls = [call for call in processor.db.execute.call_args_list if "INSERT INTO" in call[0][0]]
-        assert len(insert_calls) == 0
+    def test_process_batch_should_fail_events_when_partition_read_fails(self, processor):
+        """A failing read of the stored embeddings fails the run's events, which are still dequeued."""
+        event = Mock(run_id=uuid4(), severity="ERROR", ts=datetime.now())
+        written = _queue(processor, [event])
+        wired = processor.db.execute_concurrent.side_effect
 
-        # The only DELETE should come from _mark_event_is_duplicate itself (mocked), not from step 5
-        delete_calls = [
-            call
-            for call in processor.db.execute.call_args_list
-            if call[0][0].startswith(f"DELETE FROM {SCTUnprocessedEvent.table_name()}")
-        ]
-        assert len(delete_calls) == 0
+        def execute_concurrent(statements, concurrency=50, fetch_size=10):
+            if statements[0][0].startswith("SELECT ts, embedding"):
+                return [(False, RuntimeError("ScyllaDB timeout")) for _ in statements]
+            return wired(statements, concurrency, fetch_size)
 
-    def test_mark_event_is_duplicate_should_propagate_exceptions(self, processor):
-        """Exceptions raised during duplicate search should propagate to the caller."""
-        run_id = uuid4()
-        ts = datetime.now()
-        embedding = [0.1] * 384
+        processor.db.execute_concurrent.side_effect = execute_concurrent
 
-        processor.db.session.execute.side_effect = RuntimeError("ScyllaDB timeout")
-
-        with pytest.raises(RuntimeError, match="ScyllaDB timeout"):
-            processor._mark_event_is_duplicate(run_id, ts, "ERROR", embedding)
+        assert processor._process_batch() == 0
+        assert processor.error_count == 1
+        assert [query.split(" ")[0] for query, _ in written] == ["DELETE"]
@@ -0,0 +1,140 @@
+"""Tests for token-range sharding of the unprocessed event queue and shard leases."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from argusAI.utils.shard_lease import MAX_TOKEN, MIN_TOKEN, ShardLeaseManager, shard_token_range
+
+
+class FakeLeaseTable:
+    """Emulates the LWT statements ShardLeaseManager issues against the lease table (TTL ignored)."""
+
+    def __init__(self):
+        self.rows: dict[int, str] = {}
+
+    def execute(self, query: str, params: tuple = None):
+        if query.startswith("SELECT"):
+            return [SimpleNamespace(shard=shard, owner=owner) for shard, owner in self.rows.items()]
+        if "IF NOT EXISTS" in query:
+            shard, owner = params[0], params[1]
+            applied = shard not in self.rows
+            if applied:
+                self.rows[shard] = owner
+            return SimpleNamespace(was_applied=applied)
+        if query.startswith("INSERT"):
+            self.rows[params[0]] = params[1]
+            return None
+        if query.startswith("UPDATE"):
+            _, owner, shard, expected = params
+            applied = self.rows.get(shard) == expected
+            return SimpleNamespace(was_applied=applied)
+        if query.startswith("DELETE"):
+            shard, expected = params
+            applied = self.rows.get(shard) == expected
+            if applied:
+                del self.rows[shard]
+            return SimpleNamespace(was_applied=applied)
+        raise AssertionError(f"unexpected query {query}")
+
+    def expire(self, owner: str):
+        self.rows = {shard: holder for shard, holder in self.rows.items() if holder != owner}
+
+
+@pytest.fixture
+def clock():
+    now = [1000.0]
+    with patch("argusAI.utils.shard_lease.time.monotonic", side_effect=lambda: now[0]):
+        yield now
+
+
+def _worker(table, index, workers=2, shards=4, owner=None):
+    manager = ShardLeaseManager(table, shards=shards, worker_index=index, workers=workers, lease_seconds=30)
+    if owner:
+        manager.owner = owner
+    return manager
+
+
+@pytest.mark.parametrize("shards", [1, 3, 16])
+def test_shard_token_ranges_should_tile_the_whole_ring(shards):
+    ranges = [shard_token_range(shard, shards) for shard in range(shards)]
+
+    assert ranges[0][0] == MIN_TOKEN
+    assert ranges[-1][1] == MAX_TOKEN
+    for (_, end), (next_start, _) in zip(ranges, ranges[1:]):
+        assert next_start == end + 1
+
+
+def test_refresh_should_acquire_preferred_shards_immediately(clock):
+    table = FakeLeaseTable()
+    first = _worker(table, 0, owner="0/a")
+
+    shards, dropped = first.refresh(force=True)
+
+    assert shards == [0, 2]
+    assert not dropped
+
+
+def test_refresh_should_take_over_shards_of_a_dead_worker_after_delay(clock):
+    table = FakeLeaseTable()
+    first = _worker(table, 0, owner="0/a")
+    first.refresh(force=True)
+
+    clock[0] += 10
+    assert first.refresh(force=True)[0] == [0, 2]
+
+    clock[0] += 30
+    assert first.refresh(force=True)[0] == [0, 1, 2, 3]
+
+
+def test_refresh_should_hand_shards_back_to_a_returning_worker(clock):
+    table = FakeLeaseTable()
+    first = _worker(table, 0, owner="0/a")
+    first.refresh(force=True)
+    clock[0] += 30
+    first.refresh(force=True)
+    second = _worker(table, 1, owner="1/b")
+
+    # The returning worker announces itself but its shards are still held
+    assert second.refresh(force=True)[0] == []
+    clock[0] += 10
+    shards, dropped = first.refresh(force=True)
+    assert shards == [0, 2]
+    assert dropped
+    clock[0] += 10
+    assert second.refresh(force=True)[0] == [1, 3]
+
+
+def test_refresh_should_report_lost_leases(clock):
+    table = FakeLeaseTable()
+    first = _worker(table, 0, workers=1, shards=2, owner="0/a")
+    first.refresh(force=True)
+    table.rows[1] = "0/other-host"
+
+    shards, dropped = first.refresh(force=True)
+
+    assert shards == [0]
+    assert dropped
+
+
+def test_refresh_should_be_throttled_to_a_third_of_the_lease(clock):
+    table = FakeLeaseTable()
+    first = _worker(table, 0, owner="0/a")
+    first.refresh()
+    table.expire("0/a")
+
+    clock[0] += 5
+    assert first.refresh() == ([0, 2], False)
+    clock[0] += 10
+    assert first.refresh() == ([0, 2], True)
+
+
+def test_release_all_should_drop_leases_and_presence(clock):
+    table = FakeLeaseTable()
+    first = _worker(table, 0, owner="0/a")
+    first.refresh(force=True)
+
+    first.release_all()
+
+    assert table.rows == {}
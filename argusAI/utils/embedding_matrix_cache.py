@@ -0,0 +1,129 @@
+"""In-memory per-run embedding matrices for duplicate detection.
+
+Duplicate detection compares a new event against every embedding already stored for its run.
+Instead of re-reading the run partition and computing one cosine per row for every event, the
+similarity worker keeps the run's embeddings as a normalized float32 matrix: a lookup is one
+matrix-vector product, and unique events are appended in place. Matrices are held in a bounded
+LRU and dropped once their run has been idle for a while, which is the normal end of a run.
+
+The cache is only correct while this process is the sole writer of the run's embeddings, which
+holds because every run is handled by exactly one worker at a time.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Hashable, Iterable
+from uuid import UUID
+
+import numpy as np
+
+DEFAULT_MAX_RUNS = 256
+DEFAULT_IDLE_SECONDS = 3600
+_INITIAL_CAPACITY = 16
+
+
+def normalize(vector) -> np.ndarray:
+    """Return ``vector`` as a unit-length float32 array (zero vectors stay zero)."""
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+class RunEmbeddingMatrix:
+    """Normalized embeddings of one run partition, with the ts and event id of every row."""
+
+    def __init__(self, dimensions: int | None = None):
+        self._matrix = np.empty((_INITIAL_CAPACITY, dimensions or 0), dtype=np.float32)
+        self._size = 0
+        self.ts: list[datetime] = []
+        self.event_ids: list[UUID | None] = []
+        self.last_used = time.monotonic()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, ts: datetime, vector: np.ndarray, event_id: UUID | None = None) -> None:
+        """Append an already normalized vector, growing the backing array geometrically."""
+        if self._matrix.shape[1] != vector.shape[0]:
+            if self._size:
+                raise ValueError(f"Expected {self._matrix.shape[1]}-dim embedding, got {vector.shape[0]}")
+            self._matrix = np.empty((_INITIAL_CAPACITY, vector.shape[0]), dtype=np.float32)
+        if self._size == self._matrix.shape[0]:
+            grown = np.empty((self._size * 2, self._matrix.shape[1]), dtype=np.float32)
+            grown[: self._size] = self._matrix[: self._size]
+            self._matrix = grown
+        self._matrix[self._size] = vector
+        self._size += 1
+        self.ts.append(ts)
+        self.event_ids.append(event_id)
+
+    def find_duplicate(self, vector: np.ndarray, ts: datetime, max_distance: float) -> int | None:
+        """Index of the first row within ``max_distance`` cosine distance of ``vector``.
+
+        ``vector`` must be normalized. The row stored for ``ts`` itself is never returned, so an
+        event being reprocessed does not match its own embedding.
+        """
+        if not self._size:
+            return None
+        distances = 1.0 - self._matrix[: self._size] @ vector
+        for index in np.flatnonzero(distances < max_distance):
+            if self.ts[index] != ts:
+                return int(index)
+        return None
+
+
+class EmbeddingMatrixCache:
+    """Bounded LRU of :class:`RunEmbeddingMatrix`, keyed by (run_id, embedding table)."""
+
+    def __init__(self, max_runs: int = DEFAULT_MAX_RUNS, idle_seconds: float = DEFAULT_IDLE_SECONDS):
+        self.max_runs = max_runs
+        self.idle_seconds = idle_seconds
+        self._runs: OrderedDict[Hashable, RunEmbeddingMatrix] = OrderedDict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._runs
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def get(self, key: Hashable, loader: Callable[[], Iterable]) -> RunEmbeddingMatrix:
+        """Return the matrix for ``key``, building it from ``loader()`` rows (``ts``, ``embedding``) on a miss."""
+        matrix = self._runs.get(key)
+        if matrix is None:
+            matrix = self.build(loader())
+            self.put(key, matrix)
+        else:
+            self._runs.move_to_end(key)
+        matrix.last_used = time.monotonic()
+        return matrix
+
+    @staticmethod
+    def build(rows: Iterable) -> RunEmbeddingMatrix:
+        matrix = RunEmbeddingMatrix()
+        for row in rows:
+            matrix.append(row.ts, normalize(row.embedding))
+        return matrix
+
+    def put(self, key: Hashable, matrix: RunEmbeddingMatrix) -> None:
+        matrix.last_used = time.monotonic()
+        self._runs[key] = matrix
+        self._runs.move_to_end(key)
+        self.evict()
+
+    def discard(self, key: Hashable) -> None:
+        self._runs.pop(key, None)
+
+    def clear(self) -> None:
+        self._runs.clear()
+
+    def evict(self) -> None:
+        """Drop runs idle for longer than ``idle_seconds``, then the least recently used beyond ``max_runs``."""
+        cutoff = time.monotonic() - self.idle_seconds
+        while self._runs:
+            key, matrix = next(iter(self._runs.items()))
+            if len(self._runs) <= self.max_runs and matrix.last_used >= cutoff:
+                break
+            del self._runs[key]
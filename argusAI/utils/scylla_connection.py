@@ -1,5 +1,6 @@
 import logging
 from cassandra.cluster import Cluster, ExecutionProfile, EXEC_PROFILE_DEFAULT
+from cassandra.concurrent import execute_concurrent
 from cassandra.policies import WhiteListRoundRobinPolicy
 from cassandra.auth import PlainTextAuthProvider
 from cassandra.query import ConsistencyLevel
@@ -52,17 +53,20 @@ class ScyllaConnection:
             LOGGER.error(f"Failed to initialize ScyllaDB connection: {e}")
             raise
 
+    def prepare(self, query: str, fetch_size=10):
+        """Return the cached prepared statement for a query, preparing it on first use."""
+        if query not in self.prepared_statements:
+            prepared = self.session.prepare(query)
+            prepared.consistency_level = ConsistencyLevel.QUORUM
+            prepared.fetch_size = fetch_size
+            self.prepared_statements[query] = prepared
+            LOGGER.debug(f"Prepared and cached new statement: {query}")
+        return self.prepared_statements[query]
+
     def execute(self, query: str, params: tuple = None, fetch_size=10):
         """Execute a query, handling unprepared statements by re-preparing if needed."""
         try:
-            if query not in self.prepared_statements:
-                prepared = self.session.prepare(query)
-                prepared.consistency_level = ConsistencyLevel.QUORUM
-                prepared.fetch_size = fetch_size
-                self.prepared_statements[query] = prepared
-                LOGGER.debug(f"Prepared and cached new statement: {query}")
-
-            prepared_statement = self.prepared_statements[query]
+            prepared_statement = self.prepare(query, fetch_size)
             return self.session.execute(prepared_statement, params)
         except PreparedQueryNotFound as e:
             # Handle case where the prepared statement is no longer valid on the server
@@ -83,6 +87,18 @@ class ScyllaConnection:
             LOGGER.error(f"Error type: {type(e)}")
             LOGGER.error(f"Params: {params}")
 
+    def execute_concurrent(self, statements: list[tuple[str, tuple]], concurrency: int = 50, fetch_size=10) -> list:
+        """Execute (query, params) pairs concurrently.
+
+        Returns one (success, result_or_exception) tuple per statement, in input order. A failing
+        statement does not abort the others. Like for prepare(), the fetch_size of a query is the
+        one it was first prepared with.
+        """
+        if not statements:
+            return []
+        prepared = [(self.prepare(query, fetch_size), params) for query, params in statements]
+        return execute_concurrent(self.session, prepared, concurrency=concurrency, raise_on_first_error=False)
+
     def shutdown(self):
         """Properly shut down the ScyllaDB session and cluster."""
         try:
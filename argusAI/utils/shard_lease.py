@@ -0,0 +1,165 @@
+"""Token-range shards of the unprocessed event queue and the leases that assign them to workers.
+
+The ``sct_unprocessed_events`` token ring is split into a fixed number of contiguous ranges.
+Every run lands in exactly one shard (its partition token), so a worker owning a shard owns all
+of that shard's runs, which keeps the per-run embedding cache of a worker authoritative.
+
+Ownership is an LWT lease row in ``sct_similarity_shard_lease`` written with a TTL:
+
+* a worker prefers the shards where ``shard % workers == worker_index`` and claims them as
+  soon as they are free;
+* a free shard that is nobody's preference, or whose preferred worker is down, is taken over
+  after it has stayed free for ``takeover_delay`` seconds, so a crashed worker's shards are picked
+  up once its leases expire;
+* a worker holding another worker's preferred shard hands it back as soon as that worker
+  is alive again. Liveness is a TTL'd presence row per worker, stored in the same table under
+  the negative shard id ``-1 - worker_index``.
+
+Leases are renewed every third of their TTL. A worker only processes shards whose lease it
+renewed in the current cycle, and events are removed from the queue only after they were
+processed, so an ownership change can at worst re-process the events of one in-flight batch.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import time
+from datetime import UTC, datetime
+
+from argus.backend.models.argus_ai import SCTSimilarityShardLease
+
+LOGGER = logging.getLogger(__name__)
+
+MIN_TOKEN = -(2**63)
+MAX_TOKEN = 2**63 - 1
+DEFAULT_LEASE_SECONDS = 30
+
+
+def shard_token_range(shard: int, shards: int) -> tuple[int, int]:
+    """Inclusive ``(start, end)`` Murmur3 token range of ``shard``; the ranges tile the whole ring."""
+    step = (MAX_TOKEN - MIN_TOKEN + 1) // shards
+    start = MIN_TOKEN + shard * step
+    end = MAX_TOKEN if shard == shards - 1 else start + step - 1
+    return start, end
+
+
+def worker_owner_id(worker_index: int) -> str:
+    return f"{worker_index}/{socket.gethostname()}:{os.getpid()}"
+
+
+def owner_worker_index(owner: str) -> int | None:
+    try:
+        return int(owner.split("/", 1)[0])
+    except (AttributeError, ValueError):
+        return None
+
+
+class ShardLeaseManager:
+    """Acquires, renews and hands back shard leases for one similarity worker."""
+
+    def __init__(
+        self,
+        db,
+        shards: int,
+        worker_index: int,
+        workers: int,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+        takeover_delay: float | None = None,
+    ):
+        self.db = db
+        self.shards = shards
+        self.worker_index = worker_index
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.takeover_delay = lease_seconds if takeover_delay is None else takeover_delay
+        self.owner = worker_owner_id(worker_index)
+        self.held: set[int] = set()
+        self._free_since: dict[int, float] = {}
+        self._last_refresh = 0.0
+        self._table = SCTSimilarityShardLease.table_name()
+
+    def is_preferred(self, shard: int) -> bool:
+        return shard % self.workers == self.worker_index
+
+    def _applied(self, query: str, params: tuple) -> bool:
+        result = self.db.execute(query, params)
+        return bool(result is not None and result.was_applied)
+
+    def _acquire(self, shard: int) -> bool:
+        return self._applied(
+            f"INSERT INTO {self._table} (shard, owner, acquired_at) VALUES (?, ?, ?) IF NOT EXISTS USING TTL ?",
+            (shard, self.owner, datetime.now(UTC), self.lease_seconds),
+        )
+
+    def _renew(self, shard: int) -> bool:
+        return self._applied(
+            f"UPDATE {self._table} USING TTL ? SET owner = ? WHERE shard = ? IF owner = ?",
+            (self.lease_seconds, self.owner, shard, self.owner),
+        )
+
+    def _release(self, shard: int) -> bool:
+        return self._applied(f"DELETE FROM {self._table} WHERE shard = ? IF owner = ?", (shard, self.owner))
+
+    def _heartbeat(self) -> None:
+        self.db.execute(
+            f"INSERT INTO {self._table} (shard, owner, acquired_at) VALUES (?, ?, ?) USING TTL ?",
+            (-1 - self.worker_index, self.owner, datetime.now(UTC), self.lease_seconds),
+        )
+
+    def _current_owners(self) -> tuple[dict[int, str], set[int]]:
+        """Owners of the leased shards, and the indexes of the workers that are alive."""
+        owners, live_workers = {}, set()
+        for row in self.db.execute(f"SELECT shard, owner FROM {self._table}") or []:
+            if row.shard < 0:
+                live_workers.add(owner_worker_index(row.owner))
+            else:
+                owners[row.shard] = row.owner
+        return owners, live_workers
+
+    def refresh(self, force: bool = False) -> tuple[list[int], bool]:
+        """Renew, acquire and hand back leases; at most every third of the lease TTL unless ``force``.
+
+        Returns the shards this worker may process, sorted, and whether a previously held shard
+        was lost or handed back since the last refresh (its runs may be written by another worker).
+        """
+        now = time.monotonic()
+        if not force and now - self._last_refresh < self.lease_seconds / 3:
+            return sorted(self.held), False
+        self._last_refresh = now
+
+        self._heartbeat()
+        lost = {shard for shard in self.held if not self._renew(shard)}
+        if lost:
+            LOGGER.warning("Lost similarity shard leases %s", sorted(lost))
+        self.held -= lost
+        released = False
+
+        owners, live_workers = self._current_owners()
+        for shard in range(self.shards):
+            owner = owners.get(shard)
+            if owner is not None:
+                self._free_since.pop(shard, None)
+                if owner == self.owner and not self.is_preferred(shard) and shard % self.workers in live_workers:
+                    # The preferred worker is alive again, hand its shard back
+                    if self._release(shard):
+                        self.held.discard(shard)
+                        released = True
+                        LOGGER.info("Released similarity shard %s to worker %s", shard, shard % self.workers)
+                continue
+            free_since = self._free_since.setdefault(shard, now)
+            if self.is_preferred(shard) or now - free_since >= self.takeover_delay:
+                if self._acquire(shard):
+                    self.held.add(shard)
+                    self._free_since.pop(shard, None)
+                    LOGGER.info("Acquired similarity shard %s of %s", shard, self.shards)
+        return sorted(self.held), bool(lost) or released
+
+    def release_all(self) -> None:
+        for shard in [*sorted(self.held), -1 - self.worker_index]:
+            try:
+                self._release(shard)
+            except Exception:  # noqa: BLE001 - the lease expires on its own anyway
+                LOGGER.warning("Could not release similarity shard lease %s", shard, exc_info=True)
+        self.held.clear()
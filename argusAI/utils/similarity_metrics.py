@@ -0,0 +1,66 @@
+"""Prometheus metrics for the event-similarity worker.
+
+Like the summarization series in summary_metrics, these live in the default registry and are
+served by the worker's own scrape endpoint. They exist to size the worker against bursty SCT
+runs: a failing run can queue thousands of ERROR events within seconds, and the throughput
+gauge shows whether a single worker drains that queue fast enough.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+
+LOGGER = logging.getLogger(__name__)
+
+_NS = "argus_event_similarity"
+
+# `outcome` is one of unique/duplicate/failed.
+EVENTS = Counter(
+    f"{_NS}_events_total",
+    "Unprocessed events handled by the similarity worker, by outcome.",
+    ["severity", "outcome"],
+)
+
+BATCH_SIZE = Histogram(
+    f"{_NS}_batch_size",
+    "Events fetched from the unprocessed queue per batch.",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, float("inf")),
+)
+
+BATCH_LATENCY = Histogram(
+    f"{_NS}_batch_seconds",
+    "Wall time to read, embed, deduplicate and store one batch.",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, float("inf")),
+)
+
+EMBEDDING_LATENCY = Histogram(
+    f"{_NS}_embedding_seconds",
+    "Wall time of the batched embedding forward pass.",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 4, float("inf")),
+)
+
+THROUGHPUT = Gauge(
+    f"{_NS}_events_per_second",
+    "Events per second achieved by the most recent non-empty batch.",
+)
+
+
+def record_batch(events: int, seconds: float, embedding_seconds: float) -> float:
+    """Observe one processed batch and return its throughput in events per second."""
+    rate = events / seconds if seconds > 0 else 0.0
+    BATCH_SIZE.observe(events)
+    BATCH_LATENCY.observe(seconds)
+    EMBEDDING_LATENCY.observe(embedding_seconds)
+    THROUGHPUT.set(rate)
+    return rate
+
+
+def start_metrics_server(port: int) -> None:
+    """Serve the default registry on `port`. Failures are logged and swallowed."""
+    try:
+        start_http_server(port)
+        LOGGER.info("Event similarity metrics exposed on :%d/metrics", port)
+    except Exception as exc:  # noqa: BLE001 - metrics must never break the worker
+        LOGGER.warning("Could not start similarity metrics server on :%d: %s", port, exc)
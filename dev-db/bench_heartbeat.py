@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Benchmark run heartbeats: full row load/save against single-column UPDATEs.
+
+Usage:
+    python dev-db/bench_heartbeat.py
+    python dev-db/bench_heartbeat.py --items 200 --heartbeats 500
+
+Creates a throwaway release/group/test and one SCT run grown to a long-running
+test's size (--items logs, packages, screenshots and nemesis stats entries),
+then sends heartbeats the way ClientService.heartbeat used to (load the whole
+run by id, save the whole run) and the way it does now (one UPDATE of the
+heartbeat column by the cached primary key). Prints the median latency and the
+CQL value bytes read and written per heartbeat, protocol framing excluded.
+Runs from the repository root so argus_web.yaml is found automatically.
+"""
+
+import argparse
+import logging
+import os
+from datetime import UTC, datetime
+from statistics import median
+from time import perf_counter, time
+from uuid import uuid4
+
+os.environ["CQLENG_ALLOW_SCHEMA_MANAGEMENT"] = "1"
+
+from argus.backend.db import ScyllaCluster
+from argus.backend.models.web import ArgusRelease, ArgusGroup, ArgusTest
+from argus.backend.plugins.core import RUN_LOCATIONS
+from argus.backend.plugins.sct.testrun import SCTTestRun
+from argus.backend.plugins.sct.udt import PackageVersion
+from argus.backend.util.config import Config
+from argus.backend.cli import sync_models
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+LOGGER = logging.getLogger("bench_heartbeat")
+
+
+def setup_db():
+    Config.load_yaml_config()
+    cluster = ScyllaCluster.get()
+    sync_models(cluster.config["SCYLLA_KEYSPACE_NAME"])
+    return cluster
+
+
+def create_run(items: int) -> SCTTestRun:
+    suffix = uuid4().hex[:8]
+    release = ArgusRelease.create(name=f"bench-heartbeat-{suffix}", pretty_name="Heartbeat benchmark")
+    group = ArgusGroup.create(release_id=release.id, name=f"bench-group-{suffix}", build_system_id=f"bench-{suffix}")
+    test = ArgusTest.create(
+        release_id=release.id,
+        group_id=group.id,
+        name=f"bench-test-{suffix}",
+        build_system_id=f"bench-{suffix}/heartbeat",
+        plugin_name="scylla-cluster-tests",
+    )
+    return SCTTestRun.create(
+        build_id=test.build_system_id,
+        start_time=datetime.now(UTC),
+        id=uuid4(),
+        release_id=release.id,
+        group_id=group.id,
+        test_id=test.id,
+        status="running",
+        heartbeat=int(time()),
+        test_name="longevity-bench",
+        scylla_version="2025.1.0",
+        started_by="bench",
+        config_files=[f"configurations/bench-{index}.yaml" for index in range(10)],
+        logs=[(f"log-{index}", f"https://example.com/logs/{suffix}/log-{index}.tar.zst") for index in range(items)],
+        packages=[
+            PackageVersion(
+                name=f"package-{index}",
+                version="2025.1.0",
+                date="20250101",
+                revision_id="0123456789ab",
+                build_id=f"{index:040d}",
+            )
+            for index in range(items)
+        ],
+        screenshots=[f"https://example.com/screenshots/{suffix}/{index}.png" for index in range(items)],
+        nemesis_stats={f"disrupt_nemesis_{index}": index for index in range(items)},
+    )
+
+
+def row_bytes(cluster: ScyllaCluster, run_id, columns: str = "*") -> int:
+    """CQL value bytes of the run row as it travels over the wire, for the given columns."""
+    rows = cluster.session.execute(f"SELECT {columns} FROM {SCTTestRun.table_name()} WHERE id = %s", (run_id,))
+    row = rows.one()
+    protocol = cluster.session.cluster.protocol_version
+    return sum(
+        len(column_type.serialize(value, protocol))
+        for column_type, value in zip(rows.column_types, row.values())
+        if value is not None
+    )
+
+
+def full_heartbeat(run_id):
+    run = SCTTestRun.get(id=run_id)
+    run.update_heartbeat()
+    run.save()
+
+
+def partial_heartbeat(run_id):
+    SCTTestRun.update_run_columns(run_id, heartbeat=int(time()))
+
+
+def bench(items: int, heartbeats: int):
+    cluster = ScyllaCluster.get()
+    run = create_run(items)
+    LOGGER.info("Heartbeating run %s", run.id)
+
+    full_row = row_bytes(cluster, run.id)
+    primary_key = row_bytes(cluster, run.id, "build_id, start_time")
+    heartbeat = row_bytes(cluster, run.id, "heartbeat")
+    RUN_LOCATIONS.clear()
+
+    report = []
+    for name, send in (("load+save", full_heartbeat), ("partial", partial_heartbeat)):
+        timings = []
+        for _ in range(heartbeats):
+            started = perf_counter()
+            send(run.id)
+            timings.append(perf_counter() - started)
+        report.append((name, median(timings)))
+
+    # load+save reads and rewrites every column, the partial path reads the key once per process
+    # and then writes only the heartbeat cell addressed by the key
+    traffic = {
+        "load+save": (full_row, full_row),
+        "partial": (primary_key / heartbeats, heartbeat + primary_key),
+    }
+    print(f"{'path':>10} {'median ms':>10} {'bytes read':>11} {'bytes written':>14}")
+    for name, latency in report:
+        read, written = traffic[name]
+        print(f"{name:>10} {latency * 1000:10.2f} {read:11.0f} {written:14.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--items",
+        type=int,
+        default=100,
+        help="Logs, packages, screenshots and nemesis stats entries of the run (default: 100)",
+    )
+    parser.add_argument(
+        "--heartbeats", type=int, default=200, help="Heartbeats per path, median latency is reported (default: 200)"
+    )
+    args = parser.parse_args()
+
+    setup_db()
+    bench(args.items, args.heartbeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Microbenchmark MessageSanitizer over the eval corpus of real SCT event messages.
+
+Usage:
+    PYTHONPATH=. python dev-db/bench_message_sanitizer.py
+    PYTHONPATH=. python dev-db/bench_message_sanitizer.py --repeat 20 --memo-size 1024
+    PYTHONPATH=. python dev-db/bench_message_sanitizer.py --corpus path/to/events.json
+
+Sanitizes every message of the corpus (argusAI/eval/baseline/events.json by default, a list of
+objects with a "message" field) --repeat times and reports the total throughput, plus the
+slowest messages so regressions on large backtrace/coredump events stand out. With
+--memo-size the second and later rounds are served from the sanitizer's memo, which is the
+repeated-event case of a noisy run.
+"""
+
+import argparse
+import json
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from uuid import UUID
+
+from argusAI.utils.event_message_sanitizer import MessageSanitizer
+
+DEFAULT_CORPUS = Path(__file__).parents[1] / "argusAI" / "eval" / "baseline" / "events.json"
+RUN_ID = UUID(int=0)
+
+
+def bench(messages: list[str], repeat: int, memo_size: int):
+    sanitizer = MessageSanitizer(write_log=False, memo_size=memo_size)
+    per_message = [[] for _ in messages]
+    started = perf_counter()
+    for _ in range(repeat):
+        for index, message in enumerate(messages):
+            message_started = perf_counter()
+            sanitizer.sanitize(RUN_ID, message)
+            per_message[index].append(perf_counter() - message_started)
+    total = perf_counter() - started
+
+    chars = sum(len(message) for message in messages) * repeat
+    print(f"{len(messages)} messages x {repeat} rounds, {chars / 1e6:.1f}M chars, memo size {memo_size}")
+    print(f"total {total:.3f}s  {len(messages) * repeat / total:,.0f} messages/s  {chars / total / 1e6:.2f} MB/s")
+    print(f"{'chars':>8} {'median ms':>10}  message")
+    slowest = sorted(range(len(messages)), key=lambda index: median(per_message[index]), reverse=True)[:10]
+    for index in slowest:
+        preview = " ".join(messages[index][:60].split())
+        print(f"{len(messages[index]):>8} {median(per_message[index]) * 1000:10.3f}  {preview}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MessageSanitizer on real SCT event messages.")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="JSON list of events with a message field")
+    parser.add_argument("--repeat", type=int, default=10, help="Rounds over the corpus (default: 10)")
+    parser.add_argument("--memo-size", type=int, default=0, help="Sanitizer memo entries, 0 disables (default: 0)")
+    args = parser.parse_args()
+
+    messages = [event["message"] for event in json.loads(args.corpus.read_text()) if event.get("message")]
+    bench(messages, args.repeat, args.memo_size)
+
+
+if __name__ == "__main__":
+    main()
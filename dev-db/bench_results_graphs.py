@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Benchmark results graph building (create_chartjs) on synthetic nightly histories.
+
+Usage:
+    python dev-db/bench_results_graphs.py
+    python dev-db/bench_results_graphs.py --years 5 --columns 5 --rows 12 --repeat 5
+
+Builds one results table per run of a nightly perf test over the given number
+of years (latency percentiles x workloads, with scylla-server and driver
+package versions changing over time, validation rules and best results) and
+prints the median time create_chartjs takes to turn it into graphs, which is
+the CPU part of ResultsService.get_test_graphs. No database is needed.
+"""
+
+import argparse
+import logging
+import random
+from datetime import datetime, timedelta
+from statistics import median
+from time import perf_counter
+from uuid import uuid4
+
+from argus.backend.models.result import (
+    ArgusGenericResultData,
+    ArgusGenericResultMetadata,
+    ColumnMetadata,
+    ValidationRules,
+)
+from argus.backend.plugins.sct.udt import PackageVersion
+from argus.backend.service.results_service import BestResult, RunsDetails, _split_results_by_release, create_chartjs
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+LOGGER = logging.getLogger("bench_results_graphs")
+
+PERCENTILES = ["p50", "p90", "p99", "p999", "max"]
+MAIN_PACKAGE = "scylla-server"
+
+
+def make_history(years: int, columns: int, rows: int, seed: int):
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1)
+    days = years * 365
+    columns_meta = [
+        ColumnMetadata(
+            name=PERCENTILES[index % len(PERCENTILES)] + ("" if index < len(PERCENTILES) else str(index)),
+            unit="ms",
+            type="FLOAT",
+            higher_is_better=False,
+        )
+        for index in range(columns)
+    ]
+    rows_meta = [f"workload-{index}" for index in range(rows)]
+    validation_rules = {
+        column.name: [
+            ValidationRules(valid_from=start + timedelta(days=day), best_pct=10, best_abs=1.0)
+            for day in range(0, days, 180)
+        ]
+        for column in columns_meta
+    }
+    table = ArgusGenericResultMetadata(
+        name="latency",
+        description="Synthetic nightly history",
+        columns_meta=columns_meta,
+        rows_meta=rows_meta,
+        validation_rules=validation_rules,
+        sut_package_name=MAIN_PACKAGE,
+    )
+
+    packages, data = {}, []
+    for day in range(days):
+        run_id = uuid4()
+        packages[run_id] = [
+            PackageVersion(
+                name=MAIN_PACKAGE,
+                version=f"{2020 + day // 365}.{day // 120 % 3}.{day // 14 % 5}",
+                date=(start + timedelta(days=day)).strftime("%Y%m%d"),
+                revision_id="",
+                build_id="",
+            ),
+            PackageVersion(name="java-driver", version=f"3.11.{day // 45}", date="", revision_id="", build_id=""),
+        ]
+        sut_timestamp = start + timedelta(days=day, hours=2)
+        data.extend(
+            ArgusGenericResultData(
+                run_id=run_id,
+                column=column.name,
+                row=row,
+                value=rng.uniform(1, 100),
+                status="PASS",
+                sut_timestamp=sut_timestamp,
+            )
+            for column in columns_meta
+            for row in rows_meta
+        )
+
+    best_results = {
+        f"{column.name}:{row}": [
+            BestResult(
+                key=f"{column.name}:{row}",
+                value=rng.uniform(1, 10),
+                result_date=start + timedelta(days=day),
+                run_id=None,
+            )
+            for day in range(0, days, 30)
+        ]
+        for column in columns_meta
+        for row in rows_meta
+    }
+    return table, data, best_results, RunsDetails(ignored=frozenset(), packages=packages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, default=5, help="Years of nightly runs")
+    parser.add_argument("--columns", type=int, default=5, help="Columns of the results table")
+    parser.add_argument("--rows", type=int, default=12, help="Rows of the results table")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed builds, the median is reported")
+    parser.add_argument("--seed", type=int, default=2020)
+    args = parser.parse_args()
+
+    table, data, best_results, runs_details = make_history(args.years, args.columns, args.rows, args.seed)
+    releases_map = _split_results_by_release(runs_details.packages, main_package=MAIN_PACKAGE)
+    LOGGER.info("%s runs, %s cells, %s releases", len(runs_details.packages), len(data), len(releases_map))
+
+    timings = []
+    for _ in range(args.repeat):
+        started = perf_counter()
+        graphs = create_chartjs(
+            table, data, best_results, releases_map=releases_map, runs_details=runs_details, main_package=MAIN_PACKAGE
+        )
+        timings.append(perf_counter() - started)
+    points = sum(len(dataset["data"]) for graph in graphs for dataset in graph["data"]["datasets"])
+    LOGGER.info(
+        "create_chartjs: %s graphs, %s points, median %.3fs (min %.3fs)",
+        len(graphs),
+        points,
+        median(timings),
+        min(timings),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Benchmark SCT event ingestion throughput: per-event submission against the batch path.
+
+Usage:
+    python dev-db/bench_submit_events.py
+    python dev-db/bench_submit_events.py --sizes 50 500 2000 --repeat 5
+
+Creates a throwaway release/group/test and one SCT run, then submits bursts of
+events of growing size (mostly NORMAL/WARNING events with some ERROR, CRITICAL
+and coredump events, as a longevity run flushes them) once through
+SCTService.submit_event per event, which is how the event/submit endpoint
+stored lists before, and once through SCTService.submit_event_batch. Prints
+the median time per burst and the events per second of both paths.
+Runs from the repository root so argus_web.yaml is found automatically.
+"""
+
+import argparse
+import logging
+import os
+import random
+from datetime import UTC, datetime
+from statistics import median
+from time import perf_counter, time
+from uuid import uuid4
+
+os.environ["CQLENG_ALLOW_SCHEMA_MANAGEMENT"] = "1"
+
+from argus.backend.db import ScyllaCluster
+from argus.backend.models.web import ArgusRelease, ArgusGroup, ArgusTest
+from argus.backend.plugins.sct.service import SCTService
+from argus.backend.plugins.sct.testrun import SCTEventSeverity, SCTTestRun
+from argus.backend.util.config import Config
+from argus.backend.cli import sync_models
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+LOGGER = logging.getLogger("bench_submit_events")
+
+SEVERITIES = (
+    [SCTEventSeverity.NORMAL] * 6 + [SCTEventSeverity.WARNING] * 2 + [SCTEventSeverity.ERROR, SCTEventSeverity.CRITICAL]
+)
+
+
+def setup_db():
+    Config.load_yaml_config()
+    cluster = ScyllaCluster.get()
+    sync_models(cluster.config["SCYLLA_KEYSPACE_NAME"])
+    return cluster
+
+
+def create_run() -> SCTTestRun:
+    suffix = uuid4().hex[:8]
+    release = ArgusRelease.create(name=f"bench-events-{suffix}", pretty_name="Events benchmark")
+    group = ArgusGroup.create(release_id=release.id, name=f"bench-group-{suffix}", build_system_id=f"bench-{suffix}")
+    test = ArgusTest.create(
+        release_id=release.id,
+        group_id=group.id,
+        name=f"bench-test-{suffix}",
+        build_system_id=f"bench-{suffix}/events",
+        plugin_name="scylla-cluster-tests",
+    )
+    run = SCTTestRun.create(
+        build_id=test.build_system_id,
+        start_time=datetime.now(UTC),
+        id=uuid4(),
+        release_id=release.id,
+        group_id=group.id,
+        test_id=test.id,
+        status="running",
+        heartbeat=int(time()),
+    )
+    run.index_location()
+    return run
+
+
+def make_burst(run_id, size: int, rng: random.Random) -> list[dict]:
+    base_ts = time() + rng.uniform(0, 10**6)
+    events = []
+    for index in range(size):
+        severity = rng.choice(SEVERITIES)
+        event = {
+            "run_id": str(run_id),
+            "severity": severity.value,
+            "ts": base_ts + index / 1000,
+            "event_type": "DatabaseLogEvent",
+            "message": f"(DatabaseLogEvent Severity.{severity.value}) node=db-node-{index % 6} event {index}",
+            "node": f"db-node-{index % 6}",
+        }
+        if index % 250 == 249:
+            event["event_type"] = "CoreDumpEvent"
+            event["message"] = f"corefile_url=https://example.com/core.scylla.{index}.zst\nnode=db-node-{index % 6}"
+        events.append(event)
+    return events
+
+
+def bench(sizes: list[int], repeat: int, seed: int):
+    rng = random.Random(seed)
+    run = create_run()
+    LOGGER.info("Submitting events to run %s", run.id)
+    report = []
+    for size in sizes:
+        serial, batched = [], []
+        for _ in range(repeat):
+            burst = make_burst(run.id, size, rng)
+            started = perf_counter()
+            for event in burst:
+                SCTService.submit_event(run_id=str(run.id), raw_event=event)
+            serial.append(perf_counter() - started)
+
+            burst = make_burst(run.id, size, rng)
+            started = perf_counter()
+            SCTService.submit_event_batch(run_id=str(run.id), raw_events=burst)
+            batched.append(perf_counter() - started)
+        report.append((size, median(serial), median(batched)))
+
+    print(f"{'events':>8} {'serial ms':>10} {'ev/s':>9} {'batch ms':>10} {'ev/s':>9} {'speedup':>8}")
+    for size, serial, batched in report:
+        print(
+            f"{size:>8} {serial * 1000:10.1f} {size / serial:9.0f} {batched * 1000:10.1f} {size / batched:9.0f} "
+            f"{serial / batched:7.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10, 100, 500, 2000], help="Events per burst (default: 10 100 500 2000)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Bursts per size, median is reported (default: 3)")
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args()
+
+    setup_db()
+    bench(args.sizes, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
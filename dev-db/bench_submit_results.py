@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Benchmark ClientService.submit_results latency against result table size.
+
+Usage:
+    python dev-db/bench_submit_results.py
+    python dev-db/bench_submit_results.py --sizes 10 100 1000 5000 --repeat 5
+    python dev-db/bench_submit_results.py --compare-serial
+
+Creates a throwaway release/group/test and one SCT run, then submits tables
+of growing size (latency percentiles x workloads x nodes, as perf tests do)
+and prints the median submission latency per size. With --compare-serial the
+same cells are also written one synchronous save() at a time, which is how
+submissions were stored before the batched write path.
+Runs from the repository root so argus_web.yaml is found automatically.
+"""
+
+import argparse
+import logging
+import os
+from datetime import UTC, datetime
+from statistics import median
+from time import perf_counter, time
+from uuid import uuid4
+
+os.environ["CQLENG_ALLOW_SCHEMA_MANAGEMENT"] = "1"
+
+from argus.backend.db import ScyllaCluster
+from argus.backend.models.result import ArgusGenericResultData
+from argus.backend.models.web import ArgusRelease, ArgusGroup, ArgusTest
+from argus.backend.plugins.sct.testrun import SCTTestRun
+from argus.backend.service.client_service import ClientService
+from argus.backend.util.config import Config
+from argus.backend.cli import sync_models
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+LOGGER = logging.getLogger("bench_submit_results")
+
+PERCENTILES = ["p50", "p90", "p99", "p999", "max"]
+
+
+def setup_db():
+    Config.load_yaml_config()
+    cluster = ScyllaCluster.get()
+    sync_models(cluster.config["SCYLLA_KEYSPACE_NAME"])
+    return cluster
+
+
+def create_run() -> SCTTestRun:
+    suffix = uuid4().hex[:8]
+    release = ArgusRelease.create(name=f"bench-results-{suffix}", pretty_name="Results benchmark")
+    group = ArgusGroup.create(release_id=release.id, name=f"bench-group-{suffix}", build_system_id=f"bench-{suffix}")
+    test = ArgusTest.create(
+        release_id=release.id,
+        group_id=group.id,
+        name=f"bench-test-{suffix}",
+        build_system_id=f"bench-{suffix}/results",
+        plugin_name="scylla-cluster-tests",
+    )
+    return SCTTestRun.create(
+        build_id=test.build_system_id,
+        start_time=datetime.now(UTC),
+        id=uuid4(),
+        release_id=release.id,
+        group_id=group.id,
+        test_id=test.id,
+        status="running",
+        heartbeat=int(time()),
+    )
+
+
+def make_table(name: str, cells: int) -> dict:
+    results = [
+        {
+            "column": PERCENTILES[index % len(PERCENTILES)],
+            "row": f"workload-{index // len(PERCENTILES)}",
+            "value": float(index),
+            "status": "UNSET",
+        }
+        for index in range(cells)
+    ]
+    return {
+        "meta": {
+            "name": name,
+            "description": f"{cells} cell benchmark table",
+            "columns_meta": [
+                {"name": column, "unit": "ms", "type": "FLOAT", "higher_is_better": False} for column in PERCENTILES
+            ],
+            "rows_meta": list(dict.fromkeys(cell["row"] for cell in results)),
+            "validation_rules": {},
+            "sut_package_name": "scylla-server",
+        },
+        "sut_timestamp": int(time()),
+        "results": results,
+    }
+
+
+def serial_submit(run: SCTTestRun, table: dict):
+    sut_timestamp = datetime.fromtimestamp(table["sut_timestamp"])
+    for cell in table["results"]:
+        ArgusGenericResultData(
+            test_id=run.test_id, run_id=run.id, name=table["meta"]["name"], sut_timestamp=sut_timestamp, **cell
+        ).save()
+
+
+def bench(sizes: list[int], repeat: int, compare_serial: bool):
+    service = ClientService()
+    run = create_run()
+    LOGGER.info("Submitting results to run %s", run.id)
+    report = []
+    for size in sizes:
+        batched, serial = [], []
+        for attempt in range(repeat):
+            table = make_table(f"bench-{size}-{attempt}", size)
+            started = perf_counter()
+            service.submit_results("scylla-cluster-tests", str(run.id), table)
+            batched.append(perf_counter() - started)
+            if compare_serial:
+                table = make_table(f"bench-serial-{size}-{attempt}", size)
+                started = perf_counter()
+                serial_submit(run, table)
+                serial.append(perf_counter() - started)
+        report.append((size, median(batched), median(serial) if serial else None))
+
+    print(f"{'cells':>8} {'batched ms':>12} {'us/cell':>9} {'serial ms':>12}")
+    for size, batched, serial in report:
+        serial_ms = f"{serial * 1000:12.1f}" if serial is not None else f"{'-':>12}"
+        print(f"{size:>8} {batched * 1000:12.1f} {batched * 1e6 / size:9.1f} {serial_ms}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark result table submission latency.")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 100, 500, 1000, 5000],
+        help="Table sizes in cells (default: 10 100 500 1000 5000)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Submissions per size, median is reported (default: 3)")
+    parser.add_argument(
+        "--compare-serial", action="store_true", help="Also time one synchronous save() per cell for comparison"
+    )
+    args = parser.parse_args()
+
+    setup_db()
+    bench(args.sizes, args.repeat, args.compare_serial)
+
+
+if __name__ == "__main__":
+    main()
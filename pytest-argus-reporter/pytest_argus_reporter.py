@@ -10,6 +10,8 @@ import subprocess
 from collections import defaultdict
 import pprint
 import fnmatch
+import heapq
+import math
 import concurrent.futures
 import json
 from json import JSONDecodeError
@@ -146,6 +148,14 @@ def pytest_addoption(parser):
         default=120,
         help="Default time for a test, if history isn't found for it, in seconds",
     )
+    group.addoption(
+        "--argus-batch-size",
+        action="store",
+        type=int,
+        dest="batch_size",
+        default=int(os.environ.get("ARGUS_BATCH_SIZE", "100")),
+        help="Number of test results posted to Argus in one request, 0 posts each result as the test finishes",
+    )
 
 
 def pytest_configure(config):
@@ -158,6 +168,7 @@ def pytest_configure(config):
 def pytest_unconfigure(config):
     argus = getattr(config, "argus", None)
     if argus:
+        argus.flush_reports()
         del config.argus
         config.pluginmanager.unregister(argus)
 
@@ -192,6 +203,7 @@ class ArgusReporter(object):  # pylint: disable=too-many-instance-attributes
         self.use_tunnel = config.getoption("use_tunnel")
         self.max_splice_time = config.getoption("max_splice_time")
         self.default_test_time = config.getoption("default_test_time")
+        self.batch_size = config.getoption("batch_size")
         if self.post_reports:
             assert self.run_id and self.test_type, (
                 "'--argus-run-id' and '--argus-test-type' should be set, "
@@ -206,6 +218,9 @@ class ArgusReporter(object):  # pylint: disable=too-many-instance-attributes
         self.config = config
         self.is_slave = False
         self.slices_query_fields = dict()
+        self.pending_results = []
+        self.batch_endpoint_supported = True
+        self._sender = None
 
     @cached_property
     def argus_client(self):
@@ -325,38 +340,145 @@ class ArgusReporter(object):  # pylint: disable=too-many-instance-attributes
     def post_to_argus(self, test_data):
         if self.post_reports and not self.is_slave:
             try:
-                request_data = dict()
-
-                request_data["name"] = test_data.pop("name")
-
-                request_data["test_type"] = self.test_type
-                request_data["run_id"] = self.run_id
-                request_data["message"] = test_data.pop("failure_message", None)
-                request_data["status"] = test_data.pop("outcome")
-                request_data["duration"] = test_data.pop("duration")
-                request_data["timestamp"] = test_data.pop("timestamp")
-                request_data["session_timestamp"] = test_data.pop("session_start_time")
-                request_data["markers"] = test_data.pop("markers", [])
-                request_data["user_fields"] = {str(k): str(v) for k, v in test_data.items()}
+                request_data = self.build_request_data(test_data)
+                if self.batch_size > 0:
+                    self.queue_result(request_data)
+                else:
+                    self.post_result(request_data)
+
+            except Exception as ex:  # pylint: disable=broad-except  # noqa: BLE001
+                LOGGER.warning("Failed to POST to argus: [%s]", str(ex))
+
+    def build_request_data(self, test_data):
+        request_data = dict()
+
+        request_data["name"] = test_data.pop("name")
+
+        request_data["test_type"] = self.test_type
+        request_data["run_id"] = self.run_id
+        request_data["message"] = test_data.pop("failure_message", None)
+        request_data["status"] = test_data.pop("outcome")
+        request_data["duration"] = test_data.pop("duration")
+        request_data["timestamp"] = test_data.pop("timestamp")
+        request_data["session_timestamp"] = test_data.pop("session_start_time")
+        request_data["markers"] = test_data.pop("markers", [])
+        request_data["user_fields"] = {str(k): str(v) for k, v in test_data.items()}
+        return request_data
+
+    def post_result(self, request_data):
+        res = self.argus_client.post(endpoint="/testrun/pytest/result/submit", location_params={}, body=request_data)
+        res.raise_for_status()
+
+    def queue_result(self, request_data):
+        """
+        Queue a result for posting, a full batch is handed to the sender thread so the test
+        session doesn't wait on Argus. Batches are sent one by one, in the order they were queued.
+        """
+        self.pending_results.append(request_data)
+        if len(self.pending_results) >= self.batch_size:
+            self.send_pending_results()
+
+    def send_pending_results(self):
+        batch, self.pending_results = self.pending_results, []
+        if not batch:
+            return
+        if self._sender is None:
+            self._sender = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="argus-reporter")
+        self._sender.submit(self.post_results, batch)
+
+    def post_results(self, batch):
+        if self.batch_endpoint_supported:
+            try:
                 res = self.argus_client.post(
-                    endpoint="/testrun/pytest/result/submit", location_params={}, body=request_data
+                    endpoint="/testrun/pytest/result/submit_batch", location_params={}, body={"results": batch}
                 )
-                res.raise_for_status()
+                if res.status_code == 404:
+                    # Argus instance without the batch endpoint, stay on the per-test path from now on
+                    LOGGER.info("Argus doesn't support posting results in batches, posting each test result")
+                    self.batch_endpoint_supported = False
+                else:
+                    res.raise_for_status()
+                    try:
+                        response_data = res.json()
+                    except ValueError:
+                        response_data = {}
+                    if response_data.get("status", "ok") == "ok":
+                        return
+                    LOGGER.warning(
+                        "Argus failed to store a batch of %s results: %s", len(batch), response_data.get("response")
+                    )
+                    failed = self.failed_result_names(response_data)
+                    if failed is not None:
+                        # results stored by the batch are counted in Argus' daily status charts, only re-post the rest
+                        batch = [request_data for request_data in batch if request_data["name"] in failed]
+            except Exception as ex:  # pylint: disable=broad-except  # noqa: BLE001
+                LOGGER.warning("Failed to POST a batch of %s results to argus: [%s]", len(batch), str(ex))
 
+        for request_data in batch:
+            try:
+                self.post_result(request_data)
             except Exception as ex:  # pylint: disable=broad-except  # noqa: BLE001
                 LOGGER.warning("Failed to POST to argus: [%s]", str(ex))
 
+    @staticmethod
+    def failed_result_names(response_data):
+        """Names of the results a batch failed to store, None when Argus doesn't tell which ones failed."""
+        response = response_data.get("response")
+        arguments = response.get("arguments") if isinstance(response, dict) else None
+        if not isinstance(arguments, list) or len(arguments) < 2 or not isinstance(arguments[1], list):
+            return None
+        return {failure.get("key") for failure in arguments[1] if isinstance(failure, dict)}
+
+    def flush_reports(self):
+        """Post the queued results and wait until every batch is sent."""
+        self.send_pending_results()
+        if self._sender is not None:
+            self._sender.shutdown(wait=True)
+            self._sender = None
+
+    def pytest_sessionfinish(self):
+        self.flush_reports()
+
     def fetch_test_duration(self, collected_test_list, default_time_sec=120.0, max_workers=20):
         """
         fetch test 95 percentile duration of a list of tests
 
         :param collected_test_list: the names of the test to lookup
         :param default_time_sec: the time to return when no history data found
-        :param max_workers: number of threads to use for concurrency
+        :param max_workers: number of threads to use for concurrency, when Argus can't return the stats in bulk
 
         :returns: map from test_id to 95 percentile duration
         """
 
+        try:
+            test_durations = self.fetch_bulk_test_duration(collected_test_list)
+        except Exception as ex:  # pylint: disable=broad-except  # noqa: BLE001
+            LOGGER.warning("Failed to fetch test durations in bulk, fetching them one by one: [%s]", str(ex))
+            test_durations = self.fetch_each_test_duration(collected_test_list, max_workers=max_workers)
+
+        for test in test_durations:
+            if not test["duration"]:
+                test["duration"] = default_time_sec
+        test_durations.sort(key=lambda x: x["duration"])
+        LOGGER.debug(pprint.pformat(test_durations))
+
+        return test_durations
+
+    def fetch_bulk_test_duration(self, collected_test_list, chunk_size=1000):
+        test_durations = []
+        for start in range(0, len(collected_test_list), chunk_size):
+            res = self.argus_client.post(
+                endpoint="/testrun/pytest/stats/duration",
+                location_params=dict(),
+                body=dict(self.slices_query_fields, tests=collected_test_list[start : start + chunk_size]),
+            )
+            self.argus_client.check_response(res)
+            test_durations.extend(
+                dict(test_name=test_id, duration=stats["p95"]) for test_id, stats in res.json()["response"].items()
+            )
+        return test_durations
+
+    def fetch_each_test_duration(self, collected_test_list, max_workers=20):
         test_durations = []
 
         def get_test_stats(test_id):
@@ -381,13 +503,6 @@ class ArgusReporter(object):  # pylint: disable=too-many-instance-attributes
                     test_durations.append(future.result())
                 except Exception:  # pylint: disable=broad-except
                     LOGGER.exception("'%s' generated an exception", test_id)
-
-        for test in test_durations:
-            if not test["duration"]:
-                test["duration"] = default_time_sec
-        test_durations.sort(key=lambda x: x["duration"])
-        LOGGER.debug(pprint.pformat(test_durations))
-
         return test_durations
 
     @staticmethod
@@ -417,21 +532,33 @@ class ArgusReporter(object):  # pylint: disable=too-many-instance-attributes
 
     @staticmethod
     def make_test_slices(test_data, max_slice_duration):
-        slices = []
-        while test_data:
-            current_test = test_data.pop(0)
-            for current_slice in slices:
-                if current_slice["total"] + float(current_test["duration"]) > max_slice_duration:
-                    continue
-                current_slice["total"] += float(current_test["duration"])
-                current_slice["tests"] += [current_test["test_name"]]
-                break
-            else:
-                slices += [dict(total=0.0, tests=[])]
-                current_slice = slices[-1]
+        """
+        split tests into slices of at most `max_slice_duration` that take about the same time
+
+        Longest processing time first: tests are placed, longest first, into the slice with the
+        least total so far. It starts with as few slices as the total duration allows and adds a
+        slice until no slice is over the limit (a single test longer than the limit gets its own).
+        """
+        tests = sorted(test_data, key=lambda test: float(test["duration"]), reverse=True)
+        if not tests:
+            return []
+        total = sum(float(test["duration"]) for test in tests)
+        slices_count = min(len(tests), max(1, math.ceil(total / max_slice_duration)))
+        while True:
+            slices = [dict(total=0.0, tests=[]) for _ in range(slices_count)]
+            heap = [(0.0, index) for index in range(slices_count)]
+            for current_test in tests:
+                _, index = heapq.heappop(heap)
+                current_slice = slices[index]
                 current_slice["total"] += float(current_test["duration"])
                 current_slice["tests"] += [current_test["test_name"]]
-        return slices
+                heapq.heappush(heap, (current_slice["total"], index))
+            if slices_count == len(tests) or all(
+                current_slice["total"] <= max_slice_duration or len(current_slice["tests"]) == 1
+                for current_slice in slices
+            ):
+                return slices
+            slices_count += 1
 
     def pytest_collection_finish(self, session):
         if self.config.getoption("slices"):
@@ -1,7 +1,20 @@
 # -*- coding: utf-8 -*-
 
 import os
-import json
+
+BATCH_ENDPOINT = "https://argus.scylladb.com/api/v1/client/testrun/pytest/result/submit_batch"
+RESULT_ENDPOINT = "https://argus.scylladb.com/api/v1/client/testrun/pytest/result/submit"
+
+
+def posted_results(requests_mock):
+    """Test results posted to Argus in posting order, whether they were sent in batches or one by one."""
+    results = []
+    for req in requests_mock.request_history:
+        if req.method != "POST":
+            continue
+        body = req.json()
+        results.extend(body["results"] if req.url == BATCH_ENDPOINT else [body])
+    return results
 
 
 def test_failures(testdir, requests_mock):  # pylint: disable=redefined-outer-name
@@ -94,8 +107,7 @@ def test_failures(testdir, requests_mock):  # pylint: disable=redefined-outer-na
     # make sure that we get a '1' exit code for the testsuite
     assert result.ret == 1
 
-    for req in requests_mock.request_history:
-        req_json = req.json()
+    for req_json in posted_results(requests_mock):
         assert "status" in req_json
         assert "name" in req_json
         assert "user_fields" in req_json
@@ -276,7 +288,7 @@ def test_git_info(testdir, requests_mock):  # pylint: disable=redefined-outer-na
     # make sure that we get a '0' exit code for the testsuite
     assert result.ret == 0
 
-    last_report = json.loads(requests_mock.request_history[-1].text)["user_fields"]
+    last_report = posted_results(requests_mock)[-1]["user_fields"]
     assert last_report["git_branch"] == "master"
     assert "initial commit" in last_report["git_commit_oneline"]
     assert "initial commit" in last_report["git_commit_full"]
@@ -305,10 +317,10 @@ def test_append_test_data(testdir, requests_mock):  # pylint: disable=redefined-
     # make sure that we get a '0' exit code for the testsuite
     assert result.ret == 0
 
-    first_report = json.loads(requests_mock.request_history[0].text)
+    first_report = posted_results(requests_mock)[0]
     assert first_report["user_fields"]["my_key"] == "1"
 
-    second_report = json.loads(requests_mock.request_history[1].text)
+    second_report = posted_results(requests_mock)[1]
     assert "my_key" not in second_report["user_fields"], "key should be only on specific test"
 
 
@@ -337,10 +349,10 @@ def test_marker_collection(testdir, requests_mock):  # pylint: disable=redefined
     # make sure that we get a '0' exit code for the testsuite
     assert result.ret == 0
 
-    first_report = json.loads(requests_mock.request_history[0].text)
+    first_report = posted_results(requests_mock)[0]
     assert "mark1" in first_report["markers"]
 
-    second_report = json.loads(requests_mock.request_history[1].text)
+    second_report = posted_results(requests_mock)[1]
     assert "mark2" in second_report["markers"]
 
 
@@ -364,7 +376,7 @@ def test_user_properties(testdir, requests_mock):  # pylint: disable=redefined-o
     # make sure that we get a '0' exit code for the testsuite
     assert result.ret == 0
 
-    report = json.loads(requests_mock.request_history[0].text)
+    report = posted_results(requests_mock)[0]
     assert "example_key" in report["user_fields"]
     assert report["user_fields"]["example_key"] == "1"
 
@@ -394,7 +406,7 @@ def test_marks(testdir, requests_mock):  # pylint: disable=redefined-outer-name
     # make sure that we get a '0' exit code for the testsuite
     assert result.ret == 0
 
-    report = json.loads(requests_mock.request_history[0].text)
+    report = posted_results(requests_mock)[0]
     assert set(report["markers"]) == {"module_level", "class_level", "method_level"}
 
 
@@ -442,6 +454,103 @@ def test_no_post_reports(testdir, requests_mock):  # pylint: disable=redefined-o
     assert not requests_mock.called, "Requests are not made to Argus when post_reports is False"
 
 
+def test_results_posted_in_batches(testdir, requests_mock):  # pylint: disable=redefined-outer-name
+    testdir.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.parametrize("index", range(5))
+        def test_1(index):
+            pass
+        """
+    )
+
+    result = testdir.runpytest("--argus-post-reports", "--argus-batch-size=2", "-s", "-v")
+
+    assert result.ret == 0
+    batches = [req.json()["results"] for req in requests_mock.request_history if req.url == BATCH_ENDPOINT]
+    assert [len(batch) for batch in batches] == [2, 2, 1], "remaining results are posted at the end of the session"
+    assert [report["name"] for batch in batches for report in batch] == [
+        f"test_results_posted_in_batches.py::test_1[{index}]" for index in range(5)
+    ]
+    assert not any(req.url == RESULT_ENDPOINT for req in requests_mock.request_history)
+
+
+def test_results_posted_per_test_without_batch_endpoint(testdir, requests_mock):  # pylint: disable=redefined-outer-name
+    batch_endpoint = requests_mock.post(BATCH_ENDPOINT, status_code=404)
+    testdir.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.parametrize("index", range(3))
+        def test_1(index):
+            pass
+        """
+    )
+
+    result = testdir.runpytest("--argus-post-reports", "--argus-batch-size=2", "-s", "-v")
+
+    assert result.ret == 0
+    assert batch_endpoint.call_count == 1, "batch endpoint isn't retried once Argus doesn't support it"
+    per_test = [req.json()["name"] for req in requests_mock.request_history if req.url == RESULT_ENDPOINT]
+    assert per_test == [
+        f"test_results_posted_per_test_without_batch_endpoint.py::test_1[{index}]" for index in range(3)
+    ]
+
+
+def test_failed_batch_posted_per_test(testdir, requests_mock):  # pylint: disable=redefined-outer-name
+    requests_mock.post(BATCH_ENDPOINT, json={"status": "error", "response": {"arguments": ["failed"]}})
+    testdir.makepyfile(
+        """
+        def test_1():
+            pass
+        """
+    )
+
+    result = testdir.runpytest("--argus-post-reports", "-s", "-v")
+
+    assert result.ret == 0
+    per_test = [req.json()["name"] for req in requests_mock.request_history if req.url == RESULT_ENDPOINT]
+    assert per_test == ["test_failed_batch_posted_per_test.py::test_1"]
+
+
+def test_partially_failed_batch_reposts_failed_results(testdir, requests_mock):  # pylint: disable=redefined-outer-name
+    failures = [{"key": "test_partially_failed_batch_reposts_failed_results.py::test_2", "error": "timeout"}]
+    requests_mock.post(BATCH_ENDPOINT, json={"status": "error", "response": {"arguments": ["failed", failures]}})
+    testdir.makepyfile(
+        """
+        def test_1():
+            pass
+
+        def test_2():
+            pass
+        """
+    )
+
+    result = testdir.runpytest("--argus-post-reports", "-s", "-v")
+
+    assert result.ret == 0
+    per_test = [req.json()["name"] for req in requests_mock.request_history if req.url == RESULT_ENDPOINT]
+    assert per_test == ["test_partially_failed_batch_reposts_failed_results.py::test_2"]
+
+
+def test_results_posted_per_test_when_batching_disabled(testdir, requests_mock):  # pylint: disable=redefined-outer-name
+    testdir.makepyfile(
+        """
+        def test_1():
+            pass
+
+        def test_2():
+            pass
+        """
+    )
+
+    result = testdir.runpytest("--argus-post-reports", "--argus-batch-size=0", "-s", "-v")
+
+    assert result.ret == 0
+    assert [req.url for req in requests_mock.request_history] == [RESULT_ENDPOINT, RESULT_ENDPOINT]
+
+
 def test_replay_log_filename_carries_run_id(testdir, requests_mock):  # pylint: disable=redefined-outer-name
     # Regression test: ArgusReporter.argus_client used to construct
     # ArgusGenericClient without run_id, so the replay log filename always
@@ -495,17 +604,17 @@ def test_subtests(testdir, requests_mock):  # pylint: disable=redefined-outer-na
     assert result.ret == 1
 
     # validate each subtest is being reported on its own
-    report = json.loads(requests_mock.request_history[-1].text)
+    report = posted_results(requests_mock)[-1]
     assert report["name"] == "test_subtests.py::test_failing_subtests"
     assert "subtest" not in report["user_fields"]
     assert report["status"] == "failure"
 
-    report = json.loads(requests_mock.request_history[-2].text)
+    report = posted_results(requests_mock)[-2]
     assert report["name"] == "test_subtests.py::test_failing_subtests"
     assert report["user_fields"]["subtest"] == "success subtest"
     assert report["status"] == "passed"
 
-    report = json.loads(requests_mock.request_history[-3].text)
+    report = posted_results(requests_mock)[-3]
     assert report["name"] == "test_subtests.py::test_failing_subtests"
     assert report["user_fields"]["subtest"] == "failed subtest"
     assert report["status"] == "failure"
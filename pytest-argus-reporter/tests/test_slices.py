@@ -1,3 +1,6 @@
+from pytest_argus_reporter import ArgusReporter
+
+
 def test_history_slices(testdir):
     # create a temporary pytest test module
     testdir.makepyfile(
@@ -59,3 +62,75 @@ def test_history_slices(testdir):
         "--argus-post-reports",
         "--log-cli-level=debug",
     )
+
+
+def test_history_slices_with_bulk_stats(testdir, requests_mock):
+    stats = requests_mock.post(
+        "https://argus.scylladb.com/api/v1/client/testrun/pytest/stats/duration",
+        json={
+            "status": "ok",
+            "response": {
+                "test_bulk_slices.py::test_long": {"avg": 150.0, "p95": 180.0, "count": 10},
+                "test_bulk_slices.py::test_short_1": {"avg": 50.0, "p95": 60.0, "count": 10},
+                "test_bulk_slices.py::test_short_2": {"avg": 50.0, "p95": 60.0, "count": 10},
+                "test_bulk_slices.py::test_new": {"avg": None, "p95": None, "count": 0},
+            },
+        },
+    )
+    testdir.makepyfile(
+        test_bulk_slices="""
+        def test_long():
+            pass
+        def test_short_1():
+            pass
+        def test_short_2():
+            pass
+        def test_new():
+            pass
+        """
+    )
+
+    result = testdir.runpytest(
+        "-v",
+        "-s",
+        "--collect-only",
+        "--argus-slices",
+        "--argus-max-splice-time=4",
+        "--argus-default-test-time=60",
+        "--argus-post-reports",
+    )
+    assert result.ret == 0
+
+    assert stats.call_count == 1
+    assert set(stats.last_request.json()["tests"]) == {
+        "test_bulk_slices.py::test_long",
+        "test_bulk_slices.py::test_short_1",
+        "test_bulk_slices.py::test_short_2",
+        "test_bulk_slices.py::test_new",
+    }
+    assert not any(req.method == "GET" for req in requests_mock.request_history), "stats are fetched in bulk"
+    result.stdout.fnmatch_lines(["*0: 0:03:00*"])
+    result.stdout.fnmatch_lines(["*1: 0:03:00*"])
+
+
+def test_make_test_slices_balances_slices():
+    durations = [100, 90, 80, 70, 60, 50, 40, 30, 20, 10]
+    test_data = [dict(test_name=f"test_{duration}", duration=duration) for duration in sorted(durations)]
+
+    slices = ArgusReporter.make_test_slices(test_data, max_slice_duration=200)
+
+    assert sorted(test for current_slice in slices for test in current_slice["tests"]) == sorted(
+        f"test_{duration}" for duration in durations
+    )
+    assert len(slices) == 3
+    assert all(current_slice["total"] <= 200 for current_slice in slices)
+    assert max(s["total"] for s in slices) - min(s["total"] for s in slices) <= 10
+
+
+def test_make_test_slices_long_test_gets_own_slice():
+    test_data = [dict(test_name="test_long", duration=500), dict(test_name="test_short", duration=10)]
+
+    slices = ArgusReporter.make_test_slices(test_data, max_slice_duration=60)
+
+    assert sorted(current_slice["tests"] for current_slice in slices) == [["test_long"], ["test_short"]]
+    assert ArgusReporter.make_test_slices([], max_slice_duration=60) == []
@@ -0,0 +1,62 @@
+"""Backfill the daily pytest status rollup from pytest_v2.
+
+Counts the results submitted before the rollup was deployed into
+``pytest_daily_status``. Results of unknown runs (no test_id) are skipped, as
+they are on submission.
+
+Run ``flask cli sync-models`` first. Results are counted the way submissions
+count them, through their claim in ``pytest_counted_result``: results already
+counted on submission (whatever their client timestamp) are left alone, so the
+migration can run alongside submissions and an interrupted run can be
+restarted.
+"""
+
+import logging
+
+from argus.backend.db import ScyllaCluster
+from argus.backend.models.pytest import PytestResultTable
+from argus.backend.service.views_widgets.pytest import count_statuses
+from argus.backend.util.common import chunk
+from argus.backend.util.logsetup import setup_application_logging
+from argus.common.enums import PytestStatus
+
+
+setup_application_logging(log_level=logging.INFO)
+LOGGER = logging.getLogger(__name__)
+DB = ScyllaCluster.get()
+
+COUNT_CHUNK_SIZE = 1000
+
+
+def migrate():
+    names_stmt = DB.prepare(f"SELECT DISTINCT name FROM {PytestResultTable.table_name()}")
+    names_stmt.fetch_size = 1000
+    results_stmt = DB.prepare(
+        f"SELECT test_id, id, status FROM {PytestResultTable.table_name()} WHERE name = ? AND status IN ?"
+    )
+    statuses = [status.value for status in PytestStatus]
+
+    names = results = failed = 0
+    for name_row in DB.session.execute(names_stmt, timeout=60.0):
+        name = name_row["name"]
+        rows = (
+            PytestResultTable(name=name, test_id=row["test_id"], id=row["id"], status=row["status"])
+            for row in DB.session.execute(results_stmt, (name, statuses))
+            if row["test_id"]
+        )
+        for batch in chunk(rows, COUNT_CHUNK_SIZE):
+            errors = count_statuses(batch)
+            for error in errors.values():
+                LOGGER.error("Failed to count a result of %s: %s", name, error)
+            results += len(batch) - len(errors)
+            failed += len(errors)
+
+        names += 1
+        if names % 1000 == 0:
+            LOGGER.info("Counted %d results of %d tests...", results, names)
+
+    LOGGER.info("Migration complete: counted %d results of %d tests, %d failed.", results, names, failed)
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,46 @@
+"""Backfill the view_test_membership index from argus_user_view.
+
+Runs of a test drop the stats snapshots of the views listing it through
+``view_test_membership``, which is otherwise only written when a view is saved.
+
+Run ``flask cli sync-models`` first. The migration only inserts rows, so it is
+safe to re-run and to run while views are being edited.
+"""
+
+import logging
+
+from cassandra.concurrent import execute_concurrent_with_args
+
+from argus.backend.db import ScyllaCluster
+from argus.backend.models.web import ArgusUserView, ViewTestMembership
+from argus.backend.util.logsetup import setup_application_logging
+
+
+setup_application_logging(log_level=logging.INFO)
+LOGGER = logging.getLogger(__name__)
+DB = ScyllaCluster.get()
+
+WRITE_CONCURRENCY = 32
+
+
+def migrate():
+    views_stmt = DB.prepare(f"SELECT id, tests FROM {ArgusUserView.table_name()}")
+    views_stmt.fetch_size = 1000
+    insert_stmt = DB.prepare(f"INSERT INTO {ViewTestMembership.table_name()} (test_id, view_id) VALUES (?, ?)")
+
+    views = memberships = 0
+    for view in DB.session.execute(views_stmt, timeout=60.0):
+        rows = [(test_id, view["id"]) for test_id in set(view["tests"] or [])]
+        for success, error in execute_concurrent_with_args(
+            DB.session, insert_stmt, rows, concurrency=WRITE_CONCURRENCY, raise_on_first_error=False
+        ):
+            if not success:
+                LOGGER.error("Failed to index tests of view %s: %s", view["id"], error)
+        memberships += len(rows)
+        views += 1
+
+    LOGGER.info("Migration complete: indexed %d tests of %d views.", memberships, views)
+
+
+if __name__ == "__main__":
+    migrate()
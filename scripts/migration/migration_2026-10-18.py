@@ -0,0 +1,61 @@
+"""Backfill the pytest widget search tables from pytest_v2.
+
+Fills ``pytest_test_name`` and ``pytest_result_by_day`` for results submitted
+before the search tables existed. Results of unknown runs (no test_id) are not
+part of any release or view and are skipped, as they are on submission.
+
+Run ``flask cli sync-models`` first. The migration only inserts rows, so it is
+safe to re-run and to run while results are being submitted.
+"""
+
+import logging
+from collections import defaultdict
+
+from cassandra.concurrent import execute_concurrent
+
+from argus.backend.db import ScyllaCluster
+from argus.backend.models.pytest import PytestResultTable, PytestUserField
+from argus.backend.service.views_widgets.pytest import search_index_statements
+from argus.backend.util.logsetup import setup_application_logging
+
+
+setup_application_logging(log_level=logging.INFO)
+LOGGER = logging.getLogger(__name__)
+DB = ScyllaCluster.get()
+
+WRITE_CONCURRENCY = 32
+
+
+def migrate():
+    names_stmt = DB.prepare(f"SELECT DISTINCT name FROM {PytestResultTable.table_name()}")
+    names_stmt.fetch_size = 1000
+    results_stmt = DB.prepare(f"SELECT * FROM {PytestResultTable.table_name()} WHERE name = ?")
+    fields_stmt = DB.prepare(f"SELECT * FROM {PytestUserField.table_name()} WHERE name = ?")
+
+    names = results = 0
+    for name_row in DB.session.execute(names_stmt, timeout=60.0):
+        name = name_row["name"]
+        fields = defaultdict(list)
+        for row in DB.session.execute(fields_stmt, (name,)):
+            fields[row["id"]].append(PytestUserField(**row))
+
+        statements = []
+        for row in DB.session.execute(results_stmt, (name,)):
+            result = PytestResultTable(**row)
+            statements.extend(search_index_statements(result, fields[row["id"]]))
+            results += 1 if result.test_id else 0
+        for success, error in execute_concurrent(
+            DB.session, statements, concurrency=WRITE_CONCURRENCY, raise_on_first_error=False
+        ):
+            if not success:
+                LOGGER.error("Failed to index results of %s: %s", name, error)
+
+        names += 1
+        if names % 1000 == 0:
+            LOGGER.info("Indexed %d results of %d tests...", results, names)
+
+    LOGGER.info("Migration complete: indexed %d results of %d tests.", results, names)
+
+
+if __name__ == "__main__":
+    migrate()